@@ -1,6 +1,11 @@
 
 from __future__ import annotations
+import asyncio
+import importlib
+import time
+from typing import Awaitable, Callable
 from textual.app import App, ComposeResult
+from textual.widget import Widget
 from textual.widgets import Header, Footer, Button, ContentSwitcher, Static
 from textual.containers import Horizontal
 from textual.reactive import reactive
@@ -10,8 +15,8 @@ from services.settings_service import Settings
 from services.localization_service import LocalizationService
 from ui.views.hub import HubView
 from ui.icons import icon
-from ui.palette import PaletteScreen
-from services.rtl_service import RTLService
+from ui.jobs import JobRunner, JobsPanel
+from ui.live_text import LiveText, live
 from pathlib import Path
 
 class ConfirmScreen(ModalScreen[bool]):
@@ -70,6 +75,24 @@ class DummyView(Static):
     def compose(self) -> ComposeResult:
         yield Static(self._label + "\n(Později sem přijde obsah)")
 
+
+def lazy_view(module: str, name: str) -> Callable[..., Widget]:
+    """Factory importing ``module.name`` only when the route is first opened."""
+    def factory(**kwargs) -> Widget:
+        return getattr(importlib.import_module(module), name)(**kwargs)
+    return factory
+
+
+# route -> factory(id=route); views are built on first navigation, not in compose
+ROUTES: dict[str, Callable[..., Widget]] = {
+    "targets": lazy_view("ui.views.catalog", "CatalogView"),
+    "scheduler": lazy_view("ui.views.scheduler", "SchedulerView"),
+    "plugins": lambda **kw: DummyView("🧩 Pluginy", **kw),
+    "dictionaries": lazy_view("ui.views.dictionaries", "DictionariesView"),
+    "settings": lambda **kw: DummyView("⚙️ Nastavení", **kw),
+    "metrics": lazy_view("ui.views.metrics", "MetricsView"),
+}
+
 class PyTransApp(App):
     CSS = '\nScreen { layout: vertical; }\n#topbar { dock: top; height: 3; padding: 0 1; background: $surface; }\nFooter { dock: bottom; }\n#body { height: 1fr; overflow: hidden auto; }\n#spacer { width: 1; }\n'
     BINDINGS = [
@@ -80,30 +103,90 @@ class PyTransApp(App):
 
     route: reactive[str] = reactive("hub")
     _history: list[str] = []
+    EVICT_CHECK = 30.0  # s mezi kontrolami nečinných pohledů
 
     def __init__(self):
         super().__init__()
         self.settings = Settings()
         self.t = LocalizationService(self.settings.language)
+        # widgety podle klíčů – úprava katalogu na disku přepíše jen ty, kterých se týká
+        self.live_text = LiveText(self.t.t)
+        self._locale_watcher = None  # services.locale_watcher.LocaleWatcher, viz on_mount
+        # dlouhé úlohy a blokující I/O mimo smyčku událostí; průběh se kreslí nejvýš JobRunner.FPS×/s
+        self.jobs = JobRunner(self)
+        self._last_used: dict[str, float] = {}
+        self._evicting: dict[str, asyncio.Future] = {}  # route -> probíhající odpojení pohledu
+        self._as400_loaded = False
+        self._exporter = None  # services.metrics.FileExporter, viz on_mount
+        self.plugins: list = []  # models.plugin.Plugin, načtené na pozadí (viz start_plugins)
+        self.plugin_errors: dict[str, Exception] = {}
+        self._scheduler = None  # services.scheduler.Scheduler, spuštěný po načtení pluginů
+        # 0 = pohledy zůstávají; jinak se nečinný pohled po N s odpojí a příště postaví znovu
+        self.evict_after = float(self.settings.get("view_evict_after", 0) or 0)
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
         with Horizontal(id="topbar"):
             # bezpečné 1-cell ikony přes icon_set
             icon_set = getattr(self, "icon_set", "text")
-            yield Button(f"{icon('back', icon_set)} {self.t.t("app.back")}".strip(), id="nav-back")
-            yield Button(f"{icon('home', icon_set)} {self.t.t("app.home")}".strip(), id="nav-home")
+            yield live(self, Button(f"{icon('back', icon_set)} {self.t.t("app.back")}".strip(), id="nav-back"),
+                       "app.back", lambda text: f"{icon('back', icon_set)} {text}".strip())
+            yield live(self, Button(f"{icon('home', icon_set)} {self.t.t("app.home")}".strip(), id="nav-home"),
+                       "app.home", lambda text: f"{icon('home', icon_set)} {text}".strip())
             yield Static("", id="spacer")
         with ContentSwitcher(id="body", initial="hub"):
+            # ostatní pohledy se připojí až při první navigaci (viz ROUTES)
             yield HubView(id="hub")
-            yield DummyView("🎯 Cíle", id="targets")
-            yield DummyView("⏱️ Plánovač", id="scheduler")
-            yield DummyView("🧩 Pluginy", id="plugins")
-            yield DummyView("📚 Slovníky", id="dictionaries")
-            yield DummyView("⚙️ Nastavení", id="settings")
+        yield JobsPanel(self.jobs, id="jobs")
         yield Footer()
 
+    async def ensure_view(self, route: str) -> None:
+        """Build and mount the view of ``route`` unless it is mounted already."""
+        self._last_used[route] = time.monotonic()
+        removing = self._evicting.get(route)
+        if removing is not None:
+            await removing  # pohled se právě odpojuje – dokončit a postavit znovu
+        switcher = self.query_one(ContentSwitcher)
+        if any(child.id == route for child in switcher.children):
+            return
+        factory = ROUTES.get(route)
+        if factory is not None:
+            await switcher.mount(factory(id=route))
+
+    async def evict_idle_views(self, now: float | None = None) -> list[str]:
+        """Remove routed views not shown for ``evict_after`` seconds; returns their routes.
+
+        Views with ``keep_alive`` or a true ``dirty`` attribute (unsaved input,
+        running work) stay. Navigating to a route while its view is being removed
+        waits for the removal and builds the view again.
+        """
+        if self.evict_after <= 0:
+            return []
+        now = time.monotonic() if now is None else now
+        switcher = self.query_one(ContentSwitcher)
+        evicted = []
+        for child in list(switcher.children):
+            route = child.id
+            if route in (None, "hub", self.route) or route in self._evicting:
+                continue
+            if getattr(child, "keep_alive", False) or getattr(child, "dirty", False):
+                continue
+            if now - self._last_used.get(route, now) >= self.evict_after:
+                self._evicting[route] = asyncio.ensure_future(self._remove_view(child.remove()))
+                evicted.append(route)
+        for route in evicted:
+            try:
+                await self._evicting[route]
+            finally:
+                self._evicting.pop(route, None)
+        return evicted
+
+    @staticmethod
+    async def _remove_view(removal: Awaitable[None]) -> None:
+        await removal
+
     def watch_route(self, value: str) -> None:
+        self._last_used[value] = time.monotonic()
         self.query_one(ContentSwitcher).current = value
 
     async def _can_leave_current(self) -> bool:
@@ -114,12 +197,15 @@ class PyTransApp(App):
         if target == self.route:
             return
         if await self._can_leave_current():
+            await self.ensure_view(target)
             self._history.append(self.route)
             self.route = target
 
     async def back(self) -> None:
         if self._history and await self._can_leave_current():
-            self.route = self._history.pop()
+            route = self._history.pop()
+            await self.ensure_view(route)
+            self.route = route
 
     async def home(self) -> None:
         if await self._can_leave_current():
@@ -145,15 +231,26 @@ class PyTransApp(App):
         except Exception:
             self.icon_set = getattr(self.settings, "icon_set", "text") if hasattr(self, "settings") else "text"
 
-        # RTL podpora
-        rtl_path = Path("locales/languages.json")
-        self._rtl = RTLService(rtl_path)
-        current_lang = getattr(self.settings, "language", None) if hasattr(self, "settings") else "en"
-        lang_str = current_lang if isinstance(current_lang, str) and current_lang is not None else "en"
-        if self._rtl.is_rtl(lang_str):
-            self.screen.add_class("-rtl")
-        else:
-            self.screen.remove_class("-rtl")
+        if self.evict_after > 0:
+            self.set_interval(min(self.EVICT_CHECK, self.evict_after), self.evict_idle_views)
+
+        # periodický export metrik pro scrapery (textfile), jen když je zapnutý v nastavení
+        interval = float(self.settings.get("metrics_export_interval", 0) or 0)
+        if interval > 0:
+            from services.metrics import FileExporter, default_registry
+            target = Path(self.settings.get("metrics_export", "./metrics/pytrans.prom"))
+            self._exporter = FileExporter(default_registry(), target, interval).start()
+
+        # živé úpravy locales/*.json (inotify, jinak polling); vypnout přes "locale_watch": false
+        if self.settings.get("locale_watch", True):
+            from services.locale_watcher import LocaleWatcher
+            self._locale_watcher = LocaleWatcher(self.t.path, self.locales_changed).start()
+
+        # pluginy: načtení manifestů a souběžná inicializace mimo UI vlákno
+        self.run_worker(self.start_plugins, thread=True, exclusive=True, group="plugins", exit_on_error=False)
+
+        # RTL podpora – seznam jazyků se čte mimo smyčku událostí
+        self.run_worker(self._load_rtl(), group="rtl", exit_on_error=False)
 
         # Motiv při startu
         theme = getattr(self.settings, "theme", None) if hasattr(self, "settings") else None
@@ -162,8 +259,46 @@ class PyTransApp(App):
         else:
             self.theme_name = "textual-dark"
 
+    async def _load_rtl(self) -> None:
+        from services.rtl_service import RTLService
+        self._rtl = await self.jobs.offload(RTLService, Path("jsons/languages.json"))
+        current_lang = getattr(self.settings, "language", None) if hasattr(self, "settings") else "en"
+        lang_str = current_lang if isinstance(current_lang, str) and current_lang is not None else "en"
+        if self._rtl.is_rtl(lang_str):
+            self.screen.add_class("-rtl")
+        else:
+            self.screen.remove_class("-rtl")
+
+    def start_plugins(self) -> None:
+        """Discover, validate and initialize plugins (runs in a worker thread)."""
+        from services.plugin_loader import load_plugins
+        from services.plugin_registry import init_plugins
+        errors: dict[str, Exception] = {}
+        plugins = load_plugins(on_error=errors.__setitem__)
+        errors.update(init_plugins(plugins))
+        self.plugins, self.plugin_errors = plugins, errors
+        # naplánované pluginy (init_plugins je přidal do default_scheduler) běží se smyčkou aplikace
+        if self.settings.get("scheduler", True):
+            self.call_from_thread(self.start_scheduler)
+
+    def start_scheduler(self) -> None:
+        """Hook scheduled re-translation into the shared scheduler and run its loop until unmount."""
+        from services.scheduled_jobs import install
+        from services.scheduler import default_scheduler
+        self._scheduler = default_scheduler()
+        install(self._scheduler, self.plugins, source=self.settings.get("source_language", "en"),
+                translator=self.settings.get("translator"), queue=self.settings.get("queue"))
+        self.run_worker(self._scheduler.run(), group="scheduler", exclusive=True, exit_on_error=False)
+
+    def locales_changed(self, langs: set[str]) -> None:
+        """Apply edited catalogs (runs in the watcher thread) and relabel the affected widgets."""
+        keys = self.t.refresh(langs).get(self.t.lang)
+        if keys:
+            self.call_from_thread(self.live_text.refresh, keys)
+
     # --- Lokalizovaná paleta ---
     def action_open_palette(self) -> None:
+        from ui.palette import PaletteScreen
         self.push_screen(PaletteScreen("commands"))
 
     # --- Motivy: built-in + AS400 ---
@@ -174,11 +309,10 @@ class PyTransApp(App):
         self.screen.remove_class("-as400")
         if name == "as400":
             # Použij vlastní TCSS pokud existuje, jinak CSS třídu níže
-            tfile = Path("themes/as400.tcss")
-            if tfile.exists():
-                # načti a aplikuj jako dodatečné styly
-                self.stylesheet.read(str(tfile))
-                self.refresh_css()
+            if not self._as400_loaded:
+                # soubor se čte na pozadí; styly se přidají jen jednou, pak stačí přepnout třídu
+                self.run_worker(self._load_theme_css(Path("themes/as400.tcss")), group="theme",
+                                exclusive=True, exit_on_error=False)
             self.screen.add_class("-as400")
         else:
             try:
@@ -186,17 +320,37 @@ class PyTransApp(App):
             except Exception:
                 # fallback
                 self.theme = "textual-dark"
-        # zapiš do settings (pokud služba existuje)
+        # zapiš do settings – uloží se odloženě na pozadí (debounce), UI neblokuje
         try:
-            self.settings["theme"] = name  # type: ignore[index]
-            self.save_settings()  # vždy zavolej helper
+            self.settings["theme"] = name
         except Exception:
             pass
 
+    async def _load_theme_css(self, tfile: Path) -> None:
+        def read() -> str | None:
+            return tfile.read_text(encoding="utf-8") if tfile.exists() else None
+        css = await self.jobs.offload(read)
+        if css is not None and not self._as400_loaded:
+            self.stylesheet.add_source(css, read_from=(str(tfile.resolve()), ""))
+            self.refresh_css()
+        self._as400_loaded = True
+
     def save_settings(self) -> None:
-        """Uloží nastavení do persistentního úložiště, pokud je k dispozici."""
+        """Uloží nastavení do persistentního úložiště, pokud je k dispozici (zápis na pozadí)."""
         if hasattr(self.settings, "save_settings"):
-            self.settings.save_settings()
+            self.jobs.io(self.settings.save_settings)
+
+    def on_unmount(self) -> None:
+        # zastav úlohy (čekají na checkpointu) a dopiš případné odložené změny
+        self.jobs.shutdown()
+        self.settings.close()
+        if self._locale_watcher is not None:
+            self._locale_watcher.stop()
+        self.t.close()
+        if self._exporter is not None:
+            self._exporter.stop()
+        if self._scheduler is not None:
+            self._scheduler.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+# benchmarks/startup.py
+"""TUI startup benchmark: time to first frame and import times.
+
+``python -m benchmarks.startup --repeat 5 --output startup.json``
+
+Every sample is a fresh interpreter (``-X importtime``) that imports ``app``,
+runs :class:`PyTransApp` headless and exits on the ``Ready`` event – the first
+frame. Optionally it also opens ``--route`` and measures the first navigation.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from app import PyTransApp
+t_import = time.perf_counter()
+route = sys.argv[1] if len(sys.argv) > 1 else ""
+marks = {}
+
+class Probe(PyTransApp):
+    def on_ready(self) -> None:
+        marks["first_frame"] = time.perf_counter()
+        self.call_later(self._nav)
+
+    async def _nav(self) -> None:
+        if route:
+            started = time.perf_counter()
+            await self.go(route)
+            await self.animator.wait_until_complete()
+            marks["route"] = time.perf_counter() - started
+        self.exit()
+
+Probe().run(headless=True, size=(120, 40))
+print("@@" + json.dumps({
+    "import_app": t_import - t0,
+    "first_frame": marks["first_frame"] - t0,
+    "route": marks.get("route"),
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr: str, top: int) -> List[Dict[str, object]]:
+    """Slowest modules by cumulative import time (µs) from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative, name = line.replace("import time:", "|", 1).split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        name = name[1:]  # one space after the bar, then two per nesting level
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative),
+                     "depth": (len(name) - len(name.lstrip())) // 2})
+    rows.sort(key=lambda r: r["cumulative_us"], reverse=True)
+    return rows[:top]
+
+
+def sample(route: str, top: int) -> Dict[str, object]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE, route],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    line = next((l for l in proc.stdout.splitlines() if l.startswith("@@")), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError(f"probe failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+    result = json.loads(line[2:])
+    result["imports"] = parse_importtime(proc.stderr, top)
+    return result
+
+
+def run(repeat: int = 5, route: str = "", top: int = 15) -> Dict[str, object]:
+    samples = [sample(route, top) for _ in range(repeat)]
+
+    def stats(key: str) -> Optional[Dict[str, float]]:
+        values = [s[key] for s in samples if s.get(key) is not None]
+        if not values:
+            return None
+        return {"median_ms": round(statistics.median(values) * 1000, 2),
+                "min_ms": round(min(values) * 1000, 2), "max_ms": round(max(values) * 1000, 2)}
+
+    return {
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "import_app": stats("import_app"),
+        "first_frame": stats("first_frame"),
+        "route": {"name": route, **(stats("route") or {})} if route else None,
+        "modules": samples[-1]["modules"],
+        # import times of the last sample (the first one also pays for cold disk caches)
+        "imports": samples[-1]["imports"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--route", default="", help="also measure the first navigation to this route")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to record")
+    parser.add_argument("--output", type=Path, help="write results as JSON here")
+    args = parser.parse_args(argv)
+    result = run(args.repeat, args.route, args.top)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
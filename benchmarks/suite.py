@@ -0,0 +1,267 @@
+# benchmarks/suite.py
+"""Hot-path benchmarks on synthetic data, with JSON results and a baseline comparison.
+
+    python -m benchmarks.suite                          # 1k, 10k, 100k keys
+    python -m benchmarks.suite --sizes 1000,500000 --output now.json
+    python -m benchmarks.suite --compare baseline.json  # exit 1 on regressions
+
+Every case is timed ``--repeat`` times and the median per operation is kept;
+a case is a regression when it is more than ``--threshold`` slower than the
+baseline (and the difference is above timer noise).
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks import synthetic
+
+# name -> setup(size, workdir) returning (operation, operations per call)
+Case = Callable[[int, Path], Tuple[Callable[[], object], int]]
+CASES: Dict[str, Case] = {}
+NOISE_US = 2.0  # differences below this per operation are never regressions
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(fn: Case) -> Case:
+        CASES[name] = fn
+        return fn
+    return register
+
+
+def _locales(size: int, workdir: Path) -> Tuple[Path, List[str]]:
+    path = workdir / f"locales-{size}"
+    if not (path / "en.json").exists():
+        synthetic.write_locales(path, size)
+    keys = list(json.loads((path / "en.json").read_text(encoding="utf-8")))
+    return path, keys
+
+
+@case("localization.load_lang")
+def _load_lang(size: int, workdir: Path):
+    from services.localization_service import LocalizationService
+    path, _ = _locales(size, workdir)
+
+    def op() -> object:
+        return LocalizationService("cs", path)._load_lang("cs")
+    return op, 1
+
+
+@case("localization.first_t")
+def _first_t(size: int, workdir: Path):
+    # first lookup of a fresh service: compiled catalog from the disk cache
+    from services.localization_service import LocalizationService
+    path, keys = _locales(size, workdir)
+    LocalizationService("cs", path).t(keys[0])  # fill the compile cache
+
+    def op() -> object:
+        return LocalizationService("cs", path).t(keys[0])
+    return op, 1
+
+
+@case("localization.t")
+def _t(size: int, workdir: Path):
+    from services.localization_service import LocalizationService
+    path, keys = _locales(size, workdir)
+    service = LocalizationService("cs", path)
+    rnd = random.Random(2)
+    sample = [rnd.choice(keys) for _ in range(1000)] + [f"missing.{i}" for i in range(100)]
+
+    def op() -> object:
+        for key in sample:
+            service.t(key)
+        return None
+    return op, len(sample)
+
+
+@case("localization.t_vars")
+def _t_vars(size: int, workdir: Path):
+    from services.localization_service import LocalizationService
+    path, keys = _locales(size, workdir)
+    service = LocalizationService("cs", path)
+    sample = random.Random(3).sample(keys, min(500, len(keys)))
+
+    def op() -> object:
+        for key in sample:
+            service.t(key, name="x", count=3)
+        return None
+    return op, len(sample)
+
+
+def _settings_file(size: int, workdir: Path) -> Path:
+    file = workdir / f"settings-{size}.json"
+    if not file.exists():
+        file.write_text(json.dumps(synthetic.settings(size), indent=4), encoding="utf-8")
+    return file
+
+
+@case("settings.load")
+def _settings_load(size: int, workdir: Path):
+    from services.settings_service import Settings
+    file = _settings_file(size, workdir)
+
+    def op() -> object:
+        s = Settings(file, save_delay=0)
+        s.close()  # nothing to write; unregisters its atexit hook
+        return s
+    return op, 1
+
+
+@case("settings.save")
+def _settings_save(size: int, workdir: Path):
+    from services.settings_service import Settings
+    settings = Settings(_settings_file(size, workdir), save_delay=0)
+    counter = iter(range(10 ** 9))
+
+    def op() -> object:
+        settings.set("theme", f"theme-{next(counter)}")  # save_delay=0 writes synchronously
+        return None
+    return op, 1
+
+
+@case("plugins.load")
+def _plugins_load(size: int, workdir: Path):
+    from services.plugin_loader import load_plugins
+    count = max(1, size // 100)  # plugins.json stays far smaller than catalogs
+    file = workdir / f"plugins-{count}.json"
+    if not file.exists():
+        file.write_text(json.dumps(synthetic.plugins(count), indent=2), encoding="utf-8")
+
+    def op() -> object:
+        return load_plugins(file)
+    return op, count
+
+
+@case("rtl.is_rtl")
+def _is_rtl(size: int, workdir: Path):
+    from services.rtl_service import RTLService
+    service = RTLService()
+    rnd = random.Random(4)
+    codes = ["ar", "he", "fa", "ur", "en", "cs", "de", "zh", "xx"]
+    sample = [rnd.choice(codes) + rnd.choice(["", "-SA", "_IL", "-Latn-RS"]) for _ in range(1000)]
+
+    def op() -> object:
+        for code in sample:
+            service.is_rtl(code)
+        return None
+    return op, len(sample)
+
+
+@case("palette.filter")
+def _palette_filter(size: int, workdir: Path):
+    # the index PaletteScreen filters on every (debounced) keystroke
+    from services.search_index import SearchIndex
+    entries = [(f"cmd:{k}", k.replace(".", " "), v) for k, v in synthetic.catalog(min(size, 50_000)).items()]
+    index = SearchIndex(entries)
+    typing = ["t", "tr", "tra", "tran", "trans", "transl", "p", "pl", "plg", "plgn"]
+
+    def op() -> object:
+        for query in typing:
+            index.search(query)
+        index.search("")
+        return None
+    return op, len(typing) + 1
+
+
+def measure(op: Callable[[], object], repeat: int, budget: float) -> List[float]:
+    """Seconds per call; repeats until ``repeat`` samples or ``budget`` seconds (at least 3 samples)."""
+    times: List[float] = []
+    started = time.perf_counter()
+    while len(times) < repeat and (len(times) < 3 or time.perf_counter() - started < budget):
+        t0 = time.perf_counter()
+        op()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run(sizes: List[int], names: List[str], repeat: int, budget: float, workdir: Path,
+        log: Callable[[str], None] = lambda s: None) -> Dict[str, object]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in names:
+        for size in sizes:
+            op, per_call = CASES[name](size, workdir)
+            op()  # warm-up
+            times = measure(op, repeat, budget)
+            median = statistics.median(times) / per_call * 1e6
+            results.setdefault(name, {})[str(size)] = {
+                "median_us": round(median, 3),
+                "min_us": round(min(times) / per_call * 1e6, 3),
+                "samples": len(times),
+            }
+            log(f"{name:<26} {size:>8}  {median:12.3f} µs/op")
+    return {
+        "meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                 "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "sizes": sizes, "repeat": repeat},
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], threshold: float) -> List[Dict[str, object]]:
+    """Cases slower than ``baseline`` by more than ``threshold`` (0.2 = 20 %)."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, by_size in current["results"].items():  # type: ignore[union-attr]
+        for size, now in by_size.items():
+            before = base_results.get(name, {}).get(size)  # type: ignore[union-attr]
+            if not before:
+                continue
+            old, new = before["median_us"], now["median_us"]
+            if new > old * (1 + threshold) and new - old > NOISE_US:
+                regressions.append({"case": name, "size": int(size), "baseline_us": old, "current_us": new,
+                                    "change": round(new / old - 1, 3) if old else None})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PyTrans hot-path benchmarks")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="catalog sizes, comma separated (up to 500000)")
+    parser.add_argument("--cases", default="", help="only these cases (comma separated prefixes)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=2.0, help="max seconds per case and size")
+    parser.add_argument("--workdir", type=Path, help="keep generated data here (default: temp dir)")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20 %%)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    prefixes = [p for p in args.cases.split(",") if p]
+    names = [n for n in CASES if not prefixes or any(n.startswith(p) for p in prefixes)]
+
+    log = lambda line: print(line, file=sys.stderr, flush=True)
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        result = run(sizes, names, args.repeat, args.budget, args.workdir, log)
+    else:
+        with tempfile.TemporaryDirectory(prefix="pytrans-bench-") as tmp:
+            result = run(sizes, names, args.repeat, args.budget, Path(tmp), log)
+
+    status = 0
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        result["regressions"] = regressions
+        for r in regressions:
+            log(f"REGRESSION {r['case']} @ {r['size']}: {r['baseline_us']} → {r['current_us']} µs/op")
+        status = 1 if regressions else 0
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
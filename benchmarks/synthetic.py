@@ -0,0 +1,66 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic data for the benchmarks: catalogs, plugins.json, settings."""
+from __future__ import annotations
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+_WORDS = ("file", "open", "save", "target", "plugin", "language", "schedule", "translate", "settings",
+          "error", "warning", "user", "project", "catalog", "export", "import", "theme", "search")
+_SECTIONS = ("app", "ui", "cmd", "err", "pal", "theme", "msg")
+
+
+def catalog(size: int, seed: int = 0, templates: float = 0.2) -> Dict[str, str]:
+    """``size`` dotted keys like the real catalogs; ``templates`` share has ``{name}`` fields."""
+    rnd = random.Random(seed)
+    out: Dict[str, str] = {}
+    for i in range(size):
+        key = f"{rnd.choice(_SECTIONS)}.{rnd.choice(_WORDS)}.{i}"
+        words = " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(2, 9))).capitalize()
+        if rnd.random() < templates:
+            words += " {name} ({count})"
+        out[key] = words
+    return out
+
+
+def write_locales(path: Path, size: int, langs: Sequence[str] = ("en", "cs"), coverage: float = 0.8) -> Dict[str, str]:
+    """English catalog of ``size`` keys plus ``coverage`` translated share for the other languages."""
+    path.mkdir(parents=True, exist_ok=True)
+    source = catalog(size)
+    (path / "en.json").write_text(json.dumps(source, ensure_ascii=False), encoding="utf-8")
+    rnd = random.Random(1)
+    for lang in langs:
+        if lang == "en":
+            continue
+        target = {k: f"[{lang}] {v}" for k, v in source.items() if rnd.random() < coverage}
+        (path / f"{lang}.json").write_text(json.dumps(target, ensure_ascii=False), encoding="utf-8")
+    return source
+
+
+def plugins(size: int, seed: int = 0) -> List[dict]:
+    """Valid plugin definitions of every type, in the plugins.json shape."""
+    rnd = random.Random(seed)
+    makers = [
+        lambda i: ("translator", {"server_url": f"http://mt{i}.local/translate", "batch_size": 50,
+                                  "concurrency": 4, "rate_limit": 10.0}),
+        lambda i: ("backend", {"connection_string": f"tm{i}.sqlite", "cache_enabled": True}),
+        lambda i: ("data_accessor", {"endpoint": f"https://api{i}.local/items", "method": "GET",
+                                     "page_size": 500, "format": "json"}),
+        lambda i: ("middleware", {"order": i, "enabled": True, "kind": "glossary"}),
+        lambda i: ("scheduler", {"cron": "*/5 * * * *", "timezone": "Europe/Prague"}),
+        lambda i: ("custom", {}),
+    ]
+    out = []
+    for i in range(size):
+        kind, params = rnd.choice(makers)(i)
+        out.append({"name": f"{kind}-{i}", "plugin_type": kind, "params": params})
+    return out
+
+
+def settings(size: int) -> Dict[str, object]:
+    """Settings file with ``size`` extra keys next to the real ones."""
+    data: Dict[str, object] = {"language": "cs", "theme": "nord", "application-id": "bench", "icon_set": "text"}
+    for i in range(size):
+        data[f"bench.{i}"] = {"enabled": i % 2 == 0, "value": i, "label": f"entry {i}"} if i % 3 else f"value {i}"
+    return data
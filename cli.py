@@ -0,0 +1,502 @@
+# cli.py
+"""Headless batch runner: ``python pytrans.py run --target cs --target de``.
+
+``python pytrans.py schedule`` runs the SCHEDULER plugins (``--once`` for cron boxes).
+``python pytrans.py catalog export|import`` converts catalogs to and from ``<lang>.ptc``.
+``python pytrans.py qa`` checks the catalogs (placeholders, lengths, bidi marks).
+``python pytrans.py queue submit|work|status|collect|retry|serve`` spreads the
+work over processes and machines through a shared job queue.
+
+Uses settings, plugins and the translation stack only – nothing from ``ui/`` or
+Textual is imported. Independent target languages run in a process pool and
+progress is written to stdout as JSON lines.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.plugin_loader import load_plugins
+from services.settings_service import Settings
+
+PROGRESS_INTERVAL = 0.5  # s between progress lines of one target
+
+_events: Any = None  # queue of the pool, set in workers by _init_worker
+
+
+def emit(event: str, **fields: Any) -> None:
+    line = json.dumps({"event": event, "ts": round(time.time(), 3), **fields}, ensure_ascii=False)
+    if _events is not None:
+        _events.put(line)
+    else:
+        print(line, flush=True)
+
+
+def _init_worker(events: Any) -> None:
+    global _events
+    _events = events
+
+
+def _pick(plugins: List[Plugin], kind: PluginType, name: Optional[str]) -> Optional[Plugin]:
+    for p in plugins:
+        if p.plugin_type is kind and (name is None or p.name == name):
+            return p
+    return None
+
+
+async def _translate(lang: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    # imported here so the parent process only pays for what it runs itself
+    from services.delta_service import DeltaTranslator
+    from services.job_journal import JobJournal
+    from services.translation_engine import TranslationEngine
+    from services.translation_memory import TranslationMemory
+
+    translator: Plugin = config["translator"]
+    backend: Optional[Plugin] = config["backend"]
+    engine = TranslationEngine.from_plugin(translator)
+    memory = None
+    if backend is not None and backend.params.get("cache_enabled", True):
+        memory = TranslationMemory.from_plugin(backend)
+    pipeline = None
+    if config["middlewares"]:
+        from services import glossary_service, segmentation  # noqa: F401 – registrují middleware
+        from services.middleware_pipeline import MiddlewarePipeline
+        pipeline = MiddlewarePipeline.from_plugins(config["middlewares"])
+    journal = JobJournal.for_job(f"cli-{lang}", Path(config["locales"]) / ".journal") if config["journal"] else None
+    last = 0.0
+
+    def progress(target: str, done: int, total: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if done == total or now - last >= PROGRESS_INTERVAL:
+            last = now
+            emit("progress", target=target, done=done, total=total)
+
+    try:
+        delta = DeltaTranslator(Path(config["locales"]), config["source"])
+        if journal is not None and len(journal):
+            emit("resume", target=lang, journaled=len(journal))
+        deltas = await delta.run(engine, [lang], memory, journal=journal, progress=progress,
+                                 split_min=config["split_min"] or None, pipeline=pipeline)
+        d = deltas[lang]
+        if d.removed:
+            emit("removed", target=lang, keys=d.removed)
+        for key, problems in d.issues.items():
+            emit("placeholders", target=lang, key=key, problems=problems)
+        return {"added": len(d.added), "changed": len(d.changed), "removed": len(d.removed),
+                "unchanged": d.unchanged, "issues": len(d.issues), "throttle": engine.throttle.stats()}
+    finally:
+        await engine.aclose()
+        if memory is not None:
+            memory.close()
+
+
+def run_target(lang: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate one target language; runs in a pool worker (or inline for a single target)."""
+    started = time.perf_counter()
+    emit("start", target=lang, pid=os.getpid())
+    try:
+        summary = asyncio.run(_translate(lang, config))
+    except Exception as e:
+        emit("error", target=lang, error=f"{type(e).__name__}: {e}")
+        return {"target": lang, "ok": False, "error": str(e)}
+    seconds = round(time.perf_counter() - started, 3)
+    emit("done", target=lang, seconds=seconds, **summary)
+    return {"target": lang, "ok": True, "seconds": seconds, **summary}
+
+
+def _relay(events: Any) -> None:
+    while True:
+        line = events.get()
+        if line is None:
+            return
+        print(line, flush=True)
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    settings = Settings(args.settings, save_delay=0)
+    plugins = load_plugins(args.plugins)
+    translator = _pick(plugins, PluginType.TRANSLATOR, args.translator or settings.get("translator"))
+    if translator is None:
+        emit("error", error="no TRANSLATOR plugin configured")
+        return 2
+    locales = Path(args.locales)
+    source = args.source or settings.get("source_language", "en")
+    targets = [t for value in args.target for t in value.split(",") if t and t != source]
+    if not targets:
+        from services.delta_service import DeltaTranslator
+        targets = DeltaTranslator(locales, source).targets()
+    config = {
+        "translator": translator,
+        "backend": _pick(plugins, PluginType.BACKEND, args.backend),
+        "locales": str(locales),
+        "source": source,
+        "journal": not args.no_journal,
+        "split_min": args.split_min,
+        "middlewares": [p for p in plugins if p.plugin_type is PluginType.MIDDLEWARE] if args.middleware else [],
+    }
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(targets)))
+    emit("plan", source=source, targets=targets, translator=translator.name, workers=workers)
+    started = time.perf_counter()
+
+    if workers == 1:
+        results = [run_target(lang, config) for lang in targets]
+    else:
+        ctx = multiprocessing.get_context("spawn" if args.spawn else None)
+        events = ctx.Queue()
+        relay = threading.Thread(target=_relay, args=(events,), daemon=True)
+        relay.start()
+        try:
+            with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker, initargs=(events,)) as pool:
+                futures: List[Future] = [pool.submit(run_target, lang, config) for lang in targets]
+                results = [f.result() for f in futures]
+        finally:
+            events.put(None)
+            relay.join()
+
+    failed = [r["target"] for r in results if not r["ok"]]
+    emit("summary", targets=len(results), failed=failed, seconds=round(time.perf_counter() - started, 3))
+    return 1 if failed else 0
+
+
+def cmd_qa(args: argparse.Namespace) -> int:
+    from services.catalog_qa import CatalogQA
+    from services.rtl_service import RTLService
+
+    settings = Settings(args.settings, save_delay=0)
+    source = args.source or settings.get("source_language", "en")
+    qa = CatalogQA(Path(args.locales), source, rtl=RTLService(args.languages).is_rtl, chunk_size=args.chunk_size)
+    langs = [t for value in args.target for t in value.split(",") if t and t != source] or None
+    last = 0.0
+
+    def progress(done: int, total: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if done == total or now - last >= PROGRESS_INTERVAL:
+            last = now
+            emit("progress", done=done, total=total)
+
+    report = qa.run(langs, workers=args.workers, use_cache=not args.no_cache, progress=progress)
+    shown = 0
+    for issue in report.issues:
+        if args.errors_only and issue.severity != "error":
+            continue
+        if args.limit and shown >= args.limit:
+            break
+        shown += 1
+        emit("issue", target=issue.lang, key=issue.key, check=issue.check,
+             severity=issue.severity, message=issue.message)
+    emit("summary", source=source, targets=report.langs, keys=report.keys, issues=report.counts(),
+         errors=report.errors, missing=report.missing, chunks=report.chunks, cached=report.cached,
+         seconds=round(report.seconds, 3))
+    return 1 if report.errors else 0
+
+
+def cmd_catalog(args: argparse.Namespace) -> int:
+    from services.binary_catalog import export_locales, import_catalog
+
+    if args.action == "import":
+        emit("imported", file=str(args.file), out=str(import_catalog(args.file, args.out)))
+        return 0
+    settings = Settings(args.settings, save_delay=0)
+    source = args.source or settings.get("source_language", "en")
+    langs = [t for value in args.target for t in value.split(",") if t] or None
+    for file in export_locales(Path(args.locales), args.out, langs, default=source):
+        emit("exported", file=str(file))
+    return 0
+
+
+def cmd_schedule(args: argparse.Namespace) -> int:
+    from services.scheduled_jobs import Retranslate, install
+    from services.scheduler import Scheduler
+
+    settings = Settings(args.settings, save_delay=0)
+    plugins = load_plugins(args.plugins)
+    scheduler = Scheduler(args.max_concurrent, state_file=args.state)
+    try:
+        hook = install(scheduler, plugins, source=settings.get("source_language", "en"),
+                       translator=args.translator or settings.get("translator"), backend=args.backend,
+                       queue=settings.get("queue"))
+    except ValueError as e:
+        emit("error", error=str(e))
+        return 2
+    scheduler.on_fire.remove(hook)
+
+    async def fire(p: Plugin) -> None:
+        emit("fire", job=p.name)
+        try:
+            summary = await hook(p)
+        except Exception as e:
+            emit("error", job=p.name, error=f"{type(e).__name__}: {e}")
+            raise
+        emit("done", job=p.name, **summary)
+
+    scheduler.on_fire.append(fire)
+    emit("plan", jobs=[{"job": j.name, "cron": j.cron.expr, "next_run": j.next_run.isoformat() if j.next_run else None}
+                       for j in scheduler.upcoming(len(scheduler.jobs))])
+    if args.once:
+        ran = asyncio.run(scheduler.run_pending())
+        failed = [j.name for j in scheduler.jobs.values() if j.last_error]
+        emit("summary", ran=ran, failed=failed)
+        return 1 if failed else 0
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# --- queue: workers on several processes/machines share one job queue ---
+
+async def _work(index: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    from services.queue_worker import QueueWorker
+    from services.translation_engine import TranslationEngine
+    from services.translation_memory import TranslationMemory
+    from services.work_queue import open_queue
+
+    backend: Optional[Plugin] = config["backend"]
+    engine = TranslationEngine.from_plugin(config["translator"])
+    memory = None
+    if backend is not None and backend.params.get("cache_enabled", True):
+        memory = TranslationMemory.from_plugin(backend)
+    pipeline = None
+    if config["middlewares"]:
+        from services import glossary_service, segmentation  # noqa: F401 – registrují middleware
+        from services.middleware_pipeline import MiddlewarePipeline
+        pipeline = MiddlewarePipeline.from_plugins(config["middlewares"])
+    queue = open_queue(config["queue"])
+    shards: List[str] = config["shards"]
+    worker = QueueWorker(queue, engine, memory, pipeline, shards or None, batch=config["batch"],
+                         visibility=config["visibility"], prefer=shards[index % len(shards)] if shards else None)
+    last = 0.0
+
+    def progress(w: QueueWorker, count: int) -> None:
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= PROGRESS_INTERVAL:
+            last = now
+            emit("progress", worker=w.name, shard=w.prefer, done=w.done, failed=w.failed)
+
+    try:
+        await worker.run(until_idle=config["until_idle"], progress=progress)
+    finally:
+        await engine.aclose()
+        if memory is not None:
+            memory.close()
+        queue.close()
+    return {"worker": worker.name, "done": worker.done, "failed": worker.failed}
+
+
+def work_process(index: int, config: Dict[str, Any]) -> Dict[str, Any]:
+    """One queue worker; runs in a pool worker (or inline with ``--processes 1``)."""
+    emit("start", worker=index, pid=os.getpid())
+    try:
+        summary = asyncio.run(_work(index, config))
+    except KeyboardInterrupt:
+        return {"worker": index, "ok": True, "interrupted": True}
+    except Exception as e:
+        emit("error", worker=index, error=f"{type(e).__name__}: {e}")
+        return {"worker": index, "ok": False, "error": str(e)}
+    emit("done", **summary)
+    return {"ok": True, **summary}
+
+
+def _queue_url(args: argparse.Namespace, settings: Settings) -> str:
+    from services.work_queue import DEFAULT_QUEUE
+    return args.queue or settings.get("queue", DEFAULT_QUEUE)
+
+
+def _targets(args: argparse.Namespace, source: str) -> Optional[List[str]]:
+    return [t for value in args.target for t in value.split(",") if t and t != source] or None
+
+
+def cmd_queue(args: argparse.Namespace) -> int:
+    from services import queue_worker
+    from services.work_queue import open_queue, serve
+
+    settings = Settings(args.settings, save_delay=0)
+    url = _queue_url(args, settings)
+    source = args.source or settings.get("source_language", "en")
+    locales = Path(args.locales)
+    action = args.action
+
+    if action == "work":
+        return _cmd_queue_work(args, settings, url, source)
+    queue = open_queue(url)
+    try:
+        if action == "submit":
+            added = queue_worker.submit_targets(queue, locales, source, _targets(args, source), args.job)
+            emit("submitted", queue=url, targets=added, total=sum(added.values()))
+        elif action == "collect":
+            applied = queue_worker.collect(queue, locales, source, _targets(args, source))
+            emit("collected", targets=applied, total=sum(applied.values()))
+        elif action == "retry":
+            targets = _targets(args, source) or [None]
+            emit("retried", tasks=sum(queue.retry_dead(t) for t in targets))
+        elif action == "status":
+            stats = queue.stats()
+            for shard, s in sorted(stats.items()):
+                emit("shard", shard=shard, ready=s.ready, leased=s.leased, done=s.done, dead=s.dead,
+                     retried=s.retried, workers=s.workers)
+            emit("summary", shards=len(stats), pending=sum(s.pending for s in stats.values()),
+                 done=sum(s.done for s in stats.values()), dead=sum(s.dead for s in stats.values()))
+        elif action == "serve":
+            server = serve(queue, args.host, args.port, args.token or settings.get("queue_token"))
+            emit("serving", queue=url, host=args.host, port=server.server_address[1])
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+    finally:
+        queue.close()
+    return 0
+
+
+def _cmd_queue_work(args: argparse.Namespace, settings: Settings, url: str, source: str) -> int:
+    plugins = load_plugins(args.plugins)
+    translator = _pick(plugins, PluginType.TRANSLATOR, args.translator or settings.get("translator"))
+    if translator is None:
+        emit("error", error="no TRANSLATOR plugin configured")
+        return 2
+    shards = _targets(args, source) or []
+    config = {
+        "translator": translator,
+        "backend": _pick(plugins, PluginType.BACKEND, args.backend),
+        "middlewares": [p for p in plugins if p.plugin_type is PluginType.MIDDLEWARE] if args.middleware else [],
+        "queue": url,
+        "shards": shards,
+        "batch": args.batch,
+        "visibility": args.visibility,
+        "until_idle": args.until_idle,
+    }
+    processes = max(1, args.processes or os.cpu_count() or 1)
+    emit("plan", queue=url, shards=shards or "all", translator=translator.name, processes=processes)
+    started = time.perf_counter()
+
+    if processes == 1:
+        results = [work_process(0, config)]
+    else:
+        ctx = multiprocessing.get_context("spawn" if args.spawn else None)
+        events = ctx.Queue()
+        relay = threading.Thread(target=_relay, args=(events,), daemon=True)
+        relay.start()
+        try:
+            with ProcessPoolExecutor(processes, mp_context=ctx, initializer=_init_worker, initargs=(events,)) as pool:
+                futures: List[Future] = [pool.submit(work_process, i, config) for i in range(processes)]
+                results = [f.result() for f in futures]
+        finally:
+            events.put(None)
+            relay.join()
+
+    failed = [r["worker"] for r in results if not r["ok"]]
+    emit("summary", processes=len(results), done=sum(r.get("done", 0) for r in results),
+         failed=failed, seconds=round(time.perf_counter() - started, 3))
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pytrans", description="PyTrans headless commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="translate new and changed keys into target languages")
+    run.add_argument("--target", action="append", default=[], help="target language (repeatable or comma separated; default: all catalogs)")
+    run.add_argument("--source", help="source language (default: settings 'source_language' or en)")
+    run.add_argument("--translator", help="TRANSLATOR plugin name (default: settings 'translator' or the first one)")
+    run.add_argument("--backend", help="BACKEND plugin used as translation memory (default: the first one)")
+    run.add_argument("--workers", type=int, default=0, help="worker processes (default: one per target, up to CPU count)")
+    run.add_argument("--locales", default="./locales")
+    run.add_argument("--plugins", type=Path, default=Path("./settings/plugins.json"))
+    run.add_argument("--settings", type=Path, default=Path("./settings/settings.json"))
+    run.add_argument("--no-journal", action="store_true", help="do not journal progress for resume")
+    run.add_argument("--split-min", type=int, default=80,
+                     help="split values at least this long into sentences; 0 sends whole values unmasked")
+    run.add_argument("--middleware", action="store_true", help="run segments through the MIDDLEWARE plugins")
+    run.add_argument("--spawn", action="store_true", help="start workers with spawn instead of the platform default")
+    run.set_defaults(func=cmd_run)
+
+    qa = sub.add_parser("qa", help="check translations against the source catalog")
+    qa.add_argument("--target", action="append", default=[], help="target language (repeatable or comma separated; default: all catalogs)")
+    qa.add_argument("--source", help="source language (default: settings 'source_language' or en)")
+    qa.add_argument("--workers", type=int, default=0, help="worker processes (default: CPU count)")
+    qa.add_argument("--chunk-size", type=int, default=4096, help="keys per checked chunk")
+    qa.add_argument("--errors-only", action="store_true", help="list only issues that break formatting")
+    qa.add_argument("--limit", type=int, default=0, help="list at most N issues (the summary counts all)")
+    qa.add_argument("--no-cache", action="store_true", help="ignore and do not update the result cache")
+    qa.add_argument("--locales", default="./locales")
+    qa.add_argument("--languages", type=Path, default=Path("./jsons/languages.json"), help="language list with RTL flags")
+    qa.add_argument("--settings", type=Path, default=Path("./settings/settings.json"))
+    qa.set_defaults(func=cmd_qa)
+
+    cat = sub.add_parser("catalog", help="binary catalogs (<lang>.ptc) for memory-mapped lookups")
+    cat_actions = cat.add_subparsers(dest="action", required=True)
+    export = cat_actions.add_parser("export", help="locales/*.json -> <lang>.ptc, merged with fallbacks")
+    export.add_argument("--target", action="append", default=[], help="language (repeatable or comma separated; default: all catalogs)")
+    export.add_argument("--source", help="last fallback language (default: settings 'source_language' or en)")
+    export.add_argument("--out", type=Path, help="output directory (default: the locales directory)")
+    export.add_argument("--locales", default="./locales")
+    export.add_argument("--settings", type=Path, default=Path("./settings/settings.json"))
+    imp = cat_actions.add_parser("import", help="<lang>.ptc -> JSON catalog")
+    imp.add_argument("file", type=Path)
+    imp.add_argument("out", type=Path)
+    cat.set_defaults(func=cmd_catalog)
+
+    schedule = sub.add_parser("schedule", help="run the SCHEDULER plugins (re-translate or queue their projects)")
+    schedule.add_argument("--once", action="store_true", help="run the jobs that are due now and exit (for system cron)")
+    schedule.add_argument("--max-concurrent", type=int, default=4, help="jobs running at once")
+    schedule.add_argument("--translator", help="TRANSLATOR plugin name (default: settings 'translator' or the first one)")
+    schedule.add_argument("--backend", help="BACKEND plugin used as translation memory (default: the first one)")
+    schedule.add_argument("--state", type=Path, default=Path("./settings/scheduler_state.json"),
+                          help="last run times, shared with the app")
+    schedule.add_argument("--plugins", type=Path, default=Path("./settings/plugins.json"))
+    schedule.add_argument("--settings", type=Path, default=Path("./settings/settings.json"))
+    schedule.set_defaults(func=cmd_schedule)
+
+    q = sub.add_parser("queue", help="shared job queue for worker processes on one or more machines")
+    actions = q.add_subparsers(dest="action", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--queue", help="queue path or URL (default: settings 'queue' or ./locales/.queue/queue.sqlite)")
+    common.add_argument("--target", action="append", default=[], help="target language / shard (repeatable or comma separated; default: all)")
+    common.add_argument("--source", help="source language (default: settings 'source_language' or en)")
+    common.add_argument("--locales", default="./locales")
+    common.add_argument("--settings", type=Path, default=Path("./settings/settings.json"))
+    submit = actions.add_parser("submit", parents=[common], help="queue new and changed keys of the targets")
+    submit.add_argument("--job", help="job label (default: source and timestamp)")
+    actions.add_parser("status", parents=[common], help="tasks per shard")
+    actions.add_parser("collect", parents=[common], help="merge finished translations into the catalogs")
+    actions.add_parser("retry", parents=[common], help="requeue dead tasks")
+    work = actions.add_parser("work", parents=[common], help="lease and translate queued segments")
+    work.add_argument("--processes", type=int, default=0, help="worker processes on this machine (default: CPU count)")
+    work.add_argument("--batch", type=int, default=100, help="segments per lease")
+    work.add_argument("--visibility", type=float, default=120.0, help="lease timeout in seconds (extended while working)")
+    work.add_argument("--until-idle", action="store_true", help="exit when the shards have nothing pending")
+    work.add_argument("--translator", help="TRANSLATOR plugin name (default: settings 'translator' or the first one)")
+    work.add_argument("--backend", help="BACKEND plugin used as translation memory (default: the first one)")
+    work.add_argument("--middleware", action="store_true", help="run segments through the MIDDLEWARE plugins")
+    work.add_argument("--plugins", type=Path, default=Path("./settings/plugins.json"))
+    work.add_argument("--spawn", action="store_true", help="start workers with spawn instead of the platform default")
+    serve = actions.add_parser("serve", parents=[common], help="expose the queue over HTTP to workers on other machines")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--token", help="shared bearer token (default: settings 'queue_token')")
+    q.set_defaults(func=cmd_queue)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
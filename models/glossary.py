@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+@dataclass(slots = True)
+class GlossaryTerm:
+    """Source term; ``dnt`` keeps it as is, otherwise ``translations`` force the target wording."""
+    term: str
+    translations: Dict[str, str] = field(default_factory=dict)
+    dnt: bool = False
+
+    def target_for(self, lang: str) -> Optional[str]:
+        if self.dnt:
+            return self.term
+        return self.translations.get(lang) or self.translations.get(lang.split("-", 1)[0])
+
+@dataclass(slots = True, frozen = True)
+class TermHit:
+    start: int
+    end: int
+    term: int  # index into Glossary.terms
+
+@dataclass(slots = True, frozen = True)
+class GlossaryIssue:
+    term: str
+    expected: str
+    kind: str  # "missing" (term not in translation) | "dropped" (protected token lost)
@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
-from typing import Any, Mapping
+from typing import Any, Mapping, Optional
 from enums.plugin_type import PluginType
 
 @dataclass(slots = True)
 class Plugin:
     name: str
     plugin_type: PluginType
-    params: Mapping[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    params: Mapping[str, Any] = field(default_factory=dict)
+    handler: Optional[str] = None  # "module:func" or "/path/file.py:func"; imported on first run
\ No newline at end of file
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+@dataclass(slots = True, frozen = True)
+class QAIssue:
+    lang: str
+    key: str
+    check: str     # "placeholders" | "empty" | "untranslated" | "length" | "bidi" | "rtl"
+    severity: str  # "error" (breaks t()) | "warning" (needs a human look)
+    message: str
+
+@dataclass(slots = True)
+class QAReport:
+    source: str
+    langs: List[str] = field(default_factory=list)
+    issues: List[QAIssue] = field(default_factory=list)
+    keys: int = 0
+    missing: Dict[str, int] = field(default_factory=dict)  # lang -> keys without a translation
+    chunks: int = 0
+    cached: int = 0  # chunks taken from the content-hash cache
+    seconds: float = 0.0
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for i in self.issues if i.severity == "error")
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """lang -> check -> number of issues."""
+        out: Dict[str, Dict[str, int]] = {}
+        for issue in self.issues:
+            per_lang = out.setdefault(issue.lang, {})
+            per_lang[issue.check] = per_lang.get(issue.check, 0) + 1
+        return out
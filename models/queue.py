@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+@dataclass(slots = True)
+class QueueTask:
+    """One segment leased from a work queue; ``shard`` is the target language."""
+    id: int
+    job: str
+    shard: str
+    key: str
+    payload: Dict[str, Any] = field(default_factory=dict)  # {"text": source text, "source": source language}
+    attempts: int = 0
+    lease: Optional[str] = None
+
+@dataclass(slots = True)
+class ShardStats:
+    shard: str
+    ready: int = 0
+    leased: int = 0
+    done: int = 0
+    dead: int = 0
+    retried: int = 0  # ready/leased tasks already tried at least once
+    workers: int = 0  # distinct workers holding a lease
+
+    @property
+    def pending(self) -> int:
+        return self.ready + self.leased
\ No newline at end of file
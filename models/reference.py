@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+@dataclass(slots = True, frozen = True)
+class Language:
+    code: str
+    name: str
+    native: str
+    rtl: bool = False
+
+@dataclass(slots = True, frozen = True)
+class Country:
+    code: str
+    name: str
+    dial_code: str
+    emoji: str = ""
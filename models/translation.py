@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+@dataclass(slots = True)
+class TranslationResult:
+    key: str
+    target: str
+    text: str
+
+@dataclass(slots = True)
+class Segment:
+    """Unit of text flowing through middlewares and translators."""
+    key: str
+    text: str
+    target: str = ""
+    data: Dict[str, Any] = field(default_factory=dict)  # per-segment state (masks, hits, …)
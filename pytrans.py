@@ -1,5 +1,10 @@
-
 # Convenience launcher to keep original entrypoint name.
-from app import PyTransApp
+# `python pytrans.py run|qa|queue ...` is the headless CLI; it must not import Textual.
+import sys
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("run", "qa", "queue"):
+        from cli import main
+        sys.exit(main())
+    from app import PyTransApp
     PyTransApp().run()
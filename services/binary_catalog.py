@@ -0,0 +1,216 @@
+# services/binary_catalog.py
+"""Compact memory-mapped catalog format (``<lang>.ptc``), similar to gettext ``.mo``.
+
+Layout (little-endian u32 everywhere)::
+
+    header   magic "PTC1", count, hash_size, flags
+    entries  count x (key_off, key_len, val_off, val_len, entry_flags), sorted by key bytes
+    hash     hash_size slots with entry index + 1 (0 = empty), crc32 + linear probing
+    pool     UTF-8 keys and values
+
+Files are opened with ``mmap`` so every worker process shares one page-cached copy;
+values are sliced straight out of the mapping.
+"""
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional
+from zlib import crc32
+
+from services.catalog_compiler import CompiledCatalog, fallback_chain, placeholders
+
+MAGIC = b"PTC1"
+_HEADER = struct.Struct("<4sIII")
+_ENTRY_WORDS = 5
+FLAG_TEMPLATE = 1
+
+
+def _hash_size(count: int) -> int:
+    size = 1
+    while size < count * 2:
+        size <<= 1
+    return size if count else 0
+
+
+def pack_catalog(values: Mapping[str, str]) -> bytes:
+    items = sorted(((k.encode("utf-8"), v) for k, v in values.items()), key=lambda kv: kv[0])
+    count = len(items)
+    hsize = _hash_size(count)
+    pool_start = _HEADER.size + count * _ENTRY_WORDS * 4 + hsize * 4
+    pool = bytearray()
+    entries: List[int] = []
+    hash_table = [0] * hsize
+    mask = hsize - 1
+    for index, (kb, value) in enumerate(items):
+        vb = value.encode("utf-8")
+        flags = FLAG_TEMPLATE if placeholders(value) is not None else 0
+        koff = pool_start + len(pool)
+        pool += kb
+        voff = pool_start + len(pool)
+        pool += vb
+        entries += (koff, len(kb), voff, len(vb), flags)
+        slot = crc32(kb) & mask
+        while hash_table[slot]:
+            slot = (slot + 1) & mask
+        hash_table[slot] = index + 1
+    return b"".join((
+        _HEADER.pack(MAGIC, count, hsize, 0),
+        struct.pack(f"<{len(entries)}I", *entries),
+        struct.pack(f"<{hsize}I", *hash_table),
+        bytes(pool),
+    ))
+
+
+def export_catalog(values: Mapping[str, str], out: Path) -> Path:
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(pack_catalog(values))
+    # rename keeps readers that still map the old file valid
+    os.replace(tmp, out)
+    return out
+
+
+def export_locales(path: Path = Path("./locales"), out_dir: Optional[Path] = None,
+                   langs: Optional[List[str]] = None, default: str = "en") -> List[Path]:
+    """Export fallback-merged ``<lang>.ptc`` files for every (or the given) catalog."""
+    path = Path(path)
+    out_dir = Path(out_dir) if out_dir else path
+    langs = langs or sorted(f.stem for f in path.glob("*.json"))
+    written = []
+    for lang in langs:
+        layers = []
+        for name in fallback_chain(lang, default):
+            file = path / f"{name}.json"
+            layers.append(json.loads(file.read_text(encoding="utf-8-sig")) if file.exists() else {})
+        written.append(export_catalog(CompiledCatalog.build(lang, layers).values, out_dir / f"{lang}.ptc"))
+    return written
+
+
+class _Templates:
+    """``CompiledCatalog.templates`` view computed lazily from entry flags."""
+    __slots__ = ("_catalog",)
+
+    def __init__(self, catalog: "MappedCatalog") -> None:
+        self._catalog = catalog
+
+    def get(self, key: str, default=None):
+        index = self._catalog._find(key.encode("utf-8"))
+        if index < 0 or not self._catalog._table[index * _ENTRY_WORDS + 4] & FLAG_TEMPLATE:
+            return default
+        return placeholders(self._catalog._value(index))
+
+
+class MappedCatalog(Mapping[str, str]):
+    """Read-only ``Mapping`` over a ``.ptc`` file."""
+
+    def __init__(self, file: Path) -> None:
+        self.file = Path(file)
+        with open(self.file, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, hsize, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.file} is not a PyTrans binary catalog")
+        self._count = count
+        self._hsize = hsize
+        start = _HEADER.size
+        end = start + count * _ENTRY_WORDS * 4
+        self._view = memoryview(self._mm)
+        if sys.byteorder == "little":
+            self._table = self._view[start:end].cast("I")
+            self._hash = self._view[end:end + hsize * 4].cast("I")
+        else:  # pragma: no cover - big-endian hosts get a decoded copy
+            self._table = struct.unpack_from(f"<{count * _ENTRY_WORDS}I", self._mm, start)
+            self._hash = struct.unpack_from(f"<{hsize}I", self._mm, end)
+
+    def compiled(self, lang: str) -> CompiledCatalog:
+        return CompiledCatalog(lang, self, _Templates(self))  # type: ignore[arg-type]
+
+    def _key(self, index: int) -> bytes:
+        e = index * _ENTRY_WORDS
+        off = self._table[e]
+        return self._mm[off:off + self._table[e + 1]]
+
+    def _value(self, index: int) -> str:
+        e = index * _ENTRY_WORDS
+        off = self._table[e + 2]
+        return str(self._view[off:off + self._table[e + 3]], "utf-8")
+
+    def _find(self, kb: bytes) -> int:
+        if not self._hsize:
+            return -1
+        mask = self._hsize - 1
+        table, hashes, mm = self._table, self._hash, self._mm
+        slot = crc32(kb) & mask
+        n = len(kb)
+        while True:
+            index = hashes[slot]
+            if not index:
+                return -1
+            e = (index - 1) * _ENTRY_WORDS
+            if table[e + 1] == n and mm[table[e]:table[e] + n] == kb:
+                return index - 1
+            slot = (slot + 1) & mask
+
+    def view(self, key: str) -> Optional[memoryview]:
+        """Zero-copy UTF-8 bytes of the value."""
+        index = self._find(key.encode("utf-8"))
+        if index < 0:
+            return None
+        e = index * _ENTRY_WORDS
+        off = self._table[e + 2]
+        return self._view[off:off + self._table[e + 3]]
+
+    def get(self, key: str, default=None):  # type: ignore[override]
+        index = self._find(key.encode("utf-8"))
+        return self._value(index) if index >= 0 else default
+
+    def __getitem__(self, key: str) -> str:
+        index = self._find(key.encode("utf-8"))
+        if index < 0:
+            raise KeyError(key)
+        return self._value(index)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key.encode("utf-8")) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key(index).decode("utf-8")
+
+    def to_dict(self) -> Dict[str, str]:
+        return {self._key(i).decode("utf-8"): self._value(i) for i in range(self._count)}
+
+    def close(self) -> None:
+        """Release the mapping; lookups fail afterwards.
+
+        Slices from :meth:`view` that are still alive keep the file mapped until
+        they (and this object) are gone, instead of failing the close.
+        """
+        if isinstance(self._table, memoryview):
+            self._table.release()
+            self._hash.release()  # type: ignore[union-attr]
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # mmap se odmapuje při uvolnění posledního pohledu
+
+
+def import_catalog(file: Path, out: Path) -> Path:
+    """Convert a ``.ptc`` file back into a JSON catalog."""
+    catalog = MappedCatalog(file)
+    try:
+        data = catalog.to_dict()
+    finally:
+        catalog.close()
+    Path(out).write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8")
+    return Path(out)
@@ -0,0 +1,172 @@
+# services/catalog_compiler.py
+from __future__ import annotations
+import hashlib
+import json
+import marshal
+import os
+from pathlib import Path
+from string import Formatter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+CACHE_VERSION = 1
+_formatter = Formatter()
+
+Stamp = Tuple[str, int, int, str]  # (file name, mtime_ns, size, blake2b hex)
+
+
+def placeholders(value: str) -> Optional[FrozenSet[str]]:
+    """Top-level ``str.format`` field names of ``value``; None for plain strings.
+
+    Strings without braces format to themselves, so they never need ``format``.
+    """
+    if "{" not in value and "}" not in value:
+        return None
+    names = set()
+    try:
+        for _, field, _, _ in _formatter.parse(value):
+            if field is not None:
+                names.add(field.split(".", 1)[0].split("[", 1)[0])
+    except ValueError:
+        # malformed template – t() will return it raw anyway
+        pass
+    return frozenset(names)
+
+
+class CompiledCatalog:
+    """Fallback-merged lookup table for one language."""
+    __slots__ = ("lang", "values", "templates")
+
+    def __init__(self, lang: str, values: Dict[str, str], templates: Dict[str, FrozenSet[str]]) -> None:
+        self.lang = lang
+        self.values = values
+        self.templates = templates
+
+    @classmethod
+    def build(cls, lang: str, layers: Sequence[Dict[str, str]]) -> "CompiledCatalog":
+        """``layers`` go from most to least specific (e.g. ``[cs, en]``)."""
+        values: Dict[str, str] = {}
+        for layer in reversed(layers):
+            values.update(layer)
+        templates: Dict[str, FrozenSet[str]] = {}
+        for key, value in values.items():
+            names = placeholders(value) if isinstance(value, str) else None
+            if names is not None:
+                templates[key] = names
+        return cls(lang, values, templates)
+
+    def render(self, key: str, vars: Dict[str, object]) -> str:
+        value = self.values.get(key)
+        if value is None:
+            return key
+        names = self.templates.get(key) if vars else None
+        if names is None or not names <= vars.keys():
+            # plain string, or missing variables (format would fail) – return raw
+            return value
+        try:
+            return value.format(**vars)
+        except Exception:
+            return value
+
+
+def fallback_chain(lang: str, default: str = "en") -> List[str]:
+    chain = [lang]
+    base = lang.split("-", 1)[0].split("_", 1)[0]
+    if base != lang:
+        chain.append(base)
+    if default not in chain:
+        chain.append(default)
+    return chain
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class CatalogCompiler:
+    """Compiles ``<path>/<lang>.json`` chains and caches them as marshal blobs.
+
+    A cache entry is valid while every source file keeps its mtime and size; when
+    those differ the file hash decides, so a mere ``touch`` does not recompile.
+    """
+
+    def __init__(self, path: Path, cache_dir: Optional[Path] = None, default: str = "en") -> None:
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.path / ".cache"
+        self.default = default
+
+    def cache_file(self, lang: str) -> Path:
+        return self.cache_dir / f"{lang}.bin"
+
+    def compile(self, lang: str) -> CompiledCatalog:
+        chain = fallback_chain(lang, self.default)
+        stats = []
+        for name in chain:
+            file = self.path / f"{name}.json"
+            try:
+                st = file.stat()
+                stats.append((name, st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append((name, 0, -1))
+
+        cached = self._read_cache(lang)
+        if cached is not None:
+            stamps, values, templates = cached
+            valid, touched = self._check_stamps(stamps, stats)
+            if valid:
+                catalog = CompiledCatalog(lang, values, {k: frozenset(v) for k, v in templates.items()})
+                if touched:
+                    self._write_cache(lang, stamps, catalog)
+                return catalog
+
+        layers: List[Dict[str, str]] = []
+        stamps: List[Stamp] = []
+        for name, mtime, size in stats:
+            file = self.path / f"{name}.json"
+            if size < 0:
+                layers.append({})
+                stamps.append((name, 0, -1, ""))
+                continue
+            raw = file.read_bytes()
+            layers.append(json.loads(raw.decode("utf-8-sig")))
+            stamps.append((name, mtime, size, _digest(raw)))
+        catalog = CompiledCatalog.build(lang, layers)
+        self._write_cache(lang, stamps, catalog)
+        return catalog
+
+    def _check_stamps(self, stamps: List[Stamp], stats: List[Tuple[str, int, int]]) -> Tuple[bool, bool]:
+        """Return (still valid, stamps were refreshed in place)."""
+        if [s[0] for s in stamps] != [s[0] for s in stats]:
+            return False, False
+        touched = False
+        for i, ((name, mtime, size, digest), (_, cur_mtime, cur_size)) in enumerate(zip(stamps, stats)):
+            if (mtime, size) == (cur_mtime, cur_size):
+                continue
+            if size != cur_size or cur_size < 0:
+                return False, False
+            if _digest((self.path / f"{name}.json").read_bytes()) != digest:
+                return False, False
+            stamps[i] = (name, cur_mtime, cur_size, digest)
+            touched = True
+        return True, touched
+
+    def _read_cache(self, lang: str):
+        try:
+            # marshal.loads on one buffer; marshal.load(fh) reads the file in tiny chunks
+            version, stamps, values, templates = marshal.loads(self.cache_file(lang).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != CACHE_VERSION:
+            return None
+        return [tuple(s) for s in stamps], values, templates
+
+    def _write_cache(self, lang: str, stamps: List[Stamp], catalog: CompiledCatalog) -> None:
+        blob = (CACHE_VERSION, stamps, catalog.values, {k: tuple(v) for k, v in catalog.templates.items()})
+        file = self.cache_file(lang)
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = file.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(marshal.dumps(blob))
+            os.replace(tmp, file)
+        except OSError:
+            # read-only install: compiled table still works, just not cached
+            pass
@@ -0,0 +1,348 @@
+# services/catalog_qa.py
+from __future__ import annotations
+import hashlib
+import json
+import marshal
+import math
+import os
+import re
+import string
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from models.qa import QAIssue, QAReport
+
+QA_VERSION = 1  # zvýšit při změně kontrol – zneplatní cache výsledků
+
+# bidi řídicí znaky: značky (LRM, RLM, ALM), vnoření (LRE…RLO + PDF) a izolace (LRI…FSI + PDI)
+_BIDI = re.compile("[\u200e\u200f\u061c\u202a-\u202e\u2066-\u2069]")
+_EMBED, _PDF = frozenset("\u202a\u202b\u202d\u202e"), "\u202c"
+_ISOLATE, _PDI = frozenset("\u2066\u2067\u2068"), "\u2069"
+_STRONG_RTL = frozenset("\u200f\u061c\u202b\u202e\u2067")  # RLM, ALM, RLE, RLO, RLI
+# hebrejština, arabština, syrština, thaana, n'ko … + prezentační formy a RTL bloky SMP
+_RTL_SCRIPT = re.compile("[\u0590-\u08ff\ufb1d-\ufdff\ufe70-\ufefc\U00010800-\U00010fff\U0001e800-\U0001efff]")
+_FIELD = re.compile(r"\{[^{}]*\}")
+_SIMPLE = re.compile(r"\{([^{}!:.\[]*)[^{}]*\}")
+_LETTER = re.compile(r"[^\W\d_]")
+
+# histogram log(len(target) / len(source)); bin 0.05 ≈ 5 %
+_BIN = 0.05
+_LOW = -4.0
+_BINS = int(-2 * _LOW / _BIN)
+
+_formatter = string.Formatter()
+
+Fields = Optional[Tuple[str, ...]]
+Item = Tuple[str, str, Fields, Optional[str]]    # key, source, source fields, target (None = missing)
+Found = Tuple[str, str, str, str]                # key, check, severity, message
+ChunkResult = Tuple[List[Found], Dict[int, int], List[Tuple[str, float]], int]
+
+
+def _fields(value: str) -> Fields:
+    """Sorted top-level format fields (``{}`` stays ``''``); ``()`` without braces, None if malformed."""
+    if "{" not in value and "}" not in value:
+        return ()
+    if "{{" not in value and "}}" not in value:
+        # běžný případ bez escapování a vnořených polí – regex místo Formatter.parse
+        names = _SIMPLE.findall(value)
+        if value.count("{") == value.count("}") == len(names):
+            return tuple(sorted(names))
+    names = []
+    try:
+        for _, field, _, _ in _formatter.parse(value):
+            if field is not None:
+                names.append(field.split(".", 1)[0].split("[", 1)[0])
+    except ValueError:
+        return None
+    return tuple(sorted(names))
+
+
+def _bidi(value: str, rtl: bool, source: str) -> Optional[Tuple[str, str]]:
+    """(severity, message) for broken or suspicious bidi controls in ``value``."""
+    embeds = isolates = 0
+    stray = None
+    for ch in _BIDI.findall(value):
+        if ch in _EMBED:
+            embeds += 1
+        elif ch == _PDF:
+            embeds -= 1
+        elif ch in _ISOLATE:
+            isolates += 1
+        elif ch == _PDI:
+            isolates -= 1
+        if embeds < 0 or isolates < 0:
+            return "error", "bidi terminator without an opening control"
+        if not rtl and stray is None and ch in _STRONG_RTL and ch not in source:
+            stray = ch
+    if embeds or isolates:
+        return "error", "unterminated bidi embedding or isolate"
+    if stray is not None:
+        return "warning", f"right-to-left control U+{ord(stray):04X} in a left-to-right language"
+    return None
+
+
+def check_chunk(rtl: bool, items: Iterable[Item], min_length: int = 8,
+                candidate_ratio: float = 2.0) -> ChunkResult:
+    """Checks one chunk of ``(key, source, source fields, target)``.
+
+    Returns (issues, length histogram, length outlier candidates, missing count).
+    Length outliers are decided later over the whole language (see :func:`length_outliers`).
+    """
+    issues: List[Found] = []
+    hist: Dict[int, int] = {}
+    candidates: List[Tuple[str, float]] = []
+    missing = 0
+    limit = math.log(candidate_ratio)
+    log = math.log
+    for key, src, expected, tgt in items:
+        if tgt is None:
+            missing += 1
+            continue
+        if not tgt or tgt.isspace():
+            if src and not src.isspace():
+                issues.append((key, "empty", "error", "empty translation"))
+            continue
+        if expected or "{" in tgt or "}" in tgt:
+            found = _fields(tgt)
+            if found is None:
+                issues.append((key, "placeholders", "error", "malformed format template"))
+            elif expected is not None and expected != found:
+                lost = sorted(set(expected) - set(found))
+                extra = sorted(set(found) - set(expected))
+                if lost or extra:
+                    parts = ([f"missing {{{', '.join(lost)}}}"] if lost else []) + \
+                            ([f"unknown {{{', '.join(extra)}}}"] if extra else [])
+                    issues.append((key, "placeholders", "error", "; ".join(parts)))
+                else:
+                    issues.append((key, "placeholders", "warning", "placeholder count differs"))
+        if tgt == src:
+            if len(src) >= 4 and _LETTER.search(_FIELD.sub("", src)):
+                issues.append((key, "untranslated", "warning", "same as source"))
+        elif rtl and _LETTER.search(src) and _LETTER.search(tgt) and not _RTL_SCRIPT.search(tgt):
+            issues.append((key, "rtl", "warning", "no right-to-left script in an RTL language"))
+        if not tgt.isascii() and _BIDI.search(tgt):
+            problem = _bidi(tgt, rtl, src)
+            if problem is not None:
+                issues.append((key, "bidi", *problem))
+        n = len(src)
+        if n >= min_length:
+            r = log(len(tgt) / n)
+            b = int((r - _LOW) / _BIN)
+            b = 0 if b < 0 else _BINS - 1 if b >= _BINS else b
+            hist[b] = hist.get(b, 0) + 1
+            if r > limit or r < -limit:
+                candidates.append((key, r))
+    return issues, hist, candidates, missing
+
+
+def _hist_median(hist: Dict[int, int], total: int) -> float:
+    seen = 0
+    for b in sorted(hist):
+        seen += hist[b]
+        if 2 * seen >= total:
+            return _LOW + (b + 0.5) * _BIN
+    return 0.0
+
+
+def length_outliers(hist: Dict[int, int], candidates: Sequence[Tuple[str, float]],
+                    z: float = 3.5) -> List[Tuple[str, float, float]]:
+    """Candidates whose log length ratio is a robust outlier for the language.
+
+    Median and MAD come from the merged histogram (modified z-score, MAD floored
+    at one bin), so a language that is simply longer than the source is not flagged.
+    Returns ``(key, ratio, typical ratio)``.
+    """
+    total = sum(hist.values())
+    if not total:
+        return []
+    median = _hist_median(hist, total)
+    deviations: Dict[int, int] = {}
+    for b, n in hist.items():
+        d = int(abs(_LOW + (b + 0.5) * _BIN - median) / _BIN)
+        deviations[d] = deviations.get(d, 0) + n
+    mad = max(_BIN, (_hist_median(deviations, total) - _LOW) - 0.5 * _BIN)
+    return [(key, math.exp(r), math.exp(median)) for key, r in candidates
+            if abs(0.6745 * (r - median) / mad) > z]
+
+
+@dataclass(slots = True)
+class SourceLayout:
+    """Source catalog reordered so each chunk is one slice, with per-chunk content hashes."""
+    keys: List[str]
+    values: List[str]
+    fields: List[Fields]
+    bounds: List[Tuple[int, int]]
+    digests: List[bytes]
+    digest: bytes  # celý zdrojový soubor
+
+    @classmethod
+    def build(cls, raw: bytes, chunk_size: int) -> "SourceLayout":
+        source = {k: v for k, v in (json.loads(raw) if raw else {}).items() if isinstance(v, str)}
+        # klíče do bloků podle hashe klíče – přidaný klíč změní jen svůj blok; počet bloků
+        # je mocnina dvou, takže se rozdělení mění jen při zdvojnásobení katalogu
+        n = 1 << max(0, math.ceil(math.log2(max(1, len(source)) / chunk_size)))
+        bucket = [zlib.crc32(k.encode("utf-8")) & (n - 1) for k in source]
+        keys = list(source)
+        keys = [keys[i] for i in sorted(range(len(keys)), key=bucket.__getitem__)]
+        values = [source[k] for k in keys]
+        fields = [_fields(v) for v in values]  # jednou pro všechny jazyky
+        bounds, start = [], 0
+        for b in range(n):
+            end = start + bucket.count(b)
+            if end > start:
+                bounds.append((start, end))
+            start = end
+        digests = [hashlib.blake2b(marshal.dumps((keys[a:b], values[a:b], fields[a:b])), digest_size=16).digest()
+                   for a, b in bounds]
+        return cls(keys, values, fields, bounds, digests, hashlib.blake2b(raw, digest_size=16).digest())
+
+
+def _read_cache(file: Path) -> Tuple[Optional[tuple], Optional[tuple], Dict[bytes, ChunkResult]]:
+    try:
+        version, stamp, outcome, results = marshal.loads(file.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None, None, {}
+    return (stamp, outcome, results) if version == QA_VERSION else (None, None, {})
+
+
+def _write_cache(file: Path, stamp: tuple, outcome: tuple, results: Dict[bytes, ChunkResult]) -> None:
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps((QA_VERSION, stamp, outcome, results)))
+        os.replace(tmp, file)
+    except OSError:
+        pass  # bez cache jen příště zkontroluje vše znovu
+
+
+def check_language(layout: SourceLayout, lang: str, rtl: bool, file: Path, cache_file: Optional[Path],
+                   min_length: int = 8, z: float = 3.5) -> Tuple[List[Found], int, int, int]:
+    """QA of one target catalog; returns (issues, missing keys, chunks, chunks from cache).
+
+    A catalog byte-identical to the cached run (same source too) is not parsed at
+    all; otherwise only chunks whose content hash is not in the cache are checked.
+    """
+    try:
+        raw = file.read_bytes()
+    except FileNotFoundError:
+        raw = b""
+    stamp = (min_length, z, rtl, layout.digest, hashlib.blake2b(raw, digest_size=16).digest())
+    cached_stamp, outcome, cached = _read_cache(cache_file) if cache_file is not None else (None, None, {})
+    if cached_stamp == stamp and outcome is not None:
+        return outcome[0], outcome[1], len(cached), len(cached)
+
+    target = json.loads(raw) if raw else {}
+    if not set(map(type, target.values())) <= {str}:
+        target = {k: v for k, v in target.items() if isinstance(v, str)}
+    column = list(map(target.get, layout.keys))
+    keys, values, fields = layout.keys, layout.values, layout.fields
+    results: Dict[bytes, ChunkResult] = {}
+    hits = 0
+    for (a, b), source_digest in zip(layout.bounds, layout.digests):
+        part = column[a:b]
+        h = hashlib.blake2b(source_digest, digest_size=16)
+        h.update(marshal.dumps((QA_VERSION, min_length, rtl, part)))
+        digest = h.digest()
+        result = cached.get(digest)
+        if result is None:
+            result = check_chunk(rtl, zip(keys[a:b], values[a:b], fields[a:b], part), min_length)
+        else:
+            hits += 1
+        results[digest] = result
+
+    issues: List[Found] = []
+    hist: Dict[int, int] = {}
+    candidates: List[Tuple[str, float]] = []
+    missing = 0
+    for found, chunk_hist, chunk_candidates, chunk_missing in results.values():
+        issues.extend(found)
+        for bin_, n in chunk_hist.items():
+            hist[bin_] = hist.get(bin_, 0) + n
+        candidates.extend(chunk_candidates)
+        missing += chunk_missing
+    for key, ratio, typical in length_outliers(hist, candidates, z):
+        issues.append((key, "length", "warning", f"{ratio:.2f}× source length (typical {typical:.2f}×)"))
+    if cache_file is not None:
+        _write_cache(cache_file, stamp, (issues, missing), results)
+    return issues, missing, len(results), hits
+
+
+_layout: Optional[SourceLayout] = None  # v pool workeru, viz _init_worker
+
+
+def _init_worker(layout: SourceLayout) -> None:
+    global _layout
+    _layout = layout
+
+
+def _check_pooled(lang: str, *args) -> Tuple[str, Tuple[List[Found], int, int, int]]:
+    assert _layout is not None
+    return lang, check_language(_layout, lang, *args)
+
+
+class CatalogQA:
+    """Checks every target catalog against the source catalog.
+
+    Languages run in a process pool (the laid-out source is handed to each worker
+    once). Keys are split into chunks by a stable key hash and each chunk's result
+    is cached under the hash of its content, so a re-run checks only what changed.
+    """
+
+    def __init__(self, path: Path = Path("./locales"), source_lang: str = "en",
+                 rtl: Optional[Callable[[str], bool]] = None, cache_dir: Optional[Path] = None,
+                 chunk_size: int = 4096, min_length: int = 8, z: float = 3.5) -> None:
+        self.path = Path(path)
+        self.source_lang = source_lang
+        if rtl is None:
+            from services.rtl_service import RTLService
+            rtl = RTLService().is_rtl
+        self.rtl = rtl
+        self.cache_dir = Path(cache_dir) if cache_dir else self.path / ".cache" / "qa"
+        self.chunk_size = max(1, chunk_size)
+        self.min_length = min_length
+        self.z = z
+
+    def targets(self) -> List[str]:
+        return sorted(f.stem for f in self.path.glob("*.json") if f.stem != self.source_lang)
+
+    def cache_file(self, lang: str) -> Path:
+        return self.cache_dir / f"{lang}.bin"
+
+    def run(self, langs: Optional[Sequence[str]] = None, workers: int = 0, use_cache: bool = True,
+            progress: Optional[Callable[[int, int], None]] = None) -> QAReport:
+        """QA of ``langs`` (default: every target catalog); ``workers`` 0 = CPU count.
+
+        ``progress(done, total)`` is called after each finished language.
+        """
+        started = time.perf_counter()
+        source_file = self.path / f"{self.source_lang}.json"
+        layout = SourceLayout.build(source_file.read_bytes() if source_file.exists() else b"", self.chunk_size)
+        langs = list(langs) if langs is not None else self.targets()
+        report = QAReport(source=self.source_lang, langs=langs, keys=len(layout.keys))
+        jobs = [(lang, bool(self.rtl(lang)), self.path / f"{lang}.json",
+                 self.cache_file(lang) if use_cache else None, self.min_length, self.z) for lang in langs]
+
+        def collect(lang: str, outcome: Tuple[List[Found], int, int, int]) -> None:
+            found, missing, chunks, cached = outcome
+            report.issues.extend(QAIssue(lang, *f) for f in found)
+            report.missing[lang] = missing
+            report.chunks += chunks
+            report.cached += cached
+            if progress is not None:
+                progress(len(report.missing), len(jobs))
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        if workers == 1:
+            for lang, *args in jobs:
+                collect(lang, check_language(layout, lang, *args))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(layout,)) as pool:
+                for future in as_completed([pool.submit(_check_pooled, *job) for job in jobs]):
+                    collect(*future.result())
+        report.issues.sort(key=lambda i: (i.lang, i.key, i.check))
+        report.seconds = time.perf_counter() - started
+        return report
@@ -0,0 +1,193 @@
+# services/cron.py
+from __future__ import annotations
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+UTC = timezone.utc
+_MONTHS = {m: i for i, m in enumerate("jan feb mar apr may jun jul aug sep oct nov dec".split(), 1)}
+_DAYS = {d: i for i, d in enumerate("sun mon tue wed thu fri sat".split())}
+_MACROS = {
+    "@yearly": "0 0 1 1 *", "@annually": "0 0 1 1 *", "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0", "@daily": "0 0 * * *", "@midnight": "0 0 * * *", "@hourly": "0 * * * *",
+}
+# widest UTC offset change around a DST transition we need to look across
+_SHIFT = timedelta(hours=3)
+
+
+class CronError(ValueError):
+    pass
+
+
+def _parse_field(text: str, lo: int, hi: int, names: dict) -> Tuple[Tuple[int, ...], bool]:
+    """Return (sorted allowed values, field was '*')."""
+    values = set()
+    for part in text.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise CronError(f"Invalid step in {text!r}")
+            step = int(step_text)
+        if part in ("*", ""):
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = _value(a, names), _value(b, names)
+        else:
+            start = _value(part, names)
+            end = hi if step > 1 else start
+        if not (lo <= start <= hi and lo <= end <= hi) or start > end:
+            raise CronError(f"Value out of range in {text!r}")
+        values.update(range(start, end + 1, step))
+    if hi == 7:  # day of week: 7 == Sunday
+        values = {v % 7 for v in values}
+    return tuple(sorted(values)), text.strip() == "*"
+
+
+def _value(text: str, names: dict) -> int:
+    if text in names:
+        return names[text]
+    if not text.isdigit():
+        raise CronError(f"Invalid cron value {text!r}")
+    return int(text)
+
+
+class CronExpression:
+    """A 5-field cron expression compiled into sorted value tables.
+
+    :meth:`next_after` jumps field by field instead of scanning minutes, and
+    :meth:`next_fire` maps wall-clock matches to UTC instants with DST rules of
+    Vixie cron: fixed times in a spring-forward gap run once at the moment the
+    clocks jump (``30 2 * * *`` fires at 03:00 that day), fixed times in a repeated
+    fall-back hour run once, and jobs with ``*`` hours skip the gap and run in both
+    repeated hours.
+    """
+    __slots__ = ("expr", "minutes", "hours", "days", "months", "weekdays",
+                 "_minute_set", "_hour_set", "_day_set", "_month_set", "_weekday_set",
+                 "_any_hour", "_any_day", "_any_weekday")
+
+    def __init__(self, expr: str) -> None:
+        self.expr = expr.strip()
+        fields = _MACROS.get(self.expr.lower(), self.expr).split()
+        if len(fields) != 5:
+            raise CronError(f"Expected 5 cron fields, got {len(fields)}: {expr!r}")
+        self.minutes, _ = _parse_field(fields[0], 0, 59, {})
+        self.hours, self._any_hour = _parse_field(fields[1], 0, 23, {})
+        self.days, self._any_day = _parse_field(fields[2], 1, 31, {})
+        self.months, _ = _parse_field(fields[3], 1, 12, _MONTHS)
+        self.weekdays, self._any_weekday = _parse_field(fields[4], 0, 7, _DAYS)
+        self._minute_set: FrozenSet[int] = frozenset(self.minutes)
+        self._hour_set: FrozenSet[int] = frozenset(self.hours)
+        self._day_set: FrozenSet[int] = frozenset(self.days)
+        self._month_set: FrozenSet[int] = frozenset(self.months)
+        self._weekday_set: FrozenSet[int] = frozenset(self.weekdays)
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expr!r})"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self._day_set
+        dow = (dt.weekday() + 1) % 7 in self._weekday_set
+        if self._any_day or self._any_weekday:
+            return dom and dow
+        return dom or dow  # both restricted: either matches (Vixie cron)
+
+    def next_after(self, wall: datetime) -> datetime:
+        """Next matching naive wall-clock minute strictly after ``wall``."""
+        t = wall.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t.year + 8  # covers Feb 29 style expressions
+        while t.year <= limit:
+            if t.month not in self._month_set:
+                i = bisect_left(self.months, t.month)
+                if i == len(self.months):
+                    t = datetime(t.year + 1, self.months[0], 1)
+                else:
+                    t = datetime(t.year, self.months[i], 1)
+                continue
+            if not self._day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            if t.hour not in self._hour_set:
+                i = bisect_left(self.hours, t.hour)
+                if i == len(self.hours):
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                else:
+                    t = t.replace(hour=self.hours[i], minute=0)
+                continue
+            if t.minute not in self._minute_set:
+                i = bisect_left(self.minutes, t.minute)
+                if i == len(self.minutes):
+                    t = t.replace(minute=0) + timedelta(hours=1)
+                else:
+                    t = t.replace(minute=self.minutes[i])
+                continue
+            return t
+        raise CronError(f"{self.expr!r} never fires")
+
+    def _instants(self, wall: datetime, tz: tzinfo):
+        first = wall.replace(tzinfo=tz, fold=0)
+        if _skipped(wall, tz):
+            if not self._any_hour:
+                yield _gap_end(wall, tz)
+            return
+        yield first.astimezone(UTC)
+        if self._any_hour:
+            second = wall.replace(tzinfo=tz, fold=1)
+            if second.utcoffset() != first.utcoffset():
+                yield second.astimezone(UTC)
+
+    def next_fire(self, after: datetime, tz: Optional[tzinfo] = None) -> datetime:
+        """Next fire time as an aware UTC datetime strictly after ``after``."""
+        tz = tz or UTC
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=UTC)
+        after = after.astimezone(UTC)
+        before, later = (after - _SHIFT).astimezone(tz), (after + _SHIFT).astimezone(tz)
+        if before.utcoffset() == later.utcoffset():
+            # no transition nearby: wall clock maps 1:1 onto instants
+            wall = self.next_after(after.astimezone(tz).replace(tzinfo=None))
+            instant = wall.replace(tzinfo=tz).astimezone(UTC)
+            if not _skipped(wall, tz):
+                return instant
+            # the match falls into a later gap: resolve it from just before that change
+            return self.next_fire(max(after, instant - _SHIFT), tz)
+        # around a DST change: scan wall candidates across the window, pick the earliest instant
+        wall = before.replace(tzinfo=None)
+        end = later.replace(tzinfo=None)
+        best: Optional[datetime] = None
+        while True:
+            wall = self.next_after(wall)
+            for instant in self._instants(wall, tz):
+                if instant > after and (best is None or instant < best):
+                    best = instant
+            if wall > end and best is not None:
+                return best
+
+
+def _skipped(wall: datetime, tz: tzinfo) -> bool:
+    """``wall`` does not exist in ``tz`` (spring-forward gap)."""
+    return wall.replace(tzinfo=tz).astimezone(UTC).astimezone(tz).replace(tzinfo=None) != wall
+
+
+def _gap_end(wall: datetime, tz: tzinfo) -> datetime:
+    """UTC instant the clocks jump at, for a ``wall`` time inside the gap."""
+    t = wall
+    while _skipped(t, tz):  # mezera má nejvýš pár hodin, posun po minutách stačí
+        t -= timedelta(minutes=1)
+    return t.replace(tzinfo=tz).astimezone(UTC) + timedelta(minutes=1)
+
+
+@lru_cache(maxsize=256)
+def compile_cron(expr: str) -> CronExpression:
+    """Shared compiled expression for a cron string."""
+    return CronExpression(expr)
+
+
+@lru_cache(maxsize=64)
+def get_timezone(name: Optional[str]) -> tzinfo:
+    if not name or name.upper() == "UTC":
+        return UTC
+    return ZoneInfo(name)
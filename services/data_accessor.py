@@ -0,0 +1,390 @@
+# services/data_accessor.py
+from __future__ import annotations
+import asyncio
+import codecs
+import json
+import re
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from models.translation import Segment
+from services.fs_utils import write_json_atomic
+from services.http_client import HttpPool
+from services.metrics import MetricsRegistry, default_registry
+
+ITEMS_FIELDS = ("items", "data")
+CURSOR_FIELDS = ("next", "next_cursor", "cursor")
+CURSOR_HEADER = "x-next-cursor"
+FORMATS = ("json", "ndjson")
+
+_WS = re.compile(r"[ \t\r\n]*")
+_DELIMITERS = frozenset(" \t\r\n,:]}")
+_NEED_MORE = object()
+_END = object()
+
+
+class AccessorError(RuntimeError):
+    pass
+
+
+class _JsonPageParser:
+    """Incremental parser for one page ``{"items": [...], "next": ...}`` (or a bare array).
+
+    Elements of the items array are returned by :meth:`feed` as soon as they are
+    complete, so a page is never held in memory as a whole; other top-level
+    values (the cursor) are collected in :attr:`fields`.
+    """
+
+    def __init__(self, items_fields: Tuple[str, ...] = ITEMS_FIELDS) -> None:
+        self.items_fields = items_fields
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._top_array = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        self._buf = self._buf[self._pos:] + self._utf8.decode(data, final)
+        self._pos = 0
+        out: List[Any] = []
+        while self._step(out, final):
+            pass
+        if final and self._state != "done":
+            raise AccessorError("truncated JSON page")
+        return out
+
+    def _decode(self, final: bool) -> Any:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise AccessorError(f"invalid JSON page: {e}") from e
+            return _NEED_MORE
+        # a number cut off by the chunk boundary ("4." of "4.5") decodes as a shorter one
+        if not final and (end == len(self._buf) or self._buf[end] not in _DELIMITERS):
+            return _NEED_MORE
+        self._pos = end
+        return value
+
+    def _step(self, out: List[Any], final: bool) -> bool:
+        if self._state == "done":
+            return False
+        self._pos = _WS.match(self._buf, self._pos).end()  # type: ignore[union-attr]
+        if self._pos >= len(self._buf):
+            return False
+        ch = self._buf[self._pos]
+        state = self._state
+        if state == "start":
+            if ch not in "{[":
+                raise AccessorError(f"unexpected {ch!r} at start of page")
+            self._pos += 1
+            self._top_array = ch == "["
+            self._state = "items" if self._top_array else "key"
+        elif state == "key":
+            if ch in ",}":
+                self._pos += 1
+                self._state = "done" if ch == "}" else "key"
+                return True
+            key = self._decode(final)
+            if key is _NEED_MORE:
+                return False
+            if not isinstance(key, str):
+                raise AccessorError("object key expected")
+            self._key = key
+            self._state = "colon"
+        elif state == "colon":
+            if ch != ":":
+                raise AccessorError(f"':' expected, got {ch!r}")
+            self._pos += 1
+            self._state = "value"
+        elif state == "value":
+            if ch == "[" and self._key in self.items_fields:
+                self._pos += 1
+                self._state = "items"
+                return True
+            value = self._decode(final)
+            if value is _NEED_MORE:
+                return False
+            self.fields[self._key] = value  # type: ignore[index]
+            self._state = "key"
+        elif state == "items":
+            if ch in ",]":
+                self._pos += 1
+                if ch == "]":
+                    self._state = "done" if self._top_array else "key"
+                return True
+            item = self._decode(final)
+            if item is _NEED_MORE:
+                return False
+            out.append(item)
+        return True
+
+
+class DataAccessor:
+    """Async streaming client for a DATA_ACCESSOR plugin.
+
+    Pages through ``endpoint`` with cursor pagination (``cursor`` and ``limit``
+    as query parameters for GET, as a JSON body otherwise). A page is either JSON
+    ``{"items" | "data": [...], "next": <cursor>}`` parsed incrementally, or
+    NDJSON with the cursor in the ``X-Next-Cursor`` header. Records are
+    ``{"key": ..., "text": ...}`` objects (field names configurable) or
+    ``[key, text]`` pairs.
+
+    Parsed segments go through a bounded queue: when the consumer is slower, the
+    fetcher stops reading the socket. The position (page cursor + offset in the
+    page) is checkpointed to ``state_file`` so an interrupted run resumes where
+    it stopped; an item counts as consumed once it is handed to the consumer, so
+    leaving ``async for`` early never delivers it again.
+
+    The checkpoint of an early ``break`` is written when the generator is
+    closed. Do not leave that to garbage collection (on Python 3.11 an abandoned
+    async generator is finalized only at loop shutdown); wrap the stream in
+    :func:`contextlib.aclosing`::
+
+        async with aclosing(accessor.stream()) as segments:
+            async for seg in segments:
+                ...
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        method: str = "GET",
+        auth_token: str | None = None,
+        page_size: int = 1000,
+        format: str = "json",
+        timeout: float = 30.0,
+        queue_size: int = 1000,
+        key_field: str = "key",
+        text_field: str = "text",
+        state_file: Optional[Path] = None,
+        checkpoint_every: int = 500,
+        name: str = "",
+    ) -> None:
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format}")
+        if page_size < 1 or queue_size < 1:
+            raise ValueError("page_size and queue_size must be positive")
+        self.name = name or endpoint
+        self.endpoint = endpoint
+        self.method = method.upper()
+        self.auth_token = auth_token
+        self.page_size = int(page_size)
+        self.format = format
+        self.timeout = float(timeout)
+        self.queue_size = int(queue_size)
+        self.key_field = key_field
+        self.text_field = text_field
+        self.state_file = Path(state_file) if state_file else None
+        self.checkpoint_every = int(checkpoint_every)
+        self.position: Tuple[Optional[str], int] = (None, 0)
+        self.pages = 0
+        self.skipped = 0
+        self.records = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool = HttpPool(max_idle=1, timeout=self.timeout)
+
+    @classmethod
+    def from_plugin(cls, p: Plugin, state_dir: Path = Path("./settings/accessors")) -> "DataAccessor":
+        if p.plugin_type is not PluginType.DATA_ACCESSOR:
+            raise ValueError(f"Plugin {p.name} is not a data accessor")
+        params = dict(p.params)
+        return cls(
+            endpoint=params["endpoint"],
+            method=params.get("method", "GET"),
+            auth_token=params.get("auth_token"),
+            page_size=params.get("page_size", 1000),
+            format=params.get("format", "json"),
+            timeout=params.get("timeout", 30.0),
+            queue_size=params.get("queue_size", 1000),
+            key_field=params.get("key_field", "key"),
+            text_field=params.get("text_field", "text"),
+            state_file=state_dir / f"{p.name}.json",
+            name=p.name,
+        )
+
+    # --- checkpoint ---
+    def load_checkpoint(self) -> Tuple[Optional[str], int]:
+        if self.state_file is None or not self.state_file.exists():
+            return None, 0
+        try:
+            state = json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None, 0
+        if state.get("endpoint") != self.endpoint:
+            return None, 0
+        return state.get("cursor"), int(state.get("offset", 0))
+
+    def save_checkpoint(self) -> None:
+        if self.state_file is None:
+            return
+        cursor, offset = self.position
+        write_json_atomic(self.state_file, {"endpoint": self.endpoint, "cursor": cursor, "offset": offset})
+
+    def reset(self) -> None:
+        """Forget the checkpoint; the next :meth:`stream` starts from the first page."""
+        self.position = (None, 0)
+        if self.state_file is not None:
+            self.state_file.unlink(missing_ok=True)
+
+    # --- fetching ---
+    def _request(self, cursor: Optional[str]) -> Tuple[str, Optional[bytes], Dict[str, str]]:
+        headers = {"Accept": "application/x-ndjson" if self.format == "ndjson" else "application/json"}
+        if self.auth_token:
+            headers["Authorization"] = f"Bearer {self.auth_token}"
+        page: Dict[str, Any] = {"limit": self.page_size}
+        if cursor is not None:
+            page["cursor"] = cursor
+        if self.method == "GET":
+            parts = urlsplit(self.endpoint)
+            query = parse_qsl(parts.query, keep_blank_values=True) + [(k, str(v)) for k, v in page.items()]
+            return urlunsplit(parts._replace(query=urlencode(query))), None, headers
+        headers["Content-Type"] = "application/json"
+        return self.endpoint, json.dumps(page).encode("utf-8"), headers
+
+    def _segment(self, record: Any) -> Optional[Segment]:
+        if isinstance(record, Mapping):
+            key, text = record.get(self.key_field), record.get(self.text_field)
+            if key is None or text is None:
+                return None
+            data = {k: v for k, v in record.items() if k not in (self.key_field, self.text_field)}
+            return Segment(str(key), str(text), data=data)
+        if isinstance(record, list) and len(record) >= 2:
+            return Segment(str(record[0]), str(record[1]))
+        return None
+
+    async def _page(self, cursor: Optional[str], queue: asyncio.Queue, skip: int) -> Tuple[Optional[str], int]:
+        """Stream one page into ``queue``; returns (next cursor, number of records)."""
+        url, body, headers = self._request(cursor)
+        count = 0
+
+        async def emit(records: List[Any]) -> None:
+            nonlocal count
+            for record in records:
+                count += 1
+                if count <= skip:
+                    continue
+                seg = self._segment(record)
+                if seg is None:
+                    self.skipped += 1
+                # skipped records still advance the offset
+                await queue.put((seg, cursor, count))
+
+        async with self._pool.stream(self.method, url, body, headers) as resp:
+            if not resp.ok:
+                detail = (await resp.read())[:200].decode("utf-8", "replace")
+                raise AccessorError(f"{self.name}: HTTP {resp.status}: {detail}")
+            nxt = resp.headers.get(CURSOR_HEADER) or None
+            if self.format == "ndjson":
+                utf8 = codecs.getincrementaldecoder("utf-8")()
+                tail = ""
+                async for chunk in resp.chunks:
+                    lines = (tail + utf8.decode(chunk)).split("\n")
+                    tail = lines.pop()
+                    await emit([json.loads(line) for line in lines if line.strip()])
+                tail += utf8.decode(b"", True)
+                if tail.strip():
+                    await emit([json.loads(tail)])
+            else:
+                parser = _JsonPageParser()
+                async for chunk in resp.chunks:
+                    await emit(parser.feed(chunk))
+                await emit(parser.feed(b"", final=True))
+                nxt = next((parser.fields[f] for f in CURSOR_FIELDS if parser.fields.get(f)), nxt)
+        self.pages += 1
+        return (str(nxt) if nxt is not None else None), count
+
+    async def _produce(self, queue: asyncio.Queue, cursor: Optional[str], skip: int) -> None:
+        try:
+            while True:
+                nxt, count = await self._page(cursor, queue, skip)
+                skip = 0
+                if not nxt or count == 0:
+                    break
+                cursor = nxt
+                # the next page starts at offset 0
+                await queue.put((None, cursor, 0))
+            await queue.put(_END)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+
+    async def stream(self, resume: bool = True) -> AsyncIterator[Segment]:
+        """Yield source segments page by page; resumes from the checkpoint unless ``resume`` is False.
+
+        Consume it inside ``contextlib.aclosing`` so leaving early saves the
+        checkpoint right away (or call :meth:`save_checkpoint` after the loop).
+        """
+        cursor, skip = self.load_checkpoint() if resume else (None, 0)
+        self.position = (cursor, skip)
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._queue = queue
+        producer = asyncio.ensure_future(self._produce(queue, cursor, skip))
+        completed = False
+        since_save = 0
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is _END:
+                    completed = True
+                    break
+                if isinstance(entry, BaseException):
+                    raise entry
+                seg, page_cursor, offset = entry
+                # pozice se posune před předáním: po break (aclose) se záznam už znovu nedoručí
+                self.position = (page_cursor, offset)
+                if seg is not None:
+                    self.records += 1
+                    yield seg
+                since_save += 1
+                if self.checkpoint_every and since_save >= self.checkpoint_every:
+                    self.save_checkpoint()
+                    since_save = 0
+        finally:
+            self._queue = None
+            producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
+            if completed:
+                self.reset()
+            else:
+                self.save_checkpoint()
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+_ACCESSORS: Dict[str, DataAccessor] = {}
+
+
+def _collect(metrics: MetricsRegistry) -> None:
+    for name, accessor in list(_ACCESSORS.items()):
+        queue = accessor._queue
+        metrics.gauge("pytrans_accessor_queue_depth", "Records waiting in the accessor queue",
+                      plugin=name).set(queue.qsize() if queue is not None else 0)
+        metrics.counter("pytrans_accessor_records_total", "Records read", plugin=name).value = accessor.records
+        metrics.counter("pytrans_accessor_pages_total", "Pages fetched", plugin=name).value = accessor.pages
+
+
+default_registry().add_collector(_collect)
+
+
+def accessor_for(p: Plugin) -> DataAccessor:
+    """Return the shared accessor for a DATA_ACCESSOR plugin."""
+    accessor = _ACCESSORS.get(p.name)
+    if accessor is None:
+        accessor = _ACCESSORS[p.name] = DataAccessor.from_plugin(p)
+    return accessor
@@ -0,0 +1,244 @@
+# services/delta_service.py
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterable, List, Mapping, Optional
+from models.translation import TranslationResult
+from services.fs_utils import write_json_atomic
+
+if TYPE_CHECKING:
+    from services.job_journal import JobJournal
+    from services.middleware_pipeline import MiddlewarePipeline
+    from services.translation_engine import TranslationEngine
+    from services.translation_memory import TranslationMemory
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def read_catalog(file: Path) -> Dict[str, str]:
+    if not file.exists():
+        return {}
+    return json.loads(file.read_text(encoding="utf-8"))
+
+
+@dataclass(slots = True)
+class CatalogDelta:
+    lang: str
+    added: Dict[str, str] = field(default_factory=dict)    # key -> source text
+    changed: Dict[str, str] = field(default_factory=dict)  # key -> source text
+    removed: List[str] = field(default_factory=list)         # in the target only; reported, never deleted
+    unchanged: int = 0
+    issues: Dict[str, List[str]] = field(default_factory=dict)  # key -> lost or unknown placeholders
+
+    @property
+    def pending(self) -> Dict[str, str]:
+        return {**self.added, **self.changed}
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+
+class DeltaTranslator:
+    """Translate only new or changed source keys of each target catalog.
+
+    For every target we keep ``<locales>/.delta/<lang>.json`` with the hash of the
+    source text each translation was made from. On the first run, keys that are
+    already translated are adopted as up to date.
+    """
+
+    def __init__(self, path: Path = Path("./locales"), source_lang: str = "en", state_dir: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.source_lang = source_lang
+        self.state_dir = Path(state_dir) if state_dir else self.path / ".delta"
+        self._source: Optional[Dict[str, str]] = None
+
+    def catalog_file(self, lang: str) -> Path:
+        return self.path / f"{lang}.json"
+
+    def state_file(self, lang: str) -> Path:
+        return self.state_dir / f"{lang}.json"
+
+    @property
+    def source(self) -> Dict[str, str]:
+        if self._source is None:
+            self._source = read_catalog(self.catalog_file(self.source_lang))
+        return self._source
+
+    def targets(self) -> List[str]:
+        """All catalogs next to the source one."""
+        return sorted(f.stem for f in self.path.glob("*.json") if f.stem != self.source_lang)
+
+    def compute(self, lang: str) -> CatalogDelta:
+        target = read_catalog(self.catalog_file(lang))
+        state_file = self.state_file(lang)
+        state: Optional[Dict[str, str]] = read_catalog(state_file) if state_file.exists() else None
+        delta = CatalogDelta(lang)
+        for key, text in self.source.items():
+            if key not in target:
+                delta.added[key] = text
+            elif state is not None and state.get(key) != content_hash(text):
+                delta.changed[key] = text
+            else:
+                delta.unchanged += 1
+        delta.removed = [key for key in target if key not in self.source]
+        return delta
+
+    def apply(self, delta: CatalogDelta, translations: Mapping[str, str]) -> bool:
+        """Merge translated keys into the target catalog and record their source hashes.
+
+        Existing keys keep their order and new ones are appended. Keys the source
+        no longer has stay in the catalog (they are listed in ``delta.removed``).
+        The catalog is written only when a translation differs from it; returns
+        whether it was.
+        """
+        lang = delta.lang
+        target = read_catalog(self.catalog_file(lang))
+        state_file = self.state_file(lang)
+        baseline = not state_file.exists()
+        state = read_catalog(state_file)
+        if baseline:
+            # adopt existing translations
+            state = {k: content_hash(v) for k, v in self.source.items() if k in target}
+        written = False
+        recorded = False
+        for key, text in translations.items():
+            if key not in self.source:
+                continue
+            if target.get(key) != text:
+                target[key] = text
+                written = True
+            digest = content_hash(self.source[key])
+            if state.get(key) != digest:
+                state[key] = digest
+                recorded = True
+        if written:
+            write_json_atomic(self.catalog_file(lang), target)
+        if written or recorded or baseline:
+            write_json_atomic(state_file, {k: state[k] for k in target if k in state and k in self.source})
+        return written
+
+    async def run(
+        self,
+        engine: "TranslationEngine",
+        targets: Optional[Iterable[str]] = None,
+        memory: Optional["TranslationMemory"] = None,
+        journal: Optional["JobJournal"] = None,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        split_min: Optional[int] = 80,
+        pipeline: Optional["MiddlewarePipeline"] = None,
+    ) -> Dict[str, CatalogDelta]:
+        """Compute deltas, translate pending keys for all targets in one stream, apply them.
+
+        With a ``journal`` every finished segment is logged as it arrives and the
+        catalogs are updated periodically; after a crash or Ctrl+C the next run
+        with the same journal lands those segments first and continues from there.
+        ``progress(lang, done, total)`` is called after every translated key.
+
+        Placeholders and markup are masked and equal sentences are sent once (see
+        :class:`~services.segmentation.SegmentPlan`); values at least ``split_min``
+        long are split into sentences. ``split_min=None`` sends whole values as they are.
+        With a middleware ``pipeline`` what would go to the engine runs through it
+        (engine and memory as its translate stage).
+        """
+        if journal is not None and len(journal):
+            journal.compact(self)
+        deltas = {lang: self.compute(lang) for lang in (targets if targets is not None else self.targets())}
+        results: Dict[str, Dict[str, str]] = {lang: {} for lang in deltas}
+        totals = {lang: len(delta.added) + len(delta.changed) for lang, delta in deltas.items()}
+        # group targets by identical pending sets so each group shares one stream
+        groups: Dict[tuple, List[str]] = {}
+        for lang, delta in deltas.items():
+            if delta.pending:
+                groups.setdefault(tuple(delta.pending), []).append(lang)
+        send = engine.stream
+        if pipeline is not None:
+            # se split_min nesou segmenty v pipeline id kusů ze SegmentPlan, ne klíče katalogu
+            send = self._piped(pipeline, engine, deltas if split_min is None else None)
+        try:
+            for keys, langs in groups.items():
+                if split_min is None:
+                    stream = send({k: self.source[k] for k in keys}, self.source_lang, langs, memory)
+                else:
+                    stream = self._segmented(send, keys, langs, memory, split_min, deltas)
+                async for r in stream:
+                    results[r.target][r.key] = r.text
+                    if progress is not None:
+                        progress(r.target, len(results[r.target]), totals[r.target])
+                    if journal is not None:
+                        journal.append(r.target, r.key, r.text, self.source[r.key])
+                        if journal.appended >= journal.compact_every:
+                            journal.compact(self)
+        finally:
+            if journal is not None:
+                # interrupted or not: what finished is on disk
+                journal.close()
+        for lang, delta in deltas.items():
+            if not delta.empty or not self.state_file(lang).exists():
+                self.apply(delta, results[lang])
+        if journal is not None:
+            journal.discard()
+        return deltas
+
+    @staticmethod
+    def _piped(
+        pipeline: "MiddlewarePipeline", engine: "TranslationEngine", deltas: Optional[Mapping[str, CatalogDelta]]
+    ) -> Callable[..., AsyncIterator[TranslationResult]]:
+        # stejné rozhraní jako engine.stream, jen přes pre/post fáze middlewarů
+        from models.translation import Segment
+        from services.middleware_pipeline import translator_stage
+
+        async def stream(segments: Mapping[str, str], source: str, targets: List[str],
+                         memory: Optional["TranslationMemory"]) -> AsyncIterator[TranslationResult]:
+            batches = pipeline.run((Segment(key, text, lang) for lang in targets for key, text in segments.items()),
+                                   translator_stage(engine, source, memory), concurrency=engine.concurrency)
+            async for batch in batches:
+                for seg in batch:
+                    problems = seg.data.get("segment_issues")
+                    if problems and deltas is not None:
+                        deltas[seg.target].issues[seg.key] = problems
+                    yield TranslationResult(seg.key, seg.target, seg.text)
+
+        return stream
+
+    async def _segmented(
+        self,
+        send: Callable[..., AsyncIterator[TranslationResult]],
+        keys: Iterable[str],
+        langs: List[str],
+        memory: Optional["TranslationMemory"],
+        split_min: int,
+        deltas: Mapping[str, CatalogDelta],
+    ) -> AsyncIterator[TranslationResult]:
+        # unikátní segmenty jdou do enginu, ven vždy celý klíč, jakmile má přeložené všechny kusy
+        from services.segmentation import SegmentPlan
+
+        plan = SegmentPlan(split_min)
+        for key in keys:
+            plan.add(key, self.source[key])
+        waiting = {lang: {} for lang in langs}
+        translated: Dict[str, Dict[int, str]] = {lang: {} for lang in langs}
+        for key in keys:
+            count = len(plan.uids(key))
+            if count:
+                for lang in langs:
+                    waiting[lang][key] = count
+            else:  # prázdná hodnota – není co posílat
+                for lang in langs:
+                    yield TranslationResult(key, lang, self.source[key])
+        segments = {str(uid): text for uid, _, text in plan.items()}
+        async for r in send(segments, self.source_lang, langs, memory):
+            uid = int(r.key)
+            translated[r.target][uid] = r.text
+            for key in plan.refs(uid):
+                waiting[r.target][key] -= 1
+                if waiting[r.target][key]:
+                    continue
+                text, problems = plan.build(key, translated[r.target])
+                if problems:
+                    deltas[r.target].issues[key] = problems
+                yield TranslationResult(key, r.target, text)
@@ -0,0 +1,411 @@
+# services/glossary_service.py
+from __future__ import annotations
+import hashlib
+import json
+import marshal
+import os
+import re
+import threading
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from models.glossary import GlossaryIssue, GlossaryTerm, TermHit
+from models.plugin import Plugin
+from services.middleware_pipeline import Batch, Middleware, register_middleware
+
+CACHE_VERSION = 1
+SOURCE = ""  # automaton over source terms; other variants are keyed by target language
+TOKEN = "⟦G{}⟧"
+_TOKEN_RE = re.compile(r"⟦G(\d+)⟧")
+
+AutomatonCache = Callable[[str, Callable[[], "AhoCorasick"]], "AhoCorasick"]
+
+
+def fold(text: str) -> str:
+    """Lower-case ``text`` without changing its length, so hit offsets stay valid."""
+    low = text.lower()
+    if len(low) == len(text):
+        return low
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """Aho–Corasick automaton finding every occurrence of every pattern in one pass.
+
+    Kept as flat lists (goto dicts, failure links, output links) so the compiled
+    form marshals as is.
+    """
+    __slots__ = ("goto", "fail", "term", "link", "lengths")
+
+    def __init__(self, goto: List[Dict[str, int]], fail: List[int], term: List[int],
+                 link: List[int], lengths: List[int]) -> None:
+        self.goto = goto
+        self.fail = fail
+        self.term = term      # pattern index ending in the state, -1 if none
+        self.link = link      # nearest state on the failure chain that ends a pattern
+        self.lengths = lengths
+
+    @classmethod
+    def build(cls, patterns: Sequence[str]) -> "AhoCorasick":
+        goto: List[Dict[str, int]] = [{}]
+        term = [-1]
+        for idx, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            s = 0
+            for ch in pattern:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = goto[s][ch] = len(goto)
+                    goto.append({})
+                    term.append(-1)
+                s = nxt
+            term[s] = idx  # duplicates: the later pattern wins
+        fail = [0] * len(goto)
+        link = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, t in goto[s].items():
+                queue.append(t)
+                f = fail[s]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[t] = f
+                link[t] = f if term[f] >= 0 else link[f]
+        return cls(goto, fail, term, link, [len(p) for p in patterns])
+
+    def state(self) -> tuple:
+        return (self.goto, self.fail, self.term, self.link, self.lengths)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield ``(end, pattern index)`` for every occurrence, overlapping ones included."""
+        goto, fail, term, link = self.goto, self.fail, self.term, self.link
+        s = 0
+        for i, ch in enumerate(text):
+            nxt = goto[s].get(ch)
+            while nxt is None and s:
+                s = fail[s]
+                nxt = goto[s].get(ch)
+            s = nxt or 0
+            t = s if term[s] >= 0 else link[s]
+            while t:
+                yield i + 1, term[t]
+                t = link[t]
+
+
+class Glossary:
+    """Do-not-translate terms and forced translations matched with Aho–Corasick.
+
+    Terms are kept column-wise (sources, DNT flags, one wording list per target
+    language), which is also the cached form. Source terms compile into one
+    automaton; verification uses one automaton per target language over the
+    expected wordings. ``cache`` (set by :class:`GlossaryStore`) persists
+    compiled automata between runs.
+    """
+
+    def __init__(self, name: str, terms: Sequence[GlossaryTerm] = (), case_sensitive: bool = False,
+                 whole_words: bool = True, cache: Optional[AutomatonCache] = None) -> None:
+        self.name = name
+        self.case_sensitive = case_sensitive
+        self.whole_words = whole_words
+        self.sources = [t.term for t in terms]
+        self.dnt = bytes(t.dnt for t in terms)
+        langs = sorted({lang for t in terms for lang in t.translations})
+        self.targets: Dict[str, List[Optional[str]]] = {
+            lang: [t.translations.get(lang) for t in terms] for lang in langs
+        }
+        self._cache = cache
+        self._automata: Dict[str, AhoCorasick] = {}
+
+    @classmethod
+    def from_columns(cls, name: str, sources: List[str], dnt: bytes, targets: Dict[str, List[Optional[str]]],
+                     case_sensitive: bool = False, whole_words: bool = True,
+                     cache: Optional[AutomatonCache] = None) -> "Glossary":
+        glossary = cls(name, (), case_sensitive, whole_words, cache)
+        glossary.sources, glossary.dnt, glossary.targets = sources, dnt, targets
+        return glossary
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def term(self, i: int) -> GlossaryTerm:
+        translations = {lang: col[i] for lang, col in self.targets.items() if col[i] is not None}
+        return GlossaryTerm(self.sources[i], translations, bool(self.dnt[i]))  # type: ignore[arg-type]
+
+    @property
+    def terms(self) -> List[GlossaryTerm]:
+        return [self.term(i) for i in range(len(self.sources))]
+
+    def _column(self, lang: str) -> Optional[List[Optional[str]]]:
+        col = self.targets.get(lang)
+        return col if col is not None else self.targets.get(lang.split("-", 1)[0])
+
+    def target_for(self, i: int, lang: str) -> Optional[str]:
+        """Required wording of term ``i`` in ``lang`` (the term itself when do-not-translate)."""
+        if self.dnt[i]:
+            return self.sources[i]
+        col = self._column(lang)
+        return col[i] if col is not None else None
+
+    def _norm(self, text: str) -> str:
+        return text if self.case_sensitive else fold(text)
+
+    def _patterns(self, variant: str) -> List[str]:
+        if variant == SOURCE:
+            return [self._norm(t) for t in self.sources]
+        return [self._norm(self.target_for(i, variant) or "") for i in range(len(self.sources))]
+
+    def automaton(self, variant: str = SOURCE) -> AhoCorasick:
+        automaton = self._automata.get(variant)
+        if automaton is None:
+            build = lambda: AhoCorasick.build(self._patterns(variant))
+            automaton = self._cache(variant, build) if self._cache else build()
+            self._automata[variant] = automaton
+        return automaton
+
+    def _bounded(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word(text[start - 1]) and _is_word(text[start]):
+            return False
+        return not (end < len(text) and _is_word(text[end]) and _is_word(text[end - 1]))
+
+    def find_all(self, text: str, variant: str = SOURCE) -> List[TermHit]:
+        """Every hit in ``text``, overlapping ones included."""
+        automaton = self.automaton(variant)
+        lengths = automaton.lengths
+        hits = []
+        for end, idx in automaton.iter(self._norm(text)):
+            start = end - lengths[idx]
+            if not self.whole_words or self._bounded(text, start, end):
+                hits.append(TermHit(start, end, idx))
+        return hits
+
+    def find(self, text: str) -> List[TermHit]:
+        """Non-overlapping source term hits, leftmost-longest first."""
+        hits = sorted(self.find_all(text), key=lambda h: (h.start, -h.end))
+        chosen: List[TermHit] = []
+        last = 0
+        for hit in hits:
+            if hit.start >= last:
+                chosen.append(hit)
+                last = hit.end
+        return chosen
+
+    def protect(self, text: str, lang: str) -> Tuple[str, List[str]]:
+        """Replace term hits by tokens the translator leaves alone; returns (masked text, token values)."""
+        parts: List[str] = []
+        tokens: List[str] = []
+        pos = 0
+        for hit in self.find(text):
+            value = text[hit.start:hit.end] if self.dnt[hit.term] else self.target_for(hit.term, lang)
+            if value is None:
+                continue
+            parts += (text[pos:hit.start], TOKEN.format(len(tokens)))
+            tokens.append(value)
+            pos = hit.end
+        if not tokens:
+            return text, tokens
+        parts.append(text[pos:])
+        return "".join(parts), tokens
+
+    def restore(self, text: str, tokens: Sequence[str]) -> Tuple[str, List[int]]:
+        """Put token values back; returns (text, indices of tokens missing from ``text``)."""
+        seen = set()
+
+        def repl(m: re.Match) -> str:
+            i = int(m.group(1))
+            if i >= len(tokens):
+                return m.group(0)
+            seen.add(i)
+            return tokens[i]
+
+        restored = _TOKEN_RE.sub(repl, text)
+        return restored, [i for i in range(len(tokens)) if i not in seen]
+
+    def verify(self, source: str, translation: str, lang: str) -> List[GlossaryIssue]:
+        """Terms hit in ``source`` whose required wording is missing from ``translation``."""
+        expected: Counter = Counter()
+        wording: Dict[str, Tuple[str, str]] = {}
+        for hit in self.find(source):
+            target = self.target_for(hit.term, lang)
+            if target:
+                key = self._norm(target)
+                expected[key] += 1
+                wording[key] = (self.sources[hit.term], target)
+        if not expected:
+            return []
+        # count by wording: several terms may share one forced translation
+        found = Counter(self._norm(translation[h.start:h.end]) for h in self.find_all(translation, lang))
+        return [GlossaryIssue(*wording[key], "missing") for key, n in expected.items() if found[key] < n]
+
+
+def _parse_terms(data: Any) -> List[GlossaryTerm]:
+    """``[{"term", "translations", "dnt"}]`` or the compact ``{term: {lang: text} | null}``."""
+    if isinstance(data, dict):
+        return [GlossaryTerm(term, dict(value)) if isinstance(value, dict) else GlossaryTerm(term, dnt=True)
+                for term, value in data.items()]
+    return [GlossaryTerm(item["term"], dict(item.get("translations") or {}), bool(item.get("dnt", False)))
+            for item in data]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class GlossaryStore:
+    """Glossaries in ``<path>/<name>.json`` with compiled forms cached as marshal blobs.
+
+    The blob holds the term columns and every automaton built so far; it is valid
+    while the source keeps its mtime and size, or else its hash. Safe to share
+    between threads (plugins are initialized concurrently).
+    """
+
+    def __init__(self, path: Path = Path("./dictionaries"), cache_dir: Optional[Path] = None) -> None:
+        self.path = Path(path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.path / ".cache"
+        self._loaded: Dict[str, Tuple[Tuple[int, int], Glossary]] = {}
+        self._blobs: Dict[str, list] = {}
+        self._lock = threading.RLock()
+
+    def names(self) -> List[str]:
+        if not self.path.is_dir():
+            return []
+        return sorted(f.stem for f in self.path.glob("*.json"))
+
+    def file(self, name: str) -> Path:
+        return self.path / f"{name}.json"
+
+    def cache_file(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.glc"
+
+    def load(self, name: str) -> Glossary:
+        st = self.file(name).stat()
+        stat = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            loaded = self._loaded.get(name)
+            if loaded is not None and loaded[0] == stat:
+                return loaded[1]
+            blob = self._blob(name, stat)
+            case_sensitive, whole_words = blob[3]
+            glossary = Glossary.from_columns(name, *blob[4], case_sensitive, whole_words,
+                                             cache=lambda variant, build: self._automaton(name, variant, build))
+            self._loaded[name] = (stat, glossary)
+            return glossary
+
+    def _blob(self, name: str, stat: Tuple[int, int]) -> list:
+        """[version, (mtime_ns, size), digest, options, terms, automata]"""
+        blob = self._read_cache(name)
+        raw: Optional[bytes] = None
+        if blob is not None and tuple(blob[1]) != stat:
+            raw = self.file(name).read_bytes()
+            if _digest(raw) == blob[2]:
+                blob[1] = stat  # touched only
+                self._write_cache(name, blob)
+            else:
+                blob = None
+        if blob is None:
+            raw = raw if raw is not None else self.file(name).read_bytes()
+            data = json.loads(raw.decode("utf-8-sig"))
+            if isinstance(data, dict) and "terms" in data:
+                options = (bool(data.get("case_sensitive", False)), bool(data.get("whole_words", True)))
+                data = data["terms"]
+            else:
+                options = (False, True)
+            parsed = Glossary(name, _parse_terms(data))
+            blob = [CACHE_VERSION, stat, _digest(raw), options, (parsed.sources, parsed.dnt, parsed.targets), {}]
+            self._write_cache(name, blob)
+        self._blobs[name] = blob
+        return blob
+
+    def _automaton(self, name: str, variant: str, build: Callable[[], AhoCorasick]) -> AhoCorasick:
+        with self._lock:
+            blob = self._blobs[name]
+            state = blob[5].get(variant)
+            if state is not None:
+                return AhoCorasick(*state)
+            automaton = build()
+            blob[5][variant] = automaton.state()
+            self._write_cache(name, blob)
+            return automaton
+
+    def _read_cache(self, name: str) -> Optional[list]:
+        try:
+            blob = marshal.loads(self.cache_file(name).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(blob, list) or not blob or blob[0] != CACHE_VERSION:
+            return None
+        return blob
+
+    def _write_cache(self, name: str, blob: list) -> None:
+        file = self.cache_file(name)
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            # vlastní dočasný soubor pro každé vlákno i proces – souběžné zápisy se nepřepíšou
+            tmp = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(marshal.dumps(blob))
+            os.replace(tmp, file)
+        except OSError:
+            # read-only install: compiled glossary still works, just not cached
+            pass
+
+
+@register_middleware
+class GlossaryMiddleware(Middleware):
+    """Protects glossary terms before translation, restores and verifies them after.
+
+    Plugin params: ``glossary`` (defaults to the plugin name) and ``mode`` –
+    ``enforce`` (default) masks terms as tokens, ``verify`` only reports.
+    Problems end up in ``segment.data["glossary_issues"]``.
+    """
+    name = "glossary"
+
+    def __init__(self, plugin: Optional[Plugin] = None, glossary: Optional[Glossary] = None) -> None:
+        super().__init__(plugin)
+        params = plugin.params if plugin else {}
+        self.mode = params.get("mode", "enforce")
+        if glossary is None:
+            glossary = default_store().load(params.get("glossary") or (plugin.name if plugin else "default"))
+        self.glossary = glossary
+
+    def pre(self, batch: Batch) -> Batch:
+        for seg in batch:
+            seg.data["glossary_source"] = seg.text
+            if self.mode == "enforce":
+                seg.text, seg.data["glossary_tokens"] = self.glossary.protect(seg.text, seg.target)
+        return batch
+
+    def post(self, batch: Batch) -> Batch:
+        for seg in batch:
+            issues: List[GlossaryIssue] = []
+            tokens = seg.data.pop("glossary_tokens", None)
+            if tokens:
+                seg.text, dropped = self.glossary.restore(seg.text, tokens)
+                issues += [GlossaryIssue(tokens[i], tokens[i], "dropped") for i in dropped]
+            source = seg.data.pop("glossary_source", None)
+            if source is not None:
+                reported = {fold(i.expected) for i in issues}
+                issues += [i for i in self.glossary.verify(source, seg.text, seg.target)
+                           if fold(i.expected) not in reported]
+            if issues:
+                seg.data["glossary_issues"] = issues
+        return batch
+
+
+_STORE: Optional[GlossaryStore] = None
+_store_lock = threading.Lock()
+
+
+def default_store() -> GlossaryStore:
+    global _STORE
+    if _STORE is None:
+        with _store_lock:  # pluginy se inicializují souběžně (plugin_registry.init_plugins)
+            if _STORE is None:
+                _STORE = GlossaryStore()
+    return _STORE
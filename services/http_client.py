@@ -0,0 +1,266 @@
+# services/http_client.py
+from __future__ import annotations
+import asyncio
+import json
+import ssl
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+Origin = Tuple[str, str, int]
+
+
+class HttpError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8"))
+
+
+class HttpStream:
+    """Streaming response: ``complete`` turns True once ``chunks`` is exhausted."""
+
+    def __init__(self, status: int, headers: Dict[str, str], chunks: AsyncIterator[bytes]) -> None:
+        self.status = status
+        self.headers = headers
+        self.complete = False
+        self._source = chunks
+        self.chunks = self._track()
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    async def _track(self) -> AsyncIterator[bytes]:
+        async for chunk in self._source:
+            yield chunk
+        self.complete = True
+
+    async def read(self) -> bytes:
+        return b"".join([c async for c in self.chunks])
+
+
+class _Connection:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def closed(self) -> bool:
+        return self.writer.is_closing() or self.reader.at_eof()
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+def _origin(url: str) -> Tuple[Origin, str]:
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {url}")
+    host = parts.hostname or ""
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return (scheme, host, port), target
+
+
+def _framed(headers: Dict[str, str]) -> bool:
+    """Body has an explicit end, so the connection can be reused after it."""
+    return "content-length" in headers or headers.get("transfer-encoding", "").lower() == "chunked"
+
+
+class HttpPool:
+    """Minimal asyncio HTTP/1.1 client keeping keep-alive connections per origin."""
+
+    def __init__(self, max_idle: int = 8, timeout: float = 30.0) -> None:
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: Dict[Origin, List[_Connection]] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+
+    async def _connect(self, origin: Origin) -> _Connection:
+        scheme, host, port = origin
+        ctx = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            ctx = self._ssl
+        reader, writer = await asyncio.open_connection(host, port, ssl=ctx)
+        return _Connection(reader, writer)
+
+    def _acquire_idle(self, origin: Origin) -> Optional[_Connection]:
+        pool = self._idle.get(origin)
+        while pool:
+            conn = pool.pop()
+            if not conn.closed:
+                return conn
+            conn.close()
+        return None
+
+    def _release(self, origin: Origin, conn: _Connection) -> None:
+        pool = self._idle.setdefault(origin, [])
+        if len(pool) < self.max_idle and not conn.closed:
+            pool.append(conn)
+        else:
+            conn.close()
+
+    def _encode(self, method: str, url: str, body: bytes | None, headers: Mapping[str, str] | None) -> Tuple[Origin, bytes]:
+        origin, target = _origin(url)
+        scheme, host, port = origin
+        default_port = 443 if scheme == "https" else 80
+        head = {
+            "Host": host if port == default_port else f"{host}:{port}",
+            "Connection": "keep-alive",
+            "Content-Length": str(len(body or b"")),
+        }
+        head.update(headers or {})
+        raw = f"{method.upper()} {target} HTTP/1.1\r\n"
+        raw += "".join(f"{k}: {v}\r\n" for k, v in head.items()) + "\r\n"
+        return origin, raw.encode("latin-1") + (body or b"")
+
+    async def _send(self, origin: Origin, payload: bytes, method: str, url: str, wait: float):
+        """Send a request and read the response head: (conn, status, headers, keep-alive)."""
+        # A reused keep-alive connection may have been closed by the server meanwhile;
+        # in that case retry once on a fresh connection.
+        for attempt in range(2):
+            conn = self._acquire_idle(origin)
+            reused = conn is not None
+            if conn is None:
+                conn = await asyncio.wait_for(self._connect(origin), wait)
+            try:
+                conn.writer.write(payload)
+                await conn.writer.drain()
+                status, headers, keep = await asyncio.wait_for(self._read_head(conn), wait)
+            except (ConnectionError, asyncio.IncompleteReadError, HttpError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise HttpError(f"{method} {url} failed: {e}") from e
+            except BaseException:
+                conn.close()
+                raise
+            return conn, status, headers, keep
+        raise HttpError(f"{method} {url} failed")  # pragma: no cover
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> HttpResponse:
+        wait = self.timeout if timeout is None else timeout
+        origin, payload = self._encode(method, url, body, headers)
+        conn, status, head, keep = await self._send(origin, payload, method, url, wait)
+        try:
+            chunks = [c async for c in self._iter_body(conn, method, status, head, wait)]
+        except BaseException:
+            conn.close()
+            raise
+        if keep and _framed(head):
+            self._release(origin, conn)
+        else:
+            conn.close()
+        return HttpResponse(status, head, b"".join(chunks))
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator["HttpStream"]:
+        """Response whose body is read chunk by chunk (``async for chunk in resp.chunks``).
+
+        ``timeout`` applies per read, so slow consumers are not cut off. The
+        connection goes back to the pool only if the body was read to the end.
+        """
+        wait = self.timeout if timeout is None else timeout
+        origin, payload = self._encode(method, url, body, headers)
+        conn, status, head, keep = await self._send(origin, payload, method, url, wait)
+        resp = HttpStream(status, head, self._iter_body(conn, method, status, head, wait))
+        try:
+            yield resp
+        finally:
+            await resp.chunks.aclose()  # type: ignore[attr-defined]
+            if keep and _framed(head) and resp.complete:
+                self._release(origin, conn)
+            else:
+                conn.close()
+
+    async def _read_head(self, conn: _Connection) -> Tuple[int, Dict[str, str], bool]:
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise HttpError("connection closed before response")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise HttpError(f"malformed status line: {status_line!r}")
+        version, status = parts[0], int(parts[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        return status, headers, keep
+
+    async def _iter_body(self, conn: _Connection, method: str, status: int, headers: Dict[str, str],
+                         wait: float, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        reader = conn.reader
+        if method.upper() == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), wait)
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # trailers
+                    while (await asyncio.wait_for(reader.readline(), wait)) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                yield await asyncio.wait_for(reader.readexactly(size), wait)
+                await asyncio.wait_for(reader.readexactly(2), wait)
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                chunk = await asyncio.wait_for(reader.read(min(chunk_size, remaining)), wait)
+                if not chunk:
+                    raise HttpError("connection closed mid-body")
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while True:
+                chunk = await asyncio.wait_for(reader.read(chunk_size), wait)
+                if not chunk:
+                    return
+                yield chunk
+
+    async def aclose(self) -> None:
+        for pool in self._idle.values():
+            for conn in pool:
+                conn.close()
+        self._idle.clear()
@@ -0,0 +1,131 @@
+# services/job_journal.py
+from __future__ import annotations
+import json
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from services.delta_service import CatalogDelta, DeltaTranslator, content_hash
+
+_HEAD = struct.Struct("<II")  # payload length, crc32
+
+
+class JobJournal:
+    """Append-only write-ahead journal of finished segments of one translation job.
+
+    Each record is ``[length][crc32][json]`` and is written straight to the OS, so
+    a killed process loses nothing. ``fsync`` is batched: every ``sync_every``
+    records or ``sync_interval`` seconds, and on :meth:`sync`. A torn record left
+    by a crash is cut off when the journal is reopened.
+
+    :meth:`compact` merges the journal into the target catalogs (only records
+    whose source text did not change since) and starts it over; a job resumed
+    after a crash compacts first, so finished keys are no longer pending.
+    """
+
+    def __init__(self, file: Path, sync_every: int = 256, sync_interval: float = 1.0,
+                 compact_every: int = 10_000) -> None:
+        self.file = Path(file)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self.records: Dict[str, Dict[str, Tuple[str, str]]] = {}  # lang -> key -> (text, source hash)
+        self.appended = 0   # since the last compaction
+        self.replayed = 0
+        self._fh: Optional[BinaryIO] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._replay()
+
+    @classmethod
+    def for_job(cls, name: str, state_dir: Path = Path("./locales/.journal"), **kwargs) -> "JobJournal":
+        return cls(Path(state_dir) / f"{name}.wal", **kwargs)
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self.records.values())
+
+    def _replay(self) -> None:
+        try:
+            data = self.file.read_bytes()
+        except FileNotFoundError:
+            return
+        pos = 0
+        while pos + _HEAD.size <= len(data):
+            length, crc = _HEAD.unpack_from(data, pos)
+            start = pos + _HEAD.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            try:
+                lang, key, text, digest = json.loads(payload)
+            except ValueError:
+                break
+            self.records.setdefault(lang, {})[key] = (text, digest)
+            self.replayed += 1
+            pos = start + length
+        if pos < len(data):
+            # torn tail from a crash in the middle of a write
+            with open(self.file, "r+b") as fh:
+                fh.truncate(pos)
+                os.fsync(fh.fileno())
+
+    def _open(self) -> BinaryIO:
+        if self._fh is None:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.file, "ab", buffering=0)
+        return self._fh
+
+    def append(self, lang: str, key: str, text: str, source_text: str) -> None:
+        digest = content_hash(source_text)
+        payload = json.dumps([lang, key, text, digest], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._open().write(_HEAD.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.records.setdefault(lang, {})[key] = (text, digest)
+        self.appended += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Make every appended record durable."""
+        if self._fh is not None and self._unsynced:
+            os.fsync(self._fh.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def done(self, lang: str) -> Dict[str, str]:
+        """Keys of ``lang`` finished since the last compaction."""
+        return {key: text for key, (text, _) in self.records.get(lang, {}).items()}
+
+    def compact(self, translator: DeltaTranslator) -> int:
+        """Merge journaled translations into the catalogs and restart the journal; returns records applied."""
+        self.sync()
+        source = translator.source
+        applied = 0
+        for lang, records in self.records.items():
+            fresh = {k: text for k, (text, digest) in records.items()
+                     if k in source and content_hash(source[k]) == digest}
+            if fresh:
+                translator.apply(CatalogDelta(lang), fresh)
+                applied += len(fresh)
+        # catalogs are written (atomically, fsynced) – only now the journal may go
+        self.records.clear()
+        self.appended = 0
+        self.close()
+        with open(self.file, "wb") as fh:
+            os.fsync(fh.fileno())
+        return applied
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self.sync()
+            self._fh.close()
+            self._fh = None
+
+    def discard(self) -> None:
+        """Remove the journal once the job finished and everything is in the catalogs."""
+        self.close()
+        self.records.clear()
+        self.file.unlink(missing_ok=True)
@@ -0,0 +1,179 @@
+# services/locale_watcher.py
+"""Notices edits of ``<locales>/*.json`` while the app runs.
+
+Linux uses inotify (through ctypes, no extra dependency); elsewhere, or when
+inotify is not available (e.g. out of watches, network file systems), the
+directory is polled by mtime and size. Either way the callback gets the set of
+changed languages once the burst of writes has settled.
+"""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+OnChange = Callable[[Set[str]], None]
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+# IN_MODIFY schválně ne – editor by hlásil rozepsaný soubor; uložení končí CLOSE_WRITE nebo přejmenováním
+_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT = struct.Struct("iIII")
+
+
+def _lang(name: str) -> Optional[str]:
+    # "cs.json" -> "cs"; dočasné soubory editorů (".cs.json.swp", "cs.json~") se přeskočí
+    if name.startswith(".") or not name.endswith(".json"):
+        return None
+    return name[:-5]
+
+
+class _Inotify:
+    def __init__(self, path: Path) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(path), _MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+        self.fd = fd
+
+    def read(self, timeout: float) -> Tuple[Set[str], bool]:
+        """Languages changed within ``timeout``; the flag is False once the directory is gone."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set(), True
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), True
+        langs: Set[str] = set()
+        alive = True
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                alive = False
+            lang = _lang(name) if name else None
+            if lang is not None:
+                langs.add(lang)
+        return langs, alive
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._seen = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        out: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.path) as entries:
+                for entry in entries:
+                    lang = _lang(entry.name)
+                    if lang is not None and entry.is_file():
+                        st = entry.stat()
+                        out[lang] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return out
+
+    def read(self, timeout: float) -> Tuple[Set[str], bool]:
+        time.sleep(timeout)
+        current = self._scan()
+        changed = {lang for lang in current.keys() | self._seen.keys() if current.get(lang) != self._seen.get(lang)}
+        self._seen = current
+        return changed, True
+
+    def close(self) -> None:
+        pass
+
+
+class LocaleWatcher:
+    """Background thread calling ``on_change(langs)`` after catalog files change.
+
+    Events are collected until ``settle`` seconds pass without another one, so a
+    save that writes, renames and touches a file is reported once.
+    """
+
+    def __init__(self, path: Path, on_change: OnChange, poll_interval: float = 1.0, settle: float = 0.2,
+                 use_inotify: bool = True) -> None:
+        self.path = Path(path)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.use_inotify = use_inotify
+        self.backend = ""
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._source: _Inotify | _Poller | None = None
+
+    def _open(self) -> _Inotify | _Poller:
+        if self.use_inotify:
+            try:
+                source: _Inotify | _Poller = _Inotify(self.path)
+                self.backend = "inotify"
+                return source
+            except (OSError, AttributeError):
+                pass  # jiný systém, bez libc symbolu nebo došly watche
+        self.backend = "poll"
+        return _Poller(self.path)
+
+    def start(self) -> "LocaleWatcher":
+        if self._thread is None:
+            self._source = self._open()  # hned, ať se změny po start() neztratí
+            self._thread = threading.Thread(target=self._run, name="locale-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        source = self._source or self._open()
+        pending: Set[str] = set()
+        try:
+            while not self._stop.is_set():
+                wait = self.settle if pending else (0.5 if isinstance(source, _Inotify) else self.poll_interval)
+                langs, alive = source.read(wait)
+                if not alive:
+                    # adresář smazán nebo přesunut – dál jen polling (pozná i jeho návrat)
+                    source.close()
+                    source = _Poller(self.path)
+                    self.backend = "poll"
+                if langs:
+                    pending |= langs
+                    if isinstance(source, _Inotify):
+                        continue
+                if pending:
+                    changed, pending = pending, set()
+                    try:
+                        self.on_change(changed)
+                    except Exception:
+                        pass  # chyba obsluhy nesmí zastavit sledování
+        finally:
+            source.close()
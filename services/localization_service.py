@@ -1,15 +1,39 @@
 
 import json
 import locale
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Set
+from services.catalog_compiler import CatalogCompiler, CompiledCatalog, fallback_chain, placeholders
+from services.binary_catalog import MappedCatalog
+from services.metrics import default_registry
+
+_METRICS = default_registry()
+
+def _changed_keys(old: Dict[str, Any], new: Dict[str, Any]) -> Set[str]:
+    try:
+        return {k for k, _ in old.items() ^ new.items()}
+    except TypeError:  # nehashovatelné hodnoty (vnořené objekty)
+        return {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
 
 class LocalizationService:
-    """Simple i18n loader with fallback to 'en' and string interpolation."""
-    def __init__(self, language: str, path: Path = Path("./locales")):
+    """Simple i18n loader with fallback to 'en' and string interpolation.
+
+    Lookups go through a :class:`CompiledCatalog` – the fallback chain merged into
+    one dict when the language is first used, cached on disk under ``<path>/.cache``.
+    With ``binary=True`` an exported ``<lang>.ptc`` is memory-mapped instead when present
+    and not older than any JSON file of the language's fallback chain; a stale one
+    is ignored (the JSON is compiled) until it is exported again.
+    :meth:`refresh` applies edited catalog files to the compiled tables in place.
+    """
+    def __init__(self, language: str, path: Path = Path("./locales"), binary: bool = False):
         self.path = Path(path)
+        self.binary = binary
         self.lang = self._detect_language(language or "en")
         self._cache: Dict[str, Dict[str, str]] = {}
+        self._compiler = CatalogCompiler(self.path)
+        self._compiled: Dict[str, CompiledCatalog] = {}
+        self._active: Optional[CompiledCatalog] = None
 
     def _detect_language(self, language: str) -> str:
         if language.lower() == "auto":
@@ -20,39 +44,145 @@ class LocalizationService:
             return (lang_code.split("_")[0] if lang_code else "en").lower()
         return language.lower()
 
+    def _read_lang(self, lang: str) -> Dict[str, str]:
+        file = self.path / f"{lang}.json"
+        if not file.exists():
+            return {}
+        return json.loads(file.read_bytes().decode("utf-8-sig"))
+
     def _load_lang(self, lang: str) -> Dict[str, str]:
         if lang not in self._cache:
-            file = self.path / f"{lang}.json"
-            if file.exists():
-                self._cache[lang] = json.loads(file.read_text(encoding="utf-8"))
-            else:
-                self._cache[lang] = {}
+            self._cache[lang] = self._read_lang(lang)
         return self._cache[lang]
 
+    def _catalog(self) -> CompiledCatalog:
+        catalog = self._compiled.get(self.lang)
+        if catalog is None:
+            started = time.perf_counter()
+            mapped = self.path / f"{self.lang}.ptc"
+            if self.binary and self._fresh(mapped):
+                catalog = MappedCatalog(mapped).compiled(self.lang)
+            else:
+                catalog = self._compiler.compile(self.lang)
+            self._compiled[self.lang] = catalog
+            _METRICS.histogram("pytrans_i18n_catalog_load_seconds", "Catalog compile/load duration",
+                               lang=self.lang).record(time.perf_counter() - started)
+        self._active = catalog
+        return catalog
+
+    def _fresh(self, mapped: Path) -> bool:
+        """``mapped`` exists and was exported after the last edit of its JSON sources."""
+        try:
+            exported = mapped.stat().st_mtime_ns
+        except OSError:
+            return False
+        for name in fallback_chain(self.lang, self._compiler.default):
+            try:
+                if (self.path / f"{name}.json").stat().st_mtime_ns > exported:
+                    return False
+            except FileNotFoundError:
+                continue
+        return True
+
+    @staticmethod
+    def _close(catalog: Optional[CompiledCatalog]) -> None:
+        if catalog is not None and isinstance(catalog.values, MappedCatalog):
+            catalog.values.close()
+
     def set_language(self, language: str) -> None:
         self.lang = self._detect_language(language)
         # Lazy reload: clear only active lang cache; keep others
         self._cache.pop(self.lang, None)
+        self._close(self._compiled.pop(self.lang, None))
+        self._active = None
+
+    def refresh(self, langs: Iterable[str]) -> Dict[str, Set[str]]:
+        """Re-read the catalog files of ``langs`` and patch the compiled tables using them.
+
+        Only those files are parsed. Each affected table is copied, updated for the
+        keys that differ and swapped in with one assignment, so a concurrent
+        ``t()`` sees either the old or the new table. A file that does not parse
+        (half-saved) is skipped until its next change. Returns the keys whose
+        text changed, per compiled language.
+        """
+        fresh: Dict[str, Dict[str, str]] = {}
+        for lang in set(langs):
+            try:
+                fresh[lang] = self._read_lang(lang)
+            except (OSError, ValueError):
+                continue
+        changed: Dict[str, Set[str]] = {}
+        for lang, catalog in list(self._compiled.items()):
+            chain = fallback_chain(lang, self._compiler.default)
+            if not fresh.keys() & set(chain):
+                continue
+            if all(name in self._cache for name in chain if name in fresh):
+                # známé staré vrstvy: přepočítají se jen klíče, které se v nich změnily
+                keys: Set[str] = set()
+                for name in chain:
+                    if name in fresh:
+                        keys.update(_changed_keys(self._cache[name], fresh[name]))
+                layers = [fresh[name] if name in fresh else self._load_lang(name) for name in chain]
+                values, templates = dict(catalog.values), dict(catalog.templates)
+                for key in keys:
+                    value = next((layer[key] for layer in layers if key in layer), None)
+                    if value is None:
+                        values.pop(key, None)
+                        templates.pop(key, None)
+                        continue
+                    values[key] = value
+                    names = placeholders(value) if isinstance(value, str) else None
+                    if names is None:
+                        templates.pop(key, None)
+                    else:
+                        templates[key] = names
+                updated = CompiledCatalog(lang, values, templates)
+            else:
+                # první změna: vrstvy ještě nejsou v paměti – celý řetězec jednou, pak už po klíčích
+                updated = CompiledCatalog.build(lang, [fresh[name] if name in fresh else self._load_lang(name)
+                                                       for name in chain])
+                keys = catalog.values.keys() | updated.values.keys()
+            keys = {k for k in keys if catalog.values.get(k) != updated.values.get(k)}
+            self._compiled[lang] = updated
+            if self._active is catalog:
+                self._active = updated
+            if keys:
+                changed[lang] = keys
+        self._cache.update(fresh)
+        _METRICS.counter("pytrans_i18n_refreshes_total", "Catalog files re-read after an edit").inc(len(fresh))
+        return changed
 
     def reload(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop all loaded catalogs, unmapping binary ones."""
         self._cache.clear()
+        for catalog in self._compiled.values():
+            self._close(catalog)
+        self._compiled.clear()
+        self._active = None
 
     def has(self, key: str) -> bool:
-        return key in self._load_lang(self.lang) or key in self._load_lang("en")
+        return key in (self._active or self._catalog()).values
 
     def t(self, key: str, **vars: Any) -> str:
         """Translate key with fallback to English; if missing, return key itself."""
-        data = self._load_lang(self.lang)
-        if key in data:
-            value = data[key]
-        else:
-            value = self._load_lang("en").get(key, key)
-        # simple interpolation using str.format style
-        try:
-            return value.format(**vars) if vars else value
-        except Exception:
-            # If formatting fails, return raw to avoid crashing UI
-            return value
+        catalog = self._active or self._catalog()
+        if _METRICS.enabled:
+            self._count(catalog, key)
+        if not vars:
+            return catalog.values.get(key, key)
+        # str.format only for templates that have all their variables;
+        # if formatting fails, return raw to avoid crashing UI
+        return catalog.render(key, vars)
+
+    @staticmethod
+    def _count(catalog: CompiledCatalog, key: str) -> None:
+        # jen když se metriky sledují (dashboard/exportér) – jinak t() zůstává bez režie
+        _METRICS.counter("pytrans_i18n_lookups_total", "Translation lookups", lang=catalog.lang).inc()
+        if key not in catalog.values:
+            _METRICS.counter("pytrans_i18n_misses_total", "Lookups of missing keys", lang=catalog.lang).inc()
 
     # Backwards compatibility for your previous `.get()` usage
     def get(self, key: str) -> str:
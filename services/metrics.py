@@ -0,0 +1,296 @@
+# services/metrics.py
+from __future__ import annotations
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from services.fs_utils import write_text_atomic
+
+Labels = Tuple[Tuple[str, str], ...]
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Counter:
+    __slots__ = ("value",)
+    kind = "counter"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"value": self.value}
+
+
+class Gauge:
+    __slots__ = ("value",)
+    kind = "gauge"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def snapshot(self) -> Dict[str, float]:
+        return {"value": self.value}
+
+
+class Histogram:
+    """HDR-style latency histogram: log-linear buckets over whole microseconds.
+
+    Values below ``2 · 2^bits`` µs get exact buckets; above that every power of
+    two is split into ``2^bits`` sub-buckets, so any recorded value is known to
+    within ``2^-bits`` (3 % for the default 5 bits) at a fixed, small memory cost.
+    """
+    __slots__ = ("bits", "counts", "count", "total", "min", "max")
+    kind = "histogram"
+
+    def __init__(self, bits: int = 5) -> None:
+        self.bits = bits
+        self.counts: List[int] = []
+        self.count = 0
+        self.total = 0.0  # seconds
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, us: int) -> int:
+        shift = max(0, us.bit_length() - self.bits - 1)
+        return (shift << self.bits) + (us >> shift)
+
+    def _upper(self, index: int) -> int:
+        """Highest µs value that falls into bucket ``index``."""
+        sub = 1 << self.bits
+        shift = max(0, index // sub - 1)
+        mantissa = index - (shift << self.bits)
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1_000_000) if seconds > 0 else 0
+        i = self._index(us)
+        counts = self.counts
+        if i >= len(counts):
+            counts.extend([0] * (i + 1 - len(counts)))
+        counts[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    def quantile(self, q: float) -> float:
+        """Value (seconds) at quantile ``q`` in 0..1; 0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._upper(i) / 1_000_000, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        out = {"count": self.count, "sum": self.total, "mean": self.mean,
+               "min": self.min if self.count else 0.0, "max": self.max}
+        for q in QUANTILES:
+            out[f"p{round(q * 100):d}"] = self.quantile(q)
+        return out
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.record(time.perf_counter() - self.started)
+
+
+Metric = Union[Counter, Gauge, Histogram]
+Collector = Callable[["MetricsRegistry"], None]
+
+
+class MetricsRegistry:
+    """Named, labelled counters, gauges and histograms with Prometheus/JSON export.
+
+    Cold paths (plugin runs, catalog loads, settings I/O, translation batches)
+    always record. Per-call hot paths (e.g. every ``t()`` lookup) check
+    :attr:`enabled` first, which is on only while someone :meth:`watch`-es –
+    the dashboard or a file exporter. Live values such as queue depth are read
+    by collectors at :meth:`collect` time, so they cost nothing in between.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._watchers = 0
+        self._metrics: Dict[Tuple[str, Labels], Metric] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}  # name -> (kind, help)
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, labels: Dict[str, object]) -> Metric:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    known = self._help.get(name)
+                    if known is not None and known[0] != cls.kind:
+                        raise ValueError(f"metric {name} is a {known[0]}, not a {cls.kind}")
+                    if known is None or (help and not known[1]):
+                        self._help[name] = (cls.kind, help)
+                    metric = self._metrics[key] = cls()
+        if not isinstance(metric, cls):
+            raise ValueError(f"metric {name} is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def counter(self, name: str, help: str = "", **labels: object) -> Counter:
+        return self._get(Counter, name, help, labels)  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str = "", **labels: object) -> Gauge:
+        return self._get(Gauge, name, help, labels)  # type: ignore[return-value]
+
+    def histogram(self, name: str, help: str = "", **labels: object) -> Histogram:
+        return self._get(Histogram, name, help, labels)  # type: ignore[return-value]
+
+    # --- hot-path switch ---
+    def watch(self) -> None:
+        with self._lock:
+            self._watchers += 1
+            self.enabled = True
+
+    def unwatch(self) -> None:
+        with self._lock:
+            self._watchers = max(0, self._watchers - 1)
+            self.enabled = self._watchers > 0
+
+    # --- reading ---
+    def add_collector(self, collector: Collector) -> None:
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def collect(self) -> None:
+        for collector in list(self._collectors):
+            collector(self)
+
+    def items(self, name: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, str], Metric]]:
+        for (metric_name, labels), metric in list(self._metrics.items()):
+            if name is None or metric_name == name:
+                yield metric_name, dict(labels), metric
+
+    def snapshot(self) -> Dict[str, object]:
+        self.collect()
+        metrics: Dict[str, dict] = {}
+        for name, labels, metric in sorted(self.items(), key=lambda x: (x[0], sorted(x[1].items()))):
+            kind, help = self._help[name]
+            entry = metrics.setdefault(name, {"type": kind, "help": help, "series": []})
+            entry["series"].append({"labels": labels, **metric.snapshot()})
+        return {"timestamp": time.time(), "metrics": metrics}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2, default=str)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text format; histograms are exported as summaries (quantiles, _sum, _count)."""
+        lines: List[str] = []
+        for name, entry in self.snapshot()["metrics"].items():  # type: ignore[union-attr]
+            kind = "summary" if entry["type"] == "histogram" else entry["type"]
+            if entry["help"]:
+                lines.append(f"# HELP {name} {entry['help']}")
+            lines.append(f"# TYPE {name} {kind}")
+            for series in entry["series"]:
+                labels = series["labels"]
+                if entry["type"] == "histogram":
+                    for q in QUANTILES:
+                        value = series[f"p{round(q * 100):d}"]
+                        lines.append(f"{name}{_labels({**labels, 'quantile': str(q)})} {_num(value)}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_num(series['sum'])}")
+                    lines.append(f"{name}_count{_labels(labels)} {series['count']}")
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_num(series['value'])}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, file: Path) -> None:
+        """Export atomically – ``.json`` as a snapshot, anything else in Prometheus text format."""
+        file = Path(file)
+        write_text_atomic(file, self.to_json() if file.suffix == ".json" else self.to_prometheus(), fsync=False)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    def escape(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class FileExporter:
+    """Writes the registry to ``file`` every ``interval`` seconds (textfile scrapers)."""
+
+    def __init__(self, registry: MetricsRegistry, file: Path, interval: float = 15.0) -> None:
+        self.registry = registry
+        self.file = Path(file)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "FileExporter":
+        if self._thread is None:
+            self.registry.watch()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.registry.write(self.file)
+            except OSError:
+                pass  # next round retries
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.registry.unwatch()
+            self.registry.write(self.file)
+
+
+_REGISTRY = MetricsRegistry()
+
+
+def default_registry() -> MetricsRegistry:
+    return _REGISTRY
@@ -0,0 +1,282 @@
+# services/middleware_pipeline.py
+from __future__ import annotations
+import asyncio
+import inspect
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from models.translation import Segment
+
+Batch = List[Segment]
+BatchResult = Union[Batch, Awaitable[Batch]]
+BatchFn = Callable[[Batch], BatchResult]
+
+
+class Middleware:
+    """Base class: override ``pre`` (before translation) and/or ``post`` (after).
+
+    Both take and return a whole batch; phases that are not overridden are left
+    out of the compiled chain entirely.
+    """
+    name = "middleware"
+
+    def __init__(self, plugin: Optional[Plugin] = None) -> None:
+        self.plugin = plugin
+
+    def pre(self, batch: Batch) -> BatchResult:
+        return batch
+
+    def post(self, batch: Batch) -> BatchResult:
+        return batch
+
+
+MIDDLEWARES: Dict[str, Callable[[Optional[Plugin]], Middleware]] = {}
+
+
+def register_middleware(cls: type) -> type:
+    """Class decorator making a middleware available to MIDDLEWARE plugins by name."""
+    MIDDLEWARES[cls.name] = cls
+    return cls
+
+
+@register_middleware
+class Normalize(Middleware):
+    """NFC-normalizes source text and strips surrounding whitespace (restored after translation)."""
+    name = "normalize"
+
+    def pre(self, batch: Batch) -> Batch:
+        for seg in batch:
+            text = unicodedata.normalize("NFC", seg.text)
+            stripped = text.strip()
+            if stripped != text:
+                lead = len(text) - len(text.lstrip())
+                seg.data["ws"] = (text[:lead], text[lead + len(stripped):])
+            seg.text = stripped
+        return batch
+
+    def post(self, batch: Batch) -> Batch:
+        for seg in batch:
+            ws = seg.data.pop("ws", None)
+            if ws:
+                seg.text = ws[0] + seg.text.strip() + ws[1]
+        return batch
+
+
+@dataclass(slots = True)
+class StageStats:
+    name: str
+    phase: str
+    batches: int = 0
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.seconds / self.batches if self.batches else 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+@dataclass(slots = True)
+class _Stage:
+    fn: BatchFn
+    stats: StageStats
+    is_async: bool
+
+
+async def _batched(segments: Union[Iterable[Segment], AsyncIterable[Segment]], size: int) -> AsyncIterator[Batch]:
+    batch: Batch = []
+    if isinstance(segments, AsyncIterable):
+        async for seg in segments:
+            batch.append(seg)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    else:
+        for seg in segments:
+            batch.append(seg)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+class MiddlewarePipeline:
+    """Ordered middleware chain compiled once into async generator stages.
+
+    ``pre`` stages run in ascending ``order``, the translate stage in the middle
+    and ``post`` stages in reverse (onion style). Every stage records latency and
+    throughput in :attr:`stats`.
+    """
+
+    def __init__(self, middlewares: Iterable[Middleware] = (), batch_size: int = 200) -> None:
+        self.middlewares = list(middlewares)
+        self.batch_size = batch_size
+        self.stats: List[StageStats] = []
+        self._pre: List[_Stage] = []
+        self._post: List[_Stage] = []
+        self.compile()
+
+    @classmethod
+    def from_plugins(cls, plugins: Iterable[Plugin], batch_size: int = 200) -> "MiddlewarePipeline":
+        """Enabled MIDDLEWARE plugins sorted by ``order`` (then name); ``kind`` defaults to the plugin name."""
+        chosen = [p for p in plugins if p.plugin_type is PluginType.MIDDLEWARE and p.params.get("enabled", True)]
+        chosen.sort(key=lambda p: (int(p.params.get("order", 0)), p.name))
+        middlewares = []
+        for p in chosen:
+            kind = p.params.get("kind", p.name)
+            factory = MIDDLEWARES.get(kind)
+            if factory is None:
+                raise ValueError(f"Unknown middleware: {kind}")
+            middlewares.append(factory(p))
+        return cls(middlewares, batch_size)
+
+    def _stage(self, mw: Middleware, phase: str) -> Optional[_Stage]:
+        fn = getattr(mw, phase)
+        if getattr(type(mw), phase) is getattr(Middleware, phase):
+            return None
+        stats = StageStats(mw.name if not mw.plugin else mw.plugin.name, phase)
+        self.stats.append(stats)
+        return _Stage(fn, stats, inspect.iscoroutinefunction(fn))
+
+    def compile(self) -> None:
+        self.stats = []
+        self._pre = [s for s in (self._stage(m, "pre") for m in self.middlewares) if s]
+        self._post = [s for s in (self._stage(m, "post") for m in reversed(self.middlewares)) if s]
+
+    @staticmethod
+    async def _run_stage(stage: _Stage, upstream: AsyncIterator[Batch]) -> AsyncIterator[Batch]:
+        stats = stage.stats
+        fn = stage.fn
+        async for batch in upstream:
+            started = time.perf_counter()
+            out = fn(batch)
+            if stage.is_async or inspect.isawaitable(out):
+                out = await out  # type: ignore[misc]
+            stats.seconds += time.perf_counter() - started
+            stats.batches += 1
+            stats.items += len(batch)
+            if out:
+                yield out  # type: ignore[misc]
+
+    @staticmethod
+    async def _run_concurrent(stage: _Stage, upstream: AsyncIterator[Batch], concurrency: int) -> AsyncIterator[Batch]:
+        """Like :meth:`_run_stage` but keeps up to ``concurrency`` batches in flight (unordered)."""
+        stats = stage.stats
+
+        async def call(batch: Batch) -> Batch:
+            started = time.perf_counter()
+            out = stage.fn(batch)
+            if inspect.isawaitable(out):
+                out = await out
+            stats.seconds += time.perf_counter() - started
+            stats.batches += 1
+            stats.items += len(batch)
+            return out  # type: ignore[return-value]
+
+        pending: Set[asyncio.Task] = set()
+        try:
+            async for batch in upstream:
+                pending.add(asyncio.ensure_future(call(batch)))
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.result():
+                            yield task.result()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _chain(self, stages: List[_Stage], upstream: AsyncIterator[Batch]) -> AsyncIterator[Batch]:
+        for stage in stages:
+            upstream = self._run_stage(stage, upstream)
+        return upstream
+
+    def pre(self, batches: AsyncIterator[Batch]) -> AsyncIterator[Batch]:
+        return self._chain(self._pre, batches)
+
+    def post(self, batches: AsyncIterator[Batch]) -> AsyncIterator[Batch]:
+        return self._chain(self._post, batches)
+
+    def run(
+        self,
+        segments: Union[Iterable[Segment], AsyncIterable[Segment]],
+        translate: Optional[BatchFn] = None,
+        name: str = "translate",
+        concurrency: int = 1,
+    ) -> AsyncIterator[Batch]:
+        """Stream ``segments`` through pre stages, ``translate`` and post stages.
+
+        With ``concurrency > 1`` several batches are translated at once and may
+        come out of order.
+        """
+        stream = self.pre(_batched(segments, self.batch_size))
+        if translate is not None:
+            stats = next((s for s in self.stats if s.phase == "translate" and s.name == name), None)
+            if stats is None:
+                stats = StageStats(name, "translate")
+                self.stats.append(stats)
+            stage = _Stage(translate, stats, inspect.iscoroutinefunction(translate))
+            if concurrency > 1:
+                stream = self._run_concurrent(stage, stream, concurrency)
+            else:
+                stream = self._run_stage(stage, stream)
+        return self.post(stream)
+
+    def report(self) -> List[Dict[str, object]]:
+        return [
+            {"stage": s.name, "phase": s.phase, "batches": s.batches, "items": s.items,
+             "seconds": round(s.seconds, 6), "avg_latency": s.avg_latency, "throughput": s.throughput}
+            for s in self.stats
+        ]
+
+
+def translator_stage(engine, source: str, memory=None) -> Callable[[Batch], Awaitable[Batch]]:
+    """Adapt a TranslationEngine to a translate stage.
+
+    Each target's segments go through ``engine.stream``, so the engine's
+    ``batch_size``/``max_batch_chars`` limits hold and a translation ``memory``
+    answers what it knows (and stores the rest).
+    """
+
+    async def translate(batch: Batch) -> Batch:
+        by_target: Dict[str, Batch] = {}
+        for seg in batch:
+            by_target.setdefault(seg.target, []).append(seg)
+        for target, segs in by_target.items():
+            # klíč = pozice v dávce; klíče segmentů se můžou opakovat
+            async for r in engine.stream([(str(i), s.text) for i, s in enumerate(segs)], source, [target], memory):
+                segs[int(r.key)].text = r.text
+        return batch
+
+    return translate
+
+
+_PLUGINS: Dict[str, Plugin] = {}
+_PIPELINE: Optional[MiddlewarePipeline] = None
+
+
+def register_plugin(p: Plugin) -> None:
+    global _PIPELINE
+    _PLUGINS[p.name] = p
+    _PIPELINE = None  # recompiled on next use
+
+
+def default_pipeline() -> MiddlewarePipeline:
+    """Pipeline compiled from every registered MIDDLEWARE plugin."""
+    global _PIPELINE
+    if _PIPELINE is None:
+        _PIPELINE = MiddlewarePipeline.from_plugins(_PLUGINS.values())
+    return _PIPELINE
@@ -1,19 +1,116 @@
-# services/plugin_loader.py
 import json
+from importlib import metadata
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from enums.plugin_type import PluginType
 from models.plugin import Plugin
 from services.plugin_validation import validate_plugin
 
-def load_plugins(path: Path = Path("./settings/plugins.json")) -> List[Plugin]:
+PLUGIN_DIR = Path("./plugins")
+# [project.entry-points."pytrans.translator"] deepl = "pytrans_deepl:handle"
+ENTRY_POINT_PREFIX = "pytrans."
+
+ErrorHandler = Callable[[str, Exception], None]
+
+
+def _manifests(data: Any) -> List[dict]:
+    return [data] if isinstance(data, dict) else list(data)
+
+
+def _settings_manifests(path: Path) -> List[dict]:
     if not path.exists():
         return []
-    data = json.loads(path.read_text(encoding="utf-8"))
+    return _manifests(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _dir_manifests(plugin_dir: Path, on_error: Optional[ErrorHandler] = None) -> List[dict]:
+    """``<dir>/<name>.json`` or ``<dir>/<name>/plugin.json``; a ``file.py:func`` handler is relative to it."""
+    if not plugin_dir.is_dir():
+        return []
+    files = sorted(plugin_dir.glob("*.json")) + sorted(plugin_dir.glob("*/plugin.json"))
+    out: List[dict] = []
+    for file in files:
+        try:
+            items = _manifests(json.loads(file.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            # rozbitý soubor jednoho pluginu nesmí shodit ostatní
+            if on_error is None:
+                raise
+            on_error(str(file), e)
+            continue
+        for item in items:
+            handler = item.get("handler") if isinstance(item, dict) else None
+            if isinstance(handler, str) and handler.partition(":")[0].endswith(".py"):
+                item = {**item, "handler": str((file.parent / handler).resolve())}
+            out.append(item)
+    return out
+
+
+def _entry_point_manifests() -> List[dict]:
+    """Entry points in ``pytrans.<plugin_type>`` groups; the package is not imported here."""
+    out: List[dict] = []
+    eps = metadata.entry_points()
+    for ptype in PluginType:
+        for ep in eps.select(group=ENTRY_POINT_PREFIX + ptype.value):
+            out.append({"name": ep.name, "plugin_type": ptype.value, "handler": ep.value})
+    return out
+
+
+def discover(path: Path = Path("./settings/plugins.json"), plugin_dir: Optional[Path] = PLUGIN_DIR,
+             entry_points: bool = True, on_error: Optional[ErrorHandler] = None) -> List[Any]:
+    """Manifests from settings, the plugin directory and entry points, merged by name.
+
+    The first source naming a plugin decides its type; ``params`` of earlier
+    sources override later ones (settings beat defaults shipped with a plugin)
+    and a missing ``handler`` is taken from a later source. Items without a
+    name are passed through unmerged for :func:`load_plugins` to report; a
+    plugin file that does not parse goes to ``on_error`` when given.
+    """
+    merged: Dict[str, dict] = {}
+    unnamed: List[Any] = []
+    sources: List[Iterable[Any]] = [_settings_manifests(path)]
+    if plugin_dir is not None:
+        sources.append(_dir_manifests(Path(plugin_dir), on_error))
+    if entry_points:
+        sources.append(_entry_point_manifests())
+    for items in sources:
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get("name"), str):
+                unnamed.append(item)
+                continue
+            known = merged.get(item["name"])
+            if known is None:
+                merged[item["name"]] = dict(item)
+                continue
+            known["params"] = {**item.get("params", {}), **known.get("params", {})}
+            if not known.get("handler") and item.get("handler"):
+                known["handler"] = item["handler"]
+            known.setdefault("plugin_type", item.get("plugin_type"))
+    return [*merged.values(), *unnamed]
+
+
+def load_plugins(path: Path = Path("./settings/plugins.json"), plugin_dir: Optional[Path] = PLUGIN_DIR,
+                 entry_points: bool = True, on_error: Optional[ErrorHandler] = None) -> List[Plugin]:
+    """Discovered plugins, validated.
+
+    Invalid plugins raise ``ValueError`` unless ``on_error`` is given; then it
+    gets ``(name, error)`` and the plugin is skipped – this includes manifests
+    that are not objects or lack a name or type.
+    """
+    # validace je pár množinových operací (~0.5 µs na plugin) – levnější než jakákoli cache
     plugins: List[Plugin] = []
-    for item in data:
-        ptype = PluginType(item["plugin_type"])  # "translator" -> PluginType.TRANSLATOR
-        p = Plugin(name=item["name"], plugin_type=ptype, params=item.get("params", {}))
-        validate_plugin(p)
+    for item in discover(Path(path), plugin_dir, entry_points, on_error):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError(f"Plugin manifest must be an object, not {type(item).__name__}")
+            ptype = PluginType(item["plugin_type"])  # "translator" -> PluginType.TRANSLATOR
+            p = Plugin(name=item["name"], plugin_type=ptype, params=item.get("params", {}),
+                       handler=item.get("handler"))
+            validate_plugin(p)
+        except (KeyError, ValueError) as e:
+            if on_error is None:
+                raise
+            on_error(item.get("name", "?") if isinstance(item, dict) else "?", e)
+            continue
         plugins.append(p)
     return plugins
@@ -1,21 +1,134 @@
-from typing import Callable
+import importlib
+import importlib.util
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
 from enums.plugin_type import PluginType
 from models.plugin import Plugin
+from services.metrics import default_registry
+
+# služby se importují až v handleru – plugin, který se nespustí, nic nenačte
 
 Handler = Callable[[Plugin], None]
 
+def handle_data_accessor(p: Plugin) -> None:
+    # sdílený accessor; stránkované čtení přes aclosing(accessor_for(p).stream()) (s pokračováním od checkpointu)
+    from services.data_accessor import accessor_for
+    accessor_for(p)
+
 def handle_backend(p: Plugin) -> None:
-    # TODO: napojení na tvoje backendy
-    ...
+    # backend = translation memory; s cache_enabled=false se neotevírá
+    if p.params.get("cache_enabled", True):
+        from services.translation_memory import memory_for
+        memory_for(p)
 
 def handle_translator(p: Plugin) -> None:
-    ...
+    # sdílený engine (pool spojení) pro plugin; překlad přes engine_for(p).stream(...)
+    from services.translation_engine import engine_for
+    engine_for(p)
+
+def handle_scheduler(p: Plugin) -> None:
+    # naplánuje plugin; co se spustí, určují háčky default_scheduler().on_fire
+    from services.scheduler import default_scheduler
+    default_scheduler().add_plugin(p)
+
+def handle_middleware(p: Plugin) -> None:
+    # zařadí do sdílené pipeline; ta se přeskládá podle "order" při dalším použití
+    from services import glossary_service, middleware_pipeline
+    from services import segmentation  # noqa: F401 – registruje middleware "segment"
+    if p.params.get("kind", p.name) == glossary_service.GlossaryMiddleware.name:
+        # zkompiluje glosář předem (nebo načte z cache), ať první dávka nečeká
+        glossary_service.default_store().load(p.params.get("glossary") or p.name).automaton()
+    middleware_pipeline.register_plugin(p)
 
 REGISTRY: dict[PluginType, Handler] = {
+    PluginType.DATA_ACCESSOR: handle_data_accessor,
     PluginType.BACKEND: handle_backend,
     PluginType.TRANSLATOR: handle_translator,
+    PluginType.SCHEDULER: handle_scheduler,
+    PluginType.MIDDLEWARE: handle_middleware,
     # ostatní doplníš
 }
 
+# vlastní handlery pluginů (Plugin.handler), importované při prvním běhu
+_HANDLERS: Dict[str, Handler] = {}
+_import_lock = threading.Lock()
+
+def _import_handler(spec: str) -> Handler:
+    module_name, sep, attr = spec.rpartition(":")
+    if not sep or attr.endswith(".py") or "/" in attr or "\\" in attr:
+        module_name, attr = spec, "run"  # bez ":func" (pozor na "C:\…" ve Windows cestě)
+    if module_name.endswith(".py"):
+        # soubor z adresáře pluginů – modul pod jménem odvozeným z cesty, ať se dva "handler.py" nepotkají
+        path = Path(module_name)
+        name = f"pytrans_plugin_{abs(hash(str(path.parent))):x}_{path.stem}"
+        module_spec = importlib.util.spec_from_file_location(name, path)
+        if module_spec is None or module_spec.loader is None:
+            raise ImportError(f"Cannot load plugin module {path}")
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, attr)
+
+def handler_for(p: Plugin) -> Optional[Handler]:
+    """Handler of ``p``: its own ``handler`` (imported on first use) or the built-in one for its type."""
+    if p.handler is None:
+        return REGISTRY.get(p.plugin_type)
+    handler = _HANDLERS.get(p.handler)
+    if handler is None:
+        with _import_lock:
+            handler = _HANDLERS.get(p.handler)
+            if handler is None:
+                handler = _HANDLERS[p.handler] = _import_handler(p.handler)
+    return handler
+
 def run_plugin(p: Plugin) -> None:
-    REGISTRY[p.plugin_type](p)
\ No newline at end of file
+    metrics = default_registry()
+    labels = {"plugin": p.name, "type": p.plugin_type.value}
+    metrics.counter("pytrans_plugin_runs_total", "Plugin handler runs", **labels).inc()
+    started = time.perf_counter()
+    try:
+        handler = handler_for(p)
+        if handler is None:
+            raise KeyError(p.plugin_type)
+        handler(p)
+    except Exception:
+        metrics.counter("pytrans_plugin_errors_total", "Plugin handler failures", **labels).inc()
+        raise
+    finally:
+        metrics.histogram("pytrans_plugin_run_seconds", "Plugin handler duration", **labels).record(
+            time.perf_counter() - started)
+
+# pořadí inicializace: zdroje (pooly spojení, DB, glosáře) souběžně, pak plánovač –
+# jeho háčky můžou hned sáhnout na ostatní a sám není thread-safe
+PHASES: tuple[tuple[frozenset[PluginType], bool], ...] = (
+    (frozenset(PluginType) - {PluginType.SCHEDULER}, True),
+    (frozenset({PluginType.SCHEDULER}), False),
+)
+
+def init_plugins(plugins: Iterable[Plugin], max_workers: int = 32) -> Dict[str, Exception]:
+    """Run the handler of every plugin, concurrently within a phase; returns failures by name.
+
+    Plugins without any handler (e.g. CUSTOM without ``handler``) are skipped.
+    """
+    pending = [p for p in plugins if p.handler is not None or p.plugin_type in REGISTRY]
+    errors: Dict[str, Exception] = {}
+
+    def run(p: Plugin) -> None:
+        try:
+            run_plugin(p)
+        except Exception as e:
+            errors[p.name] = e
+
+    for types, concurrent in PHASES:
+        batch: List[Plugin] = [p for p in pending if p.plugin_type in types]
+        if concurrent and len(batch) > 1:
+            with ThreadPoolExecutor(min(max_workers, len(batch)), thread_name_prefix="plugin-init") as pool:
+                list(pool.map(run, batch))
+        else:
+            for p in batch:
+                run(p)
+    return errors
\ No newline at end of file
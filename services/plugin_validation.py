@@ -12,11 +12,15 @@ REQUIRED_BY_TYPE: Mapping[PluginType, Set[str]] = {
 }
 
 ALLOWED_BY_TYPE: Mapping[PluginType, Set[str]] = {
-    PluginType.DATA_ACCESSOR: {"endpoint", "method", "auth_token"},
-    PluginType.BACKEND: {"connection_string", "cache_enabled"},
-    PluginType.TRANSLATOR: {"server_url", "api_key", "timeout"},
-    PluginType.MIDDLEWARE: {"order", "enabled"},
-    PluginType.SCHEDULER: {"cron", "timezone"},
+    PluginType.DATA_ACCESSOR: {"endpoint", "method", "auth_token", "page_size", "format", "timeout",
+                               "queue_size", "key_field", "text_field"},
+    PluginType.BACKEND: {"connection_string", "cache_enabled", "cache_size", "max_entries"},
+    PluginType.TRANSLATOR: {"server_url", "api_key", "timeout", "batch_size", "max_batch_chars", "concurrency",
+                            "max_concurrency", "rate_limit", "burst", "max_retries", "breaker_threshold",
+                            "breaker_reset"},
+    PluginType.MIDDLEWARE: {"order", "enabled", "kind", "glossary", "mode", "split_min"},
+    PluginType.SCHEDULER: {"cron", "timezone", "catch_up", "action", "locales", "source", "targets", "translator",
+                           "backend", "queue"},
     PluginType.CUSTOM: set(),  # volné – nebo vyplň později
 }
 
@@ -27,5 +31,5 @@ def validate_plugin(p: Plugin) -> None:
     if missing:
         raise ValueError(f"Missing required for {p.plugin_type.value}: {sorted(missing)}")
     unknown = set(p.params.keys()) - allowed
-    if unknown:
+    if unknown and p.handler is None:  # vlastní handler si parametry definuje sám
         raise ValueError(f"Unknown params for {p.plugin_type.value}: {sorted(unknown)}")
@@ -0,0 +1,156 @@
+# services/queue_worker.py
+from __future__ import annotations
+import asyncio
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence
+
+from models.queue import QueueTask
+from models.translation import Segment
+from services.delta_service import CatalogDelta, DeltaTranslator, content_hash
+from services.work_queue import WorkQueue, worker_name
+
+if TYPE_CHECKING:
+    from services.middleware_pipeline import MiddlewarePipeline
+    from services.translation_engine import TranslationEngine
+    from services.translation_memory import TranslationMemory
+
+
+def submit_targets(queue: WorkQueue, locales: Path, source_lang: str = "en",
+                   targets: Optional[Iterable[str]] = None, job: Optional[str] = None) -> Dict[str, int]:
+    """Queue the new and changed keys of each target (one shard per language); returns added per target."""
+    delta = DeltaTranslator(Path(locales), source_lang)
+    job = job or f"{source_lang}-{time.strftime('%Y%m%d-%H%M%S')}"
+    added: Dict[str, int] = {}
+    for lang in (targets if targets is not None else delta.targets()):
+        pending = delta.compute(lang).pending
+        items = ((key, content_hash(text), {"text": text, "source": source_lang}) for key, text in pending.items())
+        added[lang] = queue.submit(job, lang, items)
+    return added
+
+
+def collect(queue: WorkQueue, locales: Path, source_lang: str = "en",
+            targets: Optional[Iterable[str]] = None, page: int = 10_000) -> Dict[str, int]:
+    """Merge finished results into the target catalogs and drop them from the queue.
+
+    Each shard is drained ``page`` results at a time (applied, then acked).
+    Results whose source text changed meanwhile are dropped without being applied
+    (the next submit queues the new text). Returns applied keys per target.
+    """
+    delta = DeltaTranslator(Path(locales), source_lang)
+    shards = list(targets) if targets is not None else sorted(s for s, st in queue.stats().items() if st.done)
+    applied: Dict[str, int] = {}
+    for lang in shards:
+        while True:
+            rows = queue.results(lang, page)
+            if not rows:
+                break
+            translations = {key: text for _, key, digest, text in rows
+                            if key in delta.source and content_hash(delta.source[key]) == digest}
+            if translations:
+                delta.apply(CatalogDelta(lang), translations)
+            queue.ack([i for i, *_ in rows])
+            applied[lang] = applied.get(lang, 0) + len(translations)
+            if len(rows) < page:
+                break
+    return applied
+
+
+class QueueWorker:
+    """Leases batches of segments, translates them and reports the results back.
+
+    While a batch is in flight its lease is extended every third of the
+    visibility timeout, so only a dead worker's segments get re-leased. With
+    several ``shards`` the worker stays on the last one while it has work.
+    """
+
+    def __init__(self, queue: WorkQueue, engine: "TranslationEngine", memory: Optional["TranslationMemory"] = None,
+                 pipeline: Optional["MiddlewarePipeline"] = None, shards: Optional[Sequence[str]] = None,
+                 batch: int = 100, visibility: float = 120.0, idle: float = 1.0, name: Optional[str] = None,
+                 prefer: Optional[str] = None) -> None:
+        self.queue = queue
+        self.engine = engine
+        self.memory = memory
+        self.pipeline = pipeline if pipeline is not None and pipeline.middlewares else None
+        self.shards = list(shards) if shards else None
+        self.batch = batch
+        self.visibility = visibility
+        self.idle = idle
+        self.name = name or worker_name()
+        self.prefer = prefer
+        self.done = 0
+        self.failed = 0
+        self._stopping = False
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    async def _translate(self, tasks: List[QueueTask]) -> Dict[int, str]:
+        shard = tasks[0].shard
+        results: Dict[int, str] = {}
+        by_source: Dict[str, Dict[str, str]] = {}
+        for t in tasks:
+            # klíč segmentu = id úlohy; stejný klíč může ve frontě být se starým i novým textem
+            by_source.setdefault(t.payload.get("source", "en"), {})[str(t.id)] = t.payload["text"]
+        for source, segments in by_source.items():
+            if self.pipeline is not None:
+                from services.middleware_pipeline import translator_stage
+                stream = self.pipeline.run((Segment(k, text, shard) for k, text in segments.items()),
+                                           translator_stage(self.engine, source, self.memory),
+                                           concurrency=self.engine.concurrency)
+                async for done in stream:
+                    results.update((int(seg.key), seg.text) for seg in done)
+            else:
+                async for r in self.engine.stream(segments, source, [shard], self.memory):
+                    results[int(r.key)] = r.text
+        return results
+
+    async def _heartbeat(self, lease: str) -> None:
+        while True:
+            await asyncio.sleep(self.visibility / 3)
+            await asyncio.to_thread(self.queue.extend, lease, self.visibility)
+
+    async def step(self) -> int:
+        """Lease and process one batch; returns its size (0 = nothing to do)."""
+        tasks = await asyncio.to_thread(self.queue.lease, self.name, self.shards, self.batch, self.visibility, self.prefer)
+        if not tasks:
+            return 0
+        self.prefer = tasks[0].shard
+        lease = tasks[0].lease or ""
+        heartbeat = asyncio.ensure_future(self._heartbeat(lease))
+        try:
+            results = await self._translate(tasks)
+        except Exception as e:
+            self.failed += len(tasks)
+            await asyncio.to_thread(self.queue.fail, lease, [t.id for t in tasks], f"{type(e).__name__}: {e}")
+            return len(tasks)
+        finally:
+            heartbeat.cancel()
+        missing = [t.id for t in tasks if t.id not in results]
+        if missing:
+            self.failed += len(missing)
+            await asyncio.to_thread(self.queue.fail, lease, missing, "no translation returned")
+        self.done += await asyncio.to_thread(self.queue.complete, lease, results)
+        return len(tasks)
+
+    async def run(self, until_idle: bool = False,
+                  progress: Optional[Callable[["QueueWorker", int], None]] = None) -> int:
+        """Work until :meth:`stop` (or until the shards have nothing pending with ``until_idle``).
+
+        Returns the number of segments this worker finished.
+        """
+        while not self._stopping:
+            count = await self.step()
+            if count and progress is not None:
+                progress(self, count)
+            if not count:
+                # nic k vypůjčení – ale opakování s odstupem a cizí výpůjčky se ještě můžou vrátit
+                if until_idle and not await asyncio.to_thread(self.pending):
+                    break
+                await asyncio.sleep(self.idle)
+        return self.done
+
+    def pending(self) -> int:
+        """Ready and leased tasks in this worker's shards."""
+        stats = self.queue.stats()
+        return sum(s.pending for shard, s in stats.items() if self.shards is None or shard in self.shards)
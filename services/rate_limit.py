@@ -0,0 +1,284 @@
+# services/rate_limit.py
+from __future__ import annotations
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from services.http_client import HttpError
+
+T = TypeVar("T")
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+Clock = Callable[[], float]
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name}: circuit open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str], clock: Callable[[], float] = time.time) -> Optional[float]:
+    """``Retry-After`` in seconds (delta-seconds or HTTP date); None when absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))  # delta-seconds, i zlomky ("0.2")
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - clock())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Overload or transport trouble worth retrying; client errors (4xx) are not."""
+    if isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError, HttpError)):
+        return True
+    return getattr(exc, "status", None) in RETRY_STATUSES
+
+
+def is_outage(exc: BaseException) -> bool:
+    """Failure that says the backend is down (5xx, timeouts, connection trouble).
+
+    Throttling (429 or any ``Retry-After``) means the backend is up and asks to
+    slow down – it must not open the circuit breaker.
+    """
+    if getattr(exc, "retry_after", None) is not None:
+        return False
+    status = getattr(exc, "status", None)
+    if status is None:
+        return True
+    return status >= 500 or status == 408
+
+
+class TokenBucket:
+    """``rate`` requests per second with up to ``burst`` saved up; ``rate <= 0`` means unlimited.
+
+    :meth:`hold` blocks everyone until a moment (``Retry-After``). Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None, clock: Clock = time.monotonic) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst) if burst else max(1.0, self.rate)
+        self.tokens = self.burst
+        self.clock = clock
+        self._stamp = clock()
+        self._hold_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def hold(self, seconds: float) -> None:
+        self._hold_until = max(self._hold_until, self.clock() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self.clock()
+                if now < self._hold_until:
+                    await asyncio.sleep(self._hold_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on requests in flight, driven by latency and overload signals.
+
+    Successes at normal latency add about one slot per round of requests
+    (``+1/limit`` each); latency above ``tolerance`` × baseline trims the limit
+    by 10 %, overload (429, 5xx, timeouts) halves it – at most once per typical
+    request duration, so one burst of failures counts once.
+    """
+
+    def __init__(self, initial: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 backoff: float = 0.5, tolerance: float = 2.0, clock: Clock = time.monotonic) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.clock = clock
+        self.inflight = 0
+        self.baseline: Optional[float] = None  # slowly rising minimum latency
+        self.latency: Optional[float] = None   # EWMA latency
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.inflight -= 1
+            self._cond.notify_all()
+
+    def _decrease(self, factor: float) -> None:
+        now = self.clock()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+
+    def on_success(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += 0.01 * (latency - self.baseline)
+        if latency > self.baseline * self.tolerance:
+            self._decrease(0.9)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def on_overload(self) -> None:
+        self._decrease(self.backoff)
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; after ``reset_after`` seconds one probe may pass.
+
+    While the probe is out, other callers are told to come back after
+    ``probe_wait`` seconds; its result closes or reopens the circuit.
+    """
+
+    def __init__(self, threshold: int = 5, reset_after: float = 30.0, name: str = "",
+                 clock: Clock = time.monotonic, probe_wait: float = 0.5) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.name = name
+        self.clock = clock
+        self.probe_wait = probe_wait
+        self.failures = 0
+        self.state = "closed"  # closed | open | half-open
+        self._opened_at = 0.0
+
+    def check(self) -> bool:
+        """Pass (True when this caller is the half-open probe) or raise :class:`CircuitOpenError`."""
+        if self.state == "closed":
+            return False
+        remaining = self._opened_at + self.reset_after - self.clock()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half-open"  # this caller is the probe
+            return True
+        wait = max(remaining, 0.0) if self.state == "open" else min(self.probe_wait, self.reset_after)
+        raise CircuitOpenError(self.name, wait)
+
+    def abort_probe(self) -> None:
+        """The probe ended without a verdict (cancelled); the next caller probes instead."""
+        if self.state == "half-open":
+            self.state = "open"
+
+    def success(self) -> None:
+        self.failures = 0
+        self.state = "closed"
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            self.state = "open"
+            self._opened_at = self.clock()
+
+
+class Throttle:
+    """Per-backend guard: circuit breaker, token bucket, adaptive concurrency and retries.
+
+    Retries use full-jitter exponential backoff (``base`` · 2^attempt, capped),
+    never shorter than the server's ``Retry-After``, which also pauses the bucket
+    for every caller. Only outages (:func:`is_outage`) count toward the breaker;
+    while it is open callers wait for the half-open probe instead of failing.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: Optional[float] = None,
+        concurrency: int = 4,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        name: str = "",
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = AdaptiveConcurrency(concurrency, max_limit=max_concurrency or concurrency)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset, name)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+        self.throttled = 0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            try:
+                probe = self.breaker.check()
+            except CircuitOpenError as e:
+                # čekání na otevřený jistič se nepočítá jako pokus
+                await asyncio.sleep(e.retry_after)
+                continue
+            decided = False
+            try:
+                await self.bucket.acquire()
+                await self.limit.acquire()
+                started = time.monotonic()
+                try:
+                    result = await fn()
+                except Exception as e:
+                    if not is_retryable(e):
+                        self.breaker.success()  # backend odpověděl, chyba je na straně klienta
+                        decided = True
+                        raise
+                    retry_after = getattr(e, "retry_after", None)
+                    self.throttled += 1
+                    self.limit.on_overload()
+                    if is_outage(e):
+                        self.breaker.failure()
+                    elif probe:
+                        self.breaker.success()  # throttling: backend žije, jen chce zpomalit
+                    decided = True
+                    if retry_after:
+                        self.bucket.hold(retry_after)
+                    if attempt >= self.max_retries:
+                        raise
+                    delay = self.backoff(attempt, retry_after)
+                    attempt += 1
+                    self.retries += 1
+                else:
+                    self.limit.on_success(time.monotonic() - started)
+                    self.breaker.success()
+                    decided = True
+                    return result
+                finally:
+                    await self.limit.release()
+            finally:
+                if probe and not decided:
+                    self.breaker.abort_probe()
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "limit": round(self.limit.limit, 2), "inflight": self.limit.inflight,
+            "latency": self.limit.latency, "baseline": self.limit.baseline,
+            "breaker": self.breaker.state, "retries": self.retries, "throttled": self.throttled,
+        }
@@ -0,0 +1,183 @@
+# services/reference_data.py
+from __future__ import annotations
+import json
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.reference import Country, Language
+
+LANGUAGES_JSON = Path("./jsons/languages.json")
+COUNTRIES_JSON = Path("./jsons/countries.json")
+
+
+def fold(text: str) -> str:
+    """Case- and accent-folded form used by the search indexes ("Čeština" -> "cestina")."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def _read(path: Path):
+    # jsons/*.json ship with a UTF-8 BOM
+    return json.loads(Path(path).read_text(encoding="utf-8-sig"))
+
+
+class _PrefixIndex:
+    """Sorted (folded term, id) pairs; every word of a name is indexed."""
+    __slots__ = ("_terms", "_ids")
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]) -> None:
+        pairs: Set[Tuple[str, str]] = set()
+        for text, ident in entries:
+            folded = fold(text)
+            if not folded:
+                continue
+            pairs.add((folded, ident))
+            for word in folded.replace("/", " ").replace("-", " ").split()[1:]:
+                pairs.add((word, ident))
+        ordered = sorted(pairs)
+        self._terms = [t for t, _ in ordered]
+        self._ids = [i for _, i in ordered]
+
+    def search(self, prefix: str, limit: int) -> List[str]:
+        prefix = fold(prefix).strip()
+        if not prefix:
+            return []
+        out: List[str] = []
+        seen: Set[str] = set()
+        i = bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix) and len(out) < limit:
+            ident = self._ids[i]
+            if ident not in seen:
+                seen.add(ident)
+                out.append(ident)
+            i += 1
+        return out
+
+
+class ReferenceData:
+    """Language and country reference data, loaded once into lookup indexes.
+
+    Each file is read on first use; languages accept the shipped list format as
+    well as the older ``{"ar": {"rtl": true}}`` mapping. The maps are built
+    aside and published in one assignment, so concurrent readers never see a
+    partly filled one (at worst two threads read the file).
+    """
+
+    def __init__(self, languages_json: Path = LANGUAGES_JSON, countries_json: Path = COUNTRIES_JSON) -> None:
+        self.languages_json = Path(languages_json)
+        self.countries_json = Path(countries_json)
+        self._languages: Optional[Dict[str, Language]] = None
+        self._rtl: Set[str] = set()
+        self._lang_index: Optional[_PrefixIndex] = None
+        self._countries: Optional[Dict[str, Country]] = None
+        self._country_index: Optional[_PrefixIndex] = None
+        self._by_dial: Dict[str, List[Country]] = {}
+
+    # --- languages ---
+    @property
+    def languages(self) -> Dict[str, Language]:
+        if self._languages is None:
+            languages: Dict[str, Language] = {}
+            rtl: Set[str] = set()
+            try:
+                data = _read(self.languages_json) if self.languages_json.exists() else []
+            except (OSError, ValueError):
+                data = []
+            if isinstance(data, dict):
+                data = [dict(info, code=code) for code, info in data.items() if isinstance(info, dict)]
+            for item in data:
+                code = str(item.get("code", "")).lower()
+                if not code:
+                    continue
+                lang = Language(code, item.get("name", code), item.get("native", ""), bool(item.get("rtl")))
+                languages[code] = lang
+                if lang.rtl:
+                    rtl.add(code)
+            self._rtl = rtl  # dřív než mapa – is_rtl po ní čte _rtl
+            self._languages = languages
+        return self._languages
+
+    def language(self, code: str) -> Optional[Language]:
+        """Exact code, then BCP-47 prefix fallback: ``ar-SA`` / ``zh_Hant_TW`` -> ``ar`` / ``zh``."""
+        if not code:
+            return None
+        languages = self.languages
+        tag = code.replace("_", "-").lower()
+        while True:
+            lang = languages.get(tag)
+            if lang is not None or "-" not in tag:
+                return lang
+            tag = tag.rsplit("-", 1)[0]
+
+    def is_rtl(self, code: str) -> bool:
+        if not code:
+            return False
+        self.languages
+        tag = code.replace("_", "-").lower()
+        return tag in self._rtl or tag.split("-", 1)[0] in self._rtl
+
+    def search_languages(self, prefix: str, limit: int = 20) -> List[Language]:
+        """Prefix search over code, English and native names (case/accent-insensitive)."""
+        if self._lang_index is None:
+            entries: List[Tuple[str, str]] = []
+            for code, lang in self.languages.items():
+                entries += [(code, code), (lang.name, code), (lang.native, code)]
+            self._lang_index = _PrefixIndex(entries)
+        return [self.languages[c] for c in self._lang_index.search(prefix, limit)]
+
+    # --- countries ---
+    @property
+    def countries(self) -> Dict[str, Country]:
+        if self._countries is None:
+            countries: Dict[str, Country] = {}
+            by_dial: Dict[str, List[Country]] = {}
+            try:
+                data = _read(self.countries_json) if self.countries_json.exists() else []
+            except (OSError, ValueError):
+                data = []
+            for item in data:
+                code = str(item.get("code", "")).upper()
+                if not code:
+                    continue
+                country = Country(code, item.get("name", code), item.get("dial_code", ""), item.get("emoji", ""))
+                countries[code] = country
+                if country.dial_code:
+                    by_dial.setdefault(country.dial_code, []).append(country)
+            self._by_dial = by_dial
+            self._countries = countries
+        return self._countries
+
+    def country(self, code: str) -> Optional[Country]:
+        return self.countries.get(code.upper()) if code else None
+
+    def search_countries(self, prefix: str, limit: int = 20) -> List[Country]:
+        if self._country_index is None:
+            self._country_index = _PrefixIndex(
+                [(c.name, code) for code, c in self.countries.items()] + [(code, code) for code in self.countries]
+            )
+        return [self.countries[c] for c in self._country_index.search(prefix, limit)]
+
+    def countries_by_dial_code(self, dial: str) -> List[Country]:
+        """Countries for an exact dial code (``+1`` -> US, CA, ...)."""
+        self.countries
+        dial = dial.strip().replace(" ", "")
+        return list(self._by_dial.get(dial if dial.startswith("+") else "+" + dial, []))
+
+    def countries_for_number(self, number: str) -> List[Country]:
+        """Longest dial-code prefix match for a phone number (``+1264…`` -> Anguilla)."""
+        self.countries
+        digits = "+" + "".join(ch for ch in number if ch.isdigit())
+        for end in range(min(len(digits), 8), 1, -1):
+            found = self._by_dial.get(digits[:end])
+            if found:
+                return list(found)
+        return []
+
+
+@lru_cache(maxsize=None)
+def reference_data(languages_json: Path = LANGUAGES_JSON, countries_json: Path = COUNTRIES_JSON) -> ReferenceData:
+    """Process-wide shared instance per pair of files."""
+    return ReferenceData(Path(languages_json), Path(countries_json))
@@ -0,0 +1,269 @@
+# services/row_source.py
+from __future__ import annotations
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from array import array
+from itertools import compress, islice, repeat
+from operator import contains
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from services.glossary_service import Glossary
+
+Row = Tuple[str, ...]
+
+
+class RowSource(abc.ABC):
+    """Paged, sortable and filterable rows for a virtualized grid.
+
+    Rows are addressed by position in the current view (after filter and sort);
+    :meth:`rows` returns one page, so a grid only asks for what is visible.
+
+    Sources with ``lazy = True`` read pages from a store; the grid fetches those
+    pages in a worker thread instead of while drawing.
+    """
+    columns: Sequence[str] = ()
+    lazy = False
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Rows in the current view."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def rows(self, start: int, count: int) -> List[Row]:
+        """Up to ``count`` rows of the current view from position ``start``."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def sort(self, column: Optional[int], reverse: bool = False) -> None:
+        """Order the view by ``column`` (``None`` = original order)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def filter(self, query: str) -> None:
+        """Keep only rows containing ``query`` (case-insensitive); empty shows all."""
+        raise NotImplementedError
+
+
+class ColumnSource(RowSource):
+    """In-memory rows stored column-wise, with cached sort indexes and a folded search index.
+
+    Each column's sort order is computed once (``array('I')`` of row ids) and
+    reused in both directions. Filtering tests one casefolded string per row in
+    C (``map(contains, …)``), and only the previous hits when the query grows.
+    """
+
+    def __init__(self, columns: Sequence[str], data: Sequence[Sequence[str]]) -> None:
+        self.columns = tuple(columns)
+        self.data = [list(col) for col in data]
+        self.size = len(self.data[0]) if self.data else 0
+        self.sort_column: Optional[int] = None
+        self.reverse = False
+        self.query = ""
+        self._sort_index: Dict[int, array] = {}
+        self._folded: Optional[List[str]] = None
+        self._matches: Optional[bytearray] = None  # 1 per row in the current filter, None = all
+        self._view: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self._current())
+
+    # --- view ---
+    def _current(self) -> Sequence[int]:
+        if self._view is None:
+            order = self._order()
+            if self._matches is not None:
+                if isinstance(order, range):
+                    order = array("I", compress(order, self._matches))
+                else:
+                    order = array("I", compress(order, map(self._matches.__getitem__, order)))
+            self._view = order if isinstance(order, array) else array("I", order)
+        return self._view
+
+    def _order(self) -> Sequence[int]:
+        if self.sort_column is None:
+            return range(self.size)
+        index = self._sort_index.get(self.sort_column)
+        if index is None:
+            keys = [(v or "").casefold() for v in self.data[self.sort_column]]
+            index = self._sort_index[self.sort_column] = array("I", sorted(range(self.size), key=keys.__getitem__))
+        return index[::-1] if self.reverse else index
+
+    def rows(self, start: int, count: int) -> List[Row]:
+        view = self._current()
+        data = self.data
+        return [tuple(col[i] or "" for col in data) for i in view[max(0, start):start + count]]
+
+    def row_id(self, position: int) -> int:
+        return self._current()[position]
+
+    def sort(self, column: Optional[int], reverse: bool = False) -> None:
+        if column is not None and not 0 <= column < len(self.columns):
+            raise IndexError(column)
+        self.sort_column, self.reverse = column, reverse
+        self._view = None
+
+    # --- filter ---
+    def _index(self) -> List[str]:
+        if self._folded is None:
+            self._folded = ["\t".join(row).casefold() for row in zip(*((v or "" for v in col) for col in self.data))]
+        return self._folded
+
+    def filter(self, query: str) -> None:
+        q = query.casefold().strip()
+        if q == self.query:
+            return
+        if not q:
+            self._matches = None
+        else:
+            folded = self._index()
+            narrowing = self._matches is not None and self.query and q.startswith(self.query)
+            if narrowing and self._view is not None and len(self._view) * 4 < self.size:
+                # few candidates left – test just those rows
+                matches = bytearray(self.size)
+                for row in self._view:
+                    if q in folded[row]:
+                        matches[row] = 1
+            else:
+                matches = bytearray(map(contains, folded, repeat(q, self.size)))
+            self._matches = matches
+        self.query = q
+        self._view = None
+
+
+class SQLiteSource(RowSource):
+    """Rows in an SQLite file; only the requested page is read into memory.
+
+    The current view (filter and sort) is materialized as a ``(pos, rid)`` table,
+    so a page is an indexed range read however deep the grid scrolls. Filter and
+    sort are SQL scans over the file (the grid runs them in a worker thread), so
+    steady memory is the SQLite page cache (``cache_kib``) plus one page of rows.
+    Without ``path`` the rows go to a temporary file removed by :meth:`close`.
+    """
+    lazy = True
+
+    def __init__(self, columns: Sequence[str], rows: Iterable[Sequence[Optional[str]]],
+                 path: Optional[Path] = None, cache_kib: int = 8192) -> None:
+        self.columns = tuple(columns)
+        self.sort_column: Optional[int] = None
+        self.reverse = False
+        self.query = ""
+        self._lock = threading.Lock()
+        if path is None:
+            fd, name = tempfile.mkstemp(prefix="pytrans-rows-", suffix=".sqlite")
+            os.close(fd)
+            self.path, self._temporary = Path(name), True
+        else:
+            self.path, self._temporary = Path(path), False
+            self.path.unlink(missing_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=OFF")  # stavová kopie, po pádu se postaví znovu
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+        self._db.create_function("fold", 1, str.casefold, deterministic=True)
+        names = [f"c{i}" for i in range(len(self.columns))]
+        self._select = ", ".join(f"r.{n}" for n in names)
+        self._haystack = " || char(9) || ".join(names)
+        self._db.execute(f"CREATE TABLE rows (id INTEGER PRIMARY KEY, {', '.join(f'{n} TEXT' for n in names)})")
+        self._db.execute("CREATE TABLE view (pos INTEGER PRIMARY KEY, rid INTEGER NOT NULL)")
+        insert = f"INSERT INTO rows ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+        width = len(names)
+        it = iter(rows)
+        with self._db:
+            while True:
+                chunk = [tuple(v or "" for v in islice(row, width)) for row in islice(it, 10_000)]
+                if not chunk:
+                    break
+                self._db.executemany(insert, chunk)
+        self.size = self._db.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+        self._count = self.size
+        self._viewed = False  # False = všechny řádky v původním pořadí, čte se rovnou z rows
+
+    def __len__(self) -> int:
+        return self._count
+
+    def rows(self, start: int, count: int) -> List[Row]:
+        start = max(0, start)
+        with self._lock:
+            if self._viewed:
+                sql = (f"SELECT {self._select} FROM view v JOIN rows r ON r.id = v.rid "
+                       "WHERE v.pos > ? AND v.pos <= ? ORDER BY v.pos")
+            else:
+                sql = f"SELECT {self._select} FROM rows r WHERE r.id > ? AND r.id <= ? ORDER BY r.id"
+            return self._db.execute(sql, (start, start + count)).fetchall()
+
+    def sort(self, column: Optional[int], reverse: bool = False) -> None:
+        if column is not None and not 0 <= column < len(self.columns):
+            raise IndexError(column)
+        self.sort_column, self.reverse = column, reverse
+        self._rebuild()
+
+    def filter(self, query: str) -> None:
+        q = query.casefold().strip()
+        if q != self.query:
+            self.query = q
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self._viewed = bool(self.query) or self.sort_column is not None
+            if not self._viewed:
+                self._count = self.size
+                return
+            where = f"WHERE instr(fold({self._haystack}), ?) > 0" if self.query else ""
+            if self.sort_column is None:
+                order = "id"
+            else:
+                # jako ColumnSource: obrácené stabilní řazení obrátí i shody
+                direction = "DESC" if self.reverse else "ASC"
+                order = f"fold(c{self.sort_column}) {direction}, id {direction}"
+            with self._db:
+                self._db.execute("DELETE FROM view")
+                self._db.execute(f"INSERT INTO view (rid) SELECT id FROM rows {where} ORDER BY {order}",
+                                 (self.query,) if self.query else ())
+            self._count = self._db.execute("SELECT COUNT(*) FROM view").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+        if self._temporary:
+            self.path.unlink(missing_ok=True)
+
+
+def catalog_source(locales: Path, source_lang: str, target_lang: str,
+                   paged_from: Optional[int] = None) -> RowSource:
+    """Key / source / translation rows of one target catalog (source key order).
+
+    Catalogs with at least ``paged_from`` keys go into an :class:`SQLiteSource`
+    instead of memory, which would hold every row twice (rows plus the folded
+    search index).
+    """
+    def read(lang: str) -> Dict[str, object]:
+        file = Path(locales) / f"{lang}.json"
+        return json.loads(file.read_text(encoding="utf-8")) if file.exists() else {}
+
+    source = {k: v for k, v in read(source_lang).items() if isinstance(v, str)}
+    target = read(target_lang)
+    keys = list(source)
+
+    def translated(k: str) -> str:
+        value = target.get(k)
+        return value if isinstance(value, str) else ""
+
+    columns = ("key", "source", "translation")
+    if paged_from is not None and len(keys) >= paged_from:
+        return SQLiteSource(columns, ((k, source[k], translated(k)) for k in keys))
+    return ColumnSource(columns, [keys, [source[k] for k in keys], [translated(k) for k in keys]])
+
+
+def glossary_source(glossary: "Glossary") -> ColumnSource:
+    """Term / DNT / one column per target language."""
+    langs = sorted(glossary.targets)
+    data = [glossary.sources, ["✓" if d else "" for d in glossary.dnt]] + [glossary.targets[l] for l in langs]
+    return ColumnSource(("term", "dnt", *langs), data)  # type: ignore[arg-type]
@@ -0,0 +1,117 @@
+# services/scheduled_jobs.py
+"""What a SCHEDULER plugin does when it fires: re-translate its project or queue it for workers."""
+from __future__ import annotations
+import asyncio
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+
+if TYPE_CHECKING:
+    from services.scheduler import Scheduler
+
+ACTIONS = ("translate", "submit")
+
+
+def _targets(value: Any) -> Optional[List[str]]:
+    if not value:
+        return None
+    items = value.split(",") if isinstance(value, str) else list(value)
+    return [t.strip() for t in items if t and t.strip()] or None
+
+
+class Retranslate:
+    """``on_fire`` hook of :class:`~services.scheduler.Scheduler` for SCHEDULER plugins.
+
+    Plugin params: ``locales`` (the project's catalog directory, default
+    ``./locales``), ``source``, ``targets`` (list or comma separated; default every
+    catalog) and ``action``: ``translate`` (default) runs a
+    :class:`~services.delta_service.DeltaTranslator` with the ``translator`` and
+    ``backend`` plugins (by name, else the defaults given here); ``submit`` puts
+    the new and changed keys into ``queue`` for ``queue work`` processes.
+
+    Every run gets its own event loop in a worker thread, so catalog I/O and HTTP
+    never stall the scheduler loop (or the UI it shares a loop with). The summary
+    of the last run of each plugin is kept in :attr:`runs`.
+    """
+
+    def __init__(self, plugins: Iterable[Plugin], source: str = "en", translator: Optional[str] = None,
+                 backend: Optional[str] = None, queue: Optional[str] = None, split_min: Optional[int] = 80) -> None:
+        self.plugins = list(plugins)
+        self.source = source
+        self.translator = translator
+        self.backend = backend
+        self.queue = queue
+        self.split_min = split_min
+        self.runs: Dict[str, Dict[str, Any]] = {}
+
+    def _plugin(self, kind: PluginType, name: Optional[str]) -> Optional[Plugin]:
+        return next((p for p in self.plugins if p.plugin_type is kind and (name is None or p.name == name)), None)
+
+    async def __call__(self, p: Plugin) -> Dict[str, Any]:
+        action = p.params.get("action", "translate")
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown scheduler action: {action}")
+        run = self._submit if action == "submit" else self._translate_in_loop
+        summary = await asyncio.to_thread(run, p)
+        self.runs[p.name] = summary
+        return summary
+
+    def _submit(self, p: Plugin) -> Dict[str, Any]:
+        from services.queue_worker import submit_targets
+        from services.work_queue import DEFAULT_QUEUE, open_queue
+
+        params = p.params
+        source = params.get("source", self.source)
+        queue = open_queue(params.get("queue") or self.queue or DEFAULT_QUEUE)
+        try:
+            added = submit_targets(queue, Path(params.get("locales", "./locales")), source,
+                                   _targets(params.get("targets")), f"{p.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        finally:
+            queue.close()
+        return {"action": "submit", "queued": added}
+
+    def _translate_in_loop(self, p: Plugin) -> Dict[str, Any]:
+        return asyncio.run(self._translate(p))
+
+    async def _translate(self, p: Plugin) -> Dict[str, Any]:
+        from services.delta_service import DeltaTranslator
+        from services.translation_engine import TranslationEngine
+        from services.translation_memory import TranslationMemory
+
+        params = p.params
+        translator = self._plugin(PluginType.TRANSLATOR, params.get("translator") or self.translator)
+        if translator is None:
+            raise LookupError(f"No TRANSLATOR plugin for {p.name}")
+        backend = self._plugin(PluginType.BACKEND, params.get("backend") or self.backend)
+        engine = TranslationEngine.from_plugin(translator)
+        memory = None
+        if backend is not None and backend.params.get("cache_enabled", True):
+            memory = TranslationMemory.from_plugin(backend)
+        try:
+            delta = DeltaTranslator(Path(params.get("locales", "./locales")), params.get("source", self.source))
+            deltas = await delta.run(engine, _targets(params.get("targets")), memory, split_min=self.split_min)
+        finally:
+            await engine.aclose()
+            if memory is not None:
+                memory.close()
+        return {"action": "translate", "translator": translator.name,
+                "targets": {lang: {"added": len(d.added), "changed": len(d.changed), "removed": len(d.removed)}
+                            for lang, d in deltas.items()}}
+
+
+def install(scheduler: "Scheduler", plugins: Iterable[Plugin], **defaults: Any) -> Retranslate:
+    """Schedule every SCHEDULER plugin of ``plugins`` and hook :class:`Retranslate` into ``scheduler``.
+
+    Hooks of an earlier ``install`` are replaced, so the app can re-install after
+    reloading plugins.
+    """
+    plugins = list(plugins)
+    hook = Retranslate(plugins, **defaults)
+    scheduler.on_fire[:] = [h for h in scheduler.on_fire if not isinstance(h, Retranslate)] + [hook]
+    for p in plugins:
+        if p.plugin_type is PluginType.SCHEDULER and p.name not in scheduler.jobs:
+            scheduler.add_plugin(p)
+    return hook
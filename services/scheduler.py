@@ -0,0 +1,241 @@
+# services/scheduler.py
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, tzinfo
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.cron import UTC, CronExpression, compile_cron, get_timezone
+from services.fs_utils import write_json_atomic
+
+JobCallback = Callable[[], Awaitable[None]]
+
+CATCH_UP_POLICIES = ("skip", "once", "all")
+
+
+@dataclass(slots = True)
+class ScheduledJob:
+    name: str
+    cron: CronExpression
+    callback: JobCallback
+    tz: tzinfo = UTC
+    catch_up: str = "once"
+    next_run: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+    running: int = 0
+    last_error: Optional[str] = None
+    generation: int = 0
+    plugin: Optional[Plugin] = field(default=None, repr=False)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+class Scheduler:
+    """Asyncio cron scheduler keeping jobs in a min-heap ordered by next fire time.
+
+    Only the earliest job is looked at: the loop sleeps until it is due (or until
+    a job is added), so idle jobs cost nothing. ``max_concurrent`` caps how many
+    callbacks run at once. Last run times are persisted to ``state_file`` and
+    missed runs are caught up on start according to each job's ``catch_up``
+    policy: ``skip``, ``once`` (default) or ``all`` (at most ``max_catch_up``).
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        state_file: Optional[Path] = Path("./settings/scheduler_state.json"),
+        max_catch_up: int = 24,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.state_file = Path(state_file) if state_file else None
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.max_concurrent = max_concurrent
+        self._heap: List[Tuple[datetime, int, str, int]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._state: Dict[str, str] = self._load_state()
+        self.on_fire: List[Callable[[Plugin], Awaitable[None]]] = []
+
+    # --- state ---
+    def _load_state(self) -> Dict[str, str]:
+        if self.state_file is None or not self.state_file.exists():
+            return {}
+        try:
+            return json.loads(self.state_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        if self.state_file is None:
+            return
+        self._state.update({j.name: j.last_run.isoformat() for j in self.jobs.values() if j.last_run})
+        try:
+            write_json_atomic(self.state_file, self._state)
+        except OSError:
+            pass
+
+    # --- jobs ---
+    def add(self, name: str, cron: str, callback: JobCallback, timezone: Optional[str] = None,
+            catch_up: str = "once", plugin: Optional[Plugin] = None) -> ScheduledJob:
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"Unknown catch_up policy: {catch_up}")
+        # a fresh generation invalidates heap entries of a replaced/removed job
+        job = ScheduledJob(name, compile_cron(cron), callback, get_timezone(timezone), catch_up,
+                           generation=next(self._seq), plugin=plugin)
+        last = self._state.get(name)
+        job.last_run = datetime.fromisoformat(last) if last else None
+        self.jobs[name] = job
+        self._plan(job, self.clock())
+        return job
+
+    def add_plugin(self, p: Plugin) -> ScheduledJob:
+        """Schedule a SCHEDULER plugin; when it fires every ``on_fire`` hook gets the plugin."""
+        if p.plugin_type is not PluginType.SCHEDULER:
+            raise ValueError(f"Plugin {p.name} is not a scheduler")
+
+        async def fire() -> None:
+            await asyncio.gather(*(hook(p) for hook in self.on_fire))
+
+        return self.add(p.name, p.params["cron"], fire, p.params.get("timezone"),
+                        p.params.get("catch_up", "once"), plugin=p)
+
+    def remove(self, name: str) -> None:
+        # heap entries of removed jobs are dropped lazily
+        self.jobs.pop(name, None)
+
+    def _push(self, job: ScheduledJob, when: datetime) -> None:
+        job.next_run = when
+        heapq.heappush(self._heap, (when, next(self._seq), job.name, job.generation))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _plan(self, job: ScheduledJob, now: datetime) -> None:
+        """Queue the next run, including missed runs since ``last_run``."""
+        if job.last_run is not None and job.catch_up != "skip":
+            missed = job.cron.next_fire(job.last_run, job.tz)
+            if missed <= now:
+                self._push(job, missed)
+                return
+        self._push(job, job.cron.next_fire(now, job.tz))
+
+    def _missed_after(self, job: ScheduledJob, fired: datetime, now: datetime) -> Optional[datetime]:
+        """For catch_up='all': the next missed fire time after ``fired``, if any."""
+        if job.catch_up != "all":
+            return None
+        nxt = job.cron.next_fire(fired, job.tz)
+        if nxt > now:
+            return None
+        # bound catch-up bursts after long downtime
+        behind = 0
+        probe = nxt
+        while probe <= now and behind <= self.max_catch_up:
+            probe = job.cron.next_fire(probe, job.tz)
+            behind += 1
+        return nxt if behind <= self.max_catch_up else None
+
+    # --- loop ---
+    async def run(self) -> None:
+        """Run until :meth:`stop`."""
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._stopping = False
+        try:
+            while not self._stopping:
+                self._wakeup.clear()
+                now = self.clock()
+                due = self._pop_due(now)
+                for job, when in due:
+                    self._start(job, when)
+                    nxt = self._missed_after(job, when, now)
+                    self._push(job, nxt if nxt is not None else job.cron.next_fire(max(when, now), job.tz))
+                if due:
+                    self._save_state()
+                delay = (self._heap[0][0] - self.clock()).total_seconds() if self._heap else 3600.0
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), min(delay, 3600.0))
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self.drain()
+
+    async def run_pending(self) -> int:
+        """Run every job that is due now once (missed runs count), wait for them; returns how many ran.
+
+        For cron boxes: the system cron calls this every few minutes instead of
+        keeping :meth:`run` alive.
+        """
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        now = self.clock()
+        due = self._pop_due(now)
+        for job, when in due:
+            self._start(job, when)
+            self._push(job, job.cron.next_fire(max(when, now), job.tz))
+        await self.drain()
+        return len(due)
+
+    def _pop_due(self, now: datetime) -> List[Tuple[ScheduledJob, datetime]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, name, generation = heapq.heappop(self._heap)
+            job = self.jobs.get(name)
+            if job is None or job.generation != generation:
+                continue
+            due.append((job, when))
+        return due
+
+    def _start(self, job: ScheduledJob, when: datetime) -> None:
+        job.last_run = when
+        task = asyncio.ensure_future(self._execute(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, job: ScheduledJob) -> None:
+        assert self._slots is not None
+        async with self._slots:
+            job.running += 1
+            try:
+                await job.callback()
+                job.last_error = None
+            except Exception as e:
+                # one failing job must not stop the scheduler
+                job.last_error = f"{type(e).__name__}: {e}"
+            finally:
+                job.running -= 1
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain(self) -> None:
+        """Wait for running callbacks to finish and persist the state."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._save_state()
+
+    def upcoming(self, limit: int = 20) -> List[ScheduledJob]:
+        return sorted((j for j in self.jobs.values() if j.next_run), key=lambda j: j.next_run)[:limit]  # type: ignore[arg-type, return-value]
+
+
+_SCHEDULER: Optional[Scheduler] = None
+
+
+def default_scheduler() -> Scheduler:
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = Scheduler()
+    return _SCHEDULER
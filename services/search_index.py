@@ -0,0 +1,86 @@
+# services/search_index.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+_WORD_BREAKS = " .-_:/"
+
+
+@dataclass(slots = True)
+class SearchItem:
+    value: str
+    label: str
+    desc: str
+    haystack: str  # casefolded "label desc", built once
+
+
+def fuzzy_score(query: str, haystack: str) -> Optional[int]:
+    """Score a casefolded ``query`` against ``haystack``; None when it does not match.
+
+    Substring hits rank above subsequence hits; earlier positions and word starts
+    rank higher, gaps between subsequence characters lower the score.
+    """
+    if not query:
+        return 0
+    i = haystack.find(query)
+    if i >= 0:
+        at_word = i == 0 or haystack[i - 1] in _WORD_BREAKS
+        return 1000 - min(i, 200) + (100 if at_word else 0)
+    pos = -1
+    gaps = 0
+    bonus = 0
+    for ch in query:
+        j = haystack.find(ch, pos + 1)
+        if j < 0:
+            return None
+        if pos >= 0:
+            gaps += j - pos - 1
+        if j == 0 or haystack[j - 1] in _WORD_BREAKS:
+            bonus += 15
+        pos = j
+    return 500 - min(gaps, 400) + bonus
+
+
+class SearchIndex:
+    """Precomputed, casefolded fuzzy index with incremental narrowing.
+
+    A subsequence match of ``"abc"`` implies one of ``"ab"``, so when the query only
+    grows the previous candidate set is searched instead of every item.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, str, str]] = ()) -> None:
+        self.items: List[SearchItem] = []
+        self._last_query = ""
+        self._last: List[int] = []
+        self.extend(items)
+
+    def extend(self, items: Iterable[Tuple[str, str, str]]) -> None:
+        for value, label, desc in items:
+            self.items.append(SearchItem(value, label, desc, f"{label} {desc}".casefold()))
+        self.reset()
+
+    def reset(self) -> None:
+        self._last_query = ""
+        self._last = list(range(len(self.items)))
+
+    def search(self, query: str) -> List[SearchItem]:
+        q = query.casefold().strip()
+        if not q:
+            self.reset()
+            return list(self.items)
+        candidates: Sequence[int]
+        if self._last_query and q.startswith(self._last_query):
+            candidates = self._last
+        else:
+            candidates = range(len(self.items))
+        scored: List[Tuple[int, int]] = []
+        items = self.items
+        for i in candidates:
+            s = fuzzy_score(q, items[i].haystack)
+            if s is not None:
+                scored.append((-s, i))
+        scored.sort()
+        # keep the candidates in index order for the next narrowing step
+        self._last = sorted(i for _, i in scored)
+        self._last_query = q
+        return [items[i] for _, i in scored]
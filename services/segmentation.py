@@ -0,0 +1,240 @@
+# services/segmentation.py
+from __future__ import annotations
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+from models.plugin import Plugin
+from models.translation import Segment
+from services.middleware_pipeline import Batch, Middleware, register_middleware
+
+TOKEN = "⟦P{}⟧"
+_TOKEN_RE = re.compile(r"⟦P(\d+)⟧")
+# parts a translator must not touch; each becomes one token
+_MASK_RE = re.compile(r"""
+      \{\{ | \}\}                                  # escaped braces
+    | \{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}              # str.format field, one level of nested spec
+    | \[/?[a-zA-Z@#$][^\[\]]*\] | \[/\]            # Rich / Textual markup
+    | </?[a-zA-Z][^<>]*>                           # HTML-like tags
+    | %\(\w+\)[sdifr] | %[sdifr]                   # printf style
+""", re.X)
+_SENTENCE_END = re.compile(r"[.!?…]+[\"'”’»)\]]*(\s+)|[。！？]+")
+_ABBREVIATIONS = frozenset({"e.g", "i.e", "etc", "vs", "mr", "mrs", "ms", "dr", "no", "approx", "tzn", "např", "atd"})
+
+
+@dataclass(slots = True)
+class MaskedText:
+    text: str                                        # with ⟦Pn⟧ tokens
+    tokens: List[str] = field(default_factory=list)  # original text of each token
+
+
+def mask(text: str) -> MaskedText:
+    """Replace placeholders and markup with numbered tokens."""
+    tokens: List[str] = []
+
+    def repl(m: re.Match) -> str:
+        tokens.append(m.group(0))
+        return TOKEN.format(len(tokens) - 1)
+
+    return MaskedText(_MASK_RE.sub(repl, text), tokens)
+
+
+def unmask(text: str, tokens: List[str]) -> Tuple[str, List[str]]:
+    """Put tokens back; returns (text, problems) – lost or unknown tokens."""
+    seen = set()
+    problems: List[str] = []
+
+    def repl(m: re.Match) -> str:
+        i = int(m.group(1))
+        if i >= len(tokens):
+            problems.append(f"unknown token {m.group(0)}")
+            return m.group(0)
+        seen.add(i)
+        return tokens[i]
+
+    out = _TOKEN_RE.sub(repl, text)
+    problems += [f"lost {tok}" for i, tok in enumerate(tokens) if i not in seen]
+    return out, problems
+
+
+def _is_break(text: str, m: re.Match) -> bool:
+    if m.group(1) is None:
+        return True  # CJK full stop, no space needed
+    nxt = text[m.end():m.end() + 2].lstrip("\"'“‘„«([")
+    if not nxt or not (nxt[0].isupper() or nxt[0].isdigit() or nxt[0] == "⟦"):
+        return False
+    word = text[:m.start()].rsplit(None, 1)[-1].casefold() if text[:m.start()].strip() else ""
+    return word not in _ABBREVIATIONS and not (len(word) == 1 and word.isalpha())
+
+
+def split_sentences(text: str, split: bool = True) -> Tuple[List[str], List[str]]:
+    """Split into sentences; returns (sentences, gaps) with ``len(gaps) == len(sentences) + 1``.
+
+    ``gaps[0] + s0 + gaps[1] + s1 + … + gaps[-1]`` rebuilds ``text``. With
+    ``split=False`` only the surrounding whitespace is separated.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return [], [text]
+    lead = text[:len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()):]
+    sentences: List[str] = []
+    gaps = [lead]
+    start = 0
+    for m in _SENTENCE_END.finditer(stripped) if split else ():
+        if m.end() >= len(stripped) or not _is_break(stripped, m):
+            continue
+        end = m.start(1) if m.group(1) is not None else m.end()
+        sentences.append(stripped[start:end])
+        gaps.append(stripped[end:m.end()])
+        start = m.end()
+    sentences.append(stripped[start:])
+    gaps.append(trail)
+    return sentences, gaps
+
+
+def normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _renumber(sentence: str, tokens: List[str]) -> Tuple[str, List[str]]:
+    """Number tokens from 0 within one sentence, so equal sentences get equal text."""
+    local: List[str] = []
+
+    def repl(m: re.Match) -> str:
+        local.append(tokens[int(m.group(1))])
+        return TOKEN.format(len(local) - 1)
+
+    return _TOKEN_RE.sub(repl, sentence), local
+
+
+class SegmentPlan:
+    """Masked, sentence-split and deduplicated view of many values.
+
+    Every value added under ``ref`` is split into pieces; pieces of one ``group``
+    (e.g. target language) that are equal after :func:`normalize` share one
+    unique segment, so it is translated once and :meth:`assemble` fans the result
+    out to every ref. The segment keeps the text of its first piece as written
+    (newlines included). Values shorter than ``split_min`` stay one piece.
+    """
+
+    def __init__(self, split_min: int = 80) -> None:
+        self.split_min = split_min
+        self.texts: List[str] = []
+        self.groups: List[str] = []
+        self.pieces = 0
+        self._unique: Dict[Tuple[str, str], int] = {}
+        self._values: Dict[Hashable, Tuple[List[str], List[Tuple[int, List[str]]]]] = {}
+        self._refs: Dict[int, List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, ref: Hashable, text: str, group: str = "") -> None:
+        masked = mask(text)
+        sentences, gaps = split_sentences(masked.text, len(text) >= self.split_min)
+        parts: List[Tuple[int, List[str]]] = []
+        for sentence in sentences:
+            local, tokens = _renumber(sentence, masked.tokens)
+            key = (group, normalize(local))
+            uid = self._unique.get(key)
+            if uid is None:
+                uid = self._unique[key] = len(self.texts)
+                self.texts.append(local)  # normalizovaný text je jen klíč, posílá se původní
+                self.groups.append(group)
+            parts.append((uid, tokens))
+        self.pieces += len(parts)
+        self._values[ref] = (gaps, parts)
+        for uid in dict.fromkeys(uid for uid, _ in parts):
+            self._refs.setdefault(uid, []).append(ref)
+
+    def refs(self, uid: int) -> List[Hashable]:
+        """Refs whose value contains the unique segment ``uid``."""
+        return self._refs.get(uid, [])
+
+    def uids(self, ref: Hashable) -> List[int]:
+        """Distinct unique segments of the value added under ``ref``."""
+        return list(dict.fromkeys(uid for uid, _ in self._values[ref][1]))
+
+    def build(self, ref: Hashable, translated: Mapping[int, str]) -> Optional[Tuple[str, List[str]]]:
+        """Rebuild one value; ``None`` while some of its pieces are not in ``translated``."""
+        gaps, parts = self._values[ref]
+        if not parts:
+            return "".join(gaps), []
+        chunks = [gaps[0]]
+        problems: List[str] = []
+        for (uid, tokens), gap in zip(parts, gaps[1:]):
+            text = translated.get(uid)
+            if text is None:
+                return None
+            text, lost = unmask(text, tokens)
+            problems += lost
+            chunks += (text, gap)
+        return "".join(chunks), problems
+
+    def items(self, group: Optional[str] = None) -> Iterable[Tuple[int, str, str]]:
+        """``(uid, group, masked text)`` of unique segments, optionally of one group."""
+        for uid, (text, g) in enumerate(zip(self.texts, self.groups)):
+            if group is None or g == group:
+                yield uid, g, text
+
+    def assemble(self, translated: Mapping[int, str]) -> Tuple[Dict[Hashable, str], Dict[Hashable, List[str]]]:
+        """Rebuild every value whose pieces are all in ``translated`` (uid -> text).
+
+        Returns (texts, token problems) keyed by ref.
+        """
+        out: Dict[Hashable, str] = {}
+        issues: Dict[Hashable, List[str]] = {}
+        for ref in self._values:
+            built = self.build(ref, translated)
+            if built is None:
+                continue
+            out[ref], problems = built
+            if problems:
+                issues[ref] = problems
+        return out, issues
+
+
+@register_middleware
+class SegmentMiddleware(Middleware):
+    """Masks, splits and deduplicates a batch before translation and fans results out after.
+
+    Plugin param ``split_min``: values at least this long are split into sentences.
+    Token problems end up in ``segment.data["segment_issues"]``.
+    """
+    name = "segment"
+
+    def __init__(self, plugin: Optional[Plugin] = None) -> None:
+        super().__init__(plugin)
+        params = plugin.params if plugin else {}
+        self.split_min = int(params.get("split_min", 80))
+
+    def pre(self, batch: Batch) -> Batch:
+        plan = SegmentPlan(self.split_min)
+        for i, seg in enumerate(batch):
+            plan.add(i, seg.text, seg.target)
+        if not len(plan):
+            return batch
+        return [Segment(f"#{uid}", text, target, {"segment_plan": (plan, uid, batch)})
+                for uid, target, text in plan.items()]
+
+    def post(self, batch: Batch) -> Batch:
+        out: Batch = []
+        plans: Dict[int, Tuple[SegmentPlan, Batch, Dict[int, str]]] = {}
+        for seg in batch:
+            ref = seg.data.pop("segment_plan", None)
+            if ref is None:
+                out.append(seg)
+                continue
+            plan, uid, parents = ref
+            plans.setdefault(id(plan), (plan, parents, {}))[2][uid] = seg.text
+        for plan, parents, translated in plans.values():
+            texts, issues = plan.assemble(translated)
+            for i, seg in enumerate(parents):
+                if i in texts:
+                    seg.text = texts[i]
+                if i in issues:
+                    seg.data["segment_issues"] = issues[i]
+                out.append(seg)
+        return out
@@ -1,8 +1,13 @@
-
+import atexit
 import json
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Set
 import uuid
+from services.fs_utils import write_text_atomic
+from services.metrics import default_registry
 
 DEFAULTS: Dict[str, Any] = {
     "language": "en",
@@ -12,37 +17,169 @@ DEFAULTS: Dict[str, Any] = {
 }
 
 class Settings:
-    def __init__(self, file_path: Path = Path("./settings/settings.json")) -> None:
+    """JSON settings with dirty tracking and debounced, atomic saves.
+
+    ``set()`` only marks keys dirty; a background thread writes the file
+    ``save_delay`` seconds after the last change (``save_delay=0`` writes
+    synchronously). Changes inside ``with settings.transaction():`` are saved once.
+    """
+    def __init__(self, file_path: Path = Path("./settings/settings.json"), save_delay: float = 0.5) -> None:
         self.file_path = Path(file_path)
+        self.save_delay = save_delay
         self.settings: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._dirty: Set[str] = set()
+        self._depth = 0
+        self._written: Optional[str] = None
+        self._io_lock = threading.Lock()
+        self._generation = 0
+        self._written_generation = 0
+        self._deadline: Optional[float] = None
+        self._wakeup = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
         self._load()
+        atexit.register(self.flush)
 
     def _load(self) -> None:
         if self.file_path.exists():
-            self.settings = json.loads(self.file_path.read_text(encoding="utf-8"))
+            with default_registry().histogram("pytrans_settings_load_seconds", "Settings file load duration").time():
+                self._written = self.file_path.read_text(encoding="utf-8")
+                self.settings = json.loads(self._written)
         else:
             self.settings = DEFAULTS.copy()
+            self._dirty.update(self.settings)
 
         # Migration & defaults
         if not self.settings.get("application-id"):
             # Support legacy key 'id'
             legacy = self.settings.get("id")
             self.settings["application-id"] = legacy or str(uuid.uuid4())
+            self._dirty.add("application-id")
         for k, v in DEFAULTS.items():
-            self.settings.setdefault(k, v)
+            if k not in self.settings:
+                self.settings[k] = v
+                self._dirty.add(k)
+
+        if self._dirty:
+            self._save()  # ensure file exists and defaults applied
+
+    def _serialize(self) -> str:
+        return json.dumps(self.settings, ensure_ascii=False, indent=4)
+
+    def _save(self) -> bool:
+        """Write the file if its content changed; returns True when written.
+
+        The snapshot is taken under the settings lock, the disk write happens
+        outside of it so ``set()`` never waits for I/O.
+        """
+        with self._lock:
+            text = self._serialize()
+            self._dirty.clear()
+            self._deadline = None
+            self._generation += 1
+            generation = self._generation
+        with self._io_lock:
+            if text == self._written or generation < self._written_generation:
+                return False
+            metrics = default_registry()
+            try:
+                with metrics.histogram("pytrans_settings_save_seconds", "Settings file write duration").time():
+                    write_text_atomic(self.file_path, text)
+            except OSError:
+                metrics.counter("pytrans_settings_save_errors_total", "Failed settings writes").inc()
+                raise
+            metrics.counter("pytrans_settings_saved_bytes_total", "Bytes of settings written").inc(len(text))
+            self._written = text
+            self._written_generation = generation
+            return True
+
+    # --- debounced saving ---
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._depth or not self._dirty:
+                return
+            immediate = self.save_delay <= 0 or self._closed
+            if not immediate:
+                self._deadline = time.monotonic() + self.save_delay
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="settings-saver", daemon=True)
+                    self._worker.start()
+                else:
+                    self._wakeup.notify()
+        if immediate:
+            self._save()
 
-        self._save()  # ensure file exists and defaults applied
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                if self._deadline is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                    continue
+            try:
+                self._save()
+            except OSError:
+                # stay dirty so the next set()/flush() retries
+                with self._lock:
+                    self._dirty.add("*")
 
-    def _save(self) -> None:
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        self.file_path.write_text(json.dumps(self.settings, ensure_ascii=False, indent=4), encoding="utf-8")
+    @property
+    def dirty(self) -> Set[str]:
+        with self._lock:
+            return set(self._dirty)
+
+    def flush(self) -> bool:
+        """Write pending changes now (no-op if nothing changed)."""
+        with self._lock:
+            if not self._dirty:
+                return False
+        return self._save()
+
+    # compatibility with app.save_settings()
+    save_settings = flush
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify_all()
+        self.flush()
+        atexit.unregister(self.flush)
 
+    @contextmanager
+    def transaction(self) -> Iterator["Settings"]:
+        """Group several ``set()`` calls into one save (saved even if the block raises)."""
+        with self._lock:
+            self._depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+            self._schedule()
+
+    # --- access ---
     def get(self, key: str, default: Optional[Any] = None) -> Any:
         return self.settings.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
-        self.settings[key] = value
-        self._save()
+        with self._lock:
+            if key in self.settings and self.settings[key] == value:
+                return
+            self.settings[key] = value
+            self._dirty.add(key)
+        self._schedule()
+
+    def __getitem__(self, key: str) -> Any:
+        return self.settings[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
 
     @property
     def language(self) -> str:
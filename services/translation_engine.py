@@ -0,0 +1,242 @@
+# services/translation_engine.py
+from __future__ import annotations
+import asyncio
+import json
+import time
+import weakref
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from models.translation import TranslationResult
+from services.http_client import HttpPool
+from services.metrics import MetricsRegistry, default_registry
+from services.rate_limit import Throttle, parse_retry_after
+
+if TYPE_CHECKING:
+    from services.translation_memory import TranslationMemory
+
+KeyedText = Tuple[str, str]  # (key, source text)
+
+
+class TranslationError(RuntimeError):
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _segments(source: Mapping[str, str] | Iterable[KeyedText]) -> Iterable[KeyedText]:
+    return source.items() if isinstance(source, Mapping) else source
+
+
+class TranslationEngine:
+    """Async batched client for a TRANSLATOR plugin.
+
+    Protocol: ``POST server_url`` with ``{"source", "target", "texts": [...]}``,
+    the server answers ``{"translations": [...]}`` in the same order.
+
+    Requests go through a :class:`Throttle`: ``rate_limit`` requests/s (0 = off),
+    in-flight batches adapting between 1 and ``max_concurrency`` starting at
+    ``concurrency``, jittered retries on 429/5xx honouring ``Retry-After`` and a
+    circuit breaker.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        api_key: str | None = None,
+        timeout: float = 30.0,
+        batch_size: int = 100,
+        max_batch_chars: int = 20_000,
+        concurrency: int = 4,
+        name: str = "",
+        max_concurrency: Optional[int] = None,
+        rate_limit: float = 0.0,
+        burst: Optional[float] = None,
+        max_retries: int = 4,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+    ) -> None:
+        if batch_size < 1 or concurrency < 1 or max_batch_chars < 1:
+            raise ValueError("batch_size, max_batch_chars and concurrency must be positive")
+        self.name = name or server_url
+        self.server_url = server_url
+        self.api_key = api_key
+        self.timeout = float(timeout)
+        self.batch_size = int(batch_size)
+        self.max_batch_chars = int(max_batch_chars)
+        # the stream window is the ceiling; the throttle decides how much of it is used
+        self.concurrency = max(int(max_concurrency or concurrency), int(concurrency))
+        self.throttle = Throttle(
+            rate=rate_limit, burst=burst, concurrency=int(concurrency), max_concurrency=self.concurrency,
+            max_retries=int(max_retries), breaker_threshold=int(breaker_threshold),
+            breaker_reset=float(breaker_reset), name=self.name,
+        )
+        self._pool = HttpPool(max_idle=self.concurrency, timeout=self.timeout)
+        metrics = default_registry()
+        self._latency = metrics.histogram("pytrans_translate_batch_seconds",
+                                          "Batch round trip incl. retries", plugin=self.name)
+        self._segments = metrics.counter("pytrans_translate_segments_total", "Segments translated", plugin=self.name)
+        self._failures = metrics.counter("pytrans_translate_errors_total", "Failed batches", plugin=self.name)
+        _LIVE.add(self)
+
+    @classmethod
+    def from_plugin(cls, p: Plugin) -> "TranslationEngine":
+        if p.plugin_type is not PluginType.TRANSLATOR:
+            raise ValueError(f"Plugin {p.name} is not a translator")
+        params = dict(p.params)
+        return cls(
+            server_url=params["server_url"],
+            api_key=params.get("api_key"),
+            timeout=params.get("timeout", 30.0),
+            batch_size=params.get("batch_size", 100),
+            max_batch_chars=params.get("max_batch_chars", 20_000),
+            concurrency=params.get("concurrency", 4),
+            name=p.name,
+            max_concurrency=params.get("max_concurrency"),
+            rate_limit=params.get("rate_limit", 0.0),
+            burst=params.get("burst"),
+            max_retries=params.get("max_retries", 4),
+            breaker_threshold=params.get("breaker_threshold", 5),
+            breaker_reset=params.get("breaker_reset", 30.0),
+        )
+
+    def batches(self, segments: Mapping[str, str] | Iterable[KeyedText]) -> Iterator[List[KeyedText]]:
+        """Pack segments into batches bounded by count and total characters."""
+        batch: List[KeyedText] = []
+        chars = 0
+        for key, text in _segments(segments):
+            if batch and (len(batch) >= self.batch_size or chars + len(text) > self.max_batch_chars):
+                yield batch
+                batch, chars = [], 0
+            batch.append((key, text))
+            chars += len(text)
+        if batch:
+            yield batch
+
+    async def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[str]:
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        body = json.dumps({"source": source, "target": target, "texts": list(texts)}, ensure_ascii=False)
+        started = time.perf_counter()
+        try:
+            out = await self.throttle.call(lambda: self._post(body.encode("utf-8"), headers, len(texts)))
+        except Exception:
+            self._failures.inc()
+            raise
+        self._latency.record(time.perf_counter() - started)
+        self._segments.inc(len(texts))
+        return out
+
+    async def _post(self, body: bytes, headers: Dict[str, str], count: int) -> List[str]:
+        response = await self._pool.request("POST", self.server_url, body, headers)
+        if not response.ok:
+            raise TranslationError(f"{self.server_url} returned HTTP {response.status}", response.status,
+                                   parse_retry_after(response.headers.get("retry-after")))
+        data = response.json()
+        out = data.get("translations") if isinstance(data, dict) else data
+        if not isinstance(out, list) or len(out) != count:
+            raise TranslationError(f"{self.server_url} returned {len(out or [])} translations for {count} texts")
+        return [str(x) for x in out]
+
+    async def stream(
+        self,
+        segments: Mapping[str, str] | Iterable[KeyedText],
+        source: str,
+        targets: Iterable[str],
+        memory: Optional["TranslationMemory"] = None,
+    ) -> AsyncIterator[TranslationResult]:
+        """Translate into every target, yielding results as their batches complete.
+
+        At most ``concurrency`` batches are in flight; batches are produced lazily.
+        With a translation ``memory`` hits are yielded first and only misses are sent.
+        """
+        items = list(_segments(segments))
+        pending: Dict[asyncio.Task, Tuple[str, List[KeyedText]]] = {}
+        try:
+            for target in targets:
+                todo = items
+                if memory is not None:
+                    known = memory.get_many((text for _, text in items), source, target, self.name)
+                    todo = []
+                    for key, text in items:
+                        if text in known:
+                            yield TranslationResult(key, target, known[text])
+                        else:
+                            todo.append((key, text))
+                for batch in self.batches(todo):
+                    if len(pending) >= self.concurrency:
+                        for result in await self._drain(pending, source, memory):
+                            yield result
+                    task = asyncio.ensure_future(self.translate_batch([t for _, t in batch], source, target))
+                    pending[task] = (target, batch)
+            while pending:
+                for result in await self._drain(pending, source, memory):
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            # zrušené dávky se dočkají, ať po break nezůstanou běžet nad zavřeným spojením
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _drain(
+        self,
+        pending: Dict[asyncio.Task, Tuple[str, List[KeyedText]]],
+        source: str,
+        memory: Optional["TranslationMemory"],
+    ) -> List[TranslationResult]:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        results: List[TranslationResult] = []
+        for task in done:
+            target, batch = pending.pop(task)
+            texts = task.result()
+            if memory is not None:
+                memory.put_many(((src, text) for (_, src), text in zip(batch, texts)), source, target, self.name)
+            results.extend(TranslationResult(key, target, text) for (key, _), text in zip(batch, texts))
+        return results
+
+    async def translate(
+        self,
+        segments: Mapping[str, str] | Iterable[KeyedText],
+        source: str,
+        targets: Iterable[str],
+        memory: Optional["TranslationMemory"] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """Collect :meth:`stream` into ``{target: {key: text}}``."""
+        out: Dict[str, Dict[str, str]] = {}
+        async for r in self.stream(segments, source, targets, memory):
+            out.setdefault(r.target, {})[r.key] = r.text
+        return out
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+_ENGINES: Dict[str, TranslationEngine] = {}
+_LIVE: "weakref.WeakSet[TranslationEngine]" = weakref.WeakSet()
+
+
+def _collect(metrics: MetricsRegistry) -> None:
+    # živé hodnoty se čtou až při exportu/obnově dashboardu
+    for engine in list(_LIVE):
+        limit = engine.throttle.limit
+        metrics.gauge("pytrans_translate_inflight", "Batches in flight", plugin=engine.name).set(limit.inflight)
+        metrics.gauge("pytrans_translate_concurrency_limit", "Adaptive concurrency limit",
+                      plugin=engine.name).set(round(limit.limit, 2))
+        metrics.gauge("pytrans_translate_circuit_open", "1 while the circuit breaker is not closed",
+                      plugin=engine.name).set(engine.throttle.breaker.state != "closed")
+        metrics.counter("pytrans_translate_retries_total", "Retried requests", plugin=engine.name).value = \
+            engine.throttle.retries
+
+
+default_registry().add_collector(_collect)
+
+
+def engine_for(p: Plugin) -> TranslationEngine:
+    """Return the shared engine (and its connection pool) for a translator plugin."""
+    engine = _ENGINES.get(p.name)
+    if engine is None:
+        engine = _ENGINES[p.name] = TranslationEngine.from_plugin(p)
+    return engine
@@ -0,0 +1,184 @@
+# services/translation_memory.py
+from __future__ import annotations
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.metrics import MetricsRegistry, default_registry
+
+_CHUNK = 500  # stays below SQLite's bound-parameter limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tm (
+    hash BLOB PRIMARY KEY,
+    translation TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tm_last_used ON tm(last_used);
+"""
+
+
+def parse_connection_string(connection_string: str) -> str:
+    """'sqlite:///path/tm.db', 'sqlite://:memory:' or a plain file path -> sqlite3 database."""
+    if "://" not in connection_string:
+        return connection_string
+    scheme, _, rest = connection_string.partition("://")
+    if scheme.lower() != "sqlite":
+        raise ValueError(f"Unsupported translation memory backend: {scheme}")
+    if rest in (":memory:", "/:memory:"):
+        return ":memory:"
+    # SQLAlchemy style: sqlite:///relative.db, sqlite:////absolute.db
+    return rest[1:] if rest.startswith("/") else rest
+
+
+class TranslationMemory:
+    """SQLite translation memory with an in-process LRU in front of it."""
+
+    def __init__(self, connection_string: str, cache_size: int = 10_000, max_entries: int = 1_000_000) -> None:
+        database = parse_connection_string(connection_string)
+        if database != ":memory:":
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+        self.cache_size = int(cache_size)
+        self.max_entries = int(max_entries)
+        self._db = sqlite3.connect(database, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lru: "OrderedDict[bytes, str]" = OrderedDict()
+        self._approx_count = len(self)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_plugin(cls, p: Plugin) -> "TranslationMemory":
+        if p.plugin_type is not PluginType.BACKEND:
+            raise ValueError(f"Plugin {p.name} is not a backend")
+        params = dict(p.params)
+        return cls(
+            params["connection_string"],
+            cache_size=params.get("cache_size", 10_000),
+            max_entries=params.get("max_entries", 1_000_000),
+        )
+
+    @staticmethod
+    def key(text: str, source: str, target: str, translator: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (source.lower(), target.lower(), translator, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.digest()
+
+    # --- LRU ---
+    def _remember(self, h: bytes, translation: str) -> None:
+        self._lru[h] = translation
+        self._lru.move_to_end(h)
+        while len(self._lru) > self.cache_size:
+            self._lru.popitem(last=False)
+
+    # --- lookup ---
+    def get(self, text: str, source: str, target: str, translator: str) -> Optional[str]:
+        return self.get_many([text], source, target, translator).get(text)
+
+    def get_many(self, texts: Iterable[str], source: str, target: str, translator: str) -> Dict[str, str]:
+        """Bulk lookup; returns ``{text: translation}`` for hits only.
+
+        Repeated texts are looked up once; :attr:`hits` and :attr:`misses` count unique texts.
+        """
+        found: Dict[str, str] = {}
+        missing: Dict[bytes, str] = {}
+        unique = dict.fromkeys(texts)
+        for text in unique:
+            h = self.key(text, source, target, translator)
+            cached = self._lru.get(h)
+            if cached is not None:
+                self._lru.move_to_end(h)
+                found[text] = cached
+            else:
+                missing[h] = text
+        if missing:
+            hashes = list(missing)
+            hit_hashes: List[bytes] = []
+            for i in range(0, len(hashes), _CHUNK):
+                chunk = hashes[i:i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for h, translation in self._db.execute(f"SELECT hash, translation FROM tm WHERE hash IN ({marks})", chunk):
+                    found[missing[h]] = translation
+                    self._remember(h, translation)
+                    hit_hashes.append(h)
+            if hit_hashes:
+                now = int(time.time())
+                with self._db:
+                    self._db.executemany("UPDATE tm SET last_used = ? WHERE hash = ?", [(now, h) for h in hit_hashes])
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    # --- insert ---
+    def put(self, text: str, translation: str, source: str, target: str, translator: str) -> None:
+        self.put_many([(text, translation)], source, target, translator)
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], source: str, target: str, translator: str) -> None:
+        now = int(time.time())
+        rows = []
+        for text, translation in pairs:
+            h = self.key(text, source, target, translator)
+            self._remember(h, translation)
+            rows.append((h, translation, now))
+        if not rows:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO tm(hash, translation, last_used) VALUES (?, ?, ?)", rows)
+        # replaced rows make this an over-estimate; evict() recounts exactly
+        self._approx_count += len(rows)
+        if self._approx_count > self.max_entries:
+            self.evict()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+
+    def evict(self) -> int:
+        """Trim least recently used rows down to 90 % of ``max_entries``; returns the number removed."""
+        count = len(self)
+        self._approx_count = count
+        if count <= self.max_entries:
+            return 0
+        excess = count - int(self.max_entries * 0.9)
+        with self._db:
+            self._db.execute(
+                "DELETE FROM tm WHERE hash IN (SELECT hash FROM tm ORDER BY last_used LIMIT ?)", (excess,)
+            )
+        self._approx_count = count - excess
+        return excess
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_MEMORIES: Dict[str, TranslationMemory] = {}
+
+
+def memory_for(p: Plugin) -> TranslationMemory:
+    """Return the shared translation memory opened for a backend plugin."""
+    tm = _MEMORIES.get(p.name)
+    if tm is None:
+        tm = _MEMORIES[p.name] = TranslationMemory.from_plugin(p)
+    return tm
+
+
+def _collect(metrics: MetricsRegistry) -> None:
+    for name, tm in list(_MEMORIES.items()):
+        metrics.counter("pytrans_tm_hits_total", "Translation memory hits", plugin=name).value = tm.hits
+        metrics.counter("pytrans_tm_misses_total", "Translation memory misses", plugin=name).value = tm.misses
+
+
+default_registry().add_collector(_collect)
+
+
+def default_memory() -> Optional[TranslationMemory]:
+    """First translation memory registered by a backend plugin, if any."""
+    return next(iter(_MEMORIES.values()), None)
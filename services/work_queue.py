@@ -0,0 +1,372 @@
+# services/work_queue.py
+from __future__ import annotations
+import abc
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib import request as urlrequest
+from urllib.parse import parse_qs, urlsplit
+
+from models.queue import QueueTask, ShardStats
+from services.translation_memory import parse_connection_string
+
+DEFAULT_QUEUE = "./locales/.queue/queue.sqlite"
+
+READY, LEASED, DONE, DEAD = 0, 1, 2, 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    shard TEXT NOT NULL,
+    key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    visible_at REAL NOT NULL DEFAULT 0,
+    lease TEXT,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL DEFAULT 0,
+    UNIQUE (shard, key, digest)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (shard, state, visible_at);
+CREATE INDEX IF NOT EXISTS tasks_lease ON tasks (lease);
+"""
+
+Submitted = Tuple[str, str, Mapping[str, Any]]  # key, digest of the source text, payload
+
+
+class WorkQueue(abc.ABC):
+    """Segments waiting for translation, leased to workers for a visibility timeout.
+
+    A leased task that is neither completed nor failed before its lease runs out
+    becomes visible again (another worker picks it up). Failed tasks come back
+    after a backoff until ``max_attempts``; then they are *dead* until retried.
+    Tasks are sharded by target language: one lease never mixes shards.
+    """
+
+    @abc.abstractmethod
+    def submit(self, job: str, shard: str, items: Iterable[Submitted]) -> int:
+        """Queue segments; the same (shard, key, digest) is queued once. Returns how many were added."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def lease(self, worker: str, shards: Optional[Sequence[str]] = None, limit: int = 100,
+              visibility: float = 120.0, prefer: Optional[str] = None) -> List[QueueTask]:
+        """Up to ``limit`` visible tasks of one shard (``prefer`` first, else the oldest work)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def extend(self, lease: str, visibility: float) -> int:
+        """Push the timeout of a lease that is still being worked on."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def complete(self, lease: str, results: Mapping[int, str]) -> int:
+        """Store results of leased tasks; results for lost (expired and re-leased) tasks are ignored."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def fail(self, lease: str, ids: Sequence[int], error: str) -> int:
+        """Return leased tasks after an error; they come back after a backoff or go dead.
+
+        Returns how many were still held by ``lease``.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def results(self, shard: str, limit: int = 10_000) -> List[Tuple[int, str, str, str]]:
+        """Finished tasks of ``shard`` as ``(id, key, digest, result)``."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def ack(self, ids: Sequence[int]) -> int:
+        """Drop finished tasks once their results are applied."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def retry_dead(self, shard: Optional[str] = None) -> int:
+        """Make dead tasks (of one shard or all) ready again with fresh attempts."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, ShardStats]:
+        """Task counts per shard and state."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteQueue(WorkQueue):
+    """Queue in one SQLite file (WAL); any number of local processes may share it."""
+
+    def __init__(self, path: Path | str = DEFAULT_QUEUE, max_attempts: int = 5, retry_delay: float = 5.0,
+                 busy_timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit; zápisy v BEGIN IMMEDIATE, ať se dva workery nepřetahují o stejné řádky
+        self._db = sqlite3.connect(str(path), timeout=busy_timeout, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def submit(self, job: str, shard: str, items: Iterable[Submitted]) -> int:
+        now = time.time()
+        rows = ((job, shard, key, digest, json.dumps(payload, ensure_ascii=False), now) for key, digest, payload in items)
+        with self._tx() as db:
+            before = db.total_changes
+            # mrtvé úlohy se stejným textem ožijí; hotové/rozpracované zůstávají
+            db.executemany(
+                "INSERT INTO tasks (job, shard, key, digest, payload, updated) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (shard, key, digest) DO UPDATE SET state = 0, attempts = 0, visible_at = 0, "
+                "error = NULL, job = excluded.job, updated = excluded.updated WHERE tasks.state = 3",
+                rows)
+            return db.total_changes - before
+
+    def _pick_shard(self, db: sqlite3.Connection, now: float, shards: Optional[Sequence[str]],
+                    prefer: Optional[str]) -> Optional[str]:
+        if prefer is not None and (shards is None or prefer in shards):
+            if db.execute("SELECT 1 FROM tasks WHERE shard = ? AND state < 2 AND visible_at <= ? LIMIT 1",
+                          (prefer, now)).fetchone():
+                return prefer
+        where, args = "", ()
+        if shards is not None:
+            where, args = f" AND shard IN ({','.join('?' * len(shards))})", tuple(shards)
+        row = db.execute(f"SELECT shard FROM tasks WHERE state < 2 AND visible_at <= ?{where} ORDER BY id LIMIT 1",
+                         (now, *args)).fetchone()
+        return row[0] if row else None
+
+    def lease(self, worker: str, shards: Optional[Sequence[str]] = None, limit: int = 100,
+              visibility: float = 120.0, prefer: Optional[str] = None) -> List[QueueTask]:
+        if shards is not None and not shards:
+            return []
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._tx() as db:
+            # vypršené výpůjčky bez dalších pokusů → dead
+            db.execute("UPDATE tasks SET state = 3, lease = NULL, error = COALESCE(error, 'lease expired'), updated = ? "
+                       "WHERE state = 1 AND visible_at <= ? AND attempts >= ?", (now, now, self.max_attempts))
+            shard = self._pick_shard(db, now, shards, prefer)
+            if shard is None:
+                return []
+            rows = db.execute(
+                "UPDATE tasks SET state = 1, lease = ?, worker = ?, attempts = attempts + 1, visible_at = ?, updated = ? "
+                "WHERE id IN (SELECT id FROM tasks WHERE shard = ? AND state < 2 AND visible_at <= ? ORDER BY id LIMIT ?) "
+                "RETURNING id, job, shard, key, payload, attempts",
+                (token, worker, now + visibility, now, shard, now, limit)).fetchall()
+        rows.sort()
+        return [QueueTask(i, job, shard, key, json.loads(payload), attempts, token)
+                for i, job, shard, key, payload, attempts in rows]
+
+    def extend(self, lease: str, visibility: float) -> int:
+        now = time.time()
+        with self._tx() as db:
+            return db.execute("UPDATE tasks SET visible_at = ?, updated = ? WHERE lease = ? AND state = 1",
+                              (now + visibility, now, lease)).rowcount
+
+    def complete(self, lease: str, results: Mapping[int, str]) -> int:
+        now = time.time()
+        with self._tx() as db:
+            before = db.total_changes
+            db.executemany("UPDATE tasks SET state = 2, result = ?, lease = NULL, error = NULL, updated = ? "
+                           "WHERE id = ? AND lease = ? AND state = 1",
+                           ((text, now, int(i), lease) for i, text in results.items()))
+            return db.total_changes - before
+
+    def fail(self, lease: str, ids: Sequence[int], error: str) -> int:
+        now = time.time()
+        with self._tx() as db:
+            before = db.total_changes
+            # exponenciální odstup: retry_delay, 2×, 4×, … podle počtu pokusů
+            db.executemany(
+                "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 3 ELSE 0 END, lease = NULL, error = ?, "
+                "visible_at = ? + ? * (1 << MIN(attempts - 1, 10)), updated = ? WHERE id = ? AND lease = ? AND state = 1",
+                ((self.max_attempts, error, now, self.retry_delay, now, int(i), lease) for i in ids))
+            return db.total_changes - before
+
+    def results(self, shard: str, limit: int = 10_000) -> List[Tuple[int, str, str, str]]:
+        with self._lock:
+            return self._db.execute("SELECT id, key, digest, result FROM tasks WHERE shard = ? AND state = 2 "
+                                    "ORDER BY id LIMIT ?", (shard, limit)).fetchall()
+
+    def ack(self, ids: Sequence[int]) -> int:
+        with self._tx() as db:
+            before = db.total_changes
+            db.executemany("DELETE FROM tasks WHERE id = ? AND state = 2", ((int(i),) for i in ids))
+            return db.total_changes - before
+
+    def retry_dead(self, shard: Optional[str] = None) -> int:
+        where, args = ("", ()) if shard is None else (" AND shard = ?", (shard,))
+        with self._tx() as db:
+            return db.execute(f"UPDATE tasks SET state = 0, attempts = 0, visible_at = 0, updated = ? "
+                              f"WHERE state = 3{where}", (time.time(), *args)).rowcount
+
+    def stats(self) -> Dict[str, ShardStats]:
+        out: Dict[str, ShardStats] = {}
+        with self._lock:
+            rows = self._db.execute("SELECT shard, state, COUNT(*), SUM((state = 0 AND attempts > 0) OR (state = 1 AND attempts > 1)), "
+                                    "COUNT(DISTINCT CASE WHEN state = 1 THEN worker END) "
+                                    "FROM tasks GROUP BY shard, state").fetchall()
+        for shard, state, count, retried, workers in rows:
+            s = out.setdefault(shard, ShardStats(shard))
+            setattr(s, ("ready", "leased", "done", "dead")[state], count)
+            s.retried += retried or 0
+            s.workers += workers or 0
+        return out
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# --- several machines: one node serves its SQLite queue over HTTP ---
+
+_REMOTE = ("submit", "lease", "extend", "complete", "fail", "results", "ack", "retry_dead", "stats")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (QueueTask, ShardStats)):
+        return asdict(value)
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+class HttpQueue(WorkQueue):
+    """Client of :func:`serve`; lets workers on other machines use one node's queue.
+
+    ``http://host:8765?token=…`` passes the shared token of ``queue serve --token``.
+    """
+
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = 30.0) -> None:
+        parts = urlsplit(url)
+        self.url = parts._replace(query="").geturl().rstrip("/")
+        self.token = token or (parse_qs(parts.query).get("token") or [None])[0]
+        self.timeout = timeout
+
+    def _call(self, method: str, **kwargs: Any) -> Any:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        req = urlrequest.Request(f"{self.url}/{method}", data=json.dumps(kwargs, ensure_ascii=False).encode("utf-8"),
+                                 headers=headers, method="POST")
+        with urlrequest.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def submit(self, job: str, shard: str, items: Iterable[Submitted]) -> int:
+        return self._call("submit", job=job, shard=shard, items=[list(i) for i in items])
+
+    def lease(self, worker: str, shards: Optional[Sequence[str]] = None, limit: int = 100,
+              visibility: float = 120.0, prefer: Optional[str] = None) -> List[QueueTask]:
+        rows = self._call("lease", worker=worker, shards=list(shards) if shards is not None else None,
+                          limit=limit, visibility=visibility, prefer=prefer)
+        return [QueueTask(**row) for row in rows]
+
+    def extend(self, lease: str, visibility: float) -> int:
+        return self._call("extend", lease=lease, visibility=visibility)
+
+    def complete(self, lease: str, results: Mapping[int, str]) -> int:
+        return self._call("complete", lease=lease, results={str(k): v for k, v in results.items()})
+
+    def fail(self, lease: str, ids: Sequence[int], error: str) -> int:
+        return self._call("fail", lease=lease, ids=list(ids), error=error)
+
+    def results(self, shard: str, limit: int = 10_000) -> List[Tuple[int, str, str, str]]:
+        return [tuple(r) for r in self._call("results", shard=shard, limit=limit)]  # type: ignore[misc]
+
+    def ack(self, ids: Sequence[int]) -> int:
+        return self._call("ack", ids=list(ids))
+
+    def retry_dead(self, shard: Optional[str] = None) -> int:
+        return self._call("retry_dead", shard=shard)
+
+    def stats(self) -> Dict[str, ShardStats]:
+        return {shard: ShardStats(**row) for shard, row in self._call("stats").items()}
+
+
+def serve(queue: WorkQueue, host: str = "127.0.0.1", port: int = 8765, token: Optional[str] = None) -> ThreadingHTTPServer:
+    """HTTP front of ``queue`` (``POST /<method>`` with JSON kwargs); call ``serve_forever()`` on the result."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 – http.server API
+            method = self.path.strip("/")
+            if token and self.headers.get("Authorization") != f"Bearer {token}":
+                self.send_error(401)
+                return
+            if method not in _REMOTE:
+                self.send_error(404)
+                return
+            try:
+                kwargs = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if method == "complete":
+                    kwargs["results"] = {int(k): v for k, v in kwargs["results"].items()}
+                body = json.dumps(_encode(getattr(queue, method)(**kwargs)), ensure_ascii=False).encode("utf-8")
+            except (TypeError, ValueError, KeyError) as e:
+                self.send_error(400, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # bez výpisu každého požadavku na stderr
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+# scheme -> factory(url); další backendy se zaregistrují přes register_backend
+_BACKENDS: Dict[str, Callable[[str], WorkQueue]] = {
+    "sqlite": lambda url: SQLiteQueue(parse_connection_string(url)),
+    "http": lambda url: HttpQueue(url),
+    "https": lambda url: HttpQueue(url),
+}
+
+
+def register_backend(scheme: str, factory: Callable[[str], WorkQueue]) -> None:
+    _BACKENDS[scheme] = factory
+
+
+def open_queue(url: str = DEFAULT_QUEUE) -> WorkQueue:
+    """``sqlite:///path``, ``http://host:port`` (a node running ``queue serve``) or a plain file path."""
+    scheme = urlsplit(url).scheme
+    if len(scheme) <= 1:  # cesta (i "C:\…")
+        return SQLiteQueue(url)
+    factory = _BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unknown queue backend: {scheme}")
+    return factory(url)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
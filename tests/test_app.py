@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+import shutil
+from pathlib import Path
+
+import pytest
+from textual.widgets import Button, ContentSwitcher, Input
+
+from app import PyTransApp
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # aplikace čte i zapisuje relativně k pracovnímu adresáři
+    for name in ("locales", "settings", "jsons", "themes"):
+        shutil.copytree(ROOT / name, tmp_path / name, ignore=shutil.ignore_patterns(".cache", ".journal", ".queue"))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _routes(app):
+    return [child.id for child in app.query_one(ContentSwitcher).children]
+
+
+def test_views_are_built_on_first_navigation(workdir):
+    async def run():
+        app = PyTransApp()
+        async with app.run_test() as pilot:
+            assert _routes(app) == ["hub"]
+            await app.go("metrics")
+            await pilot.pause()
+            assert "metrics" in _routes(app)
+            await app.back()
+            assert app.route == "hub"
+
+    asyncio.run(run())
+
+
+def test_idle_views_are_evicted_unless_dirty(workdir):
+    async def run():
+        app = PyTransApp()
+        app.evict_after = 60
+        async with app.run_test() as pilot:
+            await app.go("metrics")
+            await app.go("dictionaries")
+            await pilot.pause()
+            app.query_one("#dict-probe", Input).value = "PyTrans"
+            await app.home()
+            later = app._last_used["dictionaries"] + 120
+            assert await app.evict_idle_views(later) == ["metrics"]
+            assert _routes(app) == ["hub", "dictionaries"]
+            app.query_one("#dict-probe", Input).value = ""
+            assert await app.evict_idle_views(later) == ["dictionaries"]
+            assert _routes(app) == ["hub"]
+
+    asyncio.run(run())
+
+
+def test_navigation_during_eviction_rebuilds_the_view(workdir):
+    async def run():
+        app = PyTransApp()
+        app.evict_after = 60
+        async with app.run_test() as pilot:
+            await app.go("metrics")
+            await app.home()
+            eviction = asyncio.ensure_future(app.evict_idle_views(app._last_used["metrics"] + 120))
+            await asyncio.sleep(0)  # odpojování začalo
+            await app.go("metrics")
+            assert await eviction == ["metrics"]
+            await pilot.pause()
+            assert app.route == "metrics"
+            assert app.query_one("#metrics").is_attached
+            assert app.query_one(ContentSwitcher).current == "metrics"
+
+    asyncio.run(run())
+
+
+def test_translate_is_disabled_while_the_job_runs(workdir):
+    async def run():
+        app = PyTransApp()
+        release = threading.Event()
+        async with app.run_test() as pilot:
+            await app.go("targets")
+            await pilot.pause()
+            button = app.query_one("#catalog-translate", Button)
+            assert not button.disabled
+            job = app.jobs.start("translate-cs", lambda job: release.wait(5))
+            await pilot.pause(0.2)
+            assert button.disabled
+            button.press()
+            await pilot.pause()
+            assert app.jobs.jobs["translate-cs"] is job
+            release.set()
+            while job.finished is None:
+                await pilot.pause(0.05)
+            await pilot.pause(0.2)
+            assert not button.disabled
+
+    asyncio.run(run())
+
+
+def test_edited_catalog_relabels_bound_widgets(workdir):
+    async def run():
+        app = PyTransApp()
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            button = app.query_one("#go-metrics", Button)
+            title = str(button.label)
+            catalog = workdir / "locales" / f"{app.t.lang}.json"
+            data = json.loads(catalog.read_text(encoding="utf-8"))
+            data["ui.hub.metrics"] = "Živé metriky"
+            catalog.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            for _ in range(100):
+                if "Živé metriky" in str(button.label):
+                    break
+                await pilot.pause(0.05)
+            assert "Živé metriky" in str(button.label) and str(button.label) != title
+            assert app.t.t("ui.hub.metrics") == "Živé metriky"
+
+    asyncio.run(run())
+
+
+def test_due_scheduler_plugin_fires_with_the_app(workdir, monkeypatch):
+    from services import scheduler as scheduler_module
+
+    monkeypatch.setattr(scheduler_module, "_SCHEDULER", None)
+    (workdir / "settings" / "plugins.json").write_text(json.dumps([
+        {"name": "nightly", "plugin_type": "scheduler",
+         "params": {"cron": "0 3 * * *", "action": "submit", "targets": "de", "queue": str(workdir / "q.sqlite")}},
+    ]), encoding="utf-8")
+    (workdir / "settings" / "scheduler_state.json").write_text(
+        json.dumps({"nightly": "2000-01-01T03:00:00+00:00"}), encoding="utf-8")
+
+    async def run():
+        app = PyTransApp()
+        async with app.run_test() as pilot:
+            for _ in range(200):
+                hooks = app._scheduler.on_fire if app._scheduler is not None else []
+                if hooks and "nightly" in hooks[0].runs:
+                    break
+                await pilot.pause(0.05)
+            assert app._scheduler is scheduler_module.default_scheduler()
+            assert hooks[0].runs["nightly"]["queued"]["de"] > 0
+            assert app._scheduler.jobs["nightly"].last_error is None
+        return app
+
+    app = asyncio.run(run())
+    assert app._scheduler._stopping
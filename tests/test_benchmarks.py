@@ -0,0 +1,51 @@
+import json
+
+from benchmarks import suite, synthetic
+from benchmarks.startup import parse_importtime
+from services.plugin_loader import load_plugins
+
+
+def test_synthetic_data_is_deterministic_and_valid(tmp_path):
+    assert synthetic.catalog(50) == synthetic.catalog(50)
+    source = synthetic.write_locales(tmp_path, 100, coverage=0.5)
+    cs = json.loads((tmp_path / "cs.json").read_text(encoding="utf-8"))
+    assert len(source) == 100 and 0 < len(cs) < 100
+    assert all(cs[k] == f"[cs] {source[k]}" for k in cs)
+    plugins = tmp_path / "plugins.json"
+    plugins.write_text(json.dumps(synthetic.plugins(30)), encoding="utf-8")
+    assert len(load_plugins(plugins, None, False)) == 30
+
+
+def test_every_case_runs_on_a_small_size(tmp_path):
+    result = suite.run([20], list(suite.CASES), repeat=3, budget=0.1, workdir=tmp_path)
+    assert set(result["results"]) == set(suite.CASES)
+    for by_size in result["results"].values():
+        assert by_size["20"]["samples"] == 3
+        assert by_size["20"]["median_us"] >= 0
+
+
+def test_compare_ignores_noise_and_missing_cases():
+    baseline = {"results": {"a": {"10": {"median_us": 10.0}}, "b": {"10": {"median_us": 100.0}}}}
+    current = {"results": {"a": {"10": {"median_us": 11.5}}, "b": {"10": {"median_us": 130.0}},
+                           "c": {"10": {"median_us": 5.0}}}}
+    assert suite.compare(current, baseline, 0.2) == [
+        {"case": "b", "size": 10, "baseline_us": 100.0, "current_us": 130.0, "change": 0.3}]
+
+
+def test_main_writes_results_and_compares(tmp_path):
+    names = [n for n in suite.CASES if n.startswith("palette")]
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {n: {"20": {"median_us": 1e9}} for n in names}}), encoding="utf-8")
+    out = tmp_path / "now.json"
+    assert suite.main(["--sizes", "20", "--cases", "palette", "--repeat", "3", "--budget", "0.1",
+                       "--workdir", str(tmp_path), "--output", str(out), "--compare", str(baseline)]) == 0
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert set(result["results"]) == set(names) and result["regressions"] == []
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   json.decoder\n"
+              "import time:       300 |        420 | json\n")
+    assert parse_importtime(stderr, 1) == [{"module": "json", "self_us": 300, "cumulative_us": 420, "depth": 0}]
+    assert parse_importtime(stderr, 5)[1]["depth"] == 1
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from services.binary_catalog import MappedCatalog, export_catalog, export_locales, import_catalog, pack_catalog
+
+VALUES = {"hello": "Ahoj {name}", "empty": "", "ünïcode.ključ": "Žluťoučký kůň", "plain": "Text"}
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    mapped = MappedCatalog(export_catalog(VALUES, tmp_path / "cs.ptc"))
+    yield mapped
+    mapped.close()
+
+
+def test_lookups(catalog):
+    assert len(catalog) == 4
+    assert catalog["ünïcode.ključ"] == "Žluťoučký kůň"
+    assert catalog.get("empty") == ""
+    assert catalog.get("missing", "x") == "x"
+    assert "plain" in catalog and "missing" not in catalog
+    with pytest.raises(KeyError):
+        catalog["missing"]
+    assert sorted(catalog) == sorted(VALUES)
+    assert catalog.to_dict() == VALUES
+    with catalog.view("plain") as raw:
+        assert raw.tobytes() == b"Text"
+    assert catalog.view("missing") is None
+
+
+def test_compiled_view_knows_templates(catalog):
+    compiled = catalog.compiled("cs")
+    assert compiled.render("hello", {"name": "Eva"}) == "Ahoj Eva"
+    assert compiled.render("plain", {"name": "Eva"}) == "Text"
+    assert compiled.templates.get("plain") is None
+
+
+def test_empty_catalog(tmp_path):
+    (tmp_path / "empty.ptc").write_bytes(pack_catalog({}))
+    mapped = MappedCatalog(tmp_path / "empty.ptc")
+    assert len(mapped) == 0 and mapped.get("a") is None
+    mapped.close()
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    (tmp_path / "bad.ptc").write_bytes(b"JUNK" + bytes(12))
+    with pytest.raises(ValueError):
+        MappedCatalog(tmp_path / "bad.ptc")
+
+
+def test_export_locales_merges_fallbacks_and_imports_back(tmp_path):
+    (tmp_path / "en.json").write_text(json.dumps({"a": "A", "b": "B"}), encoding="utf-8")
+    (tmp_path / "cs.json").write_text(json.dumps({"a": "Á"}), encoding="utf-8")
+    written = export_locales(tmp_path, tmp_path / "out")
+    assert [f.name for f in written] == ["cs.ptc", "en.ptc"]
+    out = import_catalog(written[0], tmp_path / "cs.back.json")
+    assert json.loads(out.read_text(encoding="utf-8")) == {"a": "Á", "b": "B"}
+
+
+def test_close_with_a_live_view_defers_the_unmap(tmp_path):
+    mapped = MappedCatalog(export_catalog(VALUES, tmp_path / "cs.ptc"))
+    raw = mapped.view("plain")
+    mapped.close()  # nesmí spadnout na BufferError
+    assert raw.tobytes() == b"Text"  # pohled zůstává platný
+    with pytest.raises(ValueError):
+        mapped.get("plain")
+    raw.release()
+    mapped.close()
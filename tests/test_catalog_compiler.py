@@ -0,0 +1,68 @@
+import json
+import os
+
+from services.catalog_compiler import CatalogCompiler, CompiledCatalog, fallback_chain, placeholders
+
+
+def _write(path, lang, data):
+    file = path / f"{lang}.json"
+    file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return file
+
+
+def test_placeholders():
+    assert placeholders("plain") is None
+    assert placeholders("{name} has {count:d} {items[0]} {user.name}") == {"name", "count", "items", "user"}
+    assert placeholders("{{escaped}}") == frozenset()
+    assert placeholders("{broken") == frozenset()
+
+
+def test_fallback_chain():
+    assert fallback_chain("cs") == ["cs", "en"]
+    assert fallback_chain("pt-BR") == ["pt-BR", "pt", "en"]
+    assert fallback_chain("en_GB", default="de") == ["en_GB", "en", "de"]
+    assert fallback_chain("en") == ["en"]
+
+
+def test_render_returns_raw_value_when_it_cannot_format():
+    catalog = CompiledCatalog.build("cs", [{"hi": "Ahoj {name}"}, {"hi": "Hi {name}", "bye": "Bye {0}"}])
+    assert catalog.render("hi", {"name": "Eva"}) == "Ahoj Eva"
+    assert catalog.render("hi", {}) == "Ahoj {name}"
+    assert catalog.render("bye", {"x": 1}) == "Bye {0}"
+    assert catalog.render("missing", {}) == "missing"
+
+
+def test_compile_merges_the_chain_and_caches(tmp_path):
+    _write(tmp_path, "en", {"a": "A", "b": "B {n}"})
+    _write(tmp_path, "pt", {"a": "A pt"})
+    compiler = CatalogCompiler(tmp_path)
+    catalog = compiler.compile("pt-BR")
+    assert catalog.values == {"a": "A pt", "b": "B {n}"}
+    assert catalog.templates == {"b": frozenset({"n"})}
+    assert compiler.cache_file("pt-BR").exists()
+    cached = compiler.compile("pt-BR")
+    assert (cached.values, cached.templates) == (catalog.values, catalog.templates)
+
+
+def test_touch_keeps_the_cache_and_edits_invalidate_it(tmp_path, monkeypatch):
+    en = _write(tmp_path, "en", {"a": "A"})
+    compiler = CatalogCompiler(tmp_path)
+    compiler.compile("en")
+    stamp = en.stat().st_mtime_ns + 5_000_000_000
+    os.utime(en, ns=(stamp, stamp))
+    builds = []
+    build = CompiledCatalog.build.__func__
+    monkeypatch.setattr(CompiledCatalog, "build", classmethod(lambda cls, *a: builds.append(a) or build(cls, *a)))
+    assert compiler.compile("en").values == {"a": "A"}
+    assert builds == []
+    _write(tmp_path, "en", {"a": "B"})
+    assert compiler.compile("en").values == {"a": "B"}
+    assert len(builds) == 1
+
+
+def test_broken_cache_is_rebuilt(tmp_path):
+    _write(tmp_path, "en", {"a": "A"})
+    compiler = CatalogCompiler(tmp_path, cache_dir=tmp_path / "cache")
+    compiler.cache_dir.mkdir()
+    compiler.cache_file("en").write_bytes(b"not marshal")
+    assert compiler.compile("en").values == {"a": "A"}
@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import cli
+from services.catalog_qa import CatalogQA, check_chunk, length_outliers
+
+
+def _write(path, lang, data):
+    (path / f"{lang}.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def _checks(items, rtl=False):
+    issues, _, _, missing = check_chunk(rtl, items)
+    return {(key, check, severity) for key, check, severity, _ in issues}, missing
+
+
+def test_placeholder_checks():
+    found, missing = _checks([
+        ("ok", "Hi {name}", ("name",), "Ahoj {name}"),
+        ("lost", "Hi {name}", ("name",), "Ahoj {jmeno}"),
+        ("broken", "Hi {name}", ("name",), "Ahoj {name"),
+        ("twice", "Hi {name}", ("name",), "{name} ahoj {name}"),
+        ("gone", "Hi {name}", ("name",), None),
+    ])
+    assert found == {("lost", "placeholders", "error"), ("broken", "placeholders", "error"),
+                     ("twice", "placeholders", "warning")}
+    assert missing == 1
+
+
+def test_empty_untranslated_and_rtl_checks():
+    found, _ = _checks([("empty", "Save", (), " "), ("same", "Settings", (), "Settings"), ("short", "OK", (), "OK")])
+    assert found == {("empty", "empty", "error"), ("same", "untranslated", "warning")}
+    found, _ = _checks([("latin", "Save", (), "Sauver"), ("hebrew", "Save", (), "שמור")], rtl=True)
+    assert found == {("latin", "rtl", "warning")}
+
+
+def test_bidi_controls():
+    found, _ = _checks([
+        ("open", "Name", (), "\u2067שם"),
+        ("close", "Name", (), "שם\u2069"),
+        ("ok", "Name", (), "\u2067שם\u2069"),
+    ], rtl=True)
+    assert found == {("open", "bidi", "error"), ("close", "bidi", "error")}
+    found, _ = _checks([("stray", "Name", (), "Jméno\u200f")])
+    assert found == {("stray", "bidi", "warning")}
+
+
+def test_length_outliers_are_relative_to_the_language():
+    source = "A fairly ordinary sentence"
+    items = [(f"k{i}", source, (), source.upper() + "!" * (i % 3)) for i in range(200)]
+    items.append(("long", source, (), source * 6))
+    _, hist, candidates, _ = check_chunk(False, items)
+    assert [key for key, _, _ in length_outliers(hist, candidates)] == ["long"]
+    longer = [(f"k{i}", source, (), source * 3) for i in range(200)]
+    _, hist, candidates, _ = check_chunk(False, longer)
+    assert length_outliers(hist, candidates) == []
+
+
+def test_run_reports_and_reuses_cached_chunks(tmp_path):
+    _write(tmp_path, "en", {f"k{i}": f"Item {i} of {{total}}" for i in range(50)})
+    _write(tmp_path, "cs", {**{f"k{i}": f"Položka {i} z {{total}}" for i in range(49)}, "k7": "Položka 7"})
+    _write(tmp_path, "ar", {"k1": "عنصر 1 من {total}"})
+    qa = CatalogQA(tmp_path, rtl=lambda lang: lang == "ar", chunk_size=8)
+    progress = []
+    report = qa.run(workers=1, progress=lambda done, total: progress.append((done, total)))
+    assert report.langs == ["ar", "cs"] and report.keys == 50
+    assert report.missing == {"ar": 49, "cs": 1}
+    assert [(i.lang, i.key, i.check) for i in report.issues] == [("cs", "k7", "placeholders")]
+    assert report.errors == 1 and report.cached == 0
+    assert progress[-1] == (2, 2)
+    again = qa.run(["cs"], workers=1)
+    assert again.cached == again.chunks > 0
+    assert [(i.key, i.check) for i in again.issues] == [("k7", "placeholders")]
+
+
+def test_run_in_worker_processes(tmp_path):
+    _write(tmp_path, "en", {"a": "Hello {name}"})
+    for lang in ("cs", "de"):
+        _write(tmp_path, lang, {"a": "Hallo"})
+    report = CatalogQA(tmp_path, rtl=lambda lang: False).run(workers=2, use_cache=False)
+    assert sorted(i.lang for i in report.issues) == ["cs", "de"]
+    assert not (tmp_path / ".cache").exists()
+
+
+def test_qa_command_exits_non_zero_on_errors(tmp_path, monkeypatch, capsys):
+    _write(tmp_path, "en", {"a": "Hello {name}", "b": "Goodbye"})
+    _write(tmp_path, "cs", {"a": "Ahoj", "b": "Goodbye"})
+    monkeypatch.chdir(tmp_path)
+    languages = Path(cli.__file__).parent / "jsons" / "languages.json"
+    assert cli.main(["qa", "--locales", str(tmp_path), "--languages", str(languages), "--workers", "1",
+                     "--errors-only", "--no-cache"]) == 1
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(e["key"], e["check"]) for e in events if e["event"] == "issue"] == [("a", "placeholders")]
+    assert events[-1]["issues"] == {"cs": {"placeholders": 1, "untranslated": 1}}
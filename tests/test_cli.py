@@ -0,0 +1,140 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import cli
+from tools.fake_translator import FakeTranslator
+
+
+@pytest.fixture
+def translator_url():
+    """Fake translator on its own loop; the CLI runs asyncio.run() itself."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = FakeTranslator()
+    url = asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+    yield url
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text(json.dumps({"hello": "Hello {name}", "bye": "Bye"}), encoding="utf-8")
+    (locales / "cs.json").write_text(json.dumps({"bye": "Ahoj"}), encoding="utf-8")
+    (tmp_path / "settings").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _plugins(workdir, url, **params):
+    (workdir / "settings" / "plugins.json").write_text(json.dumps(
+        [{"name": "fake", "plugin_type": "translator", "params": {"server_url": url, **params}}]), encoding="utf-8")
+
+
+def _events(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_cli_does_not_import_textual():
+    code = "import sys, cli; sys.exit(any(m.split('.')[0] == 'textual' for m in sys.modules))"
+    subprocess.run([sys.executable, "-c", code], cwd=Path(cli.__file__).parent, check=True)
+
+
+def test_parser_defaults():
+    args = cli.build_parser().parse_args(["run", "--target", "cs,de", "--target", "fr"])
+    assert args.target == ["cs,de", "fr"]
+    assert (args.split_min, args.workers, args.no_journal) == (80, 0, False)
+    assert cli.build_parser().parse_args(["queue", "work", "--until-idle"]).until_idle is True
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["queue"])
+
+
+def test_run_without_translator_fails(workdir, capsys):
+    assert cli.main(["run", "--target", "cs"]) == 2
+    assert _events(capsys)[-1]["error"] == "no TRANSLATOR plugin configured"
+
+
+def test_run_translates_and_reports_json_lines(workdir, translator_url, capsys):
+    _plugins(workdir, translator_url)
+    assert cli.main(["run", "--target", "cs", "--workers", "1"]) == 0
+    events = _events(capsys)
+    assert [e["event"] for e in events if e["event"] != "progress"] == ["plan", "start", "done", "summary"]
+    done = next(e for e in events if e["event"] == "done")
+    assert (done["added"], done["unchanged"], done["issues"]) == (1, 1, 0)
+    assert events[-1]["failed"] == []
+    catalog = json.loads((workdir / "locales" / "cs.json").read_text(encoding="utf-8"))
+    assert catalog == {"bye": "Ahoj", "hello": "[cs] Hello {name}"}
+    assert not list((workdir / "locales" / ".journal").glob("*.wal"))
+
+
+@pytest.mark.parametrize("split_min", ["0", "80"])
+def test_run_applies_middleware_plugins_on_request(workdir, translator_url, capsys, monkeypatch, split_min):
+    from services.middleware_pipeline import MIDDLEWARES, Middleware
+
+    class Shout(Middleware):
+        def post(self, batch):
+            for seg in batch:
+                seg.text = seg.text.upper()
+            return batch
+
+    monkeypatch.setitem(MIDDLEWARES, "shout", Shout)
+    (workdir / "settings" / "plugins.json").write_text(json.dumps([
+        {"name": "fake", "plugin_type": "translator", "params": {"server_url": translator_url}},
+        {"name": "shout", "plugin_type": "middleware", "params": {}},
+    ]), encoding="utf-8")
+    catalog = workdir / "locales" / "cs.json"
+    args = ["run", "--target", "cs", "--workers", "1", "--no-journal", "--split-min", split_min]
+    assert cli.main(args) == 0
+    assert json.loads(catalog.read_text(encoding="utf-8"))["hello"] == "[cs] Hello {name}"
+    catalog.write_text("{}", encoding="utf-8")
+    assert cli.main([*args, "--middleware"]) == 0
+    translated = json.loads(catalog.read_text(encoding="utf-8"))
+    assert translated["bye"] == "[CS] BYE" and translated["hello"].startswith("[CS] HELLO {")
+    capsys.readouterr()
+
+
+def test_failed_target_sets_exit_code(workdir, capsys):
+    _plugins(workdir, "http://127.0.0.1:9/translate", max_retries=0, timeout=2)
+    assert cli.main(["run", "--target", "cs", "--workers", "1", "--no-journal"]) == 1
+    events = _events(capsys)
+    assert any(e["event"] == "error" and e["target"] == "cs" for e in events)
+    assert events[-1]["failed"] == ["cs"]
+
+
+def test_schedule_once_runs_due_jobs(workdir, translator_url, capsys):
+    (workdir / "settings" / "plugins.json").write_text(json.dumps([
+        {"name": "fake", "plugin_type": "translator", "params": {"server_url": translator_url}},
+        {"name": "nightly", "plugin_type": "scheduler", "params": {"cron": "0 3 * * *", "targets": "cs"}},
+        {"name": "weekly", "plugin_type": "scheduler", "params": {"cron": "0 4 * * 0"}},
+    ]), encoding="utf-8")
+    state = workdir / "settings" / "scheduler_state.json"
+    state.write_text(json.dumps({"nightly": "2000-01-01T03:00:00+00:00"}), encoding="utf-8")
+    assert cli.main(["schedule", "--once"]) == 0
+    events = _events(capsys)
+    assert [e["event"] for e in events] == ["plan", "fire", "done", "summary"]
+    assert {j["job"] for j in events[0]["jobs"]} == {"nightly", "weekly"}
+    assert events[2]["job"] == "nightly" and events[2]["targets"] == {"cs": {"added": 1, "changed": 0, "removed": 0}}
+    assert events[-1] == {**events[-1], "ran": 1, "failed": []}
+    assert json.loads((workdir / "locales" / "cs.json").read_text(encoding="utf-8"))["hello"] == "[cs] Hello {name}"
+    assert json.loads(state.read_text(encoding="utf-8"))["nightly"] > "2000-01-01T03:00:00+00:00"
+
+
+def test_catalog_export_and_import(workdir, capsys):
+    assert cli.main(["catalog", "export", "--target", "cs", "--out", "ptc"]) == 0
+    [event] = _events(capsys)
+    assert event["event"] == "exported" and event["file"].endswith("cs.ptc")
+    assert cli.main(["catalog", "import", event["file"], "cs.back.json"]) == 0
+    assert _events(capsys)[0]["out"] == "cs.back.json"
+    back = json.loads((workdir / "cs.back.json").read_text(encoding="utf-8"))
+    assert back == {"bye": "Ahoj", "hello": "Hello {name}"}  # chybějící klíče z výchozího jazyka
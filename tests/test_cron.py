@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from services.cron import UTC, CronError, CronExpression, compile_cron, get_timezone
+
+PRAGUE = get_timezone("Europe/Prague")
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("expr", ["* * * *", "61 * * * *", "*/0 * * * *", "5-1 * * * *", "x * * * *"])
+def test_invalid_expressions(expr):
+    with pytest.raises(CronError):
+        CronExpression(expr)
+
+
+def test_fields_and_macros():
+    cron = CronExpression("0,30 9-17/4 * jan-mar mon-fri")
+    assert cron.minutes == (0, 30)
+    assert cron.hours == (9, 13, 17)
+    assert cron.months == (1, 2, 3)
+    assert cron.weekdays == (1, 2, 3, 4, 5)
+    assert CronExpression("@daily").hours == (0,)
+    assert CronExpression("0 0 * * 7").weekdays == (0,)
+    assert compile_cron("@hourly") is compile_cron("@hourly")
+
+
+def test_next_after_jumps_fields():
+    cron = CronExpression("15 3 * * *")
+    assert cron.next_after(datetime(2025, 1, 1, 3, 15)) == datetime(2025, 1, 2, 3, 15)
+    assert CronExpression("0 0 29 2 *").next_after(datetime(2025, 1, 1)) == datetime(2028, 2, 29)
+
+
+def test_day_of_month_or_day_of_week():
+    cron = CronExpression("0 0 13 * fri")  # 13. nebo pátek
+    assert cron.next_after(datetime(2025, 6, 1)) == datetime(2025, 6, 6)
+    assert cron.next_after(datetime(2025, 6, 12)) == datetime(2025, 6, 13)
+    assert CronExpression("0 0 13 * *").next_after(datetime(2025, 6, 1)) == datetime(2025, 6, 13)
+
+
+def test_next_fire_in_utc_and_local_time():
+    cron = CronExpression("0 9 * * *")
+    assert cron.next_fire(_utc(2025, 6, 1, 9)) == _utc(2025, 6, 2, 9)
+    assert cron.next_fire(datetime(2025, 6, 1, 9)) == _utc(2025, 6, 2, 9)
+    assert cron.next_fire(_utc(2025, 6, 1), PRAGUE) == _utc(2025, 6, 1, 7)
+
+
+def test_fixed_time_in_spring_forward_gap_runs_when_clocks_jump():
+    # 2025-03-30 02:00 CET -> 03:00 CEST (01:00 UTC)
+    for expr in ("30 2 * * *", "*/15 2 * * *"):
+        cron = CronExpression(expr)
+        fired = cron.next_fire(_utc(2025, 3, 29, 12), PRAGUE)
+        assert fired == _utc(2025, 3, 30, 1)
+        assert fired.astimezone(PRAGUE).hour == 3 and fired.astimezone(PRAGUE).minute == 0
+        assert cron.next_fire(fired, PRAGUE) == _utc(2025, 3, 31, 0, 0 if expr.startswith("*") else 30)
+
+
+def test_wildcard_hours_skip_the_gap():
+    cron = CronExpression("30 * * * *")
+    fired = [cron.next_fire(_utc(2025, 3, 30, 0), PRAGUE)]
+    fired.append(cron.next_fire(fired[0], PRAGUE))
+    assert fired == [_utc(2025, 3, 30, 0, 30), _utc(2025, 3, 30, 1, 30)]  # 01:30 CET, 03:30 CEST
+
+
+def test_fall_back_hour_runs_fixed_times_once_and_wildcards_twice():
+    # 2025-10-26 03:00 CEST -> 02:00 CET, 02:xx happens twice
+    fixed = CronExpression("30 2 * * *")
+    first = fixed.next_fire(_utc(2025, 10, 25, 12), PRAGUE)
+    assert first == _utc(2025, 10, 26, 0, 30)
+    assert fixed.next_fire(first, PRAGUE) == _utc(2025, 10, 27, 1, 30)
+    hourly = CronExpression("30 * * * *")
+    times = [hourly.next_fire(_utc(2025, 10, 25, 23, 45), PRAGUE)]
+    for _ in range(2):
+        times.append(hourly.next_fire(times[-1], PRAGUE))
+    assert times == [_utc(2025, 10, 26, 0, 30), _utc(2025, 10, 26, 1, 30), _utc(2025, 10, 26, 2, 30)]
+
+
+def test_get_timezone():
+    assert get_timezone(None) is UTC
+    assert get_timezone("utc") is UTC
+    assert get_timezone("Europe/Prague").key == "Europe/Prague"
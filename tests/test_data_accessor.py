@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+from contextlib import aclosing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from services.data_accessor import AccessorError, DataAccessor, _JsonPageParser
+
+PAGES = {None: ([["a", "A"], ["b", "B"], {"key": "c", "text": "C", "note": 1}], "p2"),
+         "p2": ([["d", "D"], {"nokey": 1}, ["e", "E"]], "p3"),
+         "p3": ([["f", "F"]], None)}
+
+
+@pytest.fixture
+def endpoint():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):  # noqa: N802
+            cursor = parse_qs(urlsplit(self.path).query).get("cursor", [None])[0]
+            if cursor not in PAGES:
+                self.send_error(404)
+                return
+            items, nxt = PAGES[cursor]
+            body = json.dumps({"items": items, "next": nxt}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/items"
+    server.shutdown()
+    server.server_close()
+
+
+async def _take(accessor, count=None):
+    keys = []
+    async with aclosing(accessor.stream()) as segments:
+        async for seg in segments:
+            keys.append(seg.key)
+            if count is not None and len(keys) == count:
+                break
+    return keys
+
+
+def _run(accessor, count=None):
+    async def run():
+        try:
+            return await _take(accessor, count)
+        finally:
+            await accessor.aclose()
+    return asyncio.run(run())
+
+
+def test_streams_all_pages_and_resets_checkpoint(endpoint, tmp_path):
+    state = tmp_path / "state.json"
+    accessor = DataAccessor(endpoint, page_size=3, state_file=state)
+    assert _run(accessor) == ["a", "b", "c", "d", "e", "f"]
+    assert accessor.pages == 3 and accessor.skipped == 1
+    assert not state.exists()
+
+
+@pytest.mark.parametrize("taken", [1, 3, 4, 5])
+def test_break_does_not_redeliver_the_last_item(endpoint, tmp_path, taken):
+    state = tmp_path / "state.json"
+    everything = ["a", "b", "c", "d", "e", "f"]
+    first = _run(DataAccessor(endpoint, state_file=state, checkpoint_every=1000), taken)
+    assert first == everything[:taken]
+    rest = _run(DataAccessor(endpoint, state_file=state))
+    assert rest == everything[taken:]
+
+
+def test_checkpoint_does_not_wait_for_garbage_collection(endpoint, tmp_path):
+    state = tmp_path / "state.json"
+
+    async def run():
+        closed = DataAccessor(endpoint, state_file=state, checkpoint_every=1000)
+        stream = closed.stream()  # reference drží generátor naživu
+        async with aclosing(stream) as segments:
+            async for _ in segments:
+                break
+        assert json.loads(state.read_text())["offset"] == 1
+        explicit = DataAccessor(endpoint, state_file=state, checkpoint_every=1000)
+        segments = explicit.stream()
+        async for _ in segments:
+            break
+        explicit.save_checkpoint()
+        assert json.loads(state.read_text())["offset"] == 2
+        await segments.aclose()
+        await closed.aclose()
+        await explicit.aclose()
+
+    asyncio.run(run())
+
+
+def test_http_errors_raise(endpoint):
+    accessor = DataAccessor(endpoint + "?cursor=nope")
+
+    async def run():
+        try:
+            async with aclosing(accessor.stream(resume=False)) as segments:
+                async for _ in segments:
+                    pass
+        finally:
+            await accessor.aclose()
+
+    with pytest.raises(AccessorError):
+        asyncio.run(run())
+
+
+def test_json_parser_handles_any_chunking():
+    page = json.dumps({"next": "x", "items": [{"key": "k", "text": "é ü"}, [1, 4.5], "s"], "total": 3}).encode()
+    for size in (1, 2, 7, len(page)):
+        parser = _JsonPageParser()
+        items = []
+        for i in range(0, len(page), size):
+            items += parser.feed(page[i:i + size])
+        items += parser.feed(b"", final=True)
+        assert items == [{"key": "k", "text": "é ü"}, [1, 4.5], "s"]
+        assert parser.fields == {"next": "x", "total": 3}
+
+
+def test_json_parser_rejects_truncated_page():
+    parser = _JsonPageParser()
+    parser.feed(b'{"items": [1, 2')
+    with pytest.raises(AccessorError):
+        parser.feed(b"", final=True)
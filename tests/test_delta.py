@@ -0,0 +1,61 @@
+import json
+
+from services.delta_service import CatalogDelta, DeltaTranslator, content_hash
+
+
+def _write(path, lang, data):
+    (path / f"{lang}.json").write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8")
+
+
+def _read(path, lang):
+    return json.loads((path / f"{lang}.json").read_text(encoding="utf-8"))
+
+
+def test_compute_on_first_run_adopts_existing_translations(tmp_path):
+    _write(tmp_path, "en", {"a": "A", "b": "B", "c": "C"})
+    _write(tmp_path, "cs", {"b": "Bé", "old": "Staré", "a": "Á"})
+    delta = DeltaTranslator(tmp_path).compute("cs")
+    assert delta.added == {"c": "C"}
+    assert delta.changed == {}
+    assert delta.removed == ["old"]
+    assert delta.unchanged == 2
+
+
+def test_changed_source_is_detected_from_state(tmp_path):
+    _write(tmp_path, "en", {"a": "A"})
+    _write(tmp_path, "cs", {"a": "Á"})
+    translator = DeltaTranslator(tmp_path)
+    translator.apply(translator.compute("cs"), {})
+    _write(tmp_path, "en", {"a": "A2"})
+    assert DeltaTranslator(tmp_path).compute("cs").changed == {"a": "A2"}
+
+
+def test_first_apply_without_changes_leaves_catalog_untouched(tmp_path):
+    _write(tmp_path, "en", {"a": "A", "b": "B"})
+    _write(tmp_path, "cs", {"b": "Bé", "old": "Staré", "a": "Á"})
+    before = (tmp_path / "cs.json").read_bytes()
+    translator = DeltaTranslator(tmp_path)
+    assert translator.apply(translator.compute("cs"), {}) is False
+    assert (tmp_path / "cs.json").read_bytes() == before
+    state = json.loads(translator.state_file("cs").read_text(encoding="utf-8"))
+    assert state == {"b": content_hash("B"), "a": content_hash("A")}
+
+
+def test_apply_keeps_order_appends_new_and_keeps_removed_keys(tmp_path):
+    _write(tmp_path, "en", {"a": "A", "new": "New", "b": "B"})
+    _write(tmp_path, "cs", {"b": "Bé", "old": "Staré", "a": "Á"})
+    translator = DeltaTranslator(tmp_path)
+    delta = translator.compute("cs")
+    assert translator.apply(delta, {"new": "Nové", "a": "Á!", "ghost": "x"}) is True
+    assert list(_read(tmp_path, "cs").items()) == [("b", "Bé"), ("old", "Staré"), ("a", "Á!"), ("new", "Nové")]
+    assert delta.removed == ["old"]
+    assert translator.apply(translator.compute("cs"), {"new": "Nové"}) is False
+
+
+def test_apply_from_queue_results_without_delta(tmp_path):
+    _write(tmp_path, "en", {"a": "A"})
+    _write(tmp_path, "cs", {})
+    translator = DeltaTranslator(tmp_path)
+    translator.apply(CatalogDelta("cs"), {"a": "Á"})
+    assert _read(tmp_path, "cs") == {"a": "Á"}
+    assert translator.compute("cs").empty
@@ -0,0 +1,86 @@
+import json
+import threading
+
+from models.glossary import GlossaryIssue, GlossaryTerm
+from models.translation import Segment
+from services.glossary_service import AhoCorasick, Glossary, GlossaryMiddleware, GlossaryStore
+
+TERMS = [GlossaryTerm("PyTrans", dnt=True), GlossaryTerm("settings", {"cs": "nastavení"}),
+         GlossaryTerm("user settings", {"cs": "uživatelská nastavení"})]
+
+
+def _store(tmp_path, terms):
+    (tmp_path / "ui.json").write_text(json.dumps(terms), encoding="utf-8")
+    return GlossaryStore(tmp_path)
+
+
+def test_automaton_reports_every_match():
+    automaton = AhoCorasick.build(["he", "she", "hers"])
+    assert sorted(automaton.iter("ushers")) == [(4, 0), (4, 1), (6, 2)]
+
+
+def test_find_prefers_leftmost_longest_whole_words():
+    glossary = Glossary("ui", TERMS)
+    hits = glossary.find("Open User Settings in PyTrans, not PyTransX")
+    assert [glossary.sources[h.term] for h in hits] == ["user settings", "PyTrans"]
+    assert Glossary("ui", TERMS, whole_words=False).find("PyTransX")[0].end == 7
+    assert Glossary("ui", TERMS, case_sensitive=True).find("pytrans") == []
+
+
+def test_protect_restore_and_verify():
+    glossary = Glossary("ui", TERMS)
+    masked, tokens = glossary.protect("PyTrans settings", "cs")
+    assert masked == "⟦G0⟧ ⟦G1⟧"
+    assert tokens == ["PyTrans", "nastavení"]
+    assert glossary.restore("⟦G1⟧ ⟦G9⟧", tokens) == ("nastavení ⟦G9⟧", [0])
+    assert glossary.protect("settings", "de") == ("settings", [])
+    assert glossary.verify("PyTrans settings", "PyTrans nastavení", "cs") == []
+    assert glossary.verify("PyTrans settings", "Pytrans volby", "cs-CZ") == [GlossaryIssue("settings", "nastavení", "missing")]
+
+
+def test_middleware_enforces_and_reports():
+    middleware = GlossaryMiddleware(glossary=Glossary("ui", TERMS))
+    batch = middleware.pre([Segment("a", "PyTrans settings", "cs"), Segment("b", "Open settings", "cs")])
+    assert [s.text for s in batch] == ["⟦G0⟧ ⟦G1⟧", "Open ⟦G0⟧"]
+    batch[0].text = "⟦G1⟧ z ⟦G0⟧"
+    batch[1].text = "Otevřít volby"
+    out = middleware.post(batch)
+    assert out[0].text == "nastavení z PyTrans" and "glossary_issues" not in out[0].data
+    assert out[1].data["glossary_issues"] == [GlossaryIssue("nastavení", "nastavení", "dropped")]
+
+
+def test_store_caches_compiled_glossary(tmp_path):
+    store = _store(tmp_path, {"PyTrans": None, "Settings": {"cs": "Nastavení"}})
+    glossary = store.load("ui")
+    assert [glossary.sources[h.term] for h in glossary.find("Open PyTrans Settings")] == ["PyTrans", "Settings"]
+    assert store.cache_file("ui").exists()
+    assert store.load("ui") is glossary
+    again = GlossaryStore(tmp_path).load("ui")
+    assert again.sources == glossary.sources and again.targets == glossary.targets
+
+
+def test_store_is_safe_to_share_between_threads(tmp_path):
+    store = _store(tmp_path, {f"term{i}": {"cs": f"výraz{i}", "de": f"Begriff{i}"} for i in range(200)})
+    errors = []
+    loaded = []
+
+    def work(lang):
+        try:
+            glossary = store.load("ui")
+            glossary.automaton()
+            glossary.automaton(lang)
+            loaded.append(glossary)
+        except Exception as e:  # pragma: no cover - the failure being tested
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(("cs", "de")[i % 2],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len({id(g) for g in loaded}) == 1
+    assert not list(store.cache_dir.glob("*.tmp"))
+    cached = GlossaryStore(tmp_path)
+    cached.load("ui")
+    assert set(cached._blobs["ui"][5]) == {"", "cs", "de"}
@@ -0,0 +1,125 @@
+import asyncio
+
+from textual.app import App
+
+from services.row_source import ColumnSource, SQLiteSource
+from ui.grid import MAX_COLUMN, VirtualGrid
+
+
+class _GridApp(App):
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.changes = []
+        self.highlighted = []
+
+    def compose(self):
+        yield VirtualGrid(self.source, headers={"key": "Klíč"})
+
+    def on_virtual_grid_changed(self, event):
+        self.changes.append(event.count)
+
+    def on_virtual_grid_row_highlighted(self, event):
+        self.highlighted.append((event.position, event.row))
+
+
+def _source(n=10_000):
+    keys = [f"k{i:05}" for i in range(n)]
+    return ColumnSource(("key", "text"), [keys, [f"text {n - i}" for i in range(n)]])
+
+
+async def _settle(pilot, until):
+    for _ in range(50):
+        await pilot.pause()
+        if until():
+            return
+    raise AssertionError("grid did not settle")
+
+
+def test_only_a_window_of_rows_is_cached():
+    async def run():
+        app = _GridApp(_source())
+        async with app.run_test(size=(60, 12)) as pilot:
+            grid = app.query_one(VirtualGrid)
+            await _settle(pilot, lambda: app.changes)
+            assert grid.count == 10_000 and grid.virtual_size.height == 10_001
+            assert grid._widths[0] == len("Klíč") + 2 and grid._widths[1] <= MAX_COLUMN
+            assert grid.row(5) == ("k00005", "text 9995")
+            assert len(grid._cache) <= grid.size.height * (2 * grid.window + 1)
+            assert grid.row(9_000) == ("k09000", "text 1000")
+            assert grid._cache_start > 0 and len(grid._cache) <= grid.size.height * (2 * grid.window + 1)
+            assert grid.row(10_000) is None and grid.row(-1) is None
+
+    asyncio.run(run())
+
+
+def test_cursor_keys_move_and_scroll():
+    async def run():
+        app = _GridApp(_source(100))
+        async with app.run_test(size=(60, 12)) as pilot:
+            grid = app.query_one(VirtualGrid)
+            grid.focus()
+            await pilot.press("down", "down")
+            assert grid.cursor_row == 2
+            await pilot.press("end")
+            await _settle(pilot, lambda: grid.scroll_y > 0)
+            assert grid.cursor_row == 99 and app.highlighted[-1] == (99, ("k00099", "text 1"))
+            await pilot.press("home", "up")
+            assert grid.cursor_row == 0
+            await pilot.press("pagedown")
+            assert grid.cursor_row == grid.size.height - 2
+
+    asyncio.run(run())
+
+
+def test_sort_and_filter_run_off_the_ui_thread():
+    async def run():
+        app = _GridApp(_source(100))
+        async with app.run_test(size=(60, 12)) as pilot:
+            grid = app.query_one(VirtualGrid)
+            grid.focus()
+            await _settle(pilot, lambda: app.changes)
+            for column in (0, 1):  # klíč, pak text
+                await pilot.press("s")
+                await _settle(pilot, lambda: grid.source.sort_column == column and len(app.changes) == column + 2)
+            assert grid.row(0) == ("k00099", "text 1")
+            assert "text ▲" in "".join(s.text for s in grid.render_line(0))
+            await pilot.press("r")
+            await _settle(pilot, lambda: grid.source.reverse)
+            assert grid.row(0) == ("k00001", "text 99")  # řetězce se řadí lexikálně
+            grid.filter("text 5")
+            await _settle(pilot, lambda: app.changes[-1] == 11)
+            assert grid.count == 11 and grid.cursor_row == 0
+            await pilot.press("s")
+            await _settle(pilot, lambda: grid.source.sort_column is None)
+            assert grid.count == 11
+
+    asyncio.run(run())
+
+
+def test_lazy_sources_are_read_off_the_ui_thread():
+    keys = [f"k{i:05}" for i in range(10_000)]
+    paged = SQLiteSource(("key", "text"), ((k, k.upper()) for k in keys))
+
+    async def run():
+        app = _GridApp(paged)
+        async with app.run_test(size=(60, 12)) as pilot:
+            grid = app.query_one(VirtualGrid)
+            await _settle(pilot, lambda: app.changes and grid.row(0) is not None)
+            assert grid.row(0) == ("k00000", "K00000") and len(grid._cache) < 100
+            grid.focus()
+            await pilot.press("end")
+            await _settle(pilot, lambda: app.highlighted[-1][1] is not None)
+            assert app.highlighted[-1] == (9_999, ("k09999", "K09999"))
+            grid.filter("K0999")
+            await _settle(pilot, lambda: app.changes[-1] == 10)
+            await _settle(pilot, lambda: grid.row(0) is not None)
+            assert grid.row(0) == ("k09990", "K09990")
+            grid.set_source(_source(5))
+            assert not paged.path.exists()  # nahrazený zdroj se zavře (i dočasný soubor)
+            second = SQLiteSource(("key",), [("x",)])
+            grid.set_source(second)
+        return second
+
+    second = asyncio.run(run())
+    assert not second.path.exists()  # odpojený grid zavře svůj zdroj
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from services.delta_service import DeltaTranslator
+from services.job_journal import JobJournal
+from services.translation_engine import TranslationEngine
+from tools.fake_translator import FakeTranslator
+
+
+def _write(path, lang, data):
+    (path / f"{lang}.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def _read(path, lang):
+    return json.loads((path / f"{lang}.json").read_text(encoding="utf-8"))
+
+
+def test_records_survive_reopening(tmp_path):
+    journal = JobJournal(tmp_path / "job.wal", sync_every=1)
+    journal.append("cs", "a", "Á", "A")
+    journal.append("cs", "a", "Á!", "A")
+    journal.append("de", "a", "Ä", "A")
+    journal.close()
+    again = JobJournal(tmp_path / "job.wal")
+    assert again.replayed == 3
+    assert len(again) == 2
+    assert again.done("cs") == {"a": "Á!"}
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    file = tmp_path / "job.wal"
+    journal = JobJournal(file)
+    journal.append("cs", "a", "Á", "A")
+    journal.close()
+    size = file.stat().st_size
+    with open(file, "ab") as fh:
+        fh.write(b"\x40\x00\x00\x00garbage")
+    again = JobJournal(file)
+    assert again.done("cs") == {"a": "Á"}
+    assert file.stat().st_size == size
+    again.append("cs", "b", "Bé", "B")
+    again.close()
+    assert JobJournal(file).done("cs") == {"a": "Á", "b": "Bé"}
+
+
+def test_compact_applies_only_current_sources(tmp_path):
+    _write(tmp_path, "en", {"a": "A2", "b": "B"})
+    _write(tmp_path, "cs", {})
+    journal = JobJournal.for_job("cs", tmp_path / ".journal")
+    journal.append("cs", "a", "Á", "A")  # zdroj se mezitím změnil
+    journal.append("cs", "b", "Bé", "B")
+    journal.append("cs", "gone", "Pryč", "Gone")
+    assert journal.compact(DeltaTranslator(tmp_path)) == 1
+    assert _read(tmp_path, "cs") == {"b": "Bé"}
+    assert len(journal) == 0 and journal.file.stat().st_size == 0
+    journal.discard()
+    assert not journal.file.exists()
+
+
+def test_resumed_run_sends_only_pending_keys(tmp_path):
+    source = {f"k{i}": f"Text {i}" for i in range(10)}
+    _write(tmp_path, "en", source)
+    _write(tmp_path, "cs", {})
+    journal = JobJournal(tmp_path / "cs.wal")
+    for key in ("k0", "k1", "k2"):
+        journal.append("cs", key, f"hotovo {key}", source[key])
+    journal.close()
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url)
+        try:
+            await DeltaTranslator(tmp_path).run(engine, ["cs"], journal=JobJournal(tmp_path / "cs.wal"))
+        finally:
+            await engine.aclose()
+            await server.stop()
+        return server
+
+    server = asyncio.run(run())
+    assert server.texts == 7
+    catalog = _read(tmp_path, "cs")
+    assert catalog["k0"] == "hotovo k0" and catalog["k9"] == "[cs] Text 9"
+    assert len(catalog) == 10
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+
+from textual.app import App
+
+from ui.jobs import CANCELLED, DONE, FAILED, Job, JobCancelled, JobRunner
+
+
+class JobsApp(App):
+    def __init__(self) -> None:
+        super().__init__()
+        self.jobs = JobRunner(self, fps=50)
+
+
+async def _until(pilot, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await pilot.pause(0.02)
+
+
+def test_progress_is_batched_and_on_done_runs_on_ui_thread():
+    async def run():
+        app = JobsApp()
+        seen = []
+        done = []
+        async with app.run_test() as pilot:
+            app.jobs.watch(lambda changed, removed: seen.append([j.done for j in changed]))
+
+            def fn(job: Job) -> int:
+                for i in range(10_000):
+                    job.advance()
+                return job.done
+
+            ui_thread = threading.get_ident()
+            job = app.jobs.start("count", fn, on_done=lambda j: done.append((j.state, j.result,
+                                                                             threading.get_ident() == ui_thread)))
+            await _until(pilot, lambda: done)
+        assert done == [(DONE, 10_000, True)]
+        assert len(seen) < 100
+        assert job.rate > 0
+
+    asyncio.run(run())
+
+
+def test_same_name_is_not_started_twice():
+    async def run():
+        app = JobsApp()
+        release = threading.Event()
+        runs = []
+        done = []
+        async with app.run_test() as pilot:
+            def fn(job: Job) -> None:
+                runs.append(job)
+                release.wait(5)
+
+            first = app.jobs.start("translate-cs", fn, on_done=done.append)
+            assert app.jobs.busy("translate-cs")
+            assert app.jobs.start("translate-cs", fn, on_done=done.append) is first
+            first.cancel()
+            # zrušený job ještě běží – pořád se nespustí druhý
+            assert app.jobs.start("translate-cs", fn) is first
+            release.set()
+            await _until(pilot, lambda: done)
+            assert not app.jobs.busy("translate-cs")
+            second = app.jobs.start("translate-cs", fn, on_done=done.append)
+            assert second is not first
+            await _until(pilot, lambda: len(done) == 2)
+        assert done == [first, second]
+        assert first.state == CANCELLED and second.state == DONE
+        assert len(runs) == 2
+
+    asyncio.run(run())
+
+
+def test_restart_reports_the_finished_job_first():
+    async def run():
+        app = JobsApp()
+        done = []
+        async with app.run_test():
+            first = app.jobs.start("quick", lambda job: None, on_done=done.append)
+            while first.finished is None:
+                await asyncio.sleep(0.001)
+            app.jobs.start("quick", lambda job: None)  # before the next tick
+        assert done == [first]
+
+    asyncio.run(run())
+
+
+def test_pause_cancel_and_failure():
+    async def run():
+        app = JobsApp()
+        done = []
+        async with app.run_test() as pilot:
+            started = threading.Event()
+
+            def loop(job: Job) -> None:
+                started.set()
+                while True:
+                    job.checkpoint()
+                    time.sleep(0.001)
+
+            job = app.jobs.start("loop", loop, on_done=done.append)
+            await _until(pilot, started.is_set)
+            job.pause()
+            assert job.state == "paused"
+            job.cancel()  # probudí pozastavený job
+            await _until(pilot, lambda: done)
+
+            async def broken(job: Job) -> None:
+                raise RuntimeError("boom")
+
+            app.jobs.start("broken", broken, on_done=done.append)
+            await _until(pilot, lambda: len(done) == 2)
+        assert done[0].state == CANCELLED
+        assert done[1].state == FAILED and str(done[1].error) == "boom"
+
+    asyncio.run(run())
+
+
+def test_offload_runs_blocking_calls_off_the_loop():
+    async def run():
+        app = JobsApp()
+        async with app.run_test():
+            ident = await app.jobs.offload(threading.get_ident)
+            assert ident != threading.get_ident()
+
+    asyncio.run(run())
+
+
+def test_checkpoint_raises_after_cancel():
+    job = Job("x")
+    job.cancel()
+    try:
+        job.checkpoint()
+    except JobCancelled as e:
+        assert str(e) == "x"
+    else:
+        raise AssertionError("not cancelled")
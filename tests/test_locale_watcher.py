@@ -0,0 +1,120 @@
+import gc
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from services.locale_watcher import LocaleWatcher, _Inotify, _lang
+
+
+def _write(path, lang, data):
+    (path / f"{lang}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def _watch(tmp_path, **kwargs):
+    changes = []
+    seen = threading.Event()
+
+    def on_change(langs):
+        changes.append(langs)
+        seen.set()
+
+    watcher = LocaleWatcher(tmp_path, on_change, poll_interval=0.05, settle=0.1, **kwargs).start()
+    return watcher, changes, seen
+
+
+def test_lang_skips_editor_files():
+    assert _lang("cs.json") == "cs"
+    assert _lang(".cs.json.swp") is None
+    assert _lang("cs.json~") is None
+    assert _lang("notes.txt") is None
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_burst_of_writes_is_reported_once(tmp_path, use_inotify):
+    _write(tmp_path, "en", {"a": "A"})
+    watcher, changes, seen = _watch(tmp_path, use_inotify=use_inotify)
+    try:
+        _write(tmp_path, "cs", {"a": "Á"})
+        tmp = tmp_path / "de.json.tmp"
+        tmp.write_text("{}", encoding="utf-8")
+        os.replace(tmp, tmp_path / "de.json")
+        (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+        assert seen.wait(5)
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+    # kolik dávek vznikne, závisí na časování stroje – slučování ověřuje test níže
+    assert set().union(*changes) == {"cs", "de"}
+    assert all(langs for langs in changes)
+    if not use_inotify:
+        assert watcher.backend == "poll"
+
+
+class _Script(_Inotify):
+    """inotify source replaying scripted reads; stops the watcher when they run out."""
+
+    def __init__(self, reads, stop):
+        self.reads = list(reads)
+        self.stop = stop
+        self.waits = []
+
+    def read(self, timeout):
+        self.waits.append(timeout)
+        if not self.reads:
+            self.stop.set()
+            return set(), True
+        return self.reads.pop(0), True
+
+    def close(self):
+        pass
+
+
+def test_events_within_the_settle_window_are_coalesced(tmp_path):
+    changes = []
+    watcher = LocaleWatcher(tmp_path, changes.append, settle=0.1)
+    script = _Script([{"cs"}, {"de"}, set(), {"fr"}, set()], watcher._stop)
+    watcher._source = script
+    watcher._run()
+    assert changes == [{"cs", "de"}, {"fr"}]
+    assert script.waits == [0.5, 0.1, 0.1, 0.5, 0.1, 0.5]
+
+
+def test_failing_callback_does_not_stop_watching(tmp_path):
+    calls = []
+
+    def on_change(langs):
+        calls.append(langs)
+        raise RuntimeError("boom")
+
+    watcher = LocaleWatcher(tmp_path, on_change, poll_interval=0.05, settle=0.05, use_inotify=False).start()
+    try:
+        _write(tmp_path, "cs", {})
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.02)
+        _write(tmp_path, "de", {})
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+    assert calls[:2] == [{"cs"}, {"de"}]
+
+
+def test_live_text_tracks_bound_keys():
+    from textual.widget import Widget
+    from textual.widgets import Static
+
+    from ui.live_text import LiveText, set_text
+
+    live = LiveText(str.upper)
+    label = live.bind(Static("x"), "ui.title")
+    assert live.keys() == ["ui.title"]
+    assert live.refresh(["ui.title", "ui.other"]) == 0  # nepřipojený widget se přeskočí
+    del label
+    gc.collect()  # widgety mají cykly referencí
+    assert live.keys() == []
+    with pytest.raises(TypeError):
+        set_text(Widget(), "text")
@@ -0,0 +1,88 @@
+import json
+import os
+
+from services.binary_catalog import MappedCatalog, export_locales
+from services.localization_service import LocalizationService
+
+
+def _write(path, lang, data, mtime_ns=None):
+    file = path / f"{lang}.json"
+    file.write_text(json.dumps(data, ensure_ascii=False, indent=4), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(file, ns=(mtime_ns, mtime_ns))
+    return file
+
+
+def _age(file, seconds):
+    mtime = file.stat().st_mtime_ns - int(seconds * 1e9)
+    os.utime(file, ns=(mtime, mtime))
+
+
+def test_fallback_and_interpolation(tmp_path):
+    _write(tmp_path, "en", {"hello": "Hello {name}", "bye": "Bye"})
+    _write(tmp_path, "cs", {"hello": "Ahoj {name}"})
+    service = LocalizationService("cs", tmp_path)
+    assert service.t("hello", name="Eva") == "Ahoj Eva"
+    assert service.t("bye") == "Bye"
+    assert service.t("missing") == "missing"
+    assert service.t("hello") == "Ahoj {name}"
+    assert service.t("hello", other=1) == "Ahoj {name}"
+
+
+def test_binary_catalog_is_used_when_fresh(tmp_path):
+    _write(tmp_path, "en", {"hello": "Hello"})
+    _write(tmp_path, "cs", {"hello": "Ahoj"})
+    for file in tmp_path.glob("*.json"):
+        _age(file, 10)
+    export_locales(tmp_path, langs=["cs"])
+    service = LocalizationService("cs", tmp_path, binary=True)
+    assert service.t("hello") == "Ahoj"
+    assert isinstance(service._active.values, MappedCatalog)
+    service.close()
+
+
+def test_stale_binary_catalog_falls_back_to_json(tmp_path):
+    _write(tmp_path, "en", {"hello": "Hello", "new": "New"})
+    cs = _write(tmp_path, "cs", {"hello": "Ahoj"})
+    _age(cs, 10)
+    _age(tmp_path / "en.json", 10)
+    export_locales(tmp_path, langs=["cs"])
+    _age(tmp_path / "cs.ptc", 5)
+    # en.json (a fallback layer) edited after the export
+    _write(tmp_path, "en", {"hello": "Hello", "new": "Brand new"})
+    service = LocalizationService("cs", tmp_path, binary=True)
+    assert service.t("new") == "Brand new"
+    assert not isinstance(service._active.values, MappedCatalog)
+
+
+def test_set_language_and_reload_close_mapped_catalogs(tmp_path):
+    _write(tmp_path, "en", {"hello": "Hello"})
+    _write(tmp_path, "cs", {"hello": "Ahoj"})
+    for file in tmp_path.glob("*.json"):
+        _age(file, 10)
+    export_locales(tmp_path)
+    service = LocalizationService("cs", tmp_path, binary=True)
+    service.t("hello")
+    mapped = service._active.values
+    service.set_language("cs")
+    assert mapped._mm.closed
+    assert service.t("hello") == "Ahoj"
+    mapped = service._active.values
+    service.reload()
+    assert mapped._mm.closed
+    assert service.t("hello") == "Ahoj"
+    service.close()
+
+
+def test_refresh_patches_changed_keys(tmp_path):
+    _write(tmp_path, "en", {"a": "A", "b": "B"})
+    _write(tmp_path, "cs", {"a": "Á"})
+    service = LocalizationService("cs", tmp_path)
+    assert service.t("b") == "B"
+    _write(tmp_path, "en", {"a": "A", "b": "Bee {n}"})
+    assert service.refresh(["en"]) == {"cs": {"b"}}
+    assert service.t("b", n=2) == "Bee 2"
+    # half-saved file is skipped
+    (tmp_path / "cs.json").write_text("{", encoding="utf-8")
+    assert service.refresh(["cs"]) == {}
+    assert service.t("a") == "Á"
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from services.metrics import FileExporter, Histogram, MetricsRegistry
+
+
+def test_histogram_quantiles_are_within_bucket_precision():
+    h = Histogram()
+    for us in range(1, 1001):
+        h.record(us / 1_000_000)
+    assert h.count == 1000
+    assert h.mean == pytest.approx(500.5e-6)
+    assert h.quantile(0.5) == pytest.approx(500e-6, rel=0.04)
+    assert h.quantile(0.99) == pytest.approx(990e-6, rel=0.04)
+    assert h.quantile(1.0) == h.max == pytest.approx(1e-3)
+    assert Histogram().quantile(0.5) == 0.0
+    assert Histogram().snapshot()["min"] == 0.0
+
+
+def test_registry_keys_metrics_by_name_and_labels():
+    registry = MetricsRegistry()
+    a = registry.counter("requests_total", "Requests", plugin="a")
+    assert registry.counter("requests_total", plugin="a") is a
+    assert registry.counter("requests_total", plugin="b") is not a
+    a.inc(2)
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", plugin="c")
+    with registry.histogram("load_seconds").time():
+        pass
+    assert registry.histogram("load_seconds").count == 1
+
+
+def test_watchers_switch_hot_paths():
+    registry = MetricsRegistry()
+    registry.watch()
+    registry.watch()
+    registry.unwatch()
+    assert registry.enabled
+    registry.unwatch()
+    registry.unwatch()
+    assert not registry.enabled
+
+
+def test_collectors_run_on_export():
+    registry = MetricsRegistry()
+    depth = iter(range(10))
+    registry.add_collector(lambda r: r.gauge("queue_depth", "Depth").set(next(depth)))
+    registry.counter("jobs_total", "Jobs", kind='say "hi"').inc()
+    registry.histogram("batch_seconds").record(0.002)
+    text = registry.to_prometheus()
+    assert "# HELP queue_depth Depth\n# TYPE queue_depth gauge\nqueue_depth 0\n" in text
+    assert 'jobs_total{kind="say \\"hi\\""} 1.0' in text
+    assert "# TYPE batch_seconds summary" in text
+    assert 'batch_seconds{quantile="0.5"}' in text and "batch_seconds_count 1" in text
+    snapshot = registry.snapshot()["metrics"]
+    assert snapshot["queue_depth"]["series"][0]["value"] == 1
+    assert snapshot["jobs_total"]["series"][0]["labels"] == {"kind": 'say "hi"'}
+
+
+def test_file_exporter_writes_on_stop(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("x_total").inc()
+    exporter = FileExporter(registry, tmp_path / "metrics.json", interval=60).start()
+    assert registry.enabled
+    exporter.stop()
+    assert not registry.enabled
+    data = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert data["metrics"]["x_total"]["series"][0]["value"] == 1
+    registry.write(tmp_path / "metrics.prom")
+    assert "x_total 1.0" in (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+
+
+def test_metrics_view_rows_per_plugin():
+    from ui.views.metrics import MetricsView
+
+    registry = MetricsRegistry()
+    view = MetricsView(registry)
+    segments = registry.counter("pytrans_translate_segments_total", plugin="deepl")
+    registry.histogram("pytrans_translate_batch_seconds", plugin="deepl").record(0.01)
+    registry.counter("pytrans_tm_hits_total", plugin="tm").inc(3)
+    registry.counter("pytrans_tm_misses_total", plugin="tm").inc()
+    registry.counter("pytrans_translate_errors_total", plugin="deepl").inc(2)
+    registry.counter("pytrans_i18n_lookups_total").inc()
+    assert view.rows()["deepl"]["throughput"] == 0
+    segments.inc(100)
+    rows = view.rows()
+    assert rows["deepl"]["throughput"] > 0
+    assert rows["deepl"]["p50"] == pytest.approx(0.01, rel=0.04)
+    assert rows["deepl"]["errors"] == 2
+    assert (rows["tm"]["hits"], rows["tm"]["misses"]) == (3, 1)
+    assert set(rows) == {"deepl", "tm"}
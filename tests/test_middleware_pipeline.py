@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from models.translation import Segment
+from services.middleware_pipeline import Middleware, MiddlewarePipeline, Normalize, translator_stage
+from services.translation_engine import TranslationEngine
+from tools.fake_translator import FakeTranslator
+
+
+class Tag(Middleware):
+    name = "tag"
+
+    def __init__(self, label, log):
+        super().__init__()
+        self.label = label
+        self.log = log
+
+    def pre(self, batch):
+        self.log.append(f"pre {self.label}")
+        return batch
+
+    async def post(self, batch):
+        self.log.append(f"post {self.label}")
+        return batch
+
+
+class DropEmpty(Middleware):
+    name = "drop-empty"
+
+    def pre(self, batch):
+        return [seg for seg in batch if seg.text]
+
+
+def _collect(stream):
+    async def run():
+        return [batch async for batch in stream]
+    return asyncio.run(run())
+
+
+def _upper(batch):
+    for seg in batch:
+        seg.text = seg.text.upper()
+    return batch
+
+
+def test_stages_run_in_onion_order_and_record_stats():
+    log = []
+    pipeline = MiddlewarePipeline([Tag("a", log), Tag("b", log)], batch_size=2)
+    segments = [Segment(f"k{i}", f"text {i}", "cs") for i in range(3)]
+    batches = _collect(pipeline.run(segments, _upper))
+    assert [[s.text for s in b] for b in batches] == [["TEXT 0", "TEXT 1"], ["TEXT 2"]]
+    assert log[:4] == ["pre a", "pre b", "post b", "post a"]
+    report = {(r["stage"], r["phase"]): r for r in pipeline.report()}
+    assert set(report) == {("tag", "pre"), ("tag", "post"), ("translate", "translate")}
+    assert report["translate", "translate"]["items"] == 3
+    assert report["translate", "translate"]["batches"] == 2
+
+
+def test_unchanged_phases_are_left_out():
+    pipeline = MiddlewarePipeline([DropEmpty()])
+    assert [(s.name, s.phase) for s in pipeline.stats] == [("drop-empty", "pre")]
+    batches = _collect(pipeline.run([Segment("a", "", "cs"), Segment("b", "x", "cs")]))
+    assert [[s.key for s in b] for b in batches] == [["b"]]
+
+
+def test_normalize_restores_surrounding_whitespace():
+    pipeline = MiddlewarePipeline([Normalize()])
+    seg = Segment("k", "  Café\n", "cs")
+    sent = []
+
+    def translate(batch):
+        sent.extend(s.text for s in batch)
+        return _upper(batch)
+
+    _collect(pipeline.run([seg], translate))
+    assert sent == ["Café"]
+    assert seg.text == "  CAFÉ\n"
+
+
+def test_from_plugins_orders_and_filters():
+    plugins = [
+        Plugin("late", PluginType.MIDDLEWARE, {"kind": "normalize", "order": 5}),
+        Plugin("normalize", PluginType.MIDDLEWARE, {"order": 1}),
+        Plugin("off", PluginType.MIDDLEWARE, {"kind": "normalize", "enabled": False}),
+        Plugin("other", PluginType.TRANSLATOR, {}),
+    ]
+    pipeline = MiddlewarePipeline.from_plugins(plugins)
+    assert [m.plugin.name for m in pipeline.middlewares] == ["normalize", "late"]
+    with pytest.raises(ValueError):
+        MiddlewarePipeline.from_plugins([Plugin("nope", PluginType.MIDDLEWARE, {})])
+
+
+def test_concurrent_translate_with_engine():
+    segments = [Segment(f"k{i}", f"Text {i}", "cs" if i % 2 else "de") for i in range(10)]
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url)
+        try:
+            pipeline = MiddlewarePipeline([Normalize()], batch_size=3)
+            stream = pipeline.run(segments, translator_stage(engine, "en"), concurrency=3)
+            return [seg async for batch in stream for seg in batch]
+        finally:
+            await engine.aclose()
+            await server.stop()
+
+    out = asyncio.run(run())
+    assert sorted((s.key, s.text) for s in out) == sorted((s.key, f"[{s.target}] Text {s.key[1:]}") for s in segments)
+
+
+def test_translator_stage_respects_engine_batches_and_memory(tmp_path):
+    from services.translation_memory import TranslationMemory
+
+    segments = [Segment("same", f"Sentence {i}", "cs") for i in range(12)]
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url, batch_size=5, max_batch_chars=25)
+        memory = TranslationMemory(f"sqlite:///{tmp_path / 'tm.db'}")
+        try:
+            outs = []
+            for _ in range(2):
+                stage = translator_stage(engine, "en", memory)
+                stream = MiddlewarePipeline([]).run([Segment(s.key, s.text, s.target) for s in segments], stage)
+                outs.append([seg.text async for batch in stream for seg in batch])
+            return outs, server.requests, server.texts
+        finally:
+            memory.close()
+            await engine.aclose()
+            await server.stop()
+
+    (first, second), requests, texts = asyncio.run(run())
+    assert first == second == [f"[cs] Sentence {i}" for i in range(12)]
+    assert texts == 12  # druhý běh odpoví paměť
+    assert requests == 6  # nejvýš 25 znaků (2 věty) na požadavek, ne jedna dávka pipeline
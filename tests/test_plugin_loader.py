@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.plugin_loader import discover, load_plugins
+from services.plugin_registry import init_plugins
+
+CALLS = []
+
+
+def _slow(p):
+    time.sleep(0.05)
+    CALLS.append((p.name, threading.current_thread().name))
+
+
+def _fail(p):
+    raise RuntimeError(p.name)
+
+
+def _settings(tmp_path, items):
+    file = tmp_path / "plugins.json"
+    file.write_text(json.dumps(items), encoding="utf-8")
+    return file
+
+
+def test_discover_merges_settings_and_plugin_dir(tmp_path):
+    settings = _settings(tmp_path, [{"name": "tm", "plugin_type": "backend",
+                                     "params": {"connection_string": "sqlite:///a.db"}}])
+    plugin_dir = tmp_path / "plugins"
+    (plugin_dir / "tm").mkdir(parents=True)
+    (plugin_dir / "tm" / "plugin.json").write_text(json.dumps(
+        {"name": "tm", "plugin_type": "backend", "handler": "tm.py:handle",
+         "params": {"connection_string": "sqlite:///b.db", "cache_size": 5}}), encoding="utf-8")
+    [item] = discover(settings, plugin_dir, entry_points=False)
+    assert item["params"] == {"connection_string": "sqlite:///a.db", "cache_size": 5}
+    assert item["handler"] == f"{(plugin_dir / 'tm' / 'tm.py').resolve()}:handle"
+
+
+def test_load_plugins_validates(tmp_path):
+    settings = _settings(tmp_path, [{"name": "deepl", "plugin_type": "translator",
+                                     "params": {"server_url": "http://x"}}])
+    [plugin] = load_plugins(settings, None, False)
+    assert plugin.plugin_type is PluginType.TRANSLATOR
+    assert load_plugins(settings, None, False) == [plugin]
+    assert not (tmp_path / ".cache").exists()
+
+
+def test_invalid_plugin_raises_without_on_error(tmp_path):
+    settings = _settings(tmp_path, [{"name": "deepl", "plugin_type": "translator", "params": {}}])
+    with pytest.raises(ValueError):
+        load_plugins(settings, None, False)
+
+
+def test_broken_manifests_are_reported_per_item(tmp_path):
+    settings = _settings(tmp_path, [
+        {"plugin_type": "translator", "params": {"server_url": "http://x"}},  # no name
+        "not a manifest",
+        {"name": "typo", "plugin_type": "translater"},
+        {"name": "ok", "plugin_type": "custom"},
+    ])
+    plugin_dir = tmp_path / "plugins"
+    plugin_dir.mkdir()
+    (plugin_dir / "broken.json").write_text("{", encoding="utf-8")
+    errors = []
+    plugins = load_plugins(settings, plugin_dir, False,
+                           on_error=lambda name, e: errors.append((name, type(e))))
+    assert [p.name for p in plugins] == ["ok"]
+    assert (str(plugin_dir / "broken.json"), json.JSONDecodeError) in errors
+    assert ("typo", ValueError) in errors
+    assert ("?", KeyError) in errors
+    assert ("?", ValueError) in errors
+    assert len(errors) == 4
+
+
+def test_init_plugins_runs_resources_concurrently_then_schedulers(tmp_path):
+    CALLS.clear()
+    here = __name__
+    handler = tmp_path / "handler.py"
+    handler.write_text("def run(p):\n    p.params['seen'] = True\n", encoding="utf-8")
+    plugins = [Plugin(f"mt{i}", PluginType.TRANSLATOR, {}, handler=f"{here}:_slow") for i in range(4)]
+    plugins += [Plugin("cron", PluginType.SCHEDULER, {}, handler=f"{here}:_slow"),
+                Plugin("bad", PluginType.BACKEND, {}, handler=f"{here}:_fail"),
+                Plugin("file", PluginType.CUSTOM, {}, handler=f"{handler}:run"),
+                Plugin("bare", PluginType.CUSTOM, {})]
+    started = time.perf_counter()
+    errors = init_plugins(plugins)
+    assert time.perf_counter() - started < 0.2
+    assert list(errors) == ["bad"] and str(errors["bad"]) == "bad"
+    assert CALLS[-1] == ("cron", threading.current_thread().name)
+    assert {name for name, thread in CALLS[:-1]} == {"mt0", "mt1", "mt2", "mt3"}
+    assert all(thread.startswith("plugin-init") for _, thread in CALLS[:-1])
+    assert plugins[6].params == {"seen": True}
+    assert plugins[7].params == {}
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from services.rate_limit import CircuitBreaker, CircuitOpenError, Throttle, is_outage, parse_retry_after
+from services.translation_engine import TranslationEngine, TranslationError
+from tools.fake_translator import FakeTranslator
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_retry_after_accepts_fractional_seconds():
+    assert parse_retry_after("0.2") == pytest.approx(0.2)
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_throttling_is_not_an_outage():
+    assert not is_outage(TranslationError("429", 429, 0.2))
+    assert not is_outage(TranslationError("503 with Retry-After", 503, 1.0))
+    assert is_outage(TranslationError("503", 503))
+    assert is_outage(TimeoutError())
+    assert is_outage(ConnectionResetError())
+
+
+def test_breaker_opens_after_threshold_and_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_after=10, clock=clock)
+    breaker.failure()
+    assert breaker.check() is False
+    breaker.failure()
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.check()
+    assert err.value.retry_after == pytest.approx(10)
+    clock.now = 10
+    assert breaker.check() is True  # the probe
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.check()  # others wait shortly for the probe's verdict
+    assert err.value.retry_after == pytest.approx(breaker.probe_wait)
+    breaker.success()
+    assert breaker.state == "closed"
+
+
+def test_aborted_probe_hands_over_to_the_next_caller():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_after=1, clock=clock)
+    breaker.failure()
+    clock.now = 1
+    assert breaker.check() is True
+    breaker.abort_probe()
+    assert breaker.check() is True
+
+
+def test_throttle_does_not_trip_breaker_on_429():
+    async def run():
+        throttle = Throttle(breaker_threshold=2, max_retries=10, backoff_base=0.001)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls <= 5:
+                raise TranslationError("busy", 429, 0.001)
+            return "ok"
+
+        assert await throttle.call(fn) == "ok"
+        assert throttle.breaker.state == "closed"
+        assert throttle.retries == 5
+
+    asyncio.run(run())
+
+
+def test_throttle_waits_for_open_breaker_instead_of_failing():
+    async def run():
+        throttle = Throttle(breaker_threshold=1, breaker_reset=0.05, max_retries=3, backoff_base=0.001)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise TranslationError("down", 503)
+            return "ok"
+
+        assert await throttle.call(fn) == "ok"
+        assert throttle.breaker.state == "closed"
+
+    asyncio.run(run())
+
+
+def test_throttle_gives_up_after_max_retries():
+    async def run():
+        throttle = Throttle(breaker_threshold=100, max_retries=2, backoff_base=0.001)
+
+        async def fn():
+            raise TranslationError("down", 503)
+
+        with pytest.raises(TranslationError):
+            await throttle.call(fn)
+        assert throttle.retries == 2
+
+    asyncio.run(run())
+
+
+def test_client_errors_are_not_retried():
+    async def run():
+        throttle = Throttle(max_retries=5)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            raise TranslationError("bad request", 400)
+
+        with pytest.raises(TranslationError):
+            await throttle.call(fn)
+        assert calls == 1
+
+    asyncio.run(run())
+
+
+def test_rate_limited_server_translation_completes():
+    async def run():
+        server = FakeTranslator(rate_limit=20, retry_after=0.2)
+        url = await server.start()
+        engine = TranslationEngine(url, batch_size=10, concurrency=8, max_retries=8)
+        try:
+            segments = {f"k{i}": f"text {i}" for i in range(300)}
+            out = await engine.translate(segments, "en", ["cs"])
+        finally:
+            await engine.aclose()
+            await server.stop()
+        assert out["cs"] == {k: f"[cs] {v}" for k, v in segments.items()}
+        assert server.throttled > 0
+        assert engine.throttle.breaker.state == "closed"
+
+    asyncio.run(run())
@@ -0,0 +1,80 @@
+import threading
+from pathlib import Path
+
+from services import reference_data as rd
+from services.reference_data import ReferenceData, fold
+
+ROOT = Path(__file__).resolve().parent.parent
+LANGUAGES = ROOT / "jsons" / "languages.json"
+COUNTRIES = ROOT / "jsons" / "countries.json"
+
+
+def test_fold():
+    assert fold("Čeština") == "cestina"
+    assert fold("ÅLAND") == "aland"
+
+
+def test_language_lookup_and_rtl():
+    ref = ReferenceData(LANGUAGES, COUNTRIES)
+    assert ref.language("CS").name == "Czech"
+    assert ref.language("ar_SA").code == "ar"
+    assert ref.language("zh-Hant-TW").code == "zh"
+    assert ref.is_rtl("ar-EG") and not ref.is_rtl("cs")
+    assert ref.language("") is None
+
+
+def test_search_is_prefix_and_accent_insensitive():
+    ref = ReferenceData(LANGUAGES, COUNTRIES)
+    assert "cs" in [lang.code for lang in ref.search_languages("cesk")]
+    assert [c.code for c in ref.search_countries("czech", 1)] == ["CZ"]
+    assert ref.search_languages("   ") == []
+
+
+def test_dial_codes():
+    ref = ReferenceData(LANGUAGES, COUNTRIES)
+    assert {"US", "CA"} <= {c.code for c in ref.countries_by_dial_code("1")}
+    assert [c.code for c in ref.countries_for_number("+420 777 123 456")] == ["CZ"]
+    assert ref.countries_for_number("") == []
+
+
+def test_missing_or_broken_files_give_empty_maps(tmp_path):
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    ref = ReferenceData(broken, tmp_path / "missing.json")
+    assert ref.languages == {} and ref.countries == {}
+
+
+def test_legacy_mapping_format(tmp_path):
+    file = tmp_path / "languages.json"
+    file.write_text('{"ar": {"rtl": true}, "cs": {"name": "Czech"}, "x": 1}', encoding="utf-8")
+    ref = ReferenceData(file, COUNTRIES)
+    assert sorted(ref.languages) == ["ar", "cs"]
+    assert ref.is_rtl("ar")
+
+
+def test_concurrent_readers_never_see_a_partial_map(monkeypatch):
+    inside = threading.Event()
+    release = threading.Event()
+    read = rd._read
+    calls = []
+
+    def slow_read(path):
+        calls.append(path)
+        if len(calls) == 1:
+            inside.set()
+            release.wait(5)
+        return read(path)
+
+    monkeypatch.setattr(rd, "_read", slow_read)
+    ref = ReferenceData(LANGUAGES, COUNTRIES)
+    seen = {}
+    first = threading.Thread(target=lambda: seen.setdefault("first", len(ref.languages)))
+    first.start()
+    assert inside.wait(5)
+    # první vlákno ještě staví mapu – druhý čtenář nesmí dostat prázdnou
+    full = len(ref.languages)
+    assert full > 100
+    assert ref.is_rtl("ar")
+    release.set()
+    first.join()
+    assert seen["first"] == full
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from services.row_source import ColumnSource, RowSource, SQLiteSource, catalog_source
+
+
+@pytest.fixture
+def source():
+    return ColumnSource(("key", "text"), [["b", "a", "c", "d"], ["Beta", "alpha", None, "Delta beta"]])
+
+
+def test_row_source_is_abstract():
+    with pytest.raises(TypeError):
+        RowSource()
+
+
+def test_rows_are_paged(source):
+    assert len(source) == 4
+    assert source.rows(1, 2) == [("a", "alpha"), ("c", "")]
+    assert source.rows(3, 10) == [("d", "Delta beta")]
+
+
+def test_sort_both_ways(source):
+    source.sort(1)
+    assert [r[0] for r in source.rows(0, 4)] == ["c", "a", "b", "d"]
+    source.sort(1, reverse=True)
+    assert [r[0] for r in source.rows(0, 4)] == ["d", "b", "a", "c"]
+    source.sort(None)
+    assert [r[0] for r in source.rows(0, 4)] == ["b", "a", "c", "d"]
+    with pytest.raises(IndexError):
+        source.sort(5)
+
+
+def test_filter_narrows_and_widens(source):
+    source.filter("BET")
+    assert [r[0] for r in source.rows(0, 10)] == ["b", "d"]
+    source.filter("beta ")  # surrounding spaces are ignored
+    source.filter("delta b")
+    assert [r[0] for r in source.rows(0, 10)] == ["d"]
+    source.sort(0, reverse=True)
+    source.filter("a")
+    assert [r[0] for r in source.rows(0, 10)] == ["d", "b", "a"]
+    assert source.row_id(0) == 3
+    source.filter("")
+    assert len(source) == 4
+
+
+def test_narrowing_a_small_view_matches_a_full_scan():
+    keys = [f"key{i}" for i in range(1000)]
+    source = ColumnSource(("key",), [keys])
+    source.filter("key99")
+    source.filter("key999")
+    assert source.rows(0, 10) == [("key999",)]
+
+
+def test_catalog_source_follows_source_keys(tmp_path):
+    (tmp_path / "en.json").write_text(json.dumps({"b": "B", "a": "A", "n": {"nested": 1}}), encoding="utf-8")
+    (tmp_path / "cs.json").write_text(json.dumps({"a": "Á", "x": "X"}), encoding="utf-8")
+    source = catalog_source(tmp_path, "en", "cs")
+    assert source.rows(0, 10) == [("b", "B", ""), ("a", "A", "Á")]
+    paged = catalog_source(tmp_path, "en", "cs", paged_from=2)
+    try:
+        assert isinstance(paged, SQLiteSource) and paged.lazy
+        assert paged.rows(0, 10) == source.rows(0, 10)
+    finally:
+        paged.close()
+    assert not paged.path.exists()
+    assert isinstance(catalog_source(tmp_path, "en", "cs", paged_from=3), ColumnSource)
+
+
+@pytest.mark.parametrize("steps", [
+    [("sort", (1,))],
+    [("sort", (1, True))],
+    [("filter", ("BET",))],
+    [("filter", ("a",)), ("sort", (0, True))],
+    [("sort", (1,)), ("filter", ("ta",)), ("filter", ("",)), ("sort", (None,))],
+])
+def test_sqlite_source_matches_column_source(tmp_path, steps):
+    columns = ("key", "text")
+    data = [["b", "a", "c", "d", "e"], ["Beta", "alpha", None, "Delta beta", "beta"]]
+    memory = ColumnSource(columns, data)
+    paged = SQLiteSource(columns, zip(*data), tmp_path / "rows.sqlite")
+    try:
+        for name, args in steps:
+            getattr(memory, name)(*args)
+            getattr(paged, name)(*args)
+        assert len(paged) == len(memory)
+        assert paged.rows(0, 10) == memory.rows(0, 10)
+        assert paged.rows(1, 2) == memory.rows(1, 2)
+        with pytest.raises(IndexError):
+            paged.sort(2)
+    finally:
+        paged.close()
+    assert (tmp_path / "rows.sqlite").exists()  # vlastní soubor zůstává
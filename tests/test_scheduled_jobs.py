@@ -0,0 +1,110 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.scheduled_jobs import Retranslate, _targets, install
+from services.scheduler import Scheduler
+from services.work_queue import open_queue
+from tools.fake_translator import FakeTranslator
+
+NOW = datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def locales(tmp_path):
+    path = tmp_path / "locales"
+    path.mkdir()
+    (path / "en.json").write_text(json.dumps({"hello": "Hello", "bye": "Bye"}), encoding="utf-8")
+    (path / "cs.json").write_text(json.dumps({"bye": "Ahoj"}), encoding="utf-8")
+    (path / "de.json").write_text("{}", encoding="utf-8")
+    return path
+
+
+def _due_scheduler(tmp_path, *names):
+    # poslední běh předevčírem – noční úloha je po startu hned na řadě (catch_up "once")
+    state = tmp_path / "state.json"
+    state.write_text(json.dumps({name: (NOW - timedelta(days=2)).isoformat() for name in names}), encoding="utf-8")
+    return Scheduler(state_file=state, clock=lambda: NOW)
+
+
+def _nightly(**params):
+    return Plugin("nightly", PluginType.SCHEDULER, {"cron": "0 3 * * *", **params})
+
+
+def test_targets_accept_lists_and_comma_strings():
+    assert _targets("cs, de,,") == ["cs", "de"]
+    assert _targets(["cs"]) == ["cs"]
+    assert _targets("") is None and _targets(None) is None
+
+
+def test_due_job_retranslates_its_project(tmp_path, locales):
+    async def main():
+        server = FakeTranslator()
+        url = await server.start()
+        try:
+            scheduler = _due_scheduler(tmp_path, "nightly")
+            plugins = [Plugin("mt", PluginType.TRANSLATOR, {"server_url": url}),
+                       _nightly(locales=str(locales), targets="cs")]
+            hook = install(scheduler, plugins)
+            assert scheduler.jobs["nightly"].next_run < NOW
+            assert await scheduler.run_pending() == 1
+            return scheduler, hook, server.texts
+        finally:
+            await server.stop()
+
+    scheduler, hook, texts = asyncio.run(main())
+    assert texts == 1
+    assert json.loads((locales / "cs.json").read_text(encoding="utf-8")) == {"bye": "Ahoj", "hello": "[cs] Hello"}
+    assert json.loads((locales / "de.json").read_text(encoding="utf-8")) == {}
+    assert hook.runs["nightly"]["targets"] == {"cs": {"added": 1, "changed": 0, "removed": 0}}
+    job = scheduler.jobs["nightly"]
+    assert job.last_error is None and job.next_run == datetime(2025, 6, 2, 3, 0, tzinfo=timezone.utc)
+    assert json.loads(scheduler.state_file.read_text(encoding="utf-8"))["nightly"] == job.last_run.isoformat()
+
+
+def test_running_loop_fires_submit_jobs(tmp_path, locales):
+    queue_file = tmp_path / "queue.sqlite"
+    scheduler = _due_scheduler(tmp_path, "nightly")
+    hook = install(scheduler, [_nightly(action="submit", locales=str(locales), queue=str(queue_file))])
+
+    async def main():
+        loop = asyncio.ensure_future(scheduler.run())
+        for _ in range(500):
+            if "nightly" in hook.runs:
+                break
+            await asyncio.sleep(0.01)
+        scheduler.stop()
+        await asyncio.wait_for(loop, 5)
+
+    asyncio.run(main())
+    assert hook.runs["nightly"] == {"action": "submit", "queued": {"cs": 1, "de": 2}}
+    queue = open_queue(str(queue_file))
+    try:
+        assert {shard: s.ready for shard, s in queue.stats().items()} == {"cs": 1, "de": 2}
+    finally:
+        queue.close()
+
+
+@pytest.mark.parametrize("params, error", [
+    ({"action": "rebuild"}, "ValueError: Unknown scheduler action: rebuild"),
+    ({}, "LookupError: No TRANSLATOR plugin for nightly"),
+])
+def test_failures_are_recorded_on_the_job(tmp_path, locales, params, error):
+    scheduler = _due_scheduler(tmp_path, "nightly")
+    install(scheduler, [_nightly(locales=str(locales), **params)])
+    assert asyncio.run(scheduler.run_pending()) == 1
+    assert scheduler.jobs["nightly"].last_error == error
+
+
+def test_install_replaces_earlier_hooks(tmp_path):
+    scheduler = Scheduler(state_file=None, clock=lambda: NOW)
+    first = install(scheduler, [_nightly()])
+    job = scheduler.jobs["nightly"]
+    second = install(scheduler, [_nightly()])
+    assert scheduler.on_fire == [second] and second is not first
+    assert scheduler.jobs["nightly"] is job
+    assert isinstance(second, Retranslate)
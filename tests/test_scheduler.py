@@ -0,0 +1,108 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.scheduler import Scheduler
+
+NOW = datetime(2025, 6, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def _scheduler(tmp_path, last_run=None, **kwargs):
+    state = tmp_path / "state.json"
+    if last_run is not None:
+        state.write_text(json.dumps({"job": last_run.isoformat()}), encoding="utf-8")
+    return Scheduler(state_file=state, clock=lambda: NOW, **kwargs)
+
+
+async def _noop():
+    pass
+
+
+def test_invalid_jobs_are_rejected(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    with pytest.raises(ValueError):
+        scheduler.add("job", "@hourly", _noop, catch_up="twice")
+    with pytest.raises(ValueError):
+        scheduler.add_plugin(Plugin("tm", PluginType.BACKEND, {"cron": "@hourly"}))
+
+
+@pytest.mark.parametrize("catch_up, expected", [
+    ("skip", NOW.replace(hour=13, minute=0)),
+    ("once", NOW.replace(hour=10, minute=0)),
+    ("all", NOW.replace(hour=10, minute=0)),
+])
+def test_missed_runs_follow_the_catch_up_policy(tmp_path, catch_up, expected):
+    scheduler = _scheduler(tmp_path, last_run=NOW - timedelta(hours=3))
+    job = scheduler.add("job", "0 * * * *", _noop, catch_up=catch_up)
+    assert job.next_run == expected
+
+
+def _run(scheduler, stop_after):
+    fired = []
+
+    async def record():
+        fired.append(1)
+        if len(fired) >= stop_after:
+            scheduler.stop()
+
+    async def main():
+        scheduler.add("job", "0 * * * *", record, catch_up="all")
+        await asyncio.wait_for(scheduler.run(), 5)
+
+    asyncio.run(main())
+    return fired
+
+
+def test_catch_up_all_replays_every_missed_run(tmp_path):
+    scheduler = _scheduler(tmp_path, last_run=NOW - timedelta(hours=3))
+    assert len(_run(scheduler, 3)) == 3  # 10:00, 11:00, 12:00
+    state = json.loads(scheduler.state_file.read_text(encoding="utf-8"))
+    assert state["job"] == NOW.replace(minute=0).isoformat()
+    assert scheduler.jobs["job"].next_run == NOW.replace(hour=13, minute=0)
+
+
+def test_catch_up_all_is_bounded(tmp_path):
+    scheduler = _scheduler(tmp_path, last_run=NOW - timedelta(days=3), max_catch_up=5)
+    assert len(_run(scheduler, 1)) == 1
+    assert scheduler.jobs["job"].next_run == NOW.replace(hour=13, minute=0)
+
+
+def test_failing_job_records_the_error_and_scheduler_goes_on(tmp_path):
+    scheduler = _scheduler(tmp_path, last_run=NOW - timedelta(hours=2))
+    calls = []
+
+    async def boom():
+        calls.append(1)
+        if len(calls) == 2:
+            scheduler.stop()
+        raise RuntimeError("down")
+
+    async def main():
+        scheduler.add("job", "0 * * * *", boom, catch_up="all")
+        await asyncio.wait_for(scheduler.run(), 5)
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert scheduler.jobs["job"].last_error == "RuntimeError: down"
+
+
+def test_plugin_fires_hooks_and_removed_jobs_are_dropped(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    plugin = Plugin("nightly", PluginType.SCHEDULER, {"cron": "0 3 * * *", "timezone": "Europe/Prague"})
+    job = scheduler.add_plugin(plugin)
+    assert job.next_run == datetime(2025, 6, 2, 1, 0, tzinfo=timezone.utc)
+    seen = []
+
+    async def hook(p):
+        seen.append(p.name)
+
+    scheduler.on_fire.append(hook)
+    asyncio.run(job.callback())
+    assert seen == ["nightly"]
+    scheduler.remove("nightly")
+    assert scheduler.upcoming() == []
+    assert scheduler._pop_due(NOW + timedelta(days=2)) == []
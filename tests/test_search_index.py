@@ -0,0 +1,45 @@
+from services.search_index import SearchIndex, fuzzy_score
+
+ITEMS = [
+    ("lang", "Set language", "ui.language"),
+    ("theme", "Switch theme", "dark or light"),
+    ("quit", "Quit", "leave the app"),
+    ("scheduler", "Scheduler", "cron jobs"),
+]
+
+
+def _values(items):
+    return [item.value for item in items]
+
+
+def test_fuzzy_score_ranks_substrings_and_word_starts():
+    assert fuzzy_score("", "anything") == 0
+    assert fuzzy_score("xyz", "set language") is None
+    assert fuzzy_score("lang", "set language") > fuzzy_score("lng", "set language")
+    assert fuzzy_score("lang", "language") > fuzzy_score("lang", "set language")
+    assert fuzzy_score("guage", "set language") < fuzzy_score("lang", "set language")
+    assert fuzzy_score("sl", "set language") > fuzzy_score("sl", "asetxlanguage")
+    assert fuzzy_score("sl", "misleading") > fuzzy_score("sl", "set language")
+
+
+def test_search_is_case_insensitive_and_ranked():
+    index = SearchIndex(ITEMS)
+    assert _values(index.search("THEME")) == ["theme"]
+    assert _values(index.search("sch")) == ["scheduler", "theme"]
+    assert _values(index.search("  ")) == _values(index.search("")) == ["lang", "theme", "quit", "scheduler"]
+
+
+def test_growing_query_only_rescans_the_last_candidates():
+    index = SearchIndex(ITEMS)
+    index.search("s")
+    assert index._last == [0, 1, 3]
+    index.items[2].haystack = "sx"  # kdyby se prohledávalo vše, našlo by se
+    assert _values(index.search("sx")) == []
+    assert _values(index.search("x")) == ["quit"]  # jiný začátek dotazu prohledá vše
+
+
+def test_extend_resets_narrowing():
+    index = SearchIndex(ITEMS[:1])
+    assert _values(index.search("quit")) == []
+    index.extend(ITEMS[2:3])
+    assert _values(index.search("quit")) == ["quit"]
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+from models.translation import Segment
+from services.delta_service import DeltaTranslator
+from services.segmentation import SegmentMiddleware, SegmentPlan, mask, split_sentences, unmask
+from services.translation_engine import TranslationEngine
+from tools.fake_translator import FakeTranslator
+
+
+def _echo(plan: SegmentPlan) -> dict:
+    return {uid: text for uid, _, text in plan.items()}
+
+
+def test_mask_round_trip():
+    text = "Hi {name}, you have [b]%d[/b] <i>new</i> {{messages}}"
+    masked = mask(text)
+    assert "{" not in masked.text and "[b]" not in masked.text and "<i>" not in masked.text
+    assert unmask(masked.text, masked.tokens) == (text, [])
+
+
+def test_unmask_reports_lost_and_unknown_tokens():
+    masked = mask("{a} and {b}")
+    text, problems = unmask("⟦P0⟧ ⟦P7⟧", masked.tokens)
+    assert text == "{a} ⟦P7⟧"
+    assert problems == ["unknown token ⟦P7⟧", "lost {b}"]
+
+
+def test_split_sentences_rebuilds_text():
+    text = "  First one. Second, e.g. this! Third?\n"
+    sentences, gaps = split_sentences(text)
+    assert sentences == ["First one.", "Second, e.g. this!", "Third?"]
+    rebuilt = gaps[0] + "".join(s + g for s, g in zip(sentences, gaps[1:]))
+    assert rebuilt == text
+
+
+def test_multiline_value_round_trips_unchanged():
+    plan = SegmentPlan()
+    value = "Hello {name},\n\nwelcome back"
+    plan.add("greeting", value)
+    assert [text for _, _, text in plan.items()] == ["Hello ⟦P0⟧,\n\nwelcome back"]
+    texts, issues = plan.assemble(_echo(plan))
+    assert texts == {"greeting": value}
+    assert issues == {}
+
+
+def test_long_multiline_value_keeps_its_layout():
+    plan = SegmentPlan(split_min=10)
+    value = "Line one.\n\nLine two has {count} items.\n  Indented line.\n"
+    plan.add("k", value)
+    assert len(plan) == 3
+    texts, _ = plan.assemble(_echo(plan))
+    assert texts["k"] == value
+
+
+def test_equal_sentences_are_sent_once_per_group():
+    plan = SegmentPlan(split_min=0)
+    plan.add("a", "Save {file}. Done.")
+    plan.add("b", "Save  {path}.  Done.")
+    plan.add("c", "Save {file}.", group="de")
+    assert plan.pieces == 5
+    assert len(plan) == 3
+    assert plan.refs(0) == ["a", "b"]
+    texts, _ = plan.assemble({uid: f"<{text}>" for uid, _, text in plan.items()})
+    assert texts == {"a": "<Save {file}.> <Done.>", "b": "<Save {path}.>  <Done.>", "c": "<Save {file}.>"}
+
+
+def test_build_waits_for_all_pieces():
+    plan = SegmentPlan(split_min=0)
+    plan.add("k", "One. Two.")
+    assert plan.build("k", {0: "Jedna."}) is None
+    assert plan.build("k", {0: "Jedna.", 1: "Dvě."}) == ("Jedna. Dvě.", [])
+
+
+def test_middleware_fans_results_out():
+    middleware = SegmentMiddleware()
+    batch = [Segment("a", "Hello {name},\nbye", "cs"), Segment("b", "Hello {user},\nbye", "cs"),
+             Segment("c", "Hello {name},\nbye", "de")]
+    sent = middleware.pre(batch)
+    assert [s.text for s in sent] == ["Hello ⟦P0⟧,\nbye", "Hello ⟦P0⟧,\nbye"]
+    for seg in sent:
+        seg.text = f"[{seg.target}] {seg.text}"
+    out = middleware.post(sent)
+    assert [(s.key, s.text) for s in out] == [("a", "[cs] Hello {name},\nbye"), ("b", "[cs] Hello {user},\nbye"),
+                                              ("c", "[de] Hello {name},\nbye")]
+
+
+def test_delta_run_masks_and_deduplicates(tmp_path):
+    source = {"greeting": "Hello {name},\n\nwelcome back", "again": "Hello {user},\n\nwelcome back",
+              "empty": "", "markup": "[b]Bold[/b] text"}
+    (tmp_path / "en.json").write_text(json.dumps(source), encoding="utf-8")
+    (tmp_path / "cs.json").write_text("{}", encoding="utf-8")
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url)
+        try:
+            deltas = await DeltaTranslator(tmp_path).run(engine, ["cs"])
+        finally:
+            await engine.aclose()
+            await server.stop()
+        return deltas, server
+
+    deltas, server = asyncio.run(run())
+    assert server.texts == 2  # greeting and again share one segment, empty is not sent
+    assert json.loads((tmp_path / "cs.json").read_text(encoding="utf-8")) == {
+        "greeting": "[cs] Hello {name},\n\nwelcome back",
+        "again": "[cs] Hello {user},\n\nwelcome back",
+        "empty": "",
+        "markup": "[cs] [b]Bold[/b] text",
+    }
+    assert deltas["cs"].issues == {}
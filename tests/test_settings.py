@@ -0,0 +1,90 @@
+import json
+import time
+
+from services.settings_service import DEFAULTS, Settings
+
+
+def _read(file):
+    return json.loads(file.read_text(encoding="utf-8"))
+
+
+def _settings(tmp_path, **kwargs):
+    return Settings(tmp_path / "settings.json", **kwargs)
+
+
+def test_first_run_writes_defaults_and_an_id(tmp_path):
+    settings = _settings(tmp_path)
+    try:
+        data = _read(settings.file_path)
+        assert data["application-id"] and data["language"] == DEFAULTS["language"]
+        assert settings.dirty == set()
+    finally:
+        settings.close()
+
+
+def test_legacy_id_is_migrated(tmp_path):
+    (tmp_path / "settings.json").write_text(json.dumps({"id": "legacy"}), encoding="utf-8")
+    settings = _settings(tmp_path)
+    settings.close()
+    assert _read(settings.file_path)["application-id"] == "legacy"
+    assert _read(settings.file_path)["theme"] == DEFAULTS["theme"]
+
+
+def test_set_is_debounced_and_flush_writes(tmp_path):
+    settings = _settings(tmp_path, save_delay=60)
+    try:
+        settings.set("language", "cs")
+        settings["theme"] = "nord"
+        assert settings.dirty == {"language", "theme"}
+        assert _read(settings.file_path)["language"] == "en"
+        assert settings.flush() is True
+        assert _read(settings.file_path)["theme"] == "nord"
+        assert settings.flush() is False
+        settings.set("theme", "nord")  # stejná hodnota nic nezašpiní
+        assert settings.dirty == set()
+    finally:
+        settings.close()
+
+
+def test_background_save_after_delay(tmp_path):
+    settings = _settings(tmp_path, save_delay=0.05)
+    try:
+        settings.set("language", "de")
+        deadline = time.monotonic() + 5
+        while _read(settings.file_path)["language"] != "de" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _read(settings.file_path)["language"] == "de"
+    finally:
+        settings.close()
+
+
+def test_transaction_saves_once_even_when_it_raises(tmp_path):
+    settings = _settings(tmp_path, save_delay=0)
+    saves = []
+    save = settings._save
+    settings._save = lambda: saves.append(1) or save()
+    try:
+        with settings.transaction():
+            settings.set("language", "cs")
+            settings.set("theme", "nord")
+        assert len(saves) == 1
+        try:
+            with settings.transaction():
+                settings.set("language", "de")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert _read(settings.file_path)["language"] == "de"
+        assert len(saves) == 2
+    finally:
+        settings.close()
+
+
+def test_close_flushes_pending_changes(tmp_path):
+    settings = _settings(tmp_path, save_delay=60)
+    settings.set("icon_set", "emoji")
+    settings.close()
+    assert _read(settings.file_path)["icon_set"] == "emoji"
+    reopened = _settings(tmp_path, save_delay=0)
+    assert reopened.icon_set == "emoji"
+    reopened.close()
@@ -0,0 +1,113 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.translation_engine import TranslationEngine, TranslationError, engine_for
+from services.translation_memory import TranslationMemory
+from tools.fake_translator import FakeTranslator
+
+
+async def _with_server(fn, **server_options):
+    server = FakeTranslator(**server_options)
+    url = await server.start()
+    try:
+        return await fn(url), server
+    finally:
+        await server.stop()
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        TranslationEngine("http://localhost", batch_size=0)
+
+
+def test_batches_respect_count_and_characters():
+    engine = TranslationEngine("http://localhost", batch_size=3, max_batch_chars=10)
+    segments = {"a": "12345", "b": "1234", "c": "1", "d": "1", "e": "1234567890ab"}
+    assert [[k for k, _ in batch] for batch in engine.batches(segments)] == [["a", "b", "c"], ["d"], ["e"]]
+
+
+def test_from_plugin_requires_translator():
+    plugin = Plugin("tm", PluginType.BACKEND, {"server_url": "http://localhost"})
+    with pytest.raises(ValueError):
+        TranslationEngine.from_plugin(plugin)
+    translator = Plugin("shared", PluginType.TRANSLATOR, {"server_url": "http://localhost", "batch_size": 7})
+    engine = engine_for(translator)
+    assert engine.batch_size == 7 and engine.name == "shared"
+    assert engine_for(translator) is engine
+
+
+def test_translate_into_every_target():
+    source = {f"k{i}": f"Text {i}" for i in range(25)}
+
+    async def run(url):
+        engine = TranslationEngine(url, batch_size=4, concurrency=2)
+        try:
+            return await engine.translate(source, "en", ["cs", "de"])
+        finally:
+            await engine.aclose()
+
+    out, server = asyncio.run(_with_server(run))
+    assert out == {lang: {k: f"[{lang}] {v}" for k, v in source.items()} for lang in ("cs", "de")}
+    assert server.requests == 14
+    assert server.peak_active <= 2
+
+
+def test_leaving_the_stream_early_waits_for_cancelled_batches():
+    finished = []
+
+    class Slow(TranslationEngine):
+        async def translate_batch(self, texts, source, target):
+            try:
+                await asyncio.sleep(0 if texts == ["a"] else 10)
+                return [t.upper() for t in texts]
+            finally:
+                finished.append(texts[0])
+
+    async def run():
+        engine = Slow("http://localhost", batch_size=1, concurrency=3)
+        async with aclosing(engine.stream({"a": "a", "b": "b", "c": "c"}, "en", ["cs"])) as results:
+            async for result in results:
+                break
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return result, others
+
+    result, others = asyncio.run(run())
+    assert result.text == "A" and others == []
+    assert sorted(finished) == ["a", "b", "c"]  # zrušené dávky doběhly ještě uvnitř stream()
+
+
+def test_memory_hits_are_not_sent(tmp_path):
+    memory = TranslationMemory(f"sqlite:///{tmp_path / 'tm.db'}")
+    memory.put("Hello", "Ahoj", "en", "cs", "fake")
+
+    async def run(url):
+        engine = TranslationEngine(url, name="fake")
+        try:
+            first = await engine.translate({"a": "Hello", "b": "World"}, "en", ["cs"], memory)
+            second = await engine.translate({"b": "World"}, "en", ["cs"], memory)
+            return first, second
+        finally:
+            await engine.aclose()
+
+    (first, second), server = asyncio.run(_with_server(run))
+    memory.close()
+    assert first == {"cs": {"a": "Ahoj", "b": "[cs] World"}}
+    assert second == {"cs": {"b": "[cs] World"}}
+    assert server.texts == 1
+
+
+def test_server_errors_surface_as_translation_error():
+    async def run(url):
+        engine = TranslationEngine(url, max_retries=0)
+        try:
+            await engine.translate({"a": "Hello"}, "en", ["cs"])
+        finally:
+            await engine.aclose()
+
+    with pytest.raises(TranslationError) as err:
+        asyncio.run(_with_server(run, error_rate=1.0))
+    assert err.value.status == 503
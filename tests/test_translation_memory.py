@@ -0,0 +1,54 @@
+import pytest
+
+from enums.plugin_type import PluginType
+from models.plugin import Plugin
+from services.translation_memory import TranslationMemory, parse_connection_string
+
+
+@pytest.fixture
+def tm():
+    memory = TranslationMemory("sqlite://:memory:", cache_size=2)
+    yield memory
+    memory.close()
+
+
+def test_parse_connection_string():
+    assert parse_connection_string("sqlite:///tm.db") == "tm.db"
+    assert parse_connection_string("sqlite:////abs/tm.db") == "/abs/tm.db"
+    assert parse_connection_string("sqlite://:memory:") == ":memory:"
+    assert parse_connection_string("plain/tm.db") == "plain/tm.db"
+    with pytest.raises(ValueError):
+        parse_connection_string("postgres://host/db")
+
+
+def test_put_and_get_are_scoped_by_languages_and_translator(tm):
+    tm.put("Hello", "Ahoj", "en", "cs", "deepl")
+    assert tm.get("Hello", "EN", "cs", "deepl") == "Ahoj"
+    assert tm.get("Hello", "en", "de", "deepl") is None
+    assert tm.get("Hello", "en", "cs", "google") is None
+
+
+def test_get_many_reads_past_the_lru(tm):
+    tm.put_many([(f"t{i}", f"p{i}") for i in range(5)], "en", "cs", "x")
+    assert len(tm._lru) == 2
+    assert tm.get_many([f"t{i}" for i in range(6)], "en", "cs", "x") == {f"t{i}": f"p{i}" for i in range(5)}
+
+
+def test_hits_and_misses_count_unique_texts(tm):
+    tm.put("a", "A", "en", "cs", "x")
+    assert tm.get_many(["a", "a", "b", "b", "b"], "en", "cs", "x") == {"a": "A"}
+    assert (tm.hits, tm.misses) == (1, 1)
+    tm.get_many(["a", "c"], "en", "cs", "x")
+    assert (tm.hits, tm.misses) == (2, 2)
+
+
+def test_evict_trims_least_recently_used(tm):
+    tm.max_entries = 10
+    tm.put_many([(f"t{i}", f"p{i}") for i in range(11)], "en", "cs", "x")
+    assert len(tm) == 9
+
+
+def test_from_plugin_requires_backend():
+    plugin = Plugin("tm", PluginType.TRANSLATOR, {"connection_string": "sqlite://:memory:"})
+    with pytest.raises(ValueError):
+        TranslationMemory.from_plugin(plugin)
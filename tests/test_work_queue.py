@@ -0,0 +1,175 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from services import queue_worker
+from services.delta_service import content_hash
+from services.queue_worker import QueueWorker
+from services.translation_engine import TranslationEngine
+from services.work_queue import HttpQueue, SQLiteQueue, WorkQueue, open_queue, serve
+from tools.fake_translator import FakeTranslator
+
+
+def _items(texts):
+    return [(key, content_hash(text), {"text": text, "source": "en"}) for key, text in texts.items()]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteQueue(tmp_path / "queue.sqlite", max_attempts=2, retry_delay=0.0)
+    yield q
+    q.close()
+
+
+def _locales(tmp_path, source):
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    (locales / "en.json").write_text(json.dumps(source), encoding="utf-8")
+    (locales / "cs.json").write_text("{}", encoding="utf-8")
+    return locales
+
+
+def test_work_queue_is_abstract():
+    with pytest.raises(TypeError):
+        WorkQueue()
+
+
+def test_submit_is_idempotent(queue):
+    assert queue.submit("job", "cs", _items({"a": "A", "b": "B"})) == 2
+    assert queue.submit("job", "cs", _items({"a": "A"})) == 0
+    assert queue.submit("job", "cs", _items({"a": "A changed"})) == 1
+    assert queue.stats()["cs"].ready == 3
+
+
+def test_lease_complete_and_results(queue):
+    queue.submit("job", "cs", _items({"a": "A", "b": "B"}))
+    queue.submit("job", "de", _items({"a": "A"}))
+    tasks = queue.lease("w1", limit=10)
+    assert {t.shard for t in tasks} == {"cs"} and len(tasks) == 2
+    assert queue.lease("w2", shards=["cs"]) == []
+    assert queue.complete(tasks[0].lease, {t.id: t.payload["text"].lower() for t in tasks}) == 2
+    assert [(key, text) for _, key, _, text in queue.results("cs")] == [("a", "a"), ("b", "b")]
+    stats = queue.stats()
+    assert (stats["cs"].done, stats["de"].ready) == (2, 1)
+
+
+def test_expired_lease_is_released_and_late_results_ignored(queue):
+    queue.submit("job", "cs", _items({"a": "A"}))
+    first = queue.lease("w1", visibility=0.05)
+    time.sleep(0.1)
+    second = queue.lease("w2", visibility=60)
+    assert [t.id for t in second] == [first[0].id]
+    assert second[0].attempts == 2
+    assert queue.complete(first[0].lease, {first[0].id: "late"}) == 0
+    assert queue.complete(second[0].lease, {second[0].id: "ok"}) == 1
+
+
+def test_failed_tasks_go_dead_and_can_be_retried(queue):
+    queue.submit("job", "cs", _items({"a": "A"}))
+    for _ in range(2):
+        tasks = queue.lease("w1")
+        assert queue.fail(tasks[0].lease, [t.id for t in tasks], "boom") == 1
+    assert queue.lease("w1") == []
+    assert queue.stats()["cs"].dead == 1
+    assert queue.retry_dead("cs") == 1
+    assert len(queue.lease("w1")) == 1
+
+
+def test_collect_drains_every_page(queue, tmp_path):
+    source = {f"k{i}": f"Text {i}" for i in range(25)}
+    locales = _locales(tmp_path, source)
+    assert queue_worker.submit_targets(queue, locales) == {"cs": 25}
+    tasks = queue.lease("w1", limit=100)
+    queue.complete(tasks[0].lease, {t.id: f"[cs] {t.payload['text']}" for t in tasks})
+    assert queue_worker.collect(queue, locales, page=10) == {"cs": 25}
+    catalog = json.loads((locales / "cs.json").read_text(encoding="utf-8"))
+    assert catalog == {k: f"[cs] {v}" for k, v in source.items()}
+    assert queue.stats() == {}
+
+
+def test_collect_drops_results_of_changed_source(queue, tmp_path):
+    locales = _locales(tmp_path, {"a": "A"})
+    queue_worker.submit_targets(queue, locales)
+    (locales / "en.json").write_text(json.dumps({"a": "A2"}), encoding="utf-8")
+    tasks = queue.lease("w1")
+    queue.complete(tasks[0].lease, {tasks[0].id: "old"})
+    assert queue_worker.collect(queue, locales) == {"cs": 0}
+    assert json.loads((locales / "cs.json").read_text(encoding="utf-8")) == {}
+
+
+def test_worker_translates_until_idle(queue, tmp_path):
+    locales = _locales(tmp_path, {f"k{i}": f"Text {i}" for i in range(30)})
+    queue_worker.submit_targets(queue, locales)
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url)
+        try:
+            return await QueueWorker(queue, engine, batch=7, idle=0.01).run(until_idle=True)
+        finally:
+            await engine.aclose()
+            await server.stop()
+
+    assert asyncio.run(run()) == 30
+    assert queue_worker.collect(queue, locales) == {"cs": 30}
+
+
+def test_worker_with_middleware_uses_the_memory(queue, tmp_path):
+    from services.middleware_pipeline import MiddlewarePipeline, Normalize
+    from services.translation_memory import TranslationMemory
+
+    locales = _locales(tmp_path, {"a": "Known", "b": " Fresh "})
+    queue_worker.submit_targets(queue, locales)
+    memory = TranslationMemory(f"sqlite:///{tmp_path / 'tm.db'}")
+
+    async def run():
+        server = FakeTranslator()
+        url = await server.start()
+        engine = TranslationEngine(url)
+        memory.put_many([("Known", "Známé")], "en", "cs", engine.name)
+        try:
+            worker = QueueWorker(queue, engine, memory, MiddlewarePipeline([Normalize()]), idle=0.01)
+            await worker.run(until_idle=True)
+            return server.texts, engine.name
+        finally:
+            await engine.aclose()
+            await server.stop()
+
+    try:
+        texts, name = asyncio.run(run())
+        assert texts == 1
+        assert memory.get_many(["Fresh"], "en", "cs", name) == {"Fresh": "[cs] Fresh"}
+    finally:
+        memory.close()
+    queue_worker.collect(queue, locales)
+    assert json.loads((locales / "cs.json").read_text(encoding="utf-8")) == {"a": "Známé", "b": " [cs] Fresh "}
+
+
+def test_http_queue_round_trip(queue):
+    server = serve(queue, port=0, token="secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}?token=secret"
+        remote = open_queue(url)
+        assert isinstance(remote, HttpQueue)
+        assert remote.submit("job", "cs", _items({"a": "A"})) == 1
+        tasks = remote.lease("remote")
+        assert tasks[0].payload == {"text": "A", "source": "en"}
+        assert remote.complete(tasks[0].lease, {tasks[0].id: "Á"}) == 1
+        assert [r[1:] for r in remote.results("cs")] == [("a", content_hash("A"), "Á")]
+        assert remote.stats()["cs"].done == 1
+        with pytest.raises(Exception):
+            HttpQueue(url.split("?")[0]).stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_open_queue_rejects_unknown_scheme():
+    with pytest.raises(ValueError):
+        open_queue("ftp://example.com/queue")
@@ -0,0 +1,148 @@
+# tools/fake_translator.py
+"""Local stand-in translation server for exercising TRANSLATOR plugins.
+
+Speaks the TranslationEngine protocol and "translates" by prefixing the target
+language: ``python -m tools.fake_translator --port 8765``.
+
+Throttling can be injected to exercise rate limiting: ``capacity`` concurrent
+requests (latency grows with load, beyond it 429), ``rate_limit`` requests per
+second (429 with ``Retry-After``) and a random ``error_rate`` of 503s.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+
+class FakeTranslator:
+    def __init__(
+        self,
+        delay: float = 0.0,
+        capacity: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        retry_after: float = 1.0,
+        error_rate: float = 0.0,
+    ) -> None:
+        self.delay = delay
+        self.capacity = capacity
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.connections = 0
+        self.requests = 0
+        self.texts = 0
+        self.throttled = 0
+        self.active = 0
+        self.peak_active = 0
+        self._tokens = float(rate_limit or 0)
+        self._stamp = time.monotonic()
+        self._server: asyncio.AbstractServer | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    def translate(self, text: str, target: str) -> str:
+        return f"[{target}] {text}"
+
+    def _over_rate(self) -> bool:
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        self._tokens = min(self.rate_limit, self._tokens + (now - self._stamp) * self.rate_limit)
+        self._stamp = now
+        if self._tokens < 1:
+            return True
+        self._tokens -= 1
+        return False
+
+    async def respond(self, payload: dict) -> Tuple[int, Dict[str, str], dict]:
+        if self._over_rate() or (self.capacity is not None and self.active >= self.capacity):
+            self.throttled += 1
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, {"error": "too many requests"}
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, {}, {"error": "unavailable"}
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            if self.delay:
+                # an overloaded backend answers slower
+                load = self.active / self.capacity if self.capacity else 0.0
+                await asyncio.sleep(self.delay * (1 + load))
+        finally:
+            self.active -= 1
+        texts = payload.get("texts", [])
+        self.texts += len(texts)
+        target = payload.get("target", "")
+        return 200, {}, {"translations": [self.translate(t, target) for t in texts]}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                try:
+                    status, extra, data = await self.respond(json.loads(body or b"{}"))
+                except ValueError:
+                    status, extra, data = 400, {}, {"error": "invalid json"}
+                out = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                head = f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\nContent-Length: {len(out)}\r\n"
+                head += "".join(f"{k}: {v}\r\n" for k, v in extra.items()) + "\r\n"
+                writer.write(head.encode("latin-1") + out)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+            self._handlers.discard(task)  # type: ignore[arg-type]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/translate"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._handlers):
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = FakeTranslator(args.delay, args.capacity, args.rate_limit, args.retry_after, args.error_rate)
+    url = await server.start(args.host, args.port)
+    print(f"fake translator listening on {url}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds of latency per request")
+    parser.add_argument("--capacity", type=int, default=None, help="concurrent requests before 429")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 503")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
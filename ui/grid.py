@@ -0,0 +1,283 @@
+# ui/grid.py
+from __future__ import annotations
+import threading
+
+from rich.segment import Segment
+from rich.style import Style
+from textual import events, work
+from textual.binding import Binding
+from textual.geometry import Size
+from textual.message import Message
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+from services.row_source import Row, RowSource
+
+MAX_COLUMN = 48  # šířka sloupce nejvýš (znaky), delší text se ořízne
+
+
+class VirtualGrid(ScrollView, can_focus=True):
+    """Read-only grid over a :class:`RowSource` that renders only visible lines.
+
+    Rows are fetched in windows around the viewport (a few screens at most stay
+    in memory); windows of ``lazy`` sources are read in a worker thread and drawn
+    when they arrive. Sorting (click a header or ``s``/``r``) and filtering run in
+    a worker thread; the grid keeps showing the old rows until they finish. A
+    replaced source with a ``close()`` method is closed.
+    """
+
+    DEFAULT_CSS = """
+    VirtualGrid {
+        height: 1fr;
+        background: $surface;
+    }
+    VirtualGrid > .virtual-grid--header { text-style: bold; background: $panel; }
+    VirtualGrid > .virtual-grid--cursor { background: $accent 40%; }
+    """
+    COMPONENT_CLASSES = {"virtual-grid--header", "virtual-grid--cursor"}
+    BINDINGS = [
+        Binding("up", "cursor(-1)", show=False),
+        Binding("down", "cursor(1)", show=False),
+        Binding("pageup", "page(-1)", show=False),
+        Binding("pagedown", "page(1)", show=False),
+        Binding("home", "edge(0)", show=False),
+        Binding("end", "edge(1)", show=False),
+        Binding("s", "next_sort", "Sort"),
+        Binding("r", "reverse_sort", "Reverse"),
+    ]
+
+    cursor_row: reactive[int] = reactive(0)
+
+    class RowHighlighted(Message):
+        def __init__(self, grid: "VirtualGrid", position: int, row: Row | None) -> None:
+            super().__init__()
+            self.grid = grid
+            self.position = position
+            self.row = row
+
+    class Changed(Message):
+        """Row count changed after a filter or a new source."""
+        def __init__(self, grid: "VirtualGrid", count: int) -> None:
+            super().__init__()
+            self.grid = grid
+            self.count = count
+
+    def __init__(self, source: RowSource | None = None, headers: dict[str, str] | None = None,
+                 window: int = 3, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.headers = headers or {}
+        self.window = window  # obrazovek nad i pod viewportem v cache
+        self._lock = threading.Lock()
+        self._count = 0
+        self._widths: list[int] = []
+        self._cache_start = 0
+        self._cache: list[Row] = []
+        self._generation = 0  # zvyšuje _reset – načtené okno starého pohledu se zahodí
+        self._fetching: int | None = None  # začátek okna, které se právě čte
+        self._unhighlighted: int | None = None  # kurzor na řádku, který ještě nedorazil
+        self.source: RowSource | None = None
+        self._initial = source
+
+    def on_mount(self) -> None:
+        if self._initial is not None:
+            self.set_source(self._initial)
+            self._initial = None
+
+    def on_unmount(self) -> None:
+        with self._lock:
+            if self.source is not None and hasattr(self.source, "close"):
+                self.source.close()
+
+    # --- data ---
+    def set_source(self, source: RowSource) -> None:
+        with self._lock:
+            old, self.source = self.source, source
+            self._count = len(source)
+            sample = source.rows(0, 200)
+            if old is not None and old is not source and hasattr(old, "close"):
+                old.close()
+        self._widths = self._measure(sample)
+        self._reset()
+
+    def _measure(self, sample: list[Row]) -> list[int]:
+        assert self.source is not None
+        widths = []
+        for i, name in enumerate(self.source.columns):
+            longest = max((len(r[i]) for r in sample if i < len(r)), default=0)
+            widths.append(min(MAX_COLUMN, max(len(self.headers.get(name, name)) + 2, longest)))
+        return widths
+
+    def _reset(self) -> None:
+        self._cache = []
+        self._cache_start = 0
+        self._generation += 1
+        self._fetching = None
+        self.virtual_size = Size(sum(self._widths) + len(self._widths), self._count + 1)
+        self.cursor_row = min(self.cursor_row, max(0, self._count - 1))
+        self.refresh()
+        self.post_message(self.Changed(self, self._count))
+
+    def set_header(self, name: str, label: str) -> None:
+        self.headers[name] = label
+        self.refresh()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def row(self, position: int) -> Row | None:
+        """Row at ``position`` of the current view (from the window cache when possible)."""
+        if not 0 <= position < self._count or self.source is None:
+            return None
+        offset = position - self._cache_start
+        if not 0 <= offset < len(self._cache):
+            height = max(self.size.height, 1)
+            start = max(0, position - height * self.window)
+            count = height * (2 * self.window + 1)
+            if self.source.lazy:
+                if self._fetching is None or not self._fetching <= position < self._fetching + count:
+                    self._fetching = start
+                    self._fetch(start, count, self._generation)
+                return None
+            if not self._lock.acquire(blocking=False):
+                return None  # filtr/řazení právě běží – vykreslí se po dokončení
+            try:
+                self._cache = self.source.rows(start, count)
+                self._cache_start = start
+            finally:
+                self._lock.release()
+            offset = position - start
+        return self._cache[offset] if 0 <= offset < len(self._cache) else None
+
+    @work(thread=True, group="virtual-grid-rows")
+    def _fetch(self, start: int, count: int, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or self.source is None:
+                return
+            rows = self.source.rows(start, count)
+        self.app.call_from_thread(self._fetched, start, rows, generation)
+
+    def _fetched(self, start: int, rows: list[Row], generation: int) -> None:
+        if generation != self._generation:
+            return  # mezitím jiný filtr/řazení/zdroj
+        if self._fetching == start:
+            self._fetching = None
+        self._cache, self._cache_start = rows, start
+        self.refresh()
+        position = self._unhighlighted
+        if position is not None and start <= position < start + len(rows):
+            self._unhighlighted = None
+            self.post_message(self.RowHighlighted(self, position, rows[position - start]))
+
+    # --- sort & filter (worker thread) ---
+    @work(thread=True, exclusive=True, group="virtual-grid")
+    def apply(self, query: str | None = None, sort: tuple[int | None, bool] | None = None) -> None:
+        if self.source is None:
+            return
+        with self._lock:
+            if sort is not None:
+                self.source.sort(*sort)
+            if query is not None:
+                self.source.filter(query)
+            count = len(self.source)
+        self.app.call_from_thread(self._applied, count)
+
+    def _applied(self, count: int) -> None:
+        self._count = count
+        self.scroll_to(y=0, animate=False)
+        self.cursor_row = 0
+        self._reset()
+
+    def filter(self, query: str) -> None:
+        self.apply(query=query)
+
+    def sort(self, column: int | None, reverse: bool = False) -> None:
+        self.apply(sort=(column, reverse))
+
+    def action_next_sort(self) -> None:
+        if self.source is None or not self.source.columns:
+            return
+        current = getattr(self.source, "sort_column", None)
+        column = 0 if current is None else current + 1
+        self.sort(column if column < len(self.source.columns) else None)
+
+    def action_reverse_sort(self) -> None:
+        if self.source is not None:
+            self.sort(getattr(self.source, "sort_column", None), not getattr(self.source, "reverse", False))
+
+    def on_click(self, event: events.Click) -> None:
+        if event.y == 0 and self.source is not None:
+            x = event.x + int(self.scroll_x)
+            edge = 0
+            for i, width in enumerate(self._widths):
+                edge += width + 1
+                if x < edge:
+                    same = getattr(self.source, "sort_column", None) == i
+                    self.sort(i, same and not getattr(self.source, "reverse", False))
+                    return
+        elif event.y > 0:
+            self.cursor_row = int(self.scroll_y) + event.y - 1
+
+    # --- cursor ---
+    def watch_cursor_row(self, value: int) -> None:
+        if not self._count:
+            return
+        self._scroll_cursor_into_view(value)
+        self.refresh()
+        row = self.row(value)
+        self._unhighlighted = value if row is None else None
+        self.post_message(self.RowHighlighted(self, value, row))
+
+    def _scroll_cursor_into_view(self, value: int) -> None:
+        visible = max(1, self.size.height - 1)  # bez hlavičky
+        top = int(self.scroll_y)
+        if value < top:
+            self.scroll_to(y=value, animate=False)
+        elif value >= top + visible:
+            self.scroll_to(y=value - visible + 1, animate=False)
+
+    def action_cursor(self, delta: int) -> None:
+        if self._count:
+            self.cursor_row = max(0, min(self._count - 1, self.cursor_row + delta))
+
+    def action_page(self, direction: int) -> None:
+        self.action_cursor(direction * max(1, self.size.height - 2))
+
+    def action_edge(self, end: int) -> None:
+        if self._count:
+            self.cursor_row = self._count - 1 if end else 0
+
+    # --- rendering ---
+    def _cells(self, values: Row | tuple[str, ...], style: Style) -> list[Segment]:
+        segments = []
+        for value, width in zip(values, self._widths):
+            text = value.replace("\n", "⏎")
+            text = text if len(text) <= width else text[:width - 1] + "…"
+            segments.append(Segment(text.ljust(width) + " ", style))
+        return segments
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        scroll_x = int(self.scroll_x)
+        base = self.rich_style
+        if self.source is None:
+            return Strip.blank(width, base)
+        if y == 0:
+            header_style = base + self.get_component_rich_style("virtual-grid--header")
+            sort_column = getattr(self.source, "sort_column", None)
+            arrow = "▼" if getattr(self.source, "reverse", False) else "▲"
+            labels = tuple(
+                f"{self.headers.get(name, name)}{' ' + arrow if i == sort_column else ''}"
+                for i, name in enumerate(self.source.columns))
+            strip = Strip(self._cells(labels, header_style))
+        else:
+            position = int(self.scroll_y) + y - 1
+            row = self.row(position)
+            if row is None:
+                return Strip.blank(width, base)
+            style = base
+            if position == self.cursor_row and self.has_focus:
+                style = base + self.get_component_rich_style("virtual-grid--cursor")
+            strip = Strip(self._cells(row, style))
+        return strip.crop_extend(scroll_x, scroll_x + width, base)
@@ -10,6 +10,7 @@ ICON_SETS = {
         "plugins": "🧩",
         "dictionaries": "📚",
         "settings": "⚙️",
+        "metrics": "📈",
     },
     "text": {  # preferovaná výchozí sada – stabilní šířka
         "home": "⌂",
@@ -19,10 +20,11 @@ ICON_SETS = {
         "plugins": "⊞",
         "dictionaries": "≡",
         "settings": "⚙︎",   # U+2699 + FE0E
+        "metrics": "∿",
     },
     "none": {
         "home": "", "back": "", "targets": "", "scheduler": "",
-        "plugins": "", "dictionaries": "", "settings": "",
+        "plugins": "", "dictionaries": "", "settings": "", "metrics": "",
     },
 }
 
@@ -0,0 +1,287 @@
+# ui/jobs.py
+"""Long jobs off the event loop, with progress the UI draws at a fixed rate.
+
+A job is a function ``fn(job)`` (or ``async def``) run in a Textual thread
+worker. It reports through :meth:`Job.progress` as often as it likes – that
+only stores numbers – and calls :meth:`Job.checkpoint` where it may pause or
+stop. The runner looks at the jobs ``fps`` times a second and hands only the
+changed ones to its listeners, so thousands of updates per second cost the UI
+a handful of refreshes.
+"""
+from __future__ import annotations
+import asyncio
+import inspect
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.timer import Timer
+from textual.widgets import Button, ProgressBar, Static
+
+JobFn = Callable[["Job"], Any]
+Listener = Callable[[List["Job"], List["Job"]], None]  # (changed, removed)
+
+RUNNING, PAUSED, DONE, CANCELLED, FAILED = "running", "paused", "done", "cancelled", "failed"
+
+
+class JobCancelled(Exception):
+    """Raised by :meth:`Job.checkpoint` after :meth:`Job.cancel`."""
+
+
+class Job:
+    """Handle shared by the job (progress, checkpoints) and the UI (pause, resume, cancel)."""
+
+    def __init__(self, name: str, label: str = "") -> None:
+        self.name = name
+        self.label = label or name
+        self.done = 0
+        self.total: Optional[int] = None
+        self.detail = ""
+        self.state = RUNNING
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.version = 0  # roste s každou změnou; runner porovnává se zobrazenou
+        self._shown = -1
+        self._cancel = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._on_done: Optional[Callable[["Job"], None]] = None
+
+    # --- from the job (any thread); just stores values ---
+    def progress(self, done: int, total: Optional[int] = None, detail: Optional[str] = None) -> None:
+        self.done = done
+        if total is not None:
+            self.total = total
+        if detail is not None:
+            self.detail = detail
+        self.version += 1
+
+    def advance(self, count: int = 1) -> None:
+        self.done += count
+        self.version += 1
+
+    def checkpoint(self) -> None:
+        """Block while paused; raise :class:`JobCancelled` once cancelled."""
+        if not self._resume.is_set():
+            self._resume.wait()
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # --- from the UI ---
+    @property
+    def active(self) -> bool:
+        return self.state in (RUNNING, PAUSED)
+
+    def pause(self) -> None:
+        if self.state == RUNNING:
+            self._resume.clear()
+            self.state = PAUSED
+            self.version += 1
+
+    def resume(self) -> None:
+        if self.state == PAUSED:
+            self.state = RUNNING
+            self._resume.set()
+            self.version += 1
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        self._resume.set()  # pozastavený job se musí probudit, aby skončil
+
+    @property
+    def rate(self) -> float:
+        """Units per second since the start."""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+
+class JobRunner:
+    """Starts jobs in Textual thread workers and batches their progress for the UI.
+
+    :meth:`io` and :meth:`offload` run short blocking calls (file reads and
+    writes) on a small thread pool, so event handlers never wait on the disk.
+    """
+
+    FPS = 10
+    KEEP = 5.0  # s, jak dlouho zůstane dokončený job vidět
+
+    def __init__(self, app: Any, fps: float = FPS, io_threads: int = 4) -> None:
+        self.app = app
+        self.fps = fps
+        self.jobs: Dict[str, Job] = {}
+        self._listeners: List[Listener] = []
+        self._timer: Optional[Timer] = None
+        self._pool = ThreadPoolExecutor(io_threads, thread_name_prefix="ui-io")
+
+    # --- jobs ---
+    def start(self, name: str, fn: JobFn, label: str = "",
+              on_done: Optional[Callable[[Job], None]] = None) -> Job:
+        """Run ``fn(job)`` in a thread worker and return its job.
+
+        While a job of the same name is still running (cancelled ones too, until
+        their thread ends) nothing is started and that job is returned, so two
+        runs never write the same files. ``on_done(job)`` is called on the UI
+        thread after the job ends (in any state).
+        """
+        previous = self.jobs.get(name)
+        if previous is not None:
+            if previous.finished is None:
+                return previous
+            if previous._on_done is not None:
+                # skončil, ale _tick ho ještě neohlásil – nový job ho v self.jobs nahradí
+                callback, previous._on_done = previous._on_done, None
+                callback(previous)
+        job = Job(name, label)
+        job._on_done = on_done
+        self.jobs[name] = job
+        self.app.run_worker(partial(self._run, job, fn), name=f"job:{name}", group="jobs", thread=True,
+                            exit_on_error=False)
+        if self._timer is None:
+            self._timer = self.app.set_interval(1 / self.fps, self._tick)
+        return job
+
+    def busy(self, name: str) -> bool:
+        """A job of this name is running (its thread has not ended yet)."""
+        job = self.jobs.get(name)
+        return job is not None and job.finished is None
+
+    @staticmethod
+    def _run(job: Job, fn: JobFn) -> None:
+        try:
+            if inspect.iscoroutinefunction(fn):
+                job.result = asyncio.run(fn(job))  # vlastní smyčka ve vlákně jobu
+            else:
+                job.result = fn(job)
+            job.state = CANCELLED if job.cancelled else DONE
+        except JobCancelled:
+            job.state = CANCELLED
+        except Exception as e:
+            job.error = e
+            job.state = FAILED
+        finally:
+            job.finished = time.monotonic()
+            job.version += 1
+
+    def cancel_all(self) -> None:
+        for job in self.jobs.values():
+            job.cancel()
+
+    def watch(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def unwatch(self, listener: Listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        changed: List[Job] = []
+        removed: List[Job] = []
+        for name, job in list(self.jobs.items()):
+            if job.version != job._shown:
+                job._shown = job.version
+                changed.append(job)
+                if job.finished is not None and job._on_done is not None:
+                    callback, job._on_done = job._on_done, None
+                    callback(job)
+            elif job.finished is not None and now - job.finished >= self.KEEP:
+                del self.jobs[name]
+                removed.append(job)
+        if changed or removed:
+            for listener in list(self._listeners):
+                listener(changed, removed)
+        if not self.jobs and self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    # --- short blocking calls ---
+    def io(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> "Future[Any]":
+        """Run ``fn`` on the I/O pool without waiting (fire and forget from a handler)."""
+        return self._pool.submit(fn, *args, **kwargs)
+
+    async def offload(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Await ``fn(*args)`` run on the I/O pool."""
+        return await asyncio.wrap_future(self.io(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._pool.shutdown(wait=True)
+
+
+class JobRow(Horizontal):
+    DEFAULT_CSS = '\nJobRow {\n    height: 1;\n}\nJobRow .job-label {\n    width: 28;\n}\nJobRow ProgressBar {\n    width: 1fr;\n}\nJobRow .job-detail {\n    width: 30;\n    padding: 0 1;\n}\nJobRow Button {\n    min-width: 5;\n    height: 1;\n    border: none;\n}\n'
+
+    def __init__(self, job: Job, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.job = job
+
+    def compose(self) -> ComposeResult:
+        yield Static(self.job.label, classes="job-label")
+        yield ProgressBar(total=self.job.total, show_eta=True)
+        yield Static("", classes="job-detail")
+        yield Button("⏸", classes="job-pause")
+        yield Button("✖", classes="job-cancel")
+
+    def show(self) -> None:
+        job = self.job
+        self.query_one(ProgressBar).update(total=job.total, progress=job.done)
+        state = "" if job.state == RUNNING else f"[{job.state}] "
+        rate = f"{job.rate:,.0f}/s" if job.done else ""
+        self.query_one(".job-detail", Static).update(f"{state}{job.detail} {rate}".strip())
+        self.query_one(".job-pause", Button).label = "▶" if job.state == PAUSED else "⏸"
+        self.query_one(".job-pause", Button).disabled = self.query_one(".job-cancel", Button).disabled = not job.active
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        if event.button.has_class("job-cancel"):
+            self.job.cancel()
+        elif self.job.state == PAUSED:
+            self.job.resume()
+        else:
+            self.job.pause()
+
+
+class JobsPanel(Vertical):
+    """One row per job (progress, rate, pause/resume, cancel); hidden while there are none."""
+
+    DEFAULT_CSS = '\nJobsPanel {\n    dock: bottom;\n    height: auto;\n    max-height: 8;\n    padding: 0 1;\n    background: $surface;\n}\n'
+
+    def __init__(self, runner: JobRunner, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.runner = runner
+        self._rows: Dict[Job, JobRow] = {}
+
+    def on_mount(self) -> None:
+        self.display = False
+        self.runner.watch(self.update_jobs)
+
+    def on_unmount(self) -> None:
+        self.runner.unwatch(self.update_jobs)
+
+    def update_jobs(self, changed: List[Job], removed: List[Job]) -> None:
+        for job in removed:
+            row = self._rows.pop(job, None)
+            if row is not None:
+                row.remove()
+        for job in changed:
+            row = self._rows.get(job)
+            if row is None:
+                # starší, už dokončený job stejného jména nahradí nový řádek
+                for old in [j for j in self._rows if j.name == job.name and j is not job]:
+                    self._rows.pop(old).remove()
+                row = self._rows[job] = JobRow(job)
+                self.mount(row)
+                self.call_after_refresh(row.show)
+            else:
+                row.show()
+        self.display = bool(self._rows)
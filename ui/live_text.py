@@ -0,0 +1,88 @@
+# ui/live_text.py
+"""Which widgets show which translation keys.
+
+When a catalog is edited on disk only the widgets bound to a changed key get
+their text set again; nothing is recomposed.
+"""
+from __future__ import annotations
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from rich.text import Text
+from textual.widget import Widget
+from textual.widgets import Button, DataTable, Input, Static
+
+W = TypeVar("W", bound=Widget)
+Update = Callable[[Widget, str], None]
+Format = Callable[[str], str]
+
+
+def set_text(widget: Widget, text: str) -> None:
+    """Default update: button label, input placeholder or static content."""
+    if isinstance(widget, Button):
+        widget.label = text
+    elif isinstance(widget, Input):
+        widget.placeholder = text
+    elif isinstance(widget, Static):
+        widget.update(text)
+    else:
+        raise TypeError(f"No default text update for {type(widget).__name__}")
+
+
+def column_label(column: Hashable) -> Update:
+    """Update of a :class:`DataTable` column header (by column key)."""
+    def update(table: Widget, text: str) -> None:
+        assert isinstance(table, DataTable)
+        col = next((c for key, c in table.columns.items() if key == column), None)
+        if col is None:
+            return
+        col.label = Text(text)
+        col.content_width = max(col.content_width, col.label.cell_len)
+        table._require_update_dimensions = True  # přepočet šířek jako po add_column
+        table.refresh()
+    return update
+
+
+def _same(text: str) -> str:
+    return text
+
+
+class LiveText:
+    """Registry of ``key -> widgets``; widgets are held weakly (evicted views just drop out)."""
+
+    def __init__(self, translate: Callable[[str], str]) -> None:
+        self.translate = translate
+        self._bound: Dict[str, "weakref.WeakKeyDictionary[Widget, List[Tuple[Format, Update]]]"] = {}
+
+    def bind(self, widget: W, key: str, fmt: Optional[Format] = None, update: Optional[Update] = None) -> W:
+        """Keep ``widget`` showing ``fmt(t(key))``; returns the widget (handy in ``compose``)."""
+        self._bound.setdefault(key, weakref.WeakKeyDictionary()).setdefault(widget, []).append(
+            (fmt or _same, update or set_text))
+        return widget
+
+    def keys(self) -> List[str]:
+        return [key for key, widgets in self._bound.items() if len(widgets)]
+
+    def refresh(self, keys: Iterable[str]) -> int:
+        """Set the text of widgets bound to ``keys`` again; returns how many were updated."""
+        count = 0
+        for key in keys:
+            widgets = self._bound.get(key)
+            if not widgets:
+                continue
+            text = self.translate(key)
+            for widget, entries in list(widgets.items()):
+                if not widget.is_attached:
+                    continue
+                for fmt, update in entries:
+                    update(widget, fmt(text))
+                count += 1
+        return count
+
+
+def live(app: Any, widget: W, key: str, fmt: Optional[Format] = None, update: Optional[Update] = None) -> W:
+    """Bind ``widget`` in the app's :class:`LiveText` (``app.live_text``); a no-op in other apps."""
+    registry = getattr(app, "live_text", None)
+    if isinstance(registry, LiveText):
+        registry.bind(widget, key, fmt, update)
+    return widget
@@ -4,6 +4,8 @@ from textual.screen import ModalScreen
 from textual.app import ComposeResult
 from textual.widgets import Input, ListView, ListItem, Label
 from textual.events import Key
+from textual.timer import Timer
+from services.search_index import SearchIndex, SearchItem
 
 BUILTIN_THEMES = [
     "textual-dark", "textual-light", "nord", "gruvbox",
@@ -34,9 +36,14 @@ class PaletteScreen(ModalScreen[str | None]):
     }
     """
 
+    DEBOUNCE = 0.08  # s – sloučí rychlé psaní do jednoho přefiltrování
+
     def __init__(self, mode: str = "commands") -> None:
         super().__init__()
         self.mode = mode  # "commands" | "themes"
+        self._index: SearchIndex | None = None
+        self._shown: list[str] = []  # hodnoty aktuálně zobrazených položek (v pořadí)
+        self._debounce: Timer | None = None
 
     def compose(self) -> ComposeResult:
         i18n = getattr(self.app, "i18n", None)
@@ -46,23 +53,17 @@ class PaletteScreen(ModalScreen[str | None]):
         yield Input(placeholder=t("pal.placeholder.commands"), id="search")
         yield ListView(id="list")
 
-    def on_mount(self) -> None:
-        self._refresh_items()
+    async def on_mount(self) -> None:
+        await self._refresh_items()
 
-    def _refresh_items(self, query: str = "") -> None:
+    def _build_index(self) -> SearchIndex:
+        """Přeloží popisky jednou a postaví vyhledávací index pro aktuální režim."""
         i18n = getattr(self.app, "i18n", None)
         t = (i18n.t if i18n else (lambda k, **v: k))
-        lv = self.query_one("#list", ListView)
-        lv.clear()
+        entries: list[tuple[str, str, str]] = []
 
         def add(key: str, desc_key: str, value: str) -> None:
-            name = t(key)
-            desc = t(desc_key)
-            if query and query.casefold() not in (name + " " + desc).casefold():
-                return
-            li = ListItem(Label(name), Label(desc))
-            li.data = value # type: ignore
-            lv.append(li)
+            entries.append((value, t(key), t(desc_key)))
 
         if self.mode == "commands":
             # naše „aliasy“ na akce aplikace
@@ -78,9 +79,59 @@ class PaletteScreen(ModalScreen[str | None]):
                 # přeložený popisek motivu, když existuje
                 key = f"theme.{th}" if i18n and i18n.has(f"theme.{th}") else th
                 add(key, "theme.description", f"theme:{th}")
+        return SearchIndex(entries)
+
+    async def _refresh_items(self, query: str = "") -> None:
+        if self._index is None:
+            self._index = self._build_index()
+        await self._sync_list(self._index.search(query))
+
+    @staticmethod
+    def _make_item(item: SearchItem) -> ListItem:
+        li = ListItem(Label(item.label), Label(item.desc))
+        li.data = item.value # type: ignore
+        return li
+
+    async def _sync_list(self, results: list[SearchItem]) -> None:
+        """Upraví ListView na nový výsledek – odebere/vloží jen rozdíl, když to jde."""
+        lv = self.query_one("#list", ListView)
+        wanted = [r.value for r in results]
+        if wanted == self._shown:
+            return
+        by_value = {r.value: r for r in results}
+        old = set(self._shown)
+        keep = set(wanted)
+        if [v for v in self._shown if v in keep] != [v for v in wanted if v in old]:
+            # změnilo se pořadí přeživších – levnější je postavit seznam znovu
+            await lv.clear()
+            await lv.extend(self._make_item(r) for r in results)
+            self._shown = wanted
+            return
+
+        removed = [i for i, v in enumerate(self._shown) if v not in keep]
+        if removed:
+            await lv.remove_items(removed)
+        batch: list[ListItem] = []
+        batch_at = 0
+        for idx, value in enumerate(wanted + [None]):  # type: ignore[list-item]
+            if value is not None and value not in old:
+                if not batch:
+                    batch_at = idx
+                batch.append(self._make_item(by_value[value]))
+                continue
+            if batch:
+                if batch_at >= len(lv.children):
+                    await lv.extend(batch)
+                else:
+                    await lv.insert(batch_at, batch)
+                batch = []
+        self._shown = wanted
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        self._refresh_items(event.value)
+        if self._debounce is not None:
+            self._debounce.stop()
+        value = event.value
+        self._debounce = self.set_timer(self.DEBOUNCE, lambda: self._refresh_items(value))
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         data = event.item.data # type: ignore
@@ -92,7 +143,8 @@ class PaletteScreen(ModalScreen[str | None]):
             ph = self.app.i18n.t("pal.placeholder.themes") if hasattr(self.app, "i18n") else "Search for themes..." # type: ignore
             self.query_one("#search", Input).placeholder = ph
             self.query_one("#search", Input).value = ""
-            self._refresh_items("")
+            self._index = None
+            self.call_later(self._refresh_items, "")
             return
 
         if data == "cmd:maximize":
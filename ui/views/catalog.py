@@ -0,0 +1,215 @@
+from __future__ import annotations
+from functools import partial
+from pathlib import Path
+
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Horizontal
+from textual.timer import Timer
+from textual.widget import Widget
+from textual.widgets import Button, Input, Select, Static
+
+from services.row_source import catalog_source
+from services.work_queue import DEFAULT_QUEUE, WorkQueue, open_queue
+from ..grid import VirtualGrid
+from ..icons import icon
+from ..jobs import FAILED, Job
+from ..live_text import live
+
+
+class CatalogView(Widget):
+    """Key / source / translation rows of a target catalog in a virtualized grid."""
+
+    DEFAULT_CSS = '\nCatalogView {\n    padding: 1 2;\n}\n#catalog-bar {\n    height: auto;\n}\n#catalog-lang {\n    width: 24;\n}\n#catalog-filter {\n    width: 1fr;\n}\n#catalog-status {\n    height: 1;\n    padding: 0 1;\n}\n#catalog-queue {\n    height: 1;\n    padding: 0 1;\n}\n'
+    DEBOUNCE = 0.15  # s – filtr se spustí až po krátké pauze v psaní
+    QUEUE_REFRESH = 2.0  # s
+    PAGED_FROM = 100_000  # klíčů – větší katalog se drží v SQLite souboru, v paměti je jen okno gridu
+
+    def __init__(self, locales: Path = Path("./locales"), source_lang: str = "en", **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.locales = Path(locales)
+        self.source_lang = source_lang
+        self._debounce: Timer | None = None
+        self._queue: WorkQueue | None = None
+
+    def _t(self, key: str) -> str:
+        t = getattr(self.app, "t", None)
+        return t.t(key) if t is not None and hasattr(t, "t") else key
+
+    def _targets(self) -> list[str]:
+        return sorted(f.stem for f in self.locales.glob("*.json") if f.stem != self.source_lang)
+
+    def compose(self) -> ComposeResult:
+        icon_set = getattr(self.app, "icon_set", "none")
+        yield live(self.app, Static(f"{icon('targets', icon_set)} {self._t('ui.hub.targets')}".strip(), id="catalog-title"),
+                   "ui.hub.targets", lambda text: f"{icon('targets', icon_set)} {text}".strip())
+        targets = self._targets()
+        with Horizontal(id="catalog-bar"):
+            yield Select([(lang, lang) for lang in targets], value=targets[0] if targets else Select.BLANK,
+                         allow_blank=not targets, id="catalog-lang")
+            yield live(self.app, Input(placeholder=self._t("ui.catalog.filter"), id="catalog-filter"), "ui.catalog.filter")
+            yield live(self.app, Button(self._t("ui.catalog.translate"), id="catalog-translate"), "ui.catalog.translate")
+            yield live(self.app, Button(self._t("ui.queue.submit"), id="catalog-submit"), "ui.queue.submit")
+        grid = VirtualGrid(headers={name: self._t(f"ui.catalog.{name}") for name in ("key", "source", "translation")},
+                           id="catalog-grid")
+        for name in grid.headers:
+            live(self.app, grid, f"ui.catalog.{name}", update=lambda g, text, name=name: g.set_header(name, text))
+        yield grid
+        yield Static("", id="catalog-status")
+        yield Static("", id="catalog-queue")
+
+    def on_mount(self) -> None:
+        lang = self.query_one("#catalog-lang", Select).value
+        if isinstance(lang, str):
+            self._load(lang)
+        self._queue_status()
+        self.set_interval(self.QUEUE_REFRESH, self._queue_status)
+        jobs = getattr(self.app, "jobs", None)
+        if jobs is not None:
+            jobs.watch(self._jobs_changed)
+
+    def on_unmount(self) -> None:
+        jobs = getattr(self.app, "jobs", None)
+        if jobs is not None:
+            jobs.unwatch(self._jobs_changed)
+        if self._queue is not None:
+            self._queue.close()
+            self._queue = None
+
+    @property
+    def dirty(self) -> bool:
+        """A typed filter or a running translation – the app does not evict the view then."""
+        if self.query_one("#catalog-filter", Input).value:
+            return True
+        jobs = getattr(self.app, "jobs", None)
+        return jobs is not None and any(name.startswith("translate-") and jobs.busy(name) for name in list(jobs.jobs))
+
+    def _jobs_changed(self, changed: list[Job], removed: list[Job]) -> None:
+        self._translate_state()
+
+    def _translate_state(self) -> None:
+        # překlad jazyka, který ještě běží, nejde spustit podruhé
+        jobs = getattr(self.app, "jobs", None)
+        lang = self._lang()
+        self.query_one("#catalog-translate", Button).disabled = (
+            jobs is not None and lang is not None and jobs.busy(f"translate-{lang}"))
+
+    def _lang(self) -> str | None:
+        lang = self.query_one("#catalog-lang", Select).value
+        return lang if isinstance(lang, str) else None
+
+    @property
+    def queue(self) -> WorkQueue:
+        if self._queue is None:
+            settings = getattr(self.app, "settings", None)
+            self._queue = open_queue(settings.get("queue", DEFAULT_QUEUE) if settings is not None else DEFAULT_QUEUE)
+        return self._queue
+
+    def _queue_status(self, submitted: int | None = None) -> None:
+        lang = self._lang()
+        if lang is not None:
+            self._load_queue_status(lang, submitted)
+
+    @work(thread=True, exclusive=True, group="catalog-queue")
+    def _load_queue_status(self, lang: str, submitted: int | None = None) -> None:
+        try:
+            s = self.queue.stats().get(lang)
+            text = (f"{self._t('ui.queue.title')}: {self._t('ui.queue.ready')} {s.ready:,} · "
+                    f"{self._t('ui.queue.leased')} {s.leased:,} · {self._t('ui.queue.done')} {s.done:,} · "
+                    f"{self._t('ui.queue.dead')} {s.dead:,}") if s else ""
+            if submitted is not None:
+                text = f"{self._t('ui.queue.submitted')}: {submitted:,}   {text}".rstrip()
+        except Exception as e:  # nedostupný uzel fronty
+            text = f"{type(e).__name__}: {e}"
+        self.app.call_from_thread(self.query_one("#catalog-queue", Static).update, text)
+
+    @work(thread=True, exclusive=True, group="catalog-submit")
+    def _submit(self, lang: str) -> None:
+        from services.queue_worker import submit_targets
+        try:
+            added = submit_targets(self.queue, self.locales, self.source_lang, [lang])[lang]
+        except Exception as e:
+            self.app.call_from_thread(self.query_one("#catalog-queue", Static).update, f"{type(e).__name__}: {e}")
+            return
+        self.app.call_from_thread(self._queue_status, added)
+
+    async def _translate_job(self, lang: str, job: Job) -> int:
+        # běží ve vlákně jobu s vlastní smyčkou – engine a paměť si proto otevře sám
+        from enums.plugin_type import PluginType
+        from services.delta_service import DeltaTranslator
+        from services.job_journal import JobJournal
+        from services.translation_engine import TranslationEngine
+        from services.translation_memory import TranslationMemory
+
+        settings = getattr(self.app, "settings", None)
+        wanted = settings.get("translator") if settings is not None else None
+        plugins = getattr(self.app, "plugins", [])
+        translator = next((p for p in plugins if p.plugin_type is PluginType.TRANSLATOR
+                           and (wanted is None or p.name == wanted)), None)
+        if translator is None:
+            raise LookupError("no TRANSLATOR plugin configured")
+        backend = next((p for p in plugins if p.plugin_type is PluginType.BACKEND), None)
+        engine = TranslationEngine.from_plugin(translator)
+        memory = TranslationMemory.from_plugin(backend) if backend and backend.params.get("cache_enabled", True) else None
+        # přerušený (zrušený) překlad pokračuje příště od posledního hotového segmentu
+        journal = JobJournal.for_job(f"ui-{lang}", self.locales / ".journal")
+
+        def progress(target: str, done: int, total: int) -> None:
+            job.progress(done, total)
+            job.checkpoint()
+
+        job.progress(0, detail=lang)
+        try:
+            deltas = await DeltaTranslator(self.locales, self.source_lang).run(
+                engine, [lang], memory, journal=journal, progress=progress)
+        finally:
+            await engine.aclose()
+            if memory is not None:
+                memory.close()
+        return len(deltas[lang].pending)
+
+    def _translated(self, lang: str, job: Job) -> None:
+        if job.state == FAILED:
+            self.query_one("#catalog-queue", Static).update(f"{type(job.error).__name__}: {job.error}")
+        if self._lang() == lang:
+            self._load(lang)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        lang = self._lang()
+        if lang is None or event.button.id not in ("catalog-submit", "catalog-translate"):
+            return
+        event.stop()
+        if event.button.id == "catalog-submit":
+            self._submit(lang)
+            return
+        jobs = getattr(self.app, "jobs", None)
+        if jobs is not None and not jobs.busy(f"translate-{lang}"):
+            jobs.start(f"translate-{lang}", partial(self._translate_job, lang),
+                       label=f"{self._t('ui.catalog.translate')} {lang}", on_done=partial(self._translated, lang))
+            self._translate_state()
+
+    @work(thread=True, exclusive=True, group="catalog-load")
+    def _load(self, lang: str) -> None:
+        # 500k klíčů se načítá ~1 s – mimo UI vlákno
+        source = catalog_source(self.locales, self.source_lang, lang, self.PAGED_FROM)
+        query = self.query_one("#catalog-filter", Input).value
+        if query:
+            source.filter(query)
+        self.app.call_from_thread(self.query_one(VirtualGrid).set_source, source)
+
+    def on_select_changed(self, event: Select.Changed) -> None:
+        if event.select.id == "catalog-lang" and isinstance(event.value, str):
+            self._load(event.value)
+            self._queue_status()
+            self._translate_state()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id != "catalog-filter":
+            return
+        if self._debounce is not None:
+            self._debounce.stop()
+        value = event.value
+        self._debounce = self.set_timer(self.DEBOUNCE, lambda: self.query_one(VirtualGrid).filter(value))
+
+    def on_virtual_grid_changed(self, event: VirtualGrid.Changed) -> None:
+        self.query_one("#catalog-status", Static).update(f"{event.count:,} {self._t('ui.catalog.rows')}")
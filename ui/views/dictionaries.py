@@ -0,0 +1,104 @@
+from __future__ import annotations
+from textual import work
+from textual.app import ComposeResult
+from textual.widget import Widget
+from textual.widgets import DataTable, Input, Static
+
+from services.glossary_service import Glossary, GlossaryStore, default_store
+from services.row_source import glossary_source
+from ..grid import VirtualGrid
+from ..icons import icon
+from ..live_text import column_label, live
+
+class DictionariesView(Widget):
+    """Glossaries (do-not-translate + forced terms) with a quick term-hit probe and a term grid."""
+
+    DEFAULT_CSS = '\nDictionariesView {\n    padding: 1 2;\n}\n#dict-table {\n    height: auto;\n    max-height: 30%;\n}\n#dict-terms {\n    margin-top: 1;\n}\n#dict-probe {\n    margin-top: 1;\n}\n#dict-result {\n    padding: 0 1;\n}\n'
+
+    def __init__(self, store: GlossaryStore | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.store = store or default_store()
+        self._glossaries: dict[str, Glossary] = {}
+        self._selected: str | None = None
+
+    @property
+    def dirty(self) -> bool:
+        """A typed probe – the app does not evict the view then."""
+        return bool(self.query_one("#dict-probe", Input).value)
+
+    def _t(self, key: str) -> str:
+        t = getattr(self.app, "t", None)
+        return t.t(key) if t is not None and hasattr(t, "t") else key
+
+    def compose(self) -> ComposeResult:
+        icon_set = getattr(self.app, "icon_set", "none")
+        yield live(self.app, Static(f"{icon('dictionaries', icon_set)} {self._t('ui.hub.dictionaries')}".strip(),
+                                    id="dict-title"),
+                   "ui.hub.dictionaries", lambda text: f"{icon('dictionaries', icon_set)} {text}".strip())
+        yield DataTable(id="dict-table", cursor_type="row")
+        yield live(self.app, Input(placeholder=self._t("ui.dict.probe"), id="dict-probe"), "ui.dict.probe")
+        yield Static("", id="dict-result")
+        grid = VirtualGrid(headers={"term": self._t("ui.dict.term"), "dnt": self._t("ui.dict.dnt")}, id="dict-terms")
+        for name in grid.headers:
+            live(self.app, grid, f"ui.dict.{name}", update=lambda g, text, name=name: g.set_header(name, text))
+        yield grid
+
+    def on_mount(self) -> None:
+        table = self.query_one(DataTable)
+        for key in ("name", "terms", "dnt", "languages"):
+            live(self.app, table, f"ui.dict.{key}", update=column_label(table.add_column(self._t(f"ui.dict.{key}"))))
+        self._load()
+
+    @work(thread=True, exclusive=True)
+    def _load(self) -> None:
+        # kompilace velkých glosářů trvá – mimo UI vlákno (příště z cache na disku)
+        for name in self.store.names():
+            try:
+                glossary = self.store.load(name)
+                glossary.automaton()
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.app.call_from_thread(self._add_row, name, None, str(e))
+                continue
+            self.app.call_from_thread(self._add_row, name, glossary, "")
+
+    def _add_row(self, name: str, glossary: Glossary | None, error: str) -> None:
+        table = self.query_one(DataTable)
+        if glossary is None:
+            table.add_row(name, "–", "–", error, key=name)
+            return
+        self._glossaries[name] = glossary
+        table.add_row(name, str(len(glossary)), str(sum(glossary.dnt)), ", ".join(glossary.targets), key=name)
+        if self._selected is None:
+            self._selected = name
+            self._show_terms(glossary)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        self._selected = event.row_key.value
+        self._probe(self.query_one("#dict-probe", Input).value)
+        glossary = self._glossaries.get(self._selected or "")
+        if glossary is not None:
+            self._show_terms(glossary)
+
+    def _show_terms(self, glossary: Glossary) -> None:
+        self.query_one("#dict-terms", VirtualGrid).set_source(glossary_source(glossary))
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if event.input.id == "dict-probe":
+            self._probe(event.value)
+
+    def _probe(self, text: str) -> None:
+        result = self.query_one("#dict-result", Static)
+        glossary = self._glossaries.get(self._selected or "")
+        if glossary is None or not text:
+            result.update("")
+            return
+        hits = glossary.find(text)
+        if not hits:
+            result.update(self._t("ui.dict.no_hits"))
+            return
+        lines = []
+        for hit in hits:
+            term = glossary.term(hit.term)
+            wording = "DNT" if term.dnt else ", ".join(f"{k}: {v}" for k, v in term.translations.items())
+            lines.append(f"{text[hit.start:hit.end]} → {wording}")
+        result.update("\n".join(lines))
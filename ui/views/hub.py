@@ -1,10 +1,18 @@
 
+from typing import Callable
+
 from textual.app import ComposeResult
 from textual.containers import Grid
 from textual.widgets import Button, Static
 from textual import events
 from textual.widget import Widget
 from ..icons import icon
+from ..live_text import live
+
+
+def _tile_label(name: str, icon_set: str) -> Callable[[str], str]:
+    return lambda text: f"{icon(name, icon_set)} {text}".strip()
+
 
 class HubView(Widget):
     """Hub — big buttons with emoji, colors via CSS."""
@@ -21,17 +29,19 @@ class HubView(Widget):
         icon_set = getattr(self.app, "icon_set", "none")
 
         yield Static(t.t("ui.hub.title") if hasattr(self.app, "i18n") else "Rozcestník", id="hub-title")
+
+        def tile(name: str, kind: str) -> Button:
+            label = _tile_label(name, icon_set)
+            return live(app, Button(label(t.t(f"ui.hub.{name}")), id=f"go-{name}", classes=f"tile {kind}"),
+                        f"ui.hub.{name}", label)
+
         with Grid(id="hub-grid"):
-            yield Button(f"{icon('targets', icon_set)} {t.t('ui.hub.targets')}".strip(),
-                         id="go-targets",      classes="tile success")
-            yield Button(f"{icon('scheduler', icon_set)} {t.t('ui.hub.scheduler')}".strip(),
-                         id="go-scheduler",    classes="tile info")
-            yield Button(f"{icon('plugins', icon_set)} {t.t('ui.hub.plugins')}".strip(),
-                         id="go-plugins",      classes="tile warning")
-            yield Button(f"{icon('dictionaries', icon_set)} {t.t('ui.hub.dictionaries')}".strip(),
-                         id="go-dictionaries", classes="tile neutral")
-            yield Button(f"{icon('settings', icon_set)} {t.t('ui.hub.settings')}".strip(),
-                         id="go-settings",     classes="tile danger")
+            yield tile("targets", "success")
+            yield tile("scheduler", "info")
+            yield tile("plugins", "warning")
+            yield tile("dictionaries", "neutral")
+            yield tile("settings", "danger")
+            yield tile("metrics", "info")
             yield Button(           t.t('ui.hub.sandbox') if hasattr(self.app, "i18n") else "Sandbox",
                          id="go-sandbox",      classes="tile neutral")
 
@@ -42,6 +52,7 @@ class HubView(Widget):
             "go-plugins": "plugins",
             "go-dictionaries": "dictionaries",
             "go-settings": "settings",
+            "go-metrics": "metrics",
         }
         button_id = event.button.id
         target = mapping.get(button_id) if button_id is not None else None
@@ -49,11 +60,11 @@ class HubView(Widget):
             app = self.app  # type: ignore
             go_method = getattr(app, "go", None)
             if callable(go_method):
-                go_method(target)
+                await go_method(target)
 
     async def on_key(self, event: events.Key) -> None:
         if event.key == "enter":
             app = self.app  # type: ignore
             go_method = getattr(app, "go", None)
             if callable(go_method):
-                go_method("targets")
+                await go_method("targets")
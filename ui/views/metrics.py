@@ -0,0 +1,150 @@
+from __future__ import annotations
+import time
+from pathlib import Path
+
+from textual.app import ComposeResult
+from textual.containers import Horizontal
+from textual.widget import Widget
+from textual.widgets import Button, DataTable, Static
+
+from services.metrics import MetricsRegistry, default_registry
+from ..icons import icon
+from ..live_text import column_label, live
+
+# metrika "kusů" pro propustnost podle typu pluginu
+_THROUGHPUT = ("pytrans_translate_segments_total", "pytrans_accessor_records_total")
+_LATENCY = ("pytrans_translate_batch_seconds", "pytrans_plugin_run_seconds")
+_DEPTH = ("pytrans_translate_inflight", "pytrans_accessor_queue_depth")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f} ms" if seconds else "–"
+
+
+class MetricsView(Widget):
+    """Live per-plugin throughput, latency, cache hit rate and queue depth.
+
+    Detailed (per-lookup) metrics are switched on only while the view is mounted.
+    """
+
+    DEFAULT_CSS = '\nMetricsView {\n    padding: 1 2;\n}\n#metrics-table {\n    height: auto;\n    max-height: 60%;\n}\n#metrics-app {\n    margin-top: 1;\n    padding: 0 1;\n}\n#metrics-actions {\n    height: auto;\n    margin-top: 1;\n}\n'
+    REFRESH = 1.0  # s
+
+    def __init__(self, registry: MetricsRegistry | None = None, export_path: Path | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.registry = registry or default_registry()
+        self.export_path = export_path
+        self._previous: dict[str, float] = {}
+        self._stamp = time.monotonic()
+
+    def _t(self, key: str) -> str:
+        t = getattr(self.app, "t", None)
+        return t.t(key) if t is not None and hasattr(t, "t") else key
+
+    def compose(self) -> ComposeResult:
+        icon_set = getattr(self.app, "icon_set", "none")
+        yield live(self.app, Static(f"{icon('metrics', icon_set)} {self._t('ui.hub.metrics')}".strip(), id="metrics-title"),
+                   "ui.hub.metrics", lambda text: f"{icon('metrics', icon_set)} {text}".strip())
+        yield DataTable(id="metrics-table", cursor_type="row")
+        yield Static("", id="metrics-app")
+        with Horizontal(id="metrics-actions"):
+            yield live(self.app, Button(self._t("ui.metrics.export"), id="metrics-export"), "ui.metrics.export")
+            yield Static("", id="metrics-status")
+
+    def on_mount(self) -> None:
+        self.registry.watch()
+        table = self.query_one(DataTable)
+        for key in ("plugin", "type", "throughput", "p50", "p99", "hit_rate", "queue", "errors"):
+            table.add_column(self._t(f"ui.metrics.{key}"), key=key)
+            live(self.app, table, f"ui.metrics.{key}", update=column_label(key))
+        self.refresh_metrics()
+        self.set_interval(self.REFRESH, self.refresh_metrics)
+
+    def on_unmount(self) -> None:
+        self.registry.unwatch()
+
+    def rows(self) -> dict[str, dict[str, object]]:
+        """Per-plugin values from the registry (collectors run first)."""
+        self.registry.collect()
+        now = time.monotonic()
+        elapsed = max(now - self._stamp, 1e-6)
+        self._stamp = now
+        rows: dict[str, dict[str, object]] = {}
+
+        def row(plugin: str) -> dict[str, object]:
+            return rows.setdefault(plugin, {"type": "", "throughput": None, "p50": 0.0, "p99": 0.0,
+                                            "hits": 0.0, "misses": 0.0, "queue": None, "errors": 0.0})
+
+        for name, labels, metric in self.registry.items():
+            plugin = labels.get("plugin")
+            if plugin is None:
+                continue
+            r = row(plugin)
+            if "type" in labels:
+                r["type"] = labels["type"]
+            if name in _THROUGHPUT:
+                key = f"{name}|{plugin}"
+                before = self._previous.get(key, metric.value)  # type: ignore[union-attr]
+                self._previous[key] = metric.value  # type: ignore[union-attr]
+                r["throughput"] = (metric.value - before) / elapsed  # type: ignore[union-attr]
+            elif name in _LATENCY and metric.count:  # type: ignore[union-attr]
+                # dávky překladu mají přednost před během handleru
+                if name == _LATENCY[0] or not r["p50"]:
+                    r["p50"], r["p99"] = metric.quantile(0.5), metric.quantile(0.99)  # type: ignore[union-attr]
+            elif name == "pytrans_tm_hits_total":
+                r["hits"] = metric.value  # type: ignore[union-attr]
+            elif name == "pytrans_tm_misses_total":
+                r["misses"] = metric.value  # type: ignore[union-attr]
+            elif name in _DEPTH:
+                r["queue"] = metric.value  # type: ignore[union-attr]
+            elif name.endswith("_errors_total"):
+                r["errors"] += metric.value  # type: ignore[operator, union-attr]
+        return rows
+
+    def refresh_metrics(self) -> None:
+        table = self.query_one(DataTable)
+        for plugin, r in sorted(self.rows().items()):
+            lookups = r["hits"] + r["misses"]  # type: ignore[operator]
+            cells = {
+                "plugin": plugin,
+                "type": r["type"],
+                "throughput": f"{r['throughput']:.1f}/s" if r["throughput"] is not None else "–",
+                "p50": _ms(r["p50"]),  # type: ignore[arg-type]
+                "p99": _ms(r["p99"]),  # type: ignore[arg-type]
+                "hit_rate": f"{100 * r['hits'] / lookups:.0f} %" if lookups else "–",  # type: ignore[operator]
+                "queue": f"{r['queue']:.0f}" if r["queue"] is not None else "–",
+                "errors": f"{r['errors']:.0f}",
+            }
+            if plugin in table.rows:
+                for column, value in cells.items():
+                    table.update_cell(plugin, column, value)
+            else:
+                table.add_row(*cells.values(), key=plugin)
+        self.query_one("#metrics-app", Static).update(self._app_summary())
+
+    def _app_summary(self) -> str:
+        lookups = misses = 0.0
+        for name, _, metric in self.registry.items():
+            if name == "pytrans_i18n_lookups_total":
+                lookups += metric.value  # type: ignore[union-attr]
+            elif name == "pytrans_i18n_misses_total":
+                misses += metric.value  # type: ignore[union-attr]
+        saves = self.registry.histogram("pytrans_settings_save_seconds")
+        return (f"{self._t('ui.metrics.lookups')}: {lookups:.0f} "
+                f"({self._t('ui.metrics.missing')}: {misses:.0f})   "
+                f"{self._t('ui.metrics.settings_saves')}: {saves.count} "
+                f"(p99 {_ms(saves.quantile(0.99))})")
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id != "metrics-export":
+            return
+        event.stop()
+        path = self.export_path or Path(self.app.settings.get("metrics_export", "./metrics/pytrans.prom"))  # type: ignore[attr-defined]
+        status = self.query_one("#metrics-status", Static)
+        try:
+            self.registry.write(path)
+            self.registry.write(path.with_suffix(".json"))
+        except OSError as e:
+            status.update(str(e))
+            return
+        status.update(f"{self._t('ui.metrics.exported')} {path}")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from pathlib import Path
+
+from textual import work
+from textual.app import ComposeResult
+from textual.containers import Horizontal
+from textual.widget import Widget
+from textual.widgets import Button, DataTable, Static
+
+from models.queue import ShardStats
+from services.scheduler import Scheduler, default_scheduler
+from services.work_queue import DEFAULT_QUEUE, WorkQueue, open_queue
+from ..icons import icon
+from ..live_text import column_label, live
+
+_SHARD_COLUMNS = ("shard", "ready", "leased", "done", "dead", "workers")
+
+
+class SchedulerView(Widget):
+    """Upcoming scheduled jobs and the state of the shared job queue.
+
+    Queue calls (SQLite or HTTP) run in thread workers; workers themselves are
+    started with ``pytrans.py queue work`` on this or other machines.
+    """
+
+    DEFAULT_CSS = '\nSchedulerView {\n    padding: 1 2;\n}\n#scheduler-jobs {\n    height: auto;\n    max-height: 40%;\n}\n#scheduler-queue {\n    height: auto;\n    max-height: 40%;\n}\n.scheduler-heading {\n    margin-top: 1;\n}\n#scheduler-actions {\n    height: auto;\n    margin-top: 1;\n}\n'
+    REFRESH = 2.0  # s
+
+    def __init__(self, scheduler: Scheduler | None = None, queue_url: str | None = None,
+                 locales: Path = Path("./locales"), **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.scheduler = scheduler or default_scheduler()
+        self.queue_url = queue_url
+        self.locales = Path(locales)
+        self._queue: WorkQueue | None = None
+
+    def _t(self, key: str) -> str:
+        t = getattr(self.app, "t", None)
+        return t.t(key) if t is not None and hasattr(t, "t") else key
+
+    def _setting(self, key: str, default: str) -> str:
+        settings = getattr(self.app, "settings", None)
+        return settings.get(key, default) if settings is not None else default
+
+    @property
+    def queue(self) -> WorkQueue:
+        if self._queue is None:
+            self._queue = open_queue(self.queue_url or self._setting("queue", DEFAULT_QUEUE))
+        return self._queue
+
+    def compose(self) -> ComposeResult:
+        icon_set = getattr(self.app, "icon_set", "none")
+        yield live(self.app, Static(f"{icon('scheduler', icon_set)} {self._t('ui.hub.scheduler')}".strip(),
+                                    id="scheduler-title"),
+                   "ui.hub.scheduler", lambda text: f"{icon('scheduler', icon_set)} {text}".strip())
+        yield live(self.app, Static(self._t("ui.scheduler.upcoming"), classes="scheduler-heading"), "ui.scheduler.upcoming")
+        yield DataTable(id="scheduler-jobs", cursor_type="row")
+        yield live(self.app, Static(self._t("ui.queue.title"), classes="scheduler-heading"), "ui.queue.title")
+        yield DataTable(id="scheduler-queue", cursor_type="row")
+        with Horizontal(id="scheduler-actions"):
+            yield live(self.app, Button(self._t("ui.queue.submit_all"), id="queue-submit"), "ui.queue.submit_all")
+            yield live(self.app, Button(self._t("ui.queue.collect"), id="queue-collect"), "ui.queue.collect")
+            yield live(self.app, Button(self._t("ui.queue.retry"), id="queue-retry"), "ui.queue.retry")
+            yield Static("", id="scheduler-status")
+
+    def on_mount(self) -> None:
+        jobs = self.query_one("#scheduler-jobs", DataTable)
+        for key in ("job", "cron", "next_run", "last_run", "error"):
+            jobs.add_column(self._t(f"ui.scheduler.{key}"), key=key)
+            live(self.app, jobs, f"ui.scheduler.{key}", update=column_label(key))
+        shards = self.query_one("#scheduler-queue", DataTable)
+        for key in _SHARD_COLUMNS:
+            shards.add_column(self._t(f"ui.queue.{key}"), key=key)
+            live(self.app, shards, f"ui.queue.{key}", update=column_label(key))
+        self.refresh_view()
+        self.set_interval(self.REFRESH, self.refresh_view)
+
+    def on_unmount(self) -> None:
+        if self._queue is not None:
+            self._queue.close()
+            self._queue = None
+
+    def refresh_view(self) -> None:
+        self._show_jobs()
+        self._load_stats()
+
+    def _show_jobs(self) -> None:
+        table = self.query_one("#scheduler-jobs", DataTable)
+        table.clear()
+        for job in self.scheduler.upcoming():
+            table.add_row(job.name, job.cron.expr,
+                          job.next_run.astimezone().strftime("%Y-%m-%d %H:%M") if job.next_run else "–",
+                          job.last_run.astimezone().strftime("%Y-%m-%d %H:%M") if job.last_run else "–",
+                          job.last_error or "", key=job.name)
+
+    @work(thread=True, exclusive=True, group="queue-stats")
+    def _load_stats(self) -> None:
+        try:
+            stats = self.queue.stats()
+        except Exception as e:  # nedostupný uzel fronty – zobrazí se, obnova to zkusí znovu
+            self.app.call_from_thread(self._status, f"{type(e).__name__}: {e}")
+            return
+        self.app.call_from_thread(self._show_stats, stats)
+
+    def _show_stats(self, stats: dict[str, ShardStats]) -> None:
+        table = self.query_one("#scheduler-queue", DataTable)
+        for shard in [k.value for k in table.rows if k.value not in stats]:
+            table.remove_row(shard)
+        for shard, s in sorted(stats.items()):
+            cells = {"shard": shard, "ready": s.ready, "leased": s.leased, "done": s.done, "dead": s.dead,
+                     "workers": s.workers}
+            if shard in table.rows:
+                for column, value in cells.items():
+                    table.update_cell(shard, column, value)
+            else:
+                table.add_row(*cells.values(), key=shard)
+
+    def _status(self, text: str) -> None:
+        self.query_one("#scheduler-status", Static).update(text)
+
+    @work(thread=True, exclusive=True, group="queue-action")
+    def _run_action(self, action: str) -> None:
+        from services import queue_worker
+
+        source = self._setting("source_language", "en")
+        try:
+            if action == "queue-submit":
+                counts = queue_worker.submit_targets(self.queue, self.locales, source)
+                text = f"{self._t('ui.queue.submitted')}: {sum(counts.values()):,}"
+            elif action == "queue-collect":
+                counts = queue_worker.collect(self.queue, self.locales, source)
+                text = f"{self._t('ui.queue.collected')}: {sum(counts.values()):,}"
+            else:
+                text = f"{self._t('ui.queue.retried')}: {self.queue.retry_dead():,}"
+        except Exception as e:
+            text = f"{type(e).__name__}: {e}"
+        self.app.call_from_thread(self._status, text)
+        self.app.call_from_thread(self._load_stats)
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id in ("queue-submit", "queue-collect", "queue-retry"):
+            event.stop()
+            self._run_action(event.button.id)